@@ -0,0 +1,48 @@
+"""
+APEX AI analysis engine - importable without Streamlit
+
+Detectors, analyzers, capital simulation and data/cache management used by
+the Streamlit app (app.py) and the headless scheduler (scheduler.py).
+"""
+
+from .timezones import (
+    get_ist_now, convert_to_ist, format_ist_timestamp, safe_convert_to_ist, safe_format_ist_timestamp
+)
+from .reporting import Reporter
+from .models import (
+    SwingLow, PinBar, BullishEngulfing, ThreeCandle, DragonflyDoji, ThreeWhiteSoldiers, BullishMarubozu,
+    BullishHarami, BullishAbandonedBaby, TweezerBottom, BullishKicker, TradeOutcome, SwingLowTouch,
+    CapitalEvent, Trade
+)
+from .swings import EnhancedSwingLowDetector, IncrementalSwingLowState
+from .trades import TradeWindowBatch, EnhancedTradeOutcomeAnalyzer
+from .touches import SwingLowIndex, EnhancedSwingLowTouchAnalyzer
+from .capital import MONTE_CARLO_METRICS, CapitalManager, MonteCarloCapitalSimulator, simulate_capital_paths
+from .storage import (
+    OHLCVCacheFormat, OHLCVArrays, SegmentedOHLCVStore, map_cached_series, ConsolidatedOHLCVStore, CacheManifest,
+    AnalysisResultCache, FileManager
+)
+from .data import (
+    TV_AVAILABLE, TokenBucket, FetchRequest, FetchResult, ConcurrentDataFetcher, FakeDatafeed,
+    BackgroundDataManager
+)
+from .patterns import (
+    PinBarDetector, BullishEngulfingDetector, ThreeCandleDetector, DragonflyDojiDetector,
+    ThreeWhiteSoldiersDetector, BullishMarubozuDetector, BullishHaramiDetector, BullishAbandonedBabyDetector,
+    TweezerBottomDetector, BullishKickerDetector, PatternTable, PatternRow, CandleFeatures, FusedPatternDetector
+)
+from .live import LivePatternAnalyzer
+from .instrumentation import PIPELINE_STAGES, StageStats, StageMetrics, NULL_METRICS
+from .analysis import (
+    ANALYSIS_DEBUG_COUNTERS, AnalysisSettings, AnalysisResultStream, analyze_symbol_timeframe, iter_analysis_units,
+    stream_comprehensive_analysis, run_comprehensive_analysis, detect_selected_patterns_with_today,
+    detect_selected_patterns, validate_live_entry_capability
+)
+from .resample import (
+    NSE_SESSION_OPEN, TIMEFRAME_MINUTES, RESAMPLE_TARGETS, resample_sources, infer_session_open, resample_ohlcv
+)
+from .synthetic import PLANTED_PATTERNS, nse_session_index, generate_synthetic_ohlcv, generate_synthetic_universe
+from .sweep import (
+    StagedUnitPipeline, SWEEP_METRICS, parameter_grid, random_parameter_samples, combination_settings,
+    run_parameter_sweep
+)
@@ -0,0 +1,610 @@
+"""
+Market data acquisition: concurrent TradingView fetching and incremental cache updates
+"""
+
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .resample import RESAMPLE_TARGETS, TIMEFRAME_MINUTES, resample_ohlcv, resample_sources
+from .storage import FileManager
+
+# Check for TradingView availability
+try:
+    from tvDatafeed import TvDatafeed, Interval
+
+    TV_AVAILABLE = True
+except ImportError:
+    TV_AVAILABLE = False
+
+
+# ============================================================================
+# CONCURRENT DATA FETCHER
+# ============================================================================
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter shared by all fetch workers"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until tokens are available; False if that would exceed the timeout"""
+        if self.rate <= 0:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+@dataclass
+class FetchRequest:
+    """One get_hist call; context carries caller state through to the result"""
+    symbol: str
+    exchange: str
+    timeframe: str
+    interval: Any
+    n_bars: int
+    context: Any = None
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a FetchRequest (data is None when nothing was received)"""
+    request: FetchRequest
+    data: Optional[pd.DataFrame]
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    attempts: int = 1
+
+
+class ConcurrentDataFetcher:
+    """Fetches historical bars over a bounded worker pool.
+
+    Every worker thread owns its own datafeed session (created lazily from
+    datafeed_factory), all workers share one token bucket, and each call is
+    abandoned after `timeout` seconds. Results stream back as they complete.
+    """
+
+    def __init__(self, datafeed_factory: Optional[Callable[[], Any]] = None, max_workers: int = 4,
+                 requests_per_second: float = 3.0, burst: Optional[float] = None,
+                 timeout: Optional[float] = 30.0, retries: int = 1):
+        self.datafeed_factory = datafeed_factory or TvDatafeed
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = TokenBucket(requests_per_second, burst)
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self._local = threading.local()
+
+    def _datafeed(self):
+        datafeed = getattr(self._local, 'datafeed', None)
+        if datafeed is None:
+            datafeed = self.datafeed_factory()
+            self._local.datafeed = datafeed
+        return datafeed
+
+    def _get_hist(self, request: FetchRequest) -> Optional[pd.DataFrame]:
+        """Run one get_hist call on this worker's session, enforcing the timeout"""
+        datafeed = self._datafeed()
+        if not self.timeout:
+            return datafeed.get_hist(request.symbol, request.exchange, request.interval, n_bars=request.n_bars)
+
+        outcome = {}
+
+        def call():
+            try:
+                outcome['data'] = datafeed.get_hist(request.symbol, request.exchange, request.interval,
+                                                    n_bars=request.n_bars)
+            except Exception as e:
+                outcome['error'] = e
+
+        caller = threading.Thread(target=call, daemon=True)
+        caller.start()
+        caller.join(self.timeout)
+        if caller.is_alive():
+            # The session may be wedged; the next request on this worker opens a fresh one
+            self._local.datafeed = None
+            raise TimeoutError(f"Timed out after {self.timeout:g}s")
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome.get('data')
+
+    def _fetch_one(self, request: FetchRequest) -> FetchResult:
+        start = time.perf_counter()
+        data, error, attempts = None, None, 0
+
+        while attempts <= self.retries:
+            attempts += 1
+            self.rate_limiter.acquire()
+            try:
+                data, error = self._get_hist(request), None
+                break
+            except Exception as e:
+                error = str(e) or type(e).__name__
+
+        return FetchResult(request, data, error, time.perf_counter() - start, attempts)
+
+    def fetch(self, requests: Iterable[FetchRequest]) -> Iterator[FetchResult]:
+        """Yield a FetchResult per request in completion order"""
+        requests = list(requests)
+        if not requests:
+            return
+
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, len(requests)), thread_name_prefix="tv-fetch")
+        try:
+            futures = [pool.submit(self._fetch_one, request) for request in requests]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+class FakeDatafeed:
+    """Offline stand-in for TvDatafeed with injectable latency and failures.
+
+    Serves a deterministic random walk per symbol/interval so the fetcher
+    can be exercised and benchmarked without network access.
+    """
+
+    INTERVAL_FREQUENCIES = {
+        '1': '1min', '3': '3min', '5': '5min', '15': '15min', '30': '30min', '45': '45min',
+        '1H': '1h', '2H': '2h', '3H': '3h', '4H': '4h', '1D': '1D', '1W': '7D', '1M': '30D'
+    }
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.0, failure_rate: float = 0.0,
+                 hang_rate: float = 0.0, hang_seconds: float = 3600.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.calls = 0
+        self._rng = np.random.default_rng(seed)
+
+    def get_hist(self, symbol: str, exchange: str = 'NSE', interval=None, n_bars: int = 10,
+                 **kwargs) -> Optional[pd.DataFrame]:
+        self.calls += 1
+        roll = self._rng.random()
+        time.sleep(max(0.0, self.latency + self.jitter * self._rng.standard_normal()))
+        if roll < self.hang_rate:
+            time.sleep(self.hang_seconds)
+        if roll < self.hang_rate + self.failure_rate:
+            raise ConnectionError(f"Injected failure for {symbol}")
+
+        interval_code = str(getattr(interval, 'value', interval) or '1D')
+        frequency = self.INTERVAL_FREQUENCIES.get(interval_code, '1D')
+        index = pd.date_range(end=pd.Timestamp.now().floor(frequency), periods=n_bars, freq=frequency,
+                              name='datetime')
+
+        seed = hashlib.blake2b(f"{exchange}:{symbol}:{interval_code}".encode(), digest_size=8).digest()
+        walk = np.random.default_rng(int.from_bytes(seed, 'little'))
+        close = 100.0 * np.exp(np.cumsum(walk.normal(0.0, 0.01, n_bars)))
+        open_ = np.concatenate([[close[0]], close[:-1]])
+        spread = np.abs(walk.normal(0.0, 0.005, n_bars)) * close
+        return pd.DataFrame({
+            'symbol': f"{exchange}:{symbol}",
+            'open': open_,
+            'high': np.maximum(open_, close) + spread,
+            'low': np.minimum(open_, close) - spread,
+            'close': close,
+            'volume': walk.integers(1_000, 100_000, n_bars).astype(float)
+        }, index=index)
+
+
+# ============================================================================
+# ENHANCED BACKGROUND DATA MANAGER WITH SMART UPDATES + DATE PICKER SUPPORT
+# ============================================================================
+
+class BackgroundDataManager:
+    """Enhanced data manager with intelligent incremental updates and date picker support
+
+    With resample_higher_timeframes, 15m/30m/1H/4H series are built from the
+    finest fresh cached series that covers the requested range (see
+    apex_core.resample) and only fetched when none does.
+    """
+
+    def __init__(self, file_manager: FileManager, datafeed_factory: Optional[Callable[[], Any]] = None,
+                 fetch_workers: int = 4, requests_per_second: float = 3.0, fetch_timeout: float = 30.0,
+                 resample_higher_timeframes: bool = True):
+        self.file_manager = file_manager
+        self.fetcher = ConcurrentDataFetcher(
+            datafeed_factory, fetch_workers, requests_per_second, timeout=fetch_timeout
+        ) if datafeed_factory or TV_AVAILABLE else None
+        self.timeframes = ['1m', '5m', '15m', '30m', '1H', '4H', '1D']
+        self.last_update_times = {}
+        self.resample_higher_timeframes = resample_higher_timeframes
+
+    def get_interval_from_timeframe(self, timeframe: str):
+        """Convert timeframe to TradingView interval"""
+        if not TV_AVAILABLE:
+            # Raw TradingView interval codes (what FakeDatafeed understands)
+            return {'1m': '1', '5m': '5', '15m': '15', '30m': '30',
+                    '1H': '1H', '4H': '4H', '1D': '1D'}.get(timeframe, '15')
+
+        interval_map = {
+            '1m': Interval.in_1_minute,
+            '5m': Interval.in_5_minute,
+            '15m': Interval.in_15_minute,
+            '30m': Interval.in_30_minute,
+            '1H': Interval.in_1_hour,
+            '4H': Interval.in_4_hour,
+            '1D': Interval.in_daily
+        }
+        return interval_map.get(timeframe, Interval.in_15_minute)
+
+    def should_update_timeframe(self, timeframe: str) -> bool:
+        """Check if timeframe needs updating based on its frequency"""
+        update_intervals = {
+            '1m': timedelta(minutes=2),
+            '5m': timedelta(minutes=3),
+            '15m': timedelta(minutes=5),
+            '30m': timedelta(minutes=10),
+            '1H': timedelta(minutes=15),
+            '4H': timedelta(hours=1),
+            '1D': timedelta(hours=4)
+        }
+
+        last_update = self.last_update_times.get(timeframe)
+        if not last_update:
+            return True
+
+        return datetime.now() - last_update >= update_intervals.get(timeframe, timedelta(minutes=5))
+
+    def calculate_bars_from_date(self, start_date: datetime, timeframe: str) -> int:
+        """Calculate number of bars needed from start date to now - ENHANCED WITH DATE PICKER SUPPORT"""
+        if not start_date:
+            return self._calculate_bars_needed(timeframe)
+
+        # Calculate time difference
+        now = datetime.now()
+        time_diff = now - start_date
+
+        # Calculate bars based on timeframe
+        timeframe_minutes = {
+            '1m': 1,
+            '5m': 5,
+            '15m': 15,
+            '30m': 30,
+            '1H': 60,
+            '4H': 240,
+            '1D': 1440
+        }
+
+        tf_minutes = timeframe_minutes.get(timeframe, 60)
+        total_minutes = time_diff.total_seconds() / 60
+        bars_needed = int(total_minutes / tf_minutes) + 50  # Add buffer for gaps/weekends
+
+        # Apply reasonable limits
+        max_bars = {
+            '1m': 5000,  # ~3.5 days max
+            '5m': 4000,  # ~2 weeks max
+            '15m': 3000,  # ~1 month max
+            '30m': 2500,  # ~2 months max
+            '1H': 2000,  # ~3 months max
+            '4H': 1500,  # ~9 months max
+            '1D': 1000  # ~3 years max
+        }
+
+        limit = max_bars.get(timeframe, 2000)
+        bars_needed = min(bars_needed, limit)
+
+        # Minimum bars for analysis
+        min_bars = {
+            '1m': 100,
+            '5m': 200,
+            '15m': 300,
+            '30m': 250,
+            '1H': 200,
+            '4H': 150,
+            '1D': 100
+        }
+
+        minimum = min_bars.get(timeframe, 200)
+        bars_needed = max(bars_needed, minimum)
+
+        return bars_needed
+
+    def update_data_incrementally(self, symbols: List[str], timeframes: List[str],
+                                  exchange: str = 'NSE', force_update: bool = False,
+                                  start_date: Optional[datetime] = None,
+                                  progress_callback: Optional[Callable[[int, int, str, str, str], None]] = None
+                                  ) -> Dict[str, Dict[str, str]]:
+        """Smart incremental data updates with date picker support - ENHANCED
+
+        Cache state comes from the manifest, downloads run concurrently on the
+        fetcher, and each result is merged/saved on the calling thread as it
+        arrives. Timeframes that can be resampled locally wait for the first
+        round of downloads and are fetched only if no finer series covers
+        them. progress_callback(done, total, symbol, timeframe, status) is
+        invoked once per symbol/timeframe.
+        """
+        if not self.fetcher:
+            return {"error": "TradingView not available"}
+
+        results = {symbol: {} for symbol in symbols}
+        total = len(symbols) * len(timeframes)
+        done = 0
+
+        def report(symbol: str, timeframe: str, status: str):
+            nonlocal done
+            results[symbol][timeframe] = status
+            done += 1
+            if progress_callback:
+                progress_callback(done, total, symbol, timeframe, status)
+
+        def plan(symbol: str, timeframe: str, requests: List[FetchRequest]):
+            try:
+                mode, bars, status = self._plan_update(symbol, timeframe, exchange, force_update, start_date)
+                if status is not None:
+                    report(symbol, timeframe, status)
+                else:
+                    requests.append(FetchRequest(symbol, exchange, timeframe,
+                                                 self.get_interval_from_timeframe(timeframe), bars, mode))
+            except Exception as e:
+                report(symbol, timeframe, f"❌ Error: {str(e)[:30]}")
+
+        requests = []
+        derivable = []
+        for symbol in symbols:
+            for timeframe in timeframes:
+                if self._can_resample(symbol, timeframe, exchange, timeframes, start_date):
+                    derivable.append((symbol, timeframe))
+                else:
+                    plan(symbol, timeframe, requests)
+        self._run_fetches(requests, start_date, report)
+
+        # Coarser targets first resample from finer ones built or fetched above
+        fallback = []
+        with self.file_manager.bulk_write():
+            for symbol, timeframe in sorted(derivable, key=lambda item: TIMEFRAME_MINUTES[item[1]]):
+                try:
+                    status = self._resample_from_cache(symbol, timeframe, exchange, force_update, start_date,
+                                                       results[symbol])
+                except Exception as e:
+                    status = None
+                    print(f"⚠️ Resampling {symbol} {timeframe} failed: {e}")
+                if status is not None:
+                    report(symbol, timeframe, status)
+                else:
+                    plan(symbol, timeframe, fallback)
+        self._run_fetches(fallback, start_date, report)
+
+        return results
+
+    def _run_fetches(self, requests: List[FetchRequest], start_date: Optional[datetime],
+                     report: Callable[[str, str, str], None]):
+        """Download requests concurrently, merging/saving each result as it arrives.
+
+        The cache manifest is written once for the whole round (with the
+        consolidated store, the round is upserted in one transaction).
+        """
+        with self.file_manager.bulk_write():
+            for fetched in self.fetcher.fetch(requests):
+                request = fetched.request
+                try:
+                    if fetched.error is not None:
+                        raise RuntimeError(fetched.error)
+                    status = self._apply_fetch(request, fetched.data, start_date)
+                except Exception as e:
+                    status = f"❌ Error: {str(e)[:30]}"
+                report(request.symbol, request.timeframe, status)
+
+    def _is_current(self, symbol: str, timeframe: str, exchange: str, start_date: Optional[datetime]) -> bool:
+        """True when the cached series needs no download for this request"""
+        return self._plan_update(symbol, timeframe, exchange, False, start_date)[2] is not None
+
+    def _can_resample(self, symbol: str, timeframe: str, exchange: str, timeframes: List[str],
+                      start_date: Optional[datetime]) -> bool:
+        """Whether a finer series is being updated in this request or is already current in the cache"""
+        if not self.resample_higher_timeframes or timeframe not in RESAMPLE_TARGETS:
+            return False
+        return any(source in timeframes or self._is_current(symbol, source, exchange, start_date)
+                   for source in resample_sources(timeframe))
+
+    def _resample_from_cache(self, symbol: str, timeframe: str, exchange: str, force_update: bool,
+                             start_date: Optional[datetime], statuses: Dict[str, str]) -> Optional[str]:
+        """Build timeframe from the finest up-to-date finer series that covers the requested range.
+
+        Sources updated earlier in this request count as up to date unless
+        they failed. Resampled bars are appended to an overlapping existing
+        cache, keeping its older history (unless force_update). Returns the
+        status line, or None when no source covers the range.
+        """
+        bars_needed = (self.calculate_bars_from_date(start_date, timeframe) if start_date
+                       else self._calculate_bars_needed(timeframe))
+
+        for source in resample_sources(timeframe):
+            if source in statuses:
+                if statuses[source].startswith("❌"):
+                    continue
+            elif not self._is_current(symbol, source, exchange, start_date):
+                continue
+
+            derived = resample_ohlcv(self.file_manager.load_data_from_cache(symbol, source, exchange), timeframe)
+            if derived is None or derived.empty:
+                continue
+
+            total_bars, first_bar, extends_cache = len(derived), derived.index.min(), False
+            if not force_update:
+                cached_data = self.file_manager.load_data_from_cache(symbol, timeframe, exchange)
+                if (cached_data is not None and not cached_data.empty
+                        and cached_data.index.max() >= derived.index.min()):
+                    total_bars += int((cached_data.index < derived.index.min()).sum())
+                    first_bar = min(first_bar, cached_data.index.min())
+                    extends_cache = True
+
+            covered = total_bars >= bars_needed or (start_date is not None and first_bar <= pd.Timestamp(start_date))
+            if not covered:
+                continue
+
+            if extends_cache:
+                total_bars = self.file_manager.append_data_to_cache(symbol, timeframe, exchange, derived)[1]
+            else:
+                self.file_manager.save_data_to_cache(symbol, timeframe, exchange, derived, {
+                    'timestamp': datetime.now().isoformat(),
+                    'symbol': symbol,
+                    'timeframe': timeframe,
+                    'exchange': exchange,
+                    'total_candles': len(derived),
+                    'date_range': {
+                        'start': derived.index.min().isoformat(),
+                        'end': derived.index.max().isoformat()
+                    },
+                    'resampled_from': source
+                })
+            self.last_update_times[timeframe] = datetime.now()
+            return f"✅ Resampled from {source} ({total_bars} bars)"
+
+        return None
+
+    def _plan_update(self, symbol: str, timeframe: str, exchange: str, force_update: bool,
+                     start_date: Optional[datetime]) -> Tuple[Optional[str], int, Optional[str]]:
+        """Decide what to fetch from the cache manifest: (mode, bars, status if no fetch is needed)"""
+        cache_info = self.file_manager.get_cache_info(symbol, timeframe, exchange)
+        has_cache = bool(cache_info and cache_info['total_candles'] and cache_info['last_bar'])
+
+        # Determine bars needed
+        if start_date:
+            # Use date picker to calculate bars
+            bars_needed = self.calculate_bars_from_date(start_date, timeframe)
+        else:
+            # Use default bars
+            bars_needed = self._calculate_bars_needed(timeframe)
+
+        if force_update or not has_cache:
+            return 'full', bars_needed, None
+
+        cached_bars = cache_info['total_candles']
+        last_timestamp = pd.Timestamp(cache_info['last_bar'])
+
+        if not start_date:
+            # Standard incremental update logic
+            time_diff = datetime.now() - last_timestamp
+            incremental_bars = self._calculate_incremental_bars(timeframe, time_diff)
+
+            if incremental_bars <= 1:
+                age_minutes = int(time_diff.total_seconds() / 60)
+                return None, 0, f"✅ Current ({cached_bars} bars, {age_minutes}m old)"
+            return 'incremental', incremental_bars, None
+
+        # Check if cached data covers the requested date range
+        cached_start = pd.Timestamp(cache_info['date_range']['start'])
+        if cached_start <= pd.Timestamp(start_date):
+            # We have enough data
+            age = datetime.now() - last_timestamp
+            age_hours = int(age.total_seconds() / 3600)
+            return None, 0, f"✅ Date range covered ({cached_bars} bars, {age_hours}h old)"
+
+        # Need more historical data
+        return 'historical', bars_needed, None
+
+    def _apply_fetch(self, request: FetchRequest, data: Optional[pd.DataFrame],
+                     start_date: Optional[datetime]) -> str:
+        """Merge/save one fetched series and return its status line"""
+        symbol, timeframe, exchange = request.symbol, request.timeframe, request.exchange
+        received = data is not None and not data.empty
+
+        cache_info = None
+        if request.context == 'incremental':
+            cache_info = self.file_manager.get_cache_info(symbol, timeframe, exchange)
+
+        if cache_info and cache_info['total_candles']:
+            if not received:
+                return f"✅ Current ({cache_info['total_candles']} bars)"
+            # Appends only the new bars to the series' segmented store instead of rewriting its history
+            new_bars, total_bars = self.file_manager.append_data_to_cache(symbol, timeframe, exchange,
+                                                                          self._clean_data(data))
+            self.last_update_times[timeframe] = datetime.now()
+            return f"✅ Updated +{new_bars} bars ({total_bars} total)"
+
+        if not received:
+            return "❌ No historical data received" if request.context == 'historical' else "❌ No data received"
+
+        cleaned_data = self._clean_data(data)
+        self.file_manager.save_data_to_cache(symbol, timeframe, exchange, cleaned_data)
+        self.last_update_times[timeframe] = datetime.now()
+
+        label = "Historical download" if request.context == 'historical' else "Full download"
+        if start_date:
+            # Check date coverage
+            start_coverage = "✅" if cleaned_data.index.min() <= pd.Timestamp(start_date) else "⚠️"
+            return f"{start_coverage} {label} ({len(cleaned_data)} bars from {cleaned_data.index.min().strftime('%Y-%m-%d')})"
+        return f"✅ {label} ({len(cleaned_data)} bars)"
+
+    def _calculate_incremental_bars(self, timeframe: str, time_diff: timedelta) -> int:
+        """Calculate how many bars needed based on time difference"""
+        minutes_diff = time_diff.total_seconds() / 60
+
+        timeframe_minutes = {
+            '1m': 1, '5m': 5, '15m': 15, '30m': 30,
+            '1H': 60, '4H': 240, '1D': 1440
+        }
+
+        tf_minutes = timeframe_minutes.get(timeframe, 15)
+        bars_needed = int(minutes_diff / tf_minutes) + 5
+
+        return min(bars_needed, 100)
+
+    def update_data_for_timeframes(self, symbols: List[str], timeframes: List[str],
+                                   exchange: str = 'NSE', force_update: bool = False,
+                                   start_date: Optional[datetime] = None) -> Dict[str, Dict[str, str]]:
+        """Legacy method that now uses incremental updates with date support"""
+        return self.update_data_incrementally(symbols, timeframes, exchange, force_update, start_date)
+
+    def get_cached_data(self, symbol: str, timeframe: str, exchange: str = 'NSE', window: Optional[int] = None,
+                        mapped: bool = False) -> Optional[pd.DataFrame]:
+        """Get cached OHLCV data for symbol/timeframe.
+
+        With mapped=True (implied by window) the frame is a zero-copy view of
+        the memory-mapped cache file, restricted to its last window bars if given.
+        """
+        if mapped or window is not None:
+            arrays = self.file_manager.map_data_from_cache(symbol, timeframe, exchange, window)
+            return arrays.to_frame() if arrays is not None else None
+        return self.file_manager.load_data_from_cache(symbol, timeframe, exchange)
+
+    def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Clean and prepare the fetched OHLCV data"""
+        if df is None or df.empty:
+            raise ValueError("Empty data received during cleaning.")
+
+        df.index = pd.to_datetime(df.index)
+        df = df.sort_index()
+
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+
+        df = df.dropna()
+        return df
+
+    def _calculate_bars_needed(self, timeframe: str) -> int:
+        """Calculate number of bars needed for analysis (default method)"""
+        bars_map = {
+            '1m': 500, '5m': 400, '15m': 300, '30m': 250,
+            '1H': 200, '4H': 150, '1D': 100
+        }
+        return bars_map.get(timeframe, 200)
@@ -0,0 +1,231 @@
+"""
+Per-stage wall time and counters for the analysis pipeline, aggregated per symbol and per run
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+# ============================================================================
+# STAGE METRICS
+# ============================================================================
+
+PIPELINE_STAGES = ('data_load', 'swing_detection', 'pattern_detection', 'touch_analysis', 'outcome_analysis',
+                   'result_formatting')
+
+
+@dataclass
+class StageStats:
+    """Calls, wall time and bars processed accumulated for one stage"""
+    calls: int = 0
+    seconds: float = 0.0
+    bars: int = 0
+
+    @property
+    def bars_per_second(self) -> float:
+        return self.bars / self.seconds if self.seconds > 0 else 0.0
+
+    def add(self, other: 'StageStats'):
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.bars += other.bars
+
+
+class _StageTimer:
+    """Adds the wall time of its with-block to a run-level and an optional per-symbol StageStats"""
+
+    __slots__ = ('stats', 'symbol_stats', 'bars', 'start')
+
+    def __init__(self, stats: StageStats, symbol_stats: Optional[StageStats], bars: int):
+        self.stats = stats
+        self.symbol_stats = symbol_stats
+        self.bars = bars
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        for stats in (self.stats, self.symbol_stats):
+            if stats is not None:
+                stats.calls += 1
+                stats.seconds += elapsed
+                stats.bars += self.bars
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class StageMetrics:
+    """Context-manager stage timers and counters.
+
+        with metrics.stage('swing_detection', symbol, bars=len(df)):
+            ...
+        metrics.count('touches', len(touches), symbol)
+
+    A disabled instance (see NULL_METRICS) hands out one shared no-op timer
+    and ignores counts, so instrumented code costs a method call per stage.
+    Metrics from worker processes are folded in with merge().
+    """
+
+    FILENAME = "stage_metrics.json"
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.symbol_stages: Dict[str, Dict[str, StageStats]] = {}
+        self.symbol_counters: Dict[str, Dict[str, int]] = {}
+        self.wall_seconds = 0.0
+
+    def stage(self, name: str, symbol: Optional[str] = None, bars: int = 0):
+        """Timer for one pass through a stage"""
+        if not self.enabled:
+            return _NULL_TIMER
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats()
+        symbol_stats = None
+        if symbol is not None:
+            symbol_stages = self.symbol_stages.setdefault(symbol, {})
+            symbol_stats = symbol_stages.get(name)
+            if symbol_stats is None:
+                symbol_stats = symbol_stages[name] = StageStats()
+        return _StageTimer(stats, symbol_stats, bars)
+
+    def count(self, name: str, value: int = 1, symbol: Optional[str] = None):
+        """Add value to a run-level (and per-symbol) counter"""
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + value
+        if symbol is not None:
+            symbol_counters = self.symbol_counters.setdefault(symbol, {})
+            symbol_counters[name] = symbol_counters.get(name, 0) + value
+
+    def merge(self, other: 'StageMetrics'):
+        """Fold another instance (e.g. from a worker process or an earlier shard attempt) into this one"""
+        if not self.enabled or other is None:
+            return
+        for name, stats in other.stages.items():
+            self.stages.setdefault(name, StageStats()).add(stats)
+        for name, value in other.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        for symbol, stages in other.symbol_stages.items():
+            symbol_stages = self.symbol_stages.setdefault(symbol, {})
+            for name, stats in stages.items():
+                symbol_stages.setdefault(name, StageStats()).add(stats)
+        for symbol, counters in other.symbol_counters.items():
+            symbol_counters = self.symbol_counters.setdefault(symbol, {})
+            for name, value in counters.items():
+                symbol_counters[name] = symbol_counters.get(name, 0) + value
+        self.wall_seconds += other.wall_seconds
+
+    def hit_rate(self, hits: str, misses: str) -> Optional[float]:
+        """Percentage of hits among hits + misses counters (None before any lookup)"""
+        total = self.counters.get(hits, 0) + self.counters.get(misses, 0)
+        return 100.0 * self.counters.get(hits, 0) / total if total else None
+
+    def summary(self) -> Dict:
+        """Run totals: wall time, units, bars, throughput and result cache hit rate"""
+        stage_seconds = sum(stats.seconds for stats in self.stages.values())
+        bars = self.counters.get('bars', 0)
+        return {
+            'wall_seconds': round(self.wall_seconds, 4),
+            'stage_seconds': round(stage_seconds, 4),
+            'units': self.counters.get('units', 0),
+            'symbols': len(self.symbol_stages),
+            'bars': bars,
+            'bars_per_second': round(bars / stage_seconds, 1) if stage_seconds > 0 else None,
+            'result_cache_hit_rate_pct': self.hit_rate('result_cache_hits', 'result_cache_misses')
+        }
+
+    def stage_table(self) -> pd.DataFrame:
+        """One row per stage in pipeline order: calls, total and average time, bars/sec and share"""
+        total = sum(stats.seconds for stats in self.stages.values())
+        order = [name for name in PIPELINE_STAGES if name in self.stages]
+        order += [name for name in self.stages if name not in PIPELINE_STAGES]
+        return pd.DataFrame([{
+            'Stage': name,
+            'Calls': self.stages[name].calls,
+            'Total (s)': round(self.stages[name].seconds, 4),
+            'Avg (ms)': round(1000 * self.stages[name].seconds / self.stages[name].calls, 3)
+            if self.stages[name].calls else 0.0,
+            'Bars/sec': round(self.stages[name].bars_per_second),
+            'Share %': round(100 * self.stages[name].seconds / total, 1) if total > 0 else 0.0
+        } for name in order])
+
+    def symbol_table(self) -> pd.DataFrame:
+        """One row per symbol: seconds per stage, total seconds and counters, slowest first"""
+        rows = []
+        for symbol, stages in self.symbol_stages.items():
+            row = {'Symbol': symbol, 'Total (s)': round(sum(stats.seconds for stats in stages.values()), 4)}
+            row.update({f"{name} (s)": round(stats.seconds, 4) for name, stats in stages.items()})
+            row.update(self.symbol_counters.get(symbol, {}))
+            rows.append(row)
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows).sort_values('Total (s)', ascending=False).reset_index(drop=True)
+
+    def to_dict(self) -> Dict:
+        return {
+            'summary': self.summary(),
+            'wall_seconds': self.wall_seconds,
+            'stages': {name: asdict(stats) for name, stats in self.stages.items()},
+            'counters': dict(self.counters),
+            'symbols': {
+                symbol: {
+                    'stages': {name: asdict(stats) for name, stats in stages.items()},
+                    'counters': dict(self.symbol_counters.get(symbol, {}))
+                }
+                for symbol, stages in self.symbol_stages.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'StageMetrics':
+        metrics = cls()
+        metrics.wall_seconds = data.get('wall_seconds', 0.0)
+        metrics.stages = {name: StageStats(**stats) for name, stats in data.get('stages', {}).items()}
+        metrics.counters = dict(data.get('counters', {}))
+        for symbol, entry in data.get('symbols', {}).items():
+            metrics.symbol_stages[symbol] = {name: StageStats(**stats) for name, stats in entry['stages'].items()}
+            if entry.get('counters'):
+                metrics.symbol_counters[symbol] = dict(entry['counters'])
+        return metrics
+
+    def save(self, path: str):
+        """Atomically write to_dict() as JSON"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['StageMetrics']:
+        """Read a saved file (None if missing or unreadable)"""
+        try:
+            with open(path, 'r') as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+# Shared disabled instance used when no metrics are requested
+NULL_METRICS = StageMetrics(enabled=False)
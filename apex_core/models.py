@@ -0,0 +1,360 @@
+"""
+Core data structures: swing lows, candlestick patterns, trade outcomes and capital events
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import pandas as pd
+
+
+@dataclass
+class SwingLow:
+    """Represents a swing low point in price data - ENHANCED WITH INVALIDATION TRACKING"""
+    index: int
+    timestamp: pd.Timestamp
+    price: float
+    is_invalidated: bool = False
+    invalidation_timestamp: Optional[pd.Timestamp] = None
+    invalidation_index: Optional[int] = None
+    is_touched: bool = False
+    touch_timestamp: Optional[pd.Timestamp] = None
+    touch_pattern: Optional[str] = None
+    touch_index: Optional[int] = None
+
+
+@dataclass
+class PinBar:
+    """Represents a pin bar candlestick pattern"""
+    index: int
+    timestamp: pd.Timestamp
+    open_price: float
+    high_price: float
+    low_price: float
+    close_price: float
+    pattern_type: str = 'pin_bar'
+    body_ratio: float = 0.0
+    wick_ratio: float = 0.0
+    is_bullish: bool = True
+    is_live: bool = False
+    pattern_strength: float = 0.0
+
+
+@dataclass
+class BullishEngulfing:
+    """Represents a bullish engulfing candlestick pattern"""
+    index: int
+    timestamp: pd.Timestamp
+    first_candle_open: float
+    first_candle_high: float
+    first_candle_low: float
+    first_candle_close: float
+    second_candle_open: float
+    second_candle_high: float
+    second_candle_low: float
+    second_candle_close: float
+    pattern_type: str = 'bullish_engulfing'
+    engulfing_ratio: float = 0.0
+    pattern_low: float = 0.0
+    is_bullish: bool = True
+    is_live: bool = False
+    pattern_strength: float = 0.0
+
+
+@dataclass
+class ThreeCandle:
+    """Represents a three candle (Morning Star) pattern"""
+    index: int
+    timestamp: pd.Timestamp
+    first_candle_open: float
+    first_candle_high: float
+    first_candle_low: float
+    first_candle_close: float
+    second_candle_open: float
+    second_candle_high: float
+    second_candle_low: float
+    second_candle_close: float
+    third_candle_open: float
+    third_candle_high: float
+    third_candle_low: float
+    third_candle_close: float
+    pattern_type: str = 'three_candle'
+    pattern_low: float = 0.0
+    pattern_strength: float = 0.0
+    is_bullish: bool = True
+    is_live: bool = False
+
+
+@dataclass
+class DragonflyDoji:
+    """Represents a dragonfly doji pattern"""
+    index: int
+    timestamp: pd.Timestamp
+    open_price: float
+    high_price: float
+    low_price: float
+    close_price: float
+    pattern_type: str = 'dragonfly_doji'
+    body_ratio: float = 0.0
+    lower_wick_ratio: float = 0.0
+    is_bullish: bool = True
+    is_live: bool = False
+    pattern_strength: float = 0.0
+
+
+@dataclass
+class ThreeWhiteSoldiers:
+    """Represents a three white soldiers pattern"""
+    index: int
+    timestamp: pd.Timestamp
+    first_candle_open: float
+    first_candle_high: float
+    first_candle_low: float
+    first_candle_close: float
+    second_candle_open: float
+    second_candle_high: float
+    second_candle_low: float
+    second_candle_close: float
+    third_candle_open: float
+    third_candle_high: float
+    third_candle_low: float
+    third_candle_close: float
+    pattern_type: str = 'three_white_soldiers'
+    pattern_low: float = 0.0
+    average_body_size: float = 0.0
+    is_bullish: bool = True
+    is_live: bool = False
+    pattern_strength: float = 0.0
+
+
+@dataclass
+class BullishMarubozu:
+    """Represents a bullish marubozu pattern"""
+    index: int
+    timestamp: pd.Timestamp
+    open_price: float
+    high_price: float
+    low_price: float
+    close_price: float
+    pattern_type: str = 'bullish_marubozu'
+    body_size: float = 0.0
+    upper_wick_ratio: float = 0.0
+    lower_wick_ratio: float = 0.0
+    is_bullish: bool = True
+    is_live: bool = False
+    pattern_strength: float = 0.0
+
+
+@dataclass
+class BullishHarami:
+    """Represents a bullish harami pattern"""
+    index: int
+    timestamp: pd.Timestamp
+    first_candle_open: float
+    first_candle_high: float
+    first_candle_low: float
+    first_candle_close: float
+    second_candle_open: float
+    second_candle_high: float
+    second_candle_low: float
+    second_candle_close: float
+    pattern_type: str = 'bullish_harami'
+    pattern_low: float = 0.0
+    containment_ratio: float = 0.0
+    is_bullish: bool = True
+    is_live: bool = False
+    pattern_strength: float = 0.0
+
+
+@dataclass
+class BullishAbandonedBaby:
+    """Represents a bullish abandoned baby pattern"""
+    index: int
+    timestamp: pd.Timestamp
+    first_candle_open: float
+    first_candle_high: float
+    first_candle_low: float
+    first_candle_close: float
+    doji_open: float
+    doji_high: float
+    doji_low: float
+    doji_close: float
+    third_candle_open: float
+    third_candle_high: float
+    third_candle_low: float
+    third_candle_close: float
+    pattern_type: str = 'bullish_abandoned_baby'
+    pattern_low: float = 0.0
+    gap_down_size: float = 0.0
+    gap_up_size: float = 0.0
+    is_bullish: bool = True
+    is_live: bool = False
+    pattern_strength: float = 0.0
+
+
+@dataclass
+class TweezerBottom:
+    """Represents a tweezer bottom pattern"""
+    index: int
+    timestamp: pd.Timestamp
+    first_candle_open: float
+    first_candle_high: float
+    first_candle_low: float
+    first_candle_close: float
+    second_candle_open: float
+    second_candle_high: float
+    second_candle_low: float
+    second_candle_close: float
+    pattern_type: str = 'tweezer_bottom'
+    pattern_low: float = 0.0
+    low_match_precision: float = 0.0
+    is_bullish: bool = True
+    is_live: bool = False
+    pattern_strength: float = 0.0
+
+
+@dataclass
+class BullishKicker:
+    """Represents a bullish kicker pattern"""
+    index: int
+    timestamp: pd.Timestamp
+    first_candle_open: float
+    first_candle_high: float
+    first_candle_low: float
+    first_candle_close: float
+    second_candle_open: float
+    second_candle_high: float
+    second_candle_low: float
+    second_candle_close: float
+    pattern_type: str = 'bullish_kicker'
+    pattern_low: float = 0.0
+    gap_size: float = 0.0
+    is_bullish: bool = True
+    is_live: bool = False
+    pattern_strength: float = 0.0
+
+
+@dataclass
+class TradeOutcome:
+    """Enhanced trade outcome with trailing stop and partial exit support"""
+    success: bool
+    target_reached: bool
+    sl_hit: bool
+    max_profit_pct: float
+    max_drawdown_pct: float
+    current_profit_pct: float
+    bars_to_resolution: int
+    resolution_type: str
+    target_price: float
+    sl_price: float
+    target_pct_used: float = 0.0
+    exit_timestamp: Optional[pd.Timestamp] = None
+    exit_price: float = 0.0
+    entry_price: float = 0.0
+    current_price: float = 0.0
+    last_update_timestamp: Optional[pd.Timestamp] = None
+
+    # Trailing stop fields
+    trailing_active: bool = False
+    trailing_sl_price: float = 0.0
+    highest_price_reached: float = 0.0
+    trailing_profit_pct: float = 0.0
+
+    # Partial exit fields
+    partial_exits_enabled: bool = False
+    first_exit_triggered: bool = False
+    first_exit_price: float = 0.0
+    first_exit_pct: float = 0.5  # Default 0.5%
+    first_exit_timestamp: Optional[pd.Timestamp] = None
+    first_exit_bars: int = 0
+
+    second_exit_triggered: bool = False
+    second_exit_price: float = 0.0
+    second_exit_pct: float = 0.9  # Default 0.9%
+    second_exit_timestamp: Optional[pd.Timestamp] = None
+    second_exit_bars: int = 0
+
+    # Partial exit capital tracking
+    first_exit_capital_pct: float = 50.0  # 50% of capital
+    second_exit_capital_pct: float = 50.0  # Remaining 50%
+
+    # Weighted average exit
+    weighted_exit_price: float = 0.0
+    weighted_profit_pct: float = 0.0
+    total_pnl_pct: float = 0.0
+
+
+@dataclass
+class SwingLowTouch:
+    """Represents a pattern touching an untouched swing low - ENHANCED"""
+    swing_low: SwingLow
+    pattern: Union[PinBar, BullishEngulfing, ThreeCandle, DragonflyDoji, ThreeWhiteSoldiers,
+    BullishMarubozu, BullishHarami, BullishAbandonedBaby, TweezerBottom, BullishKicker]
+    touch_type: str
+    pattern_type: str
+    distance_pips: float
+    days_between: int
+    price_difference: float
+    trade_outcome: Optional[TradeOutcome] = None
+    is_live: bool = False
+    pattern_strength: float = 0.0
+    symbol: str = ""
+    timeframe: str = ""
+    entry_price: float = 0.0
+    sl_price: float = 0.0
+    target_price: float = 0.0
+    is_swing_low_valid: bool = True  # Track if swing low was valid at touch time
+
+
+# ============================================================================
+# COMPLETE CAPITAL MANAGEMENT DATA STRUCTURES
+# ============================================================================
+
+@dataclass
+class CapitalEvent:
+    """Represents a capital event (lock/release)"""
+    timestamp: pd.Timestamp
+    event_type: str  # 'lock', 'release'
+    amount: float
+    trade_id: str
+    symbol: str
+    pattern_type: str
+    entry_price: float
+    exit_price: Optional[float] = None
+    pnl: Optional[float] = None
+    available_capital_after: float = 0.0
+    locked_capital_after: float = 0.0
+
+
+@dataclass
+class Trade:
+    """Enhanced trade structure with complete capital management"""
+    trade_id: str
+    symbol: str
+    timeframe: str
+    pattern_type: str
+    entry_timestamp: pd.Timestamp
+    entry_price: float
+    capital_allocated: float
+    target_price: float
+    sl_price: float
+    target_pct: float
+
+    # Trade status
+    status: str = 'open'  # 'open', 'closed'
+    exit_timestamp: Optional[pd.Timestamp] = None
+    exit_price: Optional[float] = None
+    pnl: Optional[float] = None
+    roi_pct: Optional[float] = None
+
+    # Touch details
+    swing_low_touch: Optional[SwingLowTouch] = None
+    trade_outcome: Optional[TradeOutcome] = None
+
+    # Capital tracking
+    capital_locked_timestamp: Optional[pd.Timestamp] = None
+    capital_released_timestamp: Optional[pd.Timestamp] = None
+
+    # Additional tracking
+    days_held: int = 0
+    bars_held: int = 0
@@ -0,0 +1,1126 @@
+"""
+Candlestick pattern detectors, the columnar PatternTable and the fused detector
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .models import (
+    BullishAbandonedBaby, BullishEngulfing, BullishHarami, BullishKicker, BullishMarubozu,
+    DragonflyDoji, PinBar, ThreeCandle, ThreeWhiteSoldiers, TweezerBottom
+)
+
+
+# ============================================================================
+# PATTERN DETECTION ENGINES - ALL PROFESSIONAL PATTERNS
+# ============================================================================
+
+class PinBarDetector:
+    """Detects pin bar candlestick patterns"""
+
+    def __init__(self, min_wick_ratio: float = 2.0, max_body_ratio: float = 0.3):
+        self.min_wick_ratio = min_wick_ratio
+        self.max_body_ratio = max_body_ratio
+
+    def detect_pinbars(self, df: pd.DataFrame, include_live: bool = False) -> List[PinBar]:
+        """Detect pin bar patterns in OHLCV data"""
+        patterns = []
+        end_index = len(df) if include_live else len(df) - 1
+
+        for i in range(end_index):
+            candle = df.iloc[i]
+            open_price = candle['open']
+            high_price = candle['high']
+            low_price = candle['low']
+            close_price = candle['close']
+
+            total_range = high_price - low_price
+            body_size = abs(close_price - open_price)
+            upper_wick = high_price - max(open_price, close_price)
+            lower_wick = min(open_price, close_price) - low_price
+
+            if total_range == 0 or body_size == 0:
+                continue
+
+            body_ratio = body_size / total_range
+            lower_wick_ratio = lower_wick / body_size
+            upper_wick_ratio = upper_wick / body_size
+
+            has_long_lower_wick = lower_wick_ratio >= self.min_wick_ratio
+            has_small_body = body_ratio <= self.max_body_ratio
+            has_small_upper_wick = upper_wick_ratio <= 1.0
+
+            if has_long_lower_wick and has_small_body and has_small_upper_wick:
+                is_bullish = close_price > open_price
+                is_live = (i == len(df) - 1) and include_live
+
+                # Calculate pattern strength (success rate based)
+                pattern_strength = 65.0  # Base success rate for pin bars
+
+                pattern = PinBar(
+                    index=i,
+                    timestamp=df.index[i],
+                    open_price=open_price,
+                    high_price=high_price,
+                    low_price=low_price,
+                    close_price=close_price,
+                    pattern_type='pin_bar',
+                    body_ratio=body_ratio,
+                    wick_ratio=lower_wick_ratio,
+                    is_bullish=is_bullish,
+                    is_live=is_live,
+                    pattern_strength=pattern_strength
+                )
+                patterns.append(pattern)
+
+        return patterns
+
+
+class BullishEngulfingDetector:
+    """Detects bullish engulfing candlestick patterns"""
+
+    def __init__(self, min_engulfing_ratio: float = 1.1):
+        self.min_engulfing_ratio = min_engulfing_ratio
+
+    def detect_bullish_engulfing(self, df: pd.DataFrame, include_live: bool = False) -> List[BullishEngulfing]:
+        """Detect bullish engulfing patterns in OHLCV data"""
+        patterns = []
+        end_index = len(df) if include_live else len(df) - 1
+
+        for i in range(1, end_index):
+            current = df.iloc[i]
+            previous = df.iloc[i - 1]
+
+            first_is_bearish = previous['close'] < previous['open']
+            second_is_bullish = current['close'] > current['open']
+
+            if not (first_is_bearish and second_is_bullish):
+                continue
+
+            first_body_size = abs(previous['close'] - previous['open'])
+            second_body_size = abs(current['close'] - current['open'])
+
+            if first_body_size == 0:
+                continue
+
+            opens_below_first_close = current['open'] < previous['close']
+            closes_above_first_open = current['close'] > previous['open']
+            engulfing_ratio = second_body_size / first_body_size
+            is_larger_body = engulfing_ratio >= self.min_engulfing_ratio
+
+            if opens_below_first_close and closes_above_first_open and is_larger_body:
+                pattern_low = min(previous['low'], current['low'])
+                is_live = (i == len(df) - 1) and include_live
+
+                # Calculate pattern strength
+                pattern_strength = 70.0  # Base success rate for bullish engulfing
+
+                pattern = BullishEngulfing(
+                    index=i,
+                    timestamp=df.index[i],
+                    first_candle_open=previous['open'],
+                    first_candle_high=previous['high'],
+                    first_candle_low=previous['low'],
+                    first_candle_close=previous['close'],
+                    second_candle_open=current['open'],
+                    second_candle_high=current['high'],
+                    second_candle_low=current['low'],
+                    second_candle_close=current['close'],
+                    pattern_type='bullish_engulfing',
+                    engulfing_ratio=engulfing_ratio,
+                    pattern_low=pattern_low,
+                    is_bullish=True,
+                    is_live=is_live,
+                    pattern_strength=pattern_strength
+                )
+                patterns.append(pattern)
+
+        return patterns
+
+
+class ThreeCandleDetector:
+    """Detects three candle (Morning Star) patterns"""
+
+    def __init__(self, min_first_body: float = 0.6, max_second_body: float = 0.4, min_third_body: float = 0.6):
+        self.min_first_body = min_first_body
+        self.max_second_body = max_second_body
+        self.min_third_body = min_third_body
+
+    def detect_three_candle(self, df: pd.DataFrame, include_live: bool = False) -> List[ThreeCandle]:
+        """Detect three candle (Morning Star) patterns in OHLCV data"""
+        patterns = []
+        end_index = len(df) if include_live else len(df) - 1
+
+        for i in range(2, end_index):
+            first = df.iloc[i - 2]
+            second = df.iloc[i - 1]
+            third = df.iloc[i]
+
+            first_range = first['high'] - first['low']
+            second_range = second['high'] - second['low']
+            third_range = third['high'] - third['low']
+
+            if first_range == 0 or second_range == 0 or third_range == 0:
+                continue
+
+            first_body = abs(first['close'] - first['open'])
+            second_body = abs(second['close'] - second['open'])
+            third_body = abs(third['close'] - third['open'])
+
+            first_body_ratio = first_body / first_range
+            second_body_ratio = second_body / second_range
+            third_body_ratio = third_body / third_range
+
+            first_is_bearish = first['close'] < first['open']
+            first_has_body = first_body_ratio >= self.min_first_body
+
+            second_is_small = second_body_ratio <= self.max_second_body
+
+            third_is_bullish = third['close'] > third['open']
+            third_has_body = third_body_ratio >= self.min_third_body
+
+            first_midpoint = (first['open'] + first['close']) / 2
+            third_closes_above_midpoint = third['close'] > first_midpoint
+
+            if (first_is_bearish and first_has_body and
+                    second_is_small and
+                    third_is_bullish and third_has_body and
+                    third_closes_above_midpoint):
+                pattern_low = min(first['low'], second['low'], third['low'])
+                is_live = (i == len(df) - 1) and include_live
+
+                pattern_strength = (first_body_ratio + third_body_ratio - second_body_ratio) / 2
+                # Convert to success rate percentage
+                base_strength = 68.0  # Base success rate for three candle patterns
+
+                pattern = ThreeCandle(
+                    index=i,
+                    timestamp=df.index[i],
+                    first_candle_open=first['open'],
+                    first_candle_high=first['high'],
+                    first_candle_low=first['low'],
+                    first_candle_close=first['close'],
+                    second_candle_open=second['open'],
+                    second_candle_high=second['high'],
+                    second_candle_low=second['low'],
+                    second_candle_close=second['close'],
+                    third_candle_open=third['open'],
+                    third_candle_high=third['high'],
+                    third_candle_low=third['low'],
+                    third_candle_close=third['close'],
+                    pattern_type='three_candle',
+                    pattern_low=pattern_low,
+                    pattern_strength=base_strength,
+                    is_bullish=True,
+                    is_live=is_live
+                )
+                patterns.append(pattern)
+
+        return patterns
+
+
+class DragonflyDojiDetector:
+    """Detects dragonfly doji patterns"""
+
+    def __init__(self, max_body_ratio: float = 0.1, min_lower_wick_ratio: float = 2.0):
+        self.max_body_ratio = max_body_ratio
+        self.min_lower_wick_ratio = min_lower_wick_ratio
+
+    def detect_dragonfly_doji(self, df: pd.DataFrame, include_live: bool = False) -> List[DragonflyDoji]:
+        """Detect dragonfly doji patterns in OHLCV data"""
+        patterns = []
+        end_index = len(df) if include_live else len(df) - 1
+
+        for i in range(end_index):
+            candle = df.iloc[i]
+            open_price = candle['open']
+            high_price = candle['high']
+            low_price = candle['low']
+            close_price = candle['close']
+
+            total_range = high_price - low_price
+            body_size = abs(close_price - open_price)
+            upper_wick = high_price - max(open_price, close_price)
+            lower_wick = min(open_price, close_price) - low_price
+
+            if total_range == 0:
+                continue
+
+            body_ratio = body_size / total_range
+            upper_wick_ratio = upper_wick / total_range
+            lower_wick_ratio = lower_wick / total_range
+
+            # Dragonfly doji criteria
+            has_small_body = body_ratio <= self.max_body_ratio
+            has_long_lower_wick = lower_wick_ratio >= (
+                        self.min_lower_wick_ratio * body_ratio) or lower_wick_ratio >= 0.6
+            has_small_upper_wick = upper_wick_ratio <= 0.1
+
+            if has_small_body and has_long_lower_wick and has_small_upper_wick:
+                is_live = (i == len(df) - 1) and include_live
+
+                # Calculate pattern strength - Dragonfly Doji has 60% success rate
+                pattern_strength = 60.0
+
+                pattern = DragonflyDoji(
+                    index=i,
+                    timestamp=df.index[i],
+                    open_price=open_price,
+                    high_price=high_price,
+                    low_price=low_price,
+                    close_price=close_price,
+                    pattern_type='dragonfly_doji',
+                    body_ratio=body_ratio,
+                    lower_wick_ratio=lower_wick_ratio,
+                    is_bullish=True,
+                    is_live=is_live,
+                    pattern_strength=pattern_strength
+                )
+                patterns.append(pattern)
+
+        return patterns
+
+
+class ThreeWhiteSoldiersDetector:
+    """Detects three white soldiers patterns"""
+
+    def __init__(self, min_body_ratio: float = 0.6, max_wick_ratio: float = 0.2):
+        self.min_body_ratio = min_body_ratio
+        self.max_wick_ratio = max_wick_ratio
+
+    def detect_three_white_soldiers(self, df: pd.DataFrame, include_live: bool = False) -> List[ThreeWhiteSoldiers]:
+        """Detect three white soldiers patterns in OHLCV data"""
+        patterns = []
+        end_index = len(df) if include_live else len(df) - 1
+
+        for i in range(2, end_index):
+            first = df.iloc[i - 2]
+            second = df.iloc[i - 1]
+            third = df.iloc[i]
+
+            # All three candles must be bullish
+            first_is_bullish = first['close'] > first['open']
+            second_is_bullish = second['close'] > second['open']
+            third_is_bullish = third['close'] > third['open']
+
+            if not (first_is_bullish and second_is_bullish and third_is_bullish):
+                continue
+
+            # Check body sizes
+            first_range = first['high'] - first['low']
+            second_range = second['high'] - second['low']
+            third_range = third['high'] - third['low']
+
+            if first_range == 0 or second_range == 0 or third_range == 0:
+                continue
+
+            first_body = first['close'] - first['open']
+            second_body = second['close'] - second['open']
+            third_body = third['close'] - third['open']
+
+            first_body_ratio = first_body / first_range
+            second_body_ratio = second_body / second_range
+            third_body_ratio = third_body / third_range
+
+            # All bodies should be significant
+            if not (first_body_ratio >= self.min_body_ratio and
+                    second_body_ratio >= self.min_body_ratio and
+                    third_body_ratio >= self.min_body_ratio):
+                continue
+
+            # Each candle should open within the previous candle's body
+            second_opens_in_first = first['open'] < second['open'] < first['close']
+            third_opens_in_second = second['open'] < third['open'] < second['close']
+
+            # Each candle should close higher than the previous
+            closes_progressively_higher = first['close'] < second['close'] < third['close']
+
+            if second_opens_in_first and third_opens_in_second and closes_progressively_higher:
+                pattern_low = min(first['low'], second['low'], third['low'])
+                is_live = (i == len(df) - 1) and include_live
+
+                average_body_size = (first_body + second_body + third_body) / 3
+
+                # Three White Soldiers has 82% success rate
+                pattern_strength = 82.0
+
+                pattern = ThreeWhiteSoldiers(
+                    index=i,
+                    timestamp=df.index[i],
+                    first_candle_open=first['open'],
+                    first_candle_high=first['high'],
+                    first_candle_low=first['low'],
+                    first_candle_close=first['close'],
+                    second_candle_open=second['open'],
+                    second_candle_high=second['high'],
+                    second_candle_low=second['low'],
+                    second_candle_close=second['close'],
+                    third_candle_open=third['open'],
+                    third_candle_high=third['high'],
+                    third_candle_low=third['low'],
+                    third_candle_close=third['close'],
+                    pattern_type='three_white_soldiers',
+                    pattern_low=pattern_low,
+                    average_body_size=average_body_size,
+                    is_bullish=True,
+                    is_live=is_live,
+                    pattern_strength=pattern_strength
+                )
+                patterns.append(pattern)
+
+        return patterns
+
+
+class BullishMarubozuDetector:
+    """Detects bullish marubozu patterns"""
+
+    def __init__(self, max_wick_ratio: float = 0.05, min_body_ratio: float = 0.8):
+        self.max_wick_ratio = max_wick_ratio
+        self.min_body_ratio = min_body_ratio
+
+    def detect_bullish_marubozu(self, df: pd.DataFrame, include_live: bool = False) -> List[BullishMarubozu]:
+        """Detect bullish marubozu patterns in OHLCV data"""
+        patterns = []
+        end_index = len(df) if include_live else len(df) - 1
+
+        for i in range(end_index):
+            candle = df.iloc[i]
+            open_price = candle['open']
+            high_price = candle['high']
+            low_price = candle['low']
+            close_price = candle['close']
+
+            # Must be bullish
+            if close_price <= open_price:
+                continue
+
+            total_range = high_price - low_price
+            body_size = close_price - open_price
+            upper_wick = high_price - close_price
+            lower_wick = open_price - low_price
+
+            if total_range == 0:
+                continue
+
+            body_ratio = body_size / total_range
+            upper_wick_ratio = upper_wick / total_range
+            lower_wick_ratio = lower_wick / total_range
+
+            # Marubozu criteria: large body, minimal wicks
+            has_large_body = body_ratio >= self.min_body_ratio
+            has_small_wicks = (upper_wick_ratio <= self.max_wick_ratio and
+                               lower_wick_ratio <= self.max_wick_ratio)
+
+            if has_large_body and has_small_wicks:
+                is_live = (i == len(df) - 1) and include_live
+
+                # Bullish Marubozu has 69% success rate
+                pattern_strength = 69.0
+
+                pattern = BullishMarubozu(
+                    index=i,
+                    timestamp=df.index[i],
+                    open_price=open_price,
+                    high_price=high_price,
+                    low_price=low_price,
+                    close_price=close_price,
+                    pattern_type='bullish_marubozu',
+                    body_size=body_size,
+                    upper_wick_ratio=upper_wick_ratio,
+                    lower_wick_ratio=lower_wick_ratio,
+                    is_bullish=True,
+                    is_live=is_live,
+                    pattern_strength=pattern_strength
+                )
+                patterns.append(pattern)
+
+        return patterns
+
+
+class BullishHaramiDetector:
+    """Detects bullish harami patterns"""
+
+    def __init__(self, min_first_body_ratio: float = 0.6):
+        self.min_first_body_ratio = min_first_body_ratio
+
+    def detect_bullish_harami(self, df: pd.DataFrame, include_live: bool = False) -> List[BullishHarami]:
+        """Detect bullish harami patterns in OHLCV data"""
+        patterns = []
+        end_index = len(df) if include_live else len(df) - 1
+
+        for i in range(1, end_index):
+            previous = df.iloc[i - 1]
+            current = df.iloc[i]
+
+            # First candle must be bearish with significant body
+            first_is_bearish = previous['close'] < previous['open']
+            if not first_is_bearish:
+                continue
+
+            first_range = previous['high'] - previous['low']
+            first_body = previous['open'] - previous['close']
+
+            if first_range == 0:
+                continue
+
+            first_body_ratio = first_body / first_range
+            if first_body_ratio < self.min_first_body_ratio:
+                continue
+
+            # Second candle must be bullish and contained within first candle's body
+            second_is_bullish = current['close'] > current['open']
+            if not second_is_bullish:
+                continue
+
+            # Check containment
+            second_open_in_first = previous['close'] < current['open'] < previous['open']
+            second_close_in_first = previous['close'] < current['close'] < previous['open']
+
+            if second_open_in_first and second_close_in_first:
+                pattern_low = min(previous['low'], current['low'])
+                is_live = (i == len(df) - 1) and include_live
+
+                second_body = current['close'] - current['open']
+                containment_ratio = second_body / first_body
+
+                # Bullish Harami has 54% success rate
+                pattern_strength = 54.0
+
+                pattern = BullishHarami(
+                    index=i,
+                    timestamp=df.index[i],
+                    first_candle_open=previous['open'],
+                    first_candle_high=previous['high'],
+                    first_candle_low=previous['low'],
+                    first_candle_close=previous['close'],
+                    second_candle_open=current['open'],
+                    second_candle_high=current['high'],
+                    second_candle_low=current['low'],
+                    second_candle_close=current['close'],
+                    pattern_type='bullish_harami',
+                    pattern_low=pattern_low,
+                    containment_ratio=containment_ratio,
+                    is_bullish=True,
+                    is_live=is_live,
+                    pattern_strength=pattern_strength
+                )
+                patterns.append(pattern)
+
+        return patterns
+
+
+class BullishAbandonedBabyDetector:
+    """Detects bullish abandoned baby patterns"""
+
+    def __init__(self, min_gap_ratio: float = 0.2, max_doji_body_ratio: float = 0.1):
+        self.min_gap_ratio = min_gap_ratio
+        self.max_doji_body_ratio = max_doji_body_ratio
+
+    def detect_bullish_abandoned_baby(self, df: pd.DataFrame, include_live: bool = False) -> List[BullishAbandonedBaby]:
+        """Detect bullish abandoned baby patterns in OHLCV data"""
+        patterns = []
+        end_index = len(df) if include_live else len(df) - 1
+
+        for i in range(2, end_index):
+            first = df.iloc[i - 2]
+            doji = df.iloc[i - 1]
+            third = df.iloc[i]
+
+            # First candle must be bearish
+            first_is_bearish = first['close'] < first['open']
+            if not first_is_bearish:
+                continue
+
+            # Third candle must be bullish
+            third_is_bullish = third['close'] > third['open']
+            if not third_is_bullish:
+                continue
+
+            # Middle candle must be doji-like
+            doji_range = doji['high'] - doji['low']
+            doji_body = abs(doji['close'] - doji['open'])
+
+            if doji_range == 0:
+                continue
+
+            doji_body_ratio = doji_body / doji_range
+            if doji_body_ratio > self.max_doji_body_ratio:
+                continue
+
+            # Check for gaps
+            gap_down = first['close'] > doji['high']  # Gap down to doji
+            gap_up = doji['low'] > third['open']  # Gap up from doji
+
+            if gap_down and gap_up:
+                pattern_low = min(first['low'], doji['low'], third['low'])
+                is_live = (i == len(df) - 1) and include_live
+
+                gap_down_size = first['close'] - doji['high']
+                gap_up_size = third['open'] - doji['low']
+
+                # Abandoned Baby is rare but very powerful
+                pattern_strength = 75.0
+
+                pattern = BullishAbandonedBaby(
+                    index=i,
+                    timestamp=df.index[i],
+                    first_candle_open=first['open'],
+                    first_candle_high=first['high'],
+                    first_candle_low=first['low'],
+                    first_candle_close=first['close'],
+                    doji_open=doji['open'],
+                    doji_high=doji['high'],
+                    doji_low=doji['low'],
+                    doji_close=doji['close'],
+                    third_candle_open=third['open'],
+                    third_candle_high=third['high'],
+                    third_candle_low=third['low'],
+                    third_candle_close=third['close'],
+                    pattern_type='bullish_abandoned_baby',
+                    pattern_low=pattern_low,
+                    gap_down_size=gap_down_size,
+                    gap_up_size=gap_up_size,
+                    is_bullish=True,
+                    is_live=is_live,
+                    pattern_strength=pattern_strength
+                )
+                patterns.append(pattern)
+
+        return patterns
+
+
+class TweezerBottomDetector:
+    """Detects tweezer bottom patterns"""
+
+    def __init__(self, max_low_difference_pct: float = 0.1):
+        self.max_low_difference_pct = max_low_difference_pct
+
+    def detect_tweezer_bottom(self, df: pd.DataFrame, include_live: bool = False) -> List[TweezerBottom]:
+        """Detect tweezer bottom patterns in OHLCV data"""
+        patterns = []
+        end_index = len(df) if include_live else len(df) - 1
+
+        for i in range(1, end_index):
+            first = df.iloc[i - 1]
+            second = df.iloc[i]
+
+            # Check if lows are approximately equal
+            low_difference_pct = abs(first['low'] - second['low']) / min(first['low'], second['low']) * 100
+
+            if low_difference_pct <= self.max_low_difference_pct:
+                # Ideally, first candle should be bearish and second bullish
+                first_is_bearish = first['close'] < first['open']
+                second_is_bullish = second['close'] > second['open']
+
+                # But we'll accept any combination as long as lows match
+                pattern_low = min(first['low'], second['low'])
+                is_live = (i == len(df) - 1) and include_live
+
+                low_match_precision = 100 - low_difference_pct
+
+                # Tweezer Bottom has 61% success rate
+                pattern_strength = 61.0
+
+                pattern = TweezerBottom(
+                    index=i,
+                    timestamp=df.index[i],
+                    first_candle_open=first['open'],
+                    first_candle_high=first['high'],
+                    first_candle_low=first['low'],
+                    first_candle_close=first['close'],
+                    second_candle_open=second['open'],
+                    second_candle_high=second['high'],
+                    second_candle_low=second['low'],
+                    second_candle_close=second['close'],
+                    pattern_type='tweezer_bottom',
+                    pattern_low=pattern_low,
+                    low_match_precision=low_match_precision,
+                    is_bullish=True,
+                    is_live=is_live,
+                    pattern_strength=pattern_strength
+                )
+                patterns.append(pattern)
+
+        return patterns
+
+
+class BullishKickerDetector:
+    """Detects bullish kicker patterns"""
+
+    def __init__(self, min_gap_ratio: float = 0.5):
+        self.min_gap_ratio = min_gap_ratio
+
+    def detect_bullish_kicker(self, df: pd.DataFrame, include_live: bool = False) -> List[BullishKicker]:
+        """Detect bullish kicker patterns in OHLCV data"""
+        patterns = []
+        end_index = len(df) if include_live else len(df) - 1
+
+        for i in range(1, end_index):
+            first = df.iloc[i - 1]
+            second = df.iloc[i]
+
+            # First candle must be bearish
+            first_is_bearish = first['close'] < first['open']
+            if not first_is_bearish:
+                continue
+
+            # Second candle must be bullish
+            second_is_bullish = second['close'] > second['open']
+            if not second_is_bullish:
+                continue
+
+            # Must have a gap up (second opens above first's high)
+            has_gap_up = second['open'] > first['high']
+            if not has_gap_up:
+                continue
+
+            # Calculate gap size
+            gap_size = second['open'] - first['high']
+            first_range = first['high'] - first['low']
+
+            if first_range == 0:
+                continue
+
+            gap_ratio = gap_size / first_range
+
+            if gap_ratio >= self.min_gap_ratio:
+                pattern_low = min(first['low'], second['low'])
+                is_live = (i == len(df) - 1) and include_live
+
+                # Bullish Kicker is very powerful - high success rate
+                pattern_strength = 78.0
+
+                pattern = BullishKicker(
+                    index=i,
+                    timestamp=df.index[i],
+                    first_candle_open=first['open'],
+                    first_candle_high=first['high'],
+                    first_candle_low=first['low'],
+                    first_candle_close=first['close'],
+                    second_candle_open=second['open'],
+                    second_candle_high=second['high'],
+                    second_candle_low=second['low'],
+                    second_candle_close=second['close'],
+                    pattern_type='bullish_kicker',
+                    pattern_low=pattern_low,
+                    gap_size=gap_size,
+                    is_bullish=True,
+                    is_live=is_live,
+                    pattern_strength=pattern_strength
+                )
+                patterns.append(pattern)
+
+        return patterns
+
+
+# ============================================================================
+# COLUMNAR PATTERN TABLE - ONE STRUCTURED ARRAY PER PATTERN TYPE
+# ============================================================================
+
+class PatternTable:
+    """Columnar storage for all detected patterns of one type.
+
+    Rows live in a NumPy structured array whose columns mirror the pattern
+    dataclass fields (timestamps as int64 ns). Iterating or indexing yields
+    lightweight PatternRow views that read like the dataclass itself.
+    """
+
+    def __init__(self, pattern_type: str, pattern_class: type, records: np.ndarray, tz=None):
+        self.pattern_type = pattern_type
+        self.pattern_class = pattern_class
+        self.records = records
+        self.tz = tz
+        self.field_names = frozenset(records.dtype.names)
+
+    @staticmethod
+    def record_dtype(pattern_class: type) -> np.dtype:
+        """Structured dtype for a pattern dataclass (str fields are stored once per table)"""
+        column_types = {int: np.int64, float: np.float64, bool: np.bool_, pd.Timestamp: np.int64}
+        return np.dtype([(f.name, column_types[f.type]) for f in fields(pattern_class) if f.type is not str])
+
+    @classmethod
+    def from_columns(cls, pattern_type: str, pattern_class: type, size: int,
+                     columns: Dict[str, Any], tz=None) -> 'PatternTable':
+        """Build a table from per-field arrays or scalars; missing fields take the dataclass default"""
+        records = np.empty(size, dtype=cls.record_dtype(pattern_class))
+        for f in fields(pattern_class):
+            if f.type is str:
+                continue
+            records[f.name] = columns[f.name] if f.name in columns else f.default
+        return cls(pattern_type, pattern_class, records, tz)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        for row in range(len(self.records)):
+            yield PatternRow(self, row)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return PatternTable(self.pattern_type, self.pattern_class, self.records[item], self.tz)
+        row = range(len(self.records))[item]
+        return PatternRow(self, row)
+
+    def __repr__(self) -> str:
+        return f"PatternTable({self.pattern_type!r}, rows={len(self)})"
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw column array (timestamps are int64 ns)"""
+        return self.records[name]
+
+    @property
+    def timestamps(self) -> pd.DatetimeIndex:
+        """All pattern timestamps boxed at once"""
+        timestamps = pd.DatetimeIndex(self.records['timestamp'].view('datetime64[ns]'))
+        return timestamps.tz_localize('UTC').tz_convert(self.tz) if self.tz is not None else timestamps
+
+    def get_value(self, row: int, name: str):
+        """Value of one field for one row, boxed like the dataclass field"""
+        if name == 'timestamp':
+            return pd.Timestamp(int(self.records['timestamp'][row]), tz=self.tz)
+        if name == 'index':
+            return int(self.records['index'][row])
+        if name in self.field_names:
+            return self.records[name][row]
+        if name == 'pattern_type':
+            return self.pattern_type
+        raise AttributeError(f"'{self.pattern_class.__name__}' pattern has no attribute '{name}'")
+
+    def to_objects(self) -> List:
+        """Materialize every row as the pattern dataclass"""
+        return [row.to_dataclass() for row in self]
+
+
+class PatternRow:
+    """Read-only view of one PatternTable row, attribute-compatible with the pattern dataclasses"""
+
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table: PatternTable, row: int):
+        self.table = table
+        self.row = row
+
+    def __getattr__(self, name: str):
+        return self.table.get_value(self.row, name)
+
+    def __reduce__(self):
+        return PatternRow, (self.table, self.row)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PatternRow):
+            other = other.to_dataclass()
+        return self.to_dataclass() == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{self.table.pattern_class.__name__}Row(index={self.index}, timestamp={self.timestamp})"
+
+    def to_dataclass(self):
+        """Materialize this row as the pattern dataclass"""
+        return self.table.pattern_class(**{f.name: getattr(self, f.name) for f in fields(self.table.pattern_class)})
+
+
+# ============================================================================
+# FUSED PATTERN DETECTION - ALL SELECTED PATTERNS IN ONE VECTORIZED PASS
+# ============================================================================
+
+@dataclass
+class CandleFeatures:
+    """Per-bar OHLC arrays and shared candle features computed once per DataFrame"""
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    total_range: np.ndarray
+    body: np.ndarray
+    upper_wick: np.ndarray
+    lower_wick: np.ndarray
+    is_bullish: np.ndarray
+    is_bearish: np.ndarray
+
+    @classmethod
+    def from_df(cls, df: pd.DataFrame) -> 'CandleFeatures':
+        o = df['open'].to_numpy(dtype=np.float64)
+        h = df['high'].to_numpy(dtype=np.float64)
+        l = df['low'].to_numpy(dtype=np.float64)
+        c = df['close'].to_numpy(dtype=np.float64)
+
+        return cls(
+            open=o, high=h, low=l, close=c,
+            total_range=h - l,
+            body=np.abs(c - o),
+            upper_wick=h - py_max(o, c),
+            lower_wick=py_min(o, c) - l,
+            is_bullish=c > o,
+            is_bearish=c < o
+        )
+
+
+def shift_bars(values: np.ndarray, periods: int) -> np.ndarray:
+    """Shift a per-bar array forward (periods > 0: previous bars) or back (periods < 0: next bars), NaN/False padded"""
+    fill = False if values.dtype == bool else np.nan
+    shifted = np.full(len(values), fill, dtype=values.dtype)
+    if periods > 0:
+        shifted[periods:] = values[:-periods]
+    elif periods < 0:
+        shifted[:periods] = values[-periods:]
+    else:
+        shifted[:] = values
+    return shifted
+
+
+def py_min(*arrays: np.ndarray) -> np.ndarray:
+    """Element-wise min with the same tie/NaN semantics as the builtin min()"""
+    result = arrays[0]
+    for values in arrays[1:]:
+        result = np.where(values < result, values, result)
+    return result
+
+
+def py_max(*arrays: np.ndarray) -> np.ndarray:
+    """Element-wise max with the same tie/NaN semantics as the builtin max()"""
+    result = arrays[0]
+    for values in arrays[1:]:
+        result = np.where(values > result, values, result)
+    return result
+
+
+class FusedPatternDetector:
+    """Evaluates every selected candlestick pattern from one set of shared per-bar features.
+
+    Thresholds come from the configured per-pattern detector instances. Results
+    are PatternTables whose rows match (in the same order) the dataclasses
+    returned by each detector's loop method.
+    """
+
+    # Reference loop method on each per-pattern detector
+    LOOP_METHODS = {
+        'pin_bar': 'detect_pinbars',
+        'bullish_engulfing': 'detect_bullish_engulfing',
+        'three_candle': 'detect_three_candle',
+        'dragonfly_doji': 'detect_dragonfly_doji',
+        'three_white_soldiers': 'detect_three_white_soldiers',
+        'bullish_marubozu': 'detect_bullish_marubozu',
+        'bullish_harami': 'detect_bullish_harami',
+        'bullish_abandoned_baby': 'detect_bullish_abandoned_baby',
+        'tweezer_bottom': 'detect_tweezer_bottom',
+        'bullish_kicker': 'detect_bullish_kicker',
+    }
+
+    PATTERN_CLASSES = {
+        'pin_bar': PinBar,
+        'bullish_engulfing': BullishEngulfing,
+        'three_candle': ThreeCandle,
+        'dragonfly_doji': DragonflyDoji,
+        'three_white_soldiers': ThreeWhiteSoldiers,
+        'bullish_marubozu': BullishMarubozu,
+        'bullish_harami': BullishHarami,
+        'bullish_abandoned_baby': BullishAbandonedBaby,
+        'tweezer_bottom': TweezerBottom,
+        'bullish_kicker': BullishKicker,
+    }
+
+    # Base success rates used as pattern_strength
+    PATTERN_STRENGTHS = {
+        'pin_bar': 65.0,
+        'bullish_engulfing': 70.0,
+        'three_candle': 68.0,
+        'dragonfly_doji': 60.0,
+        'three_white_soldiers': 82.0,
+        'bullish_marubozu': 69.0,
+        'bullish_harami': 54.0,
+        'bullish_abandoned_baby': 75.0,
+        'tweezer_bottom': 61.0,
+        'bullish_kicker': 78.0,
+    }
+
+    # (field prefix, bars back from the pattern bar) per candle; None prefix means open_price/high_price/...
+    SINGLE_CANDLE = [(None, 0)]
+    TWO_CANDLES = [('first_candle_', 1), ('second_candle_', 0)]
+    THREE_CANDLES = [('first_candle_', 2), ('second_candle_', 1), ('third_candle_', 0)]
+    PATTERN_CANDLES = {
+        'pin_bar': SINGLE_CANDLE,
+        'bullish_engulfing': TWO_CANDLES,
+        'three_candle': THREE_CANDLES,
+        'dragonfly_doji': SINGLE_CANDLE,
+        'three_white_soldiers': THREE_CANDLES,
+        'bullish_marubozu': SINGLE_CANDLE,
+        'bullish_harami': TWO_CANDLES,
+        'bullish_abandoned_baby': [('first_candle_', 2), ('doji_', 1), ('third_candle_', 0)],
+        'tweezer_bottom': TWO_CANDLES,
+        'bullish_kicker': TWO_CANDLES,
+    }
+
+    def __init__(self, detectors: Dict[str, Any]):
+        self.detectors = detectors
+
+    def detect_loop(self, df: pd.DataFrame, include_live: bool = False) -> Dict[str, List]:
+        """Run each detector's row-by-row loop (reference implementation)"""
+        return {pattern_type: getattr(detector, self.LOOP_METHODS[pattern_type])(df, include_live=include_live)
+                for pattern_type, detector in self.detectors.items()}
+
+    def detect(self, df: pd.DataFrame, include_live: bool = False) -> Dict[str, PatternTable]:
+        """Detect all configured patterns in OHLCV data as one PatternTable per pattern type"""
+        n = len(df)
+        f = CandleFeatures.from_df(df)
+
+        # Bar i is evaluated for i < end_index, matching the loop detectors
+        end_index = n if include_live else n - 1
+        in_range = np.arange(n) < end_index
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            masks, extras = self.compute_masks(f)
+
+        bar_index = pd.DatetimeIndex(df.index)
+        timestamps_ns = bar_index.as_unit('ns').asi8
+
+        all_patterns = {}
+        for pattern_type in self.detectors:
+            indices = np.flatnonzero(masks[pattern_type] & in_range)
+
+            columns = {
+                'index': indices,
+                'timestamp': timestamps_ns[indices],
+                'is_bullish': True,
+                'is_live': include_live & (indices == n - 1),
+                'pattern_strength': self.PATTERN_STRENGTHS[pattern_type],
+            }
+            for prefix, offset in self.PATTERN_CANDLES[pattern_type]:
+                for name, values in (('open', f.open), ('high', f.high), ('low', f.low), ('close', f.close)):
+                    column_name = f"{name}_price" if prefix is None else f"{prefix}{name}"
+                    columns[column_name] = values[indices - offset]
+            for name, values in extras[pattern_type].items():
+                columns[name] = values[indices]
+
+            all_patterns[pattern_type] = PatternTable.from_columns(
+                pattern_type, self.PATTERN_CLASSES[pattern_type], len(indices), columns, bar_index.tz
+            )
+
+        return all_patterns
+
+    def compute_masks(self, f: CandleFeatures) -> Tuple[Dict[str, np.ndarray], Dict[str, Dict[str, np.ndarray]]]:
+        """Boolean mask and derived feature arrays for each configured pattern"""
+        # Previous-bar shifts shared by the two- and three-candle patterns
+        o1, h1, l1, c1 = (shift_bars(a, 1) for a in (f.open, f.high, f.low, f.close))
+        o2, h2, l2, c2 = (shift_bars(a, 2) for a in (f.open, f.high, f.low, f.close))
+        range1, range2 = shift_bars(f.total_range, 1), shift_bars(f.total_range, 2)
+        body1, body2 = shift_bars(f.body, 1), shift_bars(f.body, 2)
+        bull1, bull2 = shift_bars(f.is_bullish, 1), shift_bars(f.is_bullish, 2)
+        bear1, bear2 = shift_bars(f.is_bearish, 1), shift_bars(f.is_bearish, 2)
+
+        bar = np.arange(len(f.open))
+        has_prev = bar >= 1
+        has_prev2 = bar >= 2
+
+        masks = {}
+        extras = {}
+
+        det = self.detectors.get('pin_bar')
+        if det is not None:
+            body_ratio = f.body / f.total_range
+            lower_wick_ratio = f.lower_wick / f.body
+            upper_wick_ratio = f.upper_wick / f.body
+            masks['pin_bar'] = ((f.total_range != 0) & (f.body != 0) &
+                                (lower_wick_ratio >= det.min_wick_ratio) &
+                                (body_ratio <= det.max_body_ratio) &
+                                (upper_wick_ratio <= 1.0))
+            extras['pin_bar'] = {'body_ratio': body_ratio, 'wick_ratio': lower_wick_ratio,
+                                 'is_bullish': f.is_bullish}
+
+        det = self.detectors.get('bullish_engulfing')
+        if det is not None:
+            engulfing_ratio = f.body / body1
+            masks['bullish_engulfing'] = (has_prev & bear1 & f.is_bullish & (body1 != 0) &
+                                          (f.open < c1) & (f.close > o1) &
+                                          (engulfing_ratio >= det.min_engulfing_ratio))
+            extras['bullish_engulfing'] = {'engulfing_ratio': engulfing_ratio, 'pattern_low': py_min(l1, f.low)}
+
+        det = self.detectors.get('three_candle')
+        if det is not None:
+            first_body_ratio = body2 / range2
+            second_body_ratio = body1 / range1
+            third_body_ratio = f.body / f.total_range
+            masks['three_candle'] = (has_prev2 & (range2 != 0) & (range1 != 0) & (f.total_range != 0) &
+                                     bear2 & (first_body_ratio >= det.min_first_body) &
+                                     (second_body_ratio <= det.max_second_body) &
+                                     f.is_bullish & (third_body_ratio >= det.min_third_body) &
+                                     (f.close > (o2 + c2) / 2))
+            extras['three_candle'] = {'pattern_low': py_min(l2, l1, f.low)}
+
+        det = self.detectors.get('dragonfly_doji')
+        if det is not None:
+            body_ratio = f.body / f.total_range
+            upper_wick_ratio = f.upper_wick / f.total_range
+            lower_wick_ratio = f.lower_wick / f.total_range
+            masks['dragonfly_doji'] = ((f.total_range != 0) & (body_ratio <= det.max_body_ratio) &
+                                       ((lower_wick_ratio >= det.min_lower_wick_ratio * body_ratio) |
+                                        (lower_wick_ratio >= 0.6)) &
+                                       (upper_wick_ratio <= 0.1))
+            extras['dragonfly_doji'] = {'body_ratio': body_ratio, 'lower_wick_ratio': lower_wick_ratio}
+
+        det = self.detectors.get('three_white_soldiers')
+        if det is not None:
+            first_body, second_body, third_body = c2 - o2, c1 - o1, f.close - f.open
+            masks['three_white_soldiers'] = (has_prev2 & bull2 & bull1 & f.is_bullish &
+                                             (range2 != 0) & (range1 != 0) & (f.total_range != 0) &
+                                             (first_body / range2 >= det.min_body_ratio) &
+                                             (second_body / range1 >= det.min_body_ratio) &
+                                             (third_body / f.total_range >= det.min_body_ratio) &
+                                             (o2 < o1) & (o1 < c2) & (o1 < f.open) & (f.open < c1) &
+                                             (c2 < c1) & (c1 < f.close))
+            extras['three_white_soldiers'] = {
+                'pattern_low': py_min(l2, l1, f.low),
+                'average_body_size': (first_body + second_body + third_body) / 3
+            }
+
+        det = self.detectors.get('bullish_marubozu')
+        if det is not None:
+            body_size = f.close - f.open
+            body_ratio = body_size / f.total_range
+            upper_wick_ratio = (f.high - f.close) / f.total_range
+            lower_wick_ratio = (f.open - f.low) / f.total_range
+            masks['bullish_marubozu'] = (~(f.close <= f.open) & (f.total_range != 0) &
+                                         (body_ratio >= det.min_body_ratio) &
+                                         (upper_wick_ratio <= det.max_wick_ratio) &
+                                         (lower_wick_ratio <= det.max_wick_ratio))
+            extras['bullish_marubozu'] = {'body_size': body_size, 'upper_wick_ratio': upper_wick_ratio,
+                                          'lower_wick_ratio': lower_wick_ratio}
+
+        det = self.detectors.get('bullish_harami')
+        if det is not None:
+            first_body = o1 - c1
+            masks['bullish_harami'] = (has_prev & bear1 & (range1 != 0) &
+                                       ~(first_body / range1 < det.min_first_body_ratio) &
+                                       f.is_bullish & (c1 < f.open) & (f.open < o1) &
+                                       (c1 < f.close) & (f.close < o1))
+            extras['bullish_harami'] = {'pattern_low': py_min(l1, f.low),
+                                        'containment_ratio': (f.close - f.open) / first_body}
+
+        det = self.detectors.get('bullish_abandoned_baby')
+        if det is not None:
+            masks['bullish_abandoned_baby'] = (has_prev2 & bear2 & f.is_bullish & (range1 != 0) &
+                                               ~(body1 / range1 > det.max_doji_body_ratio) &
+                                               (c2 > h1) & (l1 > f.open))
+            extras['bullish_abandoned_baby'] = {'pattern_low': py_min(l2, l1, f.low),
+                                                'gap_down_size': c2 - h1, 'gap_up_size': f.open - l1}
+
+        det = self.detectors.get('tweezer_bottom')
+        if det is not None:
+            low_difference_pct = np.abs(l1 - f.low) / py_min(l1, f.low) * 100
+            masks['tweezer_bottom'] = has_prev & (low_difference_pct <= det.max_low_difference_pct)
+            extras['tweezer_bottom'] = {'pattern_low': py_min(l1, f.low),
+                                        'low_match_precision': 100 - low_difference_pct}
+
+        det = self.detectors.get('bullish_kicker')
+        if det is not None:
+            gap_size = f.open - h1
+            masks['bullish_kicker'] = (has_prev & bear1 & f.is_bullish & (f.open > h1) & (range1 != 0) &
+                                       (gap_size / range1 >= det.min_gap_ratio))
+            extras['bullish_kicker'] = {'pattern_low': py_min(l1, f.low), 'gap_size': gap_size}
+
+        return masks, extras
@@ -0,0 +1,31 @@
+"""
+Status reporting for long-running engine work
+"""
+
+
+class Reporter:
+    """Receives status messages and progress from the engine.
+
+    The default prints to stdout (scheduler, scripts, worker processes);
+    the Streamlit UI passes a subclass that renders widgets instead.
+    """
+
+    def info(self, message: str):
+        print(message)
+
+    def success(self, message: str):
+        print(message)
+
+    def warning(self, message: str):
+        print(message)
+
+    def error(self, message: str):
+        print(message)
+
+    def progress(self, fraction: float):
+        """Report completion of the current task (0.0 - 1.0)"""
+        pass
+
+    def progress_done(self):
+        """The current task finished; clear any progress display"""
+        pass
@@ -0,0 +1,109 @@
+"""
+Session-aligned resampling of cached OHLCV series into higher timeframes
+"""
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================================
+# NSE SESSION CALENDAR
+# ============================================================================
+
+NSE_SESSION_OPEN = pd.Timedelta(hours=9, minutes=15)
+NSE_SESSION_MINUTES = 375  # 09:15 - 15:30
+
+TIMEFRAME_MINUTES = {'1m': 1, '5m': 5, '15m': 15, '30m': 30, '1H': 60, '4H': 240, '1D': NSE_SESSION_MINUTES}
+
+# Timeframes that are built locally from a finer cached series instead of being fetched
+RESAMPLE_TARGETS = ('15m', '30m', '1H', '4H')
+
+_DAY_NS = 86_400 * 10 ** 9
+
+
+def resample_sources(timeframe: str) -> List[str]:
+    """Finer timeframes whose bars tile timeframe's bars within a session, finest first"""
+    if timeframe not in RESAMPLE_TARGETS:
+        return []
+    minutes = TIMEFRAME_MINUTES[timeframe]
+    return [source for source in ('1m', '5m', '15m', '30m', '1H')
+            if TIMEFRAME_MINUTES[source] < minutes and minutes % TIMEFRAME_MINUTES[source] == 0]
+
+
+def _wall_clock_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """Bar open times as int64 ns of the series' own wall clock (tz-aware indexes use their local time)"""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit('ns').asi8
+
+
+def infer_session_open(index: pd.DatetimeIndex) -> pd.Timedelta:
+    """Most common time of day of each day's first bar.
+
+    Cached series carry whatever clock the feed used (IST-naive 09:15 or
+    UTC-naive 03:45 for NSE, midnight for 24h markets), so the session open
+    is read off the data rather than assumed; NSE_SESSION_OPEN when empty.
+    """
+    if len(index) == 0:
+        return NSE_SESSION_OPEN
+    stamps = _wall_clock_ns(pd.DatetimeIndex(index))
+    days = stamps - stamps % _DAY_NS
+    first_of_day = np.r_[True, days[1:] != days[:-1]]
+    opens, counts = np.unique(stamps[first_of_day] - days[first_of_day], return_counts=True)
+    return pd.Timedelta(int(opens[np.argmax(counts)]), unit='ns')
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str, session_open: Optional[pd.Timedelta] = None) -> pd.DataFrame:
+    """Aggregate a finer OHLCV series into timeframe bars counted from the session open.
+
+    Bars are labelled by their open time: with a 09:15 open, 1H bars open at
+    09:15, 10:15, ... 15:15 and 4H bars at 09:15 and 13:15, as the exchange
+    publishes them (not clock-aligned). The last bar of a session is cut
+    short at the close. A leading bar the source only partly covers is
+    dropped; a trailing one is kept as the bar in progress. Non-OHLCV
+    columns take their last value in each bar.
+    """
+    if df is None or df.empty:
+        return df
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    stamps = _wall_clock_ns(df.index)
+    if session_open is None:
+        session_open = infer_session_open(df.index)
+    open_ns = session_open.value
+    step = TIMEFRAME_MINUTES[timeframe] * 60 * 10 ** 9
+
+    days = stamps - stamps % _DAY_NS
+    buckets = days + open_ns + (stamps - days - open_ns) // step * step
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    if buckets[0] != stamps[0]:
+        starts = starts[1:]
+    if len(starts) == 0:
+        return df.iloc[:0]
+
+    first = starts[0]
+    starts = starts - first
+    ends = np.r_[starts[1:], len(stamps) - first] - 1
+    window = df.iloc[first:]
+
+    columns = {}
+    for name in df.columns:
+        values = window[name].to_numpy()
+        if name == 'open':
+            columns[name] = values[starts]
+        elif name == 'high':
+            columns[name] = np.maximum.reduceat(values, starts)
+        elif name == 'low':
+            columns[name] = np.minimum.reduceat(values, starts)
+        elif name == 'volume':
+            columns[name] = np.add.reduceat(values, starts)
+        else:
+            columns[name] = values[ends]
+
+    index = pd.DatetimeIndex(buckets[first:][starts].view('M8[ns]'), name=df.index.name)
+    if df.index.tz is not None:
+        index = index.tz_localize(df.index.tz)
+    return pd.DataFrame(columns, index=index)
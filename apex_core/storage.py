@@ -0,0 +1,1539 @@
+"""
+On-disk storage: binary OHLCV cache files, the optional consolidated SQLite store,
+the cache manifest, the analysis result cache and FileManager
+"""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import shutil
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .reporting import Reporter
+from .swings import IncrementalSwingLowState
+
+
+# ============================================================================
+# BINARY COLUMNAR OHLCV CACHE FORMAT
+# ============================================================================
+
+class OHLCVCacheFormat:
+    """Binary columnar cache file that loads without parsing.
+
+    Layout: MAGIC (8 bytes) | header length (uint32 LE) | JSON header | zero padding
+    to 8 bytes | timestamps (int64 ns, UTC for tz-aware series) | one raw
+    little-endian array per numeric column. Non-numeric columns (e.g. the
+    TradingView 'symbol' column) are kept in the header.
+    """
+
+    MAGIC = b'APXOHLC1'
+    VERSION = 1
+
+    # Windows cannot replace a file while it is mapped, so map() reads it there instead
+    MEMORY_MAP = os.name != 'nt'
+
+    @staticmethod
+    def _aligned(offset: int) -> int:
+        return (offset + 7) // 8 * 8
+
+    @classmethod
+    def encode(cls, df: pd.DataFrame, metadata: Dict) -> bytes:
+        """Serialize a DataFrame with a DatetimeIndex plus metadata to bytes"""
+        index = pd.DatetimeIndex(df.index).as_unit('ns')
+        arrays = [index.asi8.astype('<i8', copy=False)]
+
+        columns = []
+        for name in df.columns:
+            values = df[name].to_numpy()
+            if values.dtype.kind in 'fiub':
+                values = values.astype(values.dtype.newbyteorder('<'), copy=False)
+                columns.append({'name': name, 'dtype': values.dtype.str})
+                arrays.append(values)
+            elif len(values) > 0 and (values == values[0]).all():
+                columns.append({'name': name, 'constant': values[0]})
+            else:
+                columns.append({'name': name, 'values': values.tolist()})
+
+        header = {
+            'version': cls.VERSION,
+            'rows': len(df),
+            'tz': str(index.tz) if index.tz is not None else None,
+            'index_name': index.name,
+            'columns': columns,
+            'metadata': metadata
+        }
+        header_bytes = json.dumps(header, default=str).encode('utf-8')
+        prefix = cls.MAGIC + len(header_bytes).to_bytes(4, 'little') + header_bytes
+        padding = b'\0' * (cls._aligned(len(prefix)) - len(prefix))
+        return b''.join([prefix, padding] + [np.ascontiguousarray(a).tobytes() for a in arrays])
+
+    @staticmethod
+    def checksum(payload: bytes) -> str:
+        """Content checksum recorded in the cache manifest"""
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    @classmethod
+    def write(cls, path: str, df: pd.DataFrame, metadata: Dict) -> Tuple[int, str]:
+        """Atomically write a cache file; returns its size in bytes and checksum"""
+        payload = cls.encode(df, metadata)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return len(payload), cls.checksum(payload)
+
+    @classmethod
+    def _parse_header(cls, buffer) -> Tuple[Dict, int]:
+        if bytes(buffer[:8]) != cls.MAGIC:
+            raise ValueError("Not an OHLCV cache file")
+        header_length = int.from_bytes(buffer[8:12], 'little')
+        header = json.loads(bytes(buffer[12:12 + header_length]))
+        if header.get('version') != cls.VERSION:
+            raise ValueError(f"Unsupported OHLCV cache version: {header.get('version')}")
+        return header, cls._aligned(12 + header_length)
+
+    @classmethod
+    def read_header(cls, path: str) -> Dict:
+        """Read only the header (metadata, row count, columns)"""
+        with open(path, 'rb') as f:
+            prefix = f.read(12)
+            header_length = int.from_bytes(prefix[8:12], 'little')
+            return cls._parse_header(prefix + f.read(header_length))[0]
+
+    @classmethod
+    def read_bounds(cls, path: str) -> Tuple[int, Optional[int], Optional[int]]:
+        """Row count and first/last timestamps (int64 ns, UTC for tz-aware series) without reading the data"""
+        with open(path, 'rb') as f:
+            prefix = f.read(12)
+            header_length = int.from_bytes(prefix[8:12], 'little')
+            header, offset = cls._parse_header(prefix + f.read(header_length))
+            rows = header['rows']
+            if rows == 0:
+                return 0, None, None
+            f.seek(offset)
+            first = int.from_bytes(f.read(8), 'little', signed=True)
+            f.seek(offset + 8 * (rows - 1))
+            last = int.from_bytes(f.read(8), 'little', signed=True)
+        return rows, first, last
+
+    @classmethod
+    def map(cls, path: str, window: Optional[int] = None) -> 'OHLCVArrays':
+        """Memory-map a cache file as zero-copy column views, optionally only its last window rows.
+
+        The mapping is copy-on-write: pages come from the shared OS page cache
+        and are only faulted in when a view touches them, and writes to the
+        arrays never reach the file. A cache rewrite replaces the file, so
+        existing views keep the data they were mapped with.
+        """
+        buffer = np.memmap(path, dtype=np.uint8, mode='c') if cls.MEMORY_MAP else np.fromfile(path, dtype=np.uint8)
+        header, offset = cls._parse_header(buffer)
+        rows = header['rows']
+        start = max(0, rows - window) if window is not None else 0
+
+        timestamps = np.frombuffer(buffer, dtype='<i8', count=rows, offset=offset)
+        offset += timestamps.nbytes
+        columns = {}
+        for column in header['columns']:
+            if 'dtype' in column:
+                values = np.frombuffer(buffer, dtype=column['dtype'], count=rows, offset=offset)
+                offset += values.nbytes
+                columns[column['name']] = values[start:]
+            elif 'constant' in column:
+                columns[column['name']] = pd.Series([column['constant']]).array.take(np.zeros(rows - start,
+                                                                                             dtype=np.intp))
+            else:
+                columns[column['name']] = pd.Series(column['values'][start:]).array
+
+        return OHLCVArrays(timestamps[start:].view('M8[ns]'), columns, header.get('tz'), header.get('index_name'),
+                           start, rows, header['metadata'])
+
+    @classmethod
+    def read(cls, path: str) -> Tuple[pd.DataFrame, Dict]:
+        """Read a cache file into a DataFrame; column arrays are views on one buffer"""
+        with open(path, 'rb') as f:
+            buffer = bytearray(os.fstat(f.fileno()).st_size)
+            f.readinto(buffer)
+        return cls.decode(buffer)
+
+    @classmethod
+    def decode(cls, buffer) -> Tuple[pd.DataFrame, Dict]:
+        """Build the DataFrame from an encoded buffer"""
+        header, offset = cls._parse_header(buffer)
+        rows = header['rows']
+
+        timestamps = np.frombuffer(buffer, dtype='<i8', count=rows, offset=offset)
+        offset += timestamps.nbytes
+        index = pd.DatetimeIndex(timestamps.view('M8[ns]'), name=header.get('index_name'))
+        if header.get('tz'):
+            index = index.tz_localize('UTC').tz_convert(header['tz'])
+
+        data = {}
+        for column in header['columns']:
+            if 'dtype' in column:
+                values = np.frombuffer(buffer, dtype=column['dtype'], count=rows, offset=offset)
+                offset += values.nbytes
+            elif 'constant' in column:
+                values = pd.Series([column['constant']]).array.take(np.zeros(rows, dtype=np.intp))
+            else:
+                values = pd.Series(column['values']).array
+            data[column['name']] = values
+
+        return pd.DataFrame(data, index=index, copy=False), header['metadata']
+
+
+@dataclass
+class OHLCVArrays:
+    """NumPy column views of a cached series, or of its trailing window.
+
+    timestamps are datetime64[ns] (UTC for tz-aware series); start is the
+    position of the first row within the full series of total_rows bars.
+    Numeric columns are NumPy arrays, others (e.g. 'symbol') pandas arrays.
+    """
+    timestamps: np.ndarray
+    columns: Dict[str, Any]
+    tz: Optional[str] = None
+    index_name: Optional[str] = None
+    start: int = 0
+    total_rows: int = 0
+    metadata: Dict = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.columns['open']
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.columns['high']
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.columns['low']
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.columns['close']
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.columns['volume']
+
+    def index(self) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(self.timestamps, name=self.index_name)
+        if self.tz:
+            index = index.tz_localize('UTC').tz_convert(self.tz)
+        return index
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame over the same buffers (what load_data_from_cache returns, restricted to the window)"""
+        return pd.DataFrame(self.columns, index=self.index(), copy=False)
+
+    @classmethod
+    def concat(cls, pieces: List['OHLCVArrays']) -> 'OHLCVArrays':
+        """Join consecutive pieces of one series (copies only the rows involved)"""
+        first, last = pieces[0], pieces[-1]
+        if len(pieces) == 1:
+            return first
+        columns = {}
+        for name, values in first.columns.items():
+            parts = [piece.columns[name] for piece in pieces]
+            columns[name] = (np.concatenate(parts) if isinstance(values, np.ndarray)
+                             else pd.concat([pd.Series(part) for part in parts], ignore_index=True).array)
+        return cls(np.concatenate([piece.timestamps for piece in pieces]), columns,
+                   first.tz, first.index_name, first.start, last.start + last.total_rows, last.metadata)
+
+    def tail(self, window: int) -> 'OHLCVArrays':
+        """Last window rows as views"""
+        skip = max(0, len(self) - window)
+        return OHLCVArrays(self.timestamps[skip:], {name: values[skip:] for name, values in self.columns.items()},
+                           self.tz, self.index_name, self.start + skip, self.total_rows, self.metadata)
+
+
+# ============================================================================
+# APPEND-ONLY SEGMENTED SERIES
+# ============================================================================
+
+class SegmentedOHLCVStore:
+    """Append-only cache directory for one series: immutable sealed segments plus a one-bar tail.
+
+    Layout of <symbol>_<exchange>_<timeframe>.seg/:
+        NNNNNNNN-MMMMMMMM.ohlcv  sealed segment covering append sequence numbers N..M
+        tail.ohlcv               newest bar, which may still be forming
+
+    Both are OHLCVCacheFormat files written atomically. An append seals the
+    previous tail and every new bar except the last into one new segment,
+    so it writes O(new bars) regardless of history length; bars at or
+    before the last sealed bar are never rewritten. Compaction merges runs
+    of small segments into one covering NNNNNNNN-MMMMMMMM file and then
+    deletes the members; segments left covered by a crash mid-compaction
+    are dropped on the next listing, and a segment written just before a
+    crash shadows the bars it duplicates in the old tail.
+    """
+
+    SUFFIX = ".seg"
+    TAIL = "tail.ohlcv"
+    MAX_SEGMENTS = 16
+    SEGMENT_BARS = 100_000
+
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tail_path = os.path.join(path, self.TAIL)
+        with self._locks_guard:
+            self._lock = self._locks.setdefault(os.path.abspath(path), threading.Lock())
+
+    def exists(self) -> bool:
+        return os.path.isdir(self.path)
+
+    @staticmethod
+    def _segment_name(first_seq: int, last_seq: int) -> str:
+        return f"{first_seq:08d}-{last_seq:08d}.ohlcv"
+
+    def _segments(self) -> List[Tuple[int, int, str]]:
+        """(first_seq, last_seq, path) of live segments in order, pruning ones a compaction already covers"""
+        if not self.exists():
+            return []
+        segments = []
+        for name in os.listdir(self.path):
+            stem, extension = os.path.splitext(name)
+            if extension != '.ohlcv' or '-' not in stem:
+                continue
+            first_seq, last_seq = (int(part) for part in stem.split('-'))
+            segments.append((first_seq, last_seq, os.path.join(self.path, name)))
+        segments.sort(key=lambda segment: (segment[0], -segment[1]))
+
+        live = []
+        for segment in segments:
+            if live and segment[1] <= live[-1][1]:
+                try:
+                    os.remove(segment[2])
+                except OSError:
+                    pass
+            else:
+                live.append(segment)
+        return live
+
+    def adopt(self, cache_file: str):
+        """Turn a single-file cache into this series' first segment and tail.
+
+        The last bar may still be forming, so it becomes the tail (as in
+        append) and only the bars before it are sealed. The single file is
+        removed last: until then it shadows the store, so a crash midway
+        just repeats the adoption.
+        """
+        with self._lock:
+            if self.exists():
+                shutil.rmtree(self.path)
+            os.makedirs(self.path)
+            df, metadata = OHLCVCacheFormat.read(cache_file)
+            if len(df) > 1:
+                OHLCVCacheFormat.write(os.path.join(self.path, self._segment_name(1, 1)), df.iloc[:-1], metadata)
+            if len(df):
+                OHLCVCacheFormat.write(self.tail_path, df.iloc[-1:], metadata)
+            os.remove(cache_file)
+
+    def append(self, new_data: pd.DataFrame, metadata: Dict) -> int:
+        """Add new_data (may overlap the stored bars); returns the number of bars not stored before"""
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            segments = self._segments()
+            if segments:
+                sealed_end = OHLCVCacheFormat.read_bounds(segments[-1][2])[2]
+                if sealed_end is not None:
+                    new_data = new_data[pd.DatetimeIndex(new_data.index).as_unit('ns').asi8 > sealed_end]
+
+            tail = OHLCVCacheFormat.read(self.tail_path)[0] if os.path.exists(self.tail_path) else None
+            if tail is not None and not tail.empty:
+                added = int((~new_data.index.isin(tail.index)).sum())
+                combined = pd.concat([tail, new_data])
+                combined = combined[~combined.index.duplicated(keep='last')].sort_index()
+                if added == 0 and combined.equals(tail):
+                    return 0
+            else:
+                added = len(new_data)
+                combined = new_data.sort_index()
+            if combined.empty:
+                return 0
+
+            # Segment first, then tail: a crash in between leaves a tail bar the segment already holds
+            if len(combined) > 1:
+                seq = segments[-1][1] + 1 if segments else 1
+                OHLCVCacheFormat.write(os.path.join(self.path, self._segment_name(seq, seq)),
+                                       combined.iloc[:-1], metadata)
+            OHLCVCacheFormat.write(self.tail_path, combined.iloc[-1:], metadata)
+            return added
+
+    def read(self) -> Optional[Tuple[pd.DataFrame, Dict]]:
+        """Whole series (segments in order, then the tail) and the newest metadata; None if empty"""
+        for attempt in range(3):
+            try:
+                return self._read()
+            except FileNotFoundError:
+                # A concurrent compaction replaced segments between listing and reading
+                if attempt == 2:
+                    raise
+        return None
+
+    def _read(self) -> Optional[Tuple[pd.DataFrame, Dict]]:
+        frames = []
+        metadata = {}
+        for _, _, segment_path in self._segments():
+            df, metadata = OHLCVCacheFormat.read(segment_path)
+            if len(df):
+                frames.append(df)
+        if os.path.exists(self.tail_path):
+            tail, metadata = OHLCVCacheFormat.read(self.tail_path)
+            if frames:
+                tail = tail[tail.index > frames[-1].index[-1]]
+            frames.append(tail)
+        if not frames:
+            return None
+        return (pd.concat(frames) if len(frames) > 1 else frames[0]), metadata
+
+    def map(self, window: Optional[int] = None) -> Optional[OHLCVArrays]:
+        """Memory-mapped views of the newest segments and the tail covering window rows (all if None).
+
+        Segments live in separate files, so the pieces are joined into one
+        copy of just the requested rows; a single segment is returned as views.
+        """
+        segments = [(segment_path, OHLCVCacheFormat.read_bounds(segment_path)[0])
+                    for _, _, segment_path in self._segments()]
+        pieces = []
+        if os.path.exists(self.tail_path):
+            tail = OHLCVCacheFormat.map(self.tail_path)
+            sealed = [segment_path for segment_path, rows in segments if rows]
+            if sealed:
+                sealed_end = OHLCVCacheFormat.read_bounds(sealed[-1])[2]
+                tail = tail.tail(int((tail.timestamps.view('i8') > sealed_end).sum()))
+            if len(tail):
+                pieces.append(tail)
+        total_rows = sum(rows for _, rows in segments) + sum(len(piece) for piece in pieces)
+
+        for segment_path, rows in reversed(segments):
+            collected = sum(len(piece) for piece in pieces)
+            if window is not None and collected >= window:
+                break
+            if rows:
+                pieces.insert(0, OHLCVCacheFormat.map(segment_path, None if window is None else window - collected))
+        if not pieces:
+            return None
+
+        arrays = OHLCVArrays.concat(pieces)
+        if window is not None:
+            arrays = arrays.tail(window)
+        arrays.start = total_rows - len(arrays)
+        arrays.total_rows = total_rows
+        return arrays
+
+    def stats(self) -> Dict:
+        """Rows, first/last bar (UTC ns), bytes on disk and a checksum that changes with every write"""
+        rows, first, last, size = 0, None, None, 0
+        digest = hashlib.blake2b(digest_size=16)
+        for _, _, segment_path in self._segments():
+            segment_rows, segment_first, segment_last = OHLCVCacheFormat.read_bounds(segment_path)
+            if segment_rows:
+                rows += segment_rows
+                first = segment_first if first is None else first
+                last = segment_last
+            size += os.path.getsize(segment_path)
+            digest.update(f"{os.path.basename(segment_path)}:{segment_rows}:{segment_last};".encode())
+        if os.path.exists(self.tail_path):
+            with open(self.tail_path, 'rb') as f:
+                payload = f.read()
+            tail_rows, tail_first, tail_last = OHLCVCacheFormat.read_bounds(self.tail_path)
+            if tail_rows and (last is None or tail_last > last):
+                rows += tail_rows
+                first = tail_first if first is None else first
+                last = tail_last
+            size += len(payload)
+            digest.update(payload)
+        return {'rows': rows, 'first': first, 'last': last, 'size': size, 'checksum': digest.hexdigest()}
+
+    def _compaction_run(self, segments: List[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+        """Newest segments to merge: extended backwards while the next older one is no larger than the run.
+
+        Size-tiered, so large old segments are left alone and each bar is
+        rewritten O(log n) times over the life of the series.
+        """
+        if not segments:
+            return []
+        rows = [OHLCVCacheFormat.read_bounds(segment_path)[0] for _, _, segment_path in segments]
+        start, total = len(segments) - 1, rows[-1]
+        while start > 0 and rows[start - 1] <= total and total + rows[start - 1] <= self.SEGMENT_BARS:
+            start -= 1
+            total += rows[start]
+        return segments[start:]
+
+    def needs_compaction(self) -> bool:
+        return len(self._compaction_run(self._segments())) > self.MAX_SEGMENTS
+
+    def compact(self) -> int:
+        """Merge the trailing run of small segments into one; returns the number of segments merged away"""
+        with self._lock:
+            run = self._compaction_run(self._segments())
+            if len(run) < 2:
+                return 0
+            frames = [OHLCVCacheFormat.read(segment_path) for _, _, segment_path in run]
+            OHLCVCacheFormat.write(os.path.join(self.path, self._segment_name(run[0][0], run[-1][1])),
+                                   pd.concat([df for df, _ in frames]), frames[-1][1])
+            for _, _, segment_path in run:
+                try:
+                    os.remove(segment_path)
+                except OSError:
+                    # A concurrent listing already pruned it as covered by the merged segment
+                    pass
+            return len(run) - 1
+
+
+def map_cached_series(cache_dir: str, symbol: str, timeframe: str, exchange: str,
+                      window: Optional[int] = None) -> Optional[OHLCVArrays]:
+    """Map a series from the binary cache without a FileManager (as used by worker processes).
+
+    The single file wins over the segmented store, as in
+    FileManager.load_data_from_cache; None when neither exists.
+    """
+    name = f"{symbol}_{exchange}_{timeframe}"
+    cache_file = os.path.join(cache_dir, f"{name}.ohlcv")
+    if os.path.exists(cache_file):
+        return OHLCVCacheFormat.map(cache_file, window)
+    store = SegmentedOHLCVStore(os.path.join(cache_dir, f"{name}{SegmentedOHLCVStore.SUFFIX}"))
+    return store.map(window) if store.exists() else None
+
+
+# ============================================================================
+# CONSOLIDATED SQLITE STORE
+# ============================================================================
+
+def _utc_ns(value) -> int:
+    """Timestamp as int64 ns on the stored clock (UTC for tz-aware values, as written)"""
+    value = pd.Timestamp(value)
+    if value.tz is not None:
+        value = value.tz_convert('UTC').tz_localize(None)
+    return value.as_unit('ns').value
+
+
+def _isoformat(value: int, tz: Optional[str]) -> str:
+    """Stored int64 ns timestamp as the ISO string the manifest records"""
+    return pd.Timestamp(value, tz='UTC').tz_convert(tz).isoformat() if tz else pd.Timestamp(value).isoformat()
+
+
+class ConsolidatedOHLCVStore:
+    """Every cached series in one SQLite file, indexed by (series, timestamp).
+
+    An optional alternative to one cache file per series: a universe of
+    thousands of series is a single file, read_many() reads a date range of
+    many symbols in one query and bulk() groups the upserts of a fetch batch
+    into one transaction. Bars are kept in time-ordered blocks of up to
+    BLOCK_BARS packed rows (int64 ns timestamp and float64 OHLCV, UTC for
+    tz-aware series as in OHLCVCacheFormat) indexed by their first and last
+    timestamp, so a range read decodes whole blocks with np.frombuffer and an
+    upsert rewrites only the blocks it overlaps. Columns other than OHLCV
+    (e.g. TradingView's 'symbol') keep their last value per series. The
+    series table doubles as the cache index, so FileManager does not use the
+    JSON manifest with it. Each thread and process has its own connection and
+    the file runs in WAL mode, so readers never wait for a batch being written.
+    """
+
+    FILENAME = "market_data.sqlite"
+    OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+    BLOCK_BARS = 1024
+    BUSY_TIMEOUT = 30.0
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS series (
+            series_id INTEGER PRIMARY KEY,
+            symbol TEXT NOT NULL,
+            exchange TEXT NOT NULL,
+            timeframe TEXT NOT NULL,
+            bar_count INTEGER NOT NULL DEFAULT 0,
+            first_ts INTEGER,
+            last_ts INTEGER,
+            tz TEXT,
+            index_name TEXT,
+            columns TEXT NOT NULL DEFAULT '[]',
+            metadata TEXT NOT NULL DEFAULT '{}',
+            checksum TEXT,
+            fetched_at TEXT,
+            UNIQUE (exchange, timeframe, symbol)
+        );
+        CREATE TABLE IF NOT EXISTS blocks (
+            series_id INTEGER NOT NULL,
+            first_ts INTEGER NOT NULL,
+            last_ts INTEGER NOT NULL,
+            bar_count INTEGER NOT NULL,
+            bars BLOB NOT NULL,
+            PRIMARY KEY (series_id, first_ts)
+        );
+    """
+
+    _BAR_DTYPE = np.dtype([('ts', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                           ('close', '<f8'), ('volume', '<f8')])
+
+    # Bound parameters per IN (...) query (SQLite before 3.32 allows 999)
+    _MAX_PARAMS = 900
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connection().executescript(self._SCHEMA)
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection (reopened in a forked child)"""
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            local.connection, local.pid, local.depth = connection, os.getpid(), 0
+        return local.connection
+
+    @contextmanager
+    def bulk(self):
+        """One write transaction around everything written inside; nested blocks become savepoints"""
+        connection = self._connection()
+        local = self._local
+        savepoint = f"bulk_{local.depth}"
+        connection.execute("BEGIN IMMEDIATE" if local.depth == 0 else f"SAVEPOINT {savepoint}")
+        local.depth += 1
+        try:
+            yield connection
+        except BaseException:
+            local.depth -= 1
+            if local.depth == 0:
+                connection.execute("ROLLBACK")
+            else:
+                connection.execute(f"ROLLBACK TO {savepoint}")
+                connection.execute(f"RELEASE {savepoint}")
+            raise
+        local.depth -= 1
+        connection.execute("COMMIT" if local.depth == 0 else f"RELEASE {savepoint}")
+
+    @contextmanager
+    def _snapshot(self):
+        """Consistent reads across several queries"""
+        connection = self._connection()
+        if self._local.depth:
+            yield connection
+            return
+        connection.execute("BEGIN")
+        try:
+            yield connection
+        finally:
+            connection.execute("COMMIT")
+
+    @classmethod
+    def _decode(cls, blobs: List[bytes]) -> np.ndarray:
+        """Packed bars of consecutive blocks as one structured array"""
+        if not blobs:
+            return np.empty(0, dtype=cls._BAR_DTYPE)
+        return np.concatenate([np.frombuffer(blob, dtype=cls._BAR_DTYPE) for blob in blobs])
+
+    @staticmethod
+    def _merge(bars: np.ndarray) -> np.ndarray:
+        """Bars sorted by timestamp, keeping the last of each repeated timestamp"""
+        if len(bars) == 0:
+            return bars
+        bars = bars[np.argsort(bars['ts'], kind='stable')]
+        return bars[np.r_[bars['ts'][1:] != bars['ts'][:-1], True]]
+
+    def write(self, symbol: str, timeframe: str, exchange: str, data: pd.DataFrame,
+              metadata: Optional[Dict] = None, replace: bool = False, keep_history: bool = False) -> Tuple[int, int]:
+        """Upsert data's bars into a series; returns (bars added, total bars).
+
+        replace drops the series' other bars first; keep_history leaves bars
+        before the stored last bar untouched, as SegmentedOHLCVStore.append does.
+        """
+        index = pd.DatetimeIndex(data.index).as_unit('ns')
+        columns = []
+        for name in data.columns:
+            if name in self.OHLCV_COLUMNS and data[name].dtype.kind in 'fiub':
+                columns.append({'name': name, 'dtype': data[name].dtype.str})
+            elif len(data):
+                value = data[name].iloc[-1]
+                columns.append({'name': name, 'constant': value.item() if hasattr(value, 'item') else value})
+        present = {column['name'] for column in columns if 'dtype' in column}
+        incoming = np.zeros(len(data), dtype=self._BAR_DTYPE)
+        incoming['ts'] = index.asi8
+        for name in present:
+            incoming[name] = data[name].to_numpy(dtype=np.float64)
+        incoming = self._merge(incoming)
+        fetched_at = (metadata or {}).get('timestamp') or datetime.now().isoformat()
+
+        with self.bulk() as connection:
+            connection.execute("INSERT OR IGNORE INTO series (symbol, exchange, timeframe) VALUES (?, ?, ?)",
+                               (symbol, exchange, timeframe))
+            series = connection.execute(
+                "SELECT * FROM series WHERE exchange = ? AND timeframe = ? AND symbol = ?",
+                (exchange, timeframe, symbol)).fetchone()
+            series_id = series['series_id']
+            bar_count, first_ts, last_ts = series['bar_count'], series['first_ts'], series['last_ts']
+            changed = replace or series['checksum'] is None
+            if replace:
+                connection.execute("DELETE FROM blocks WHERE series_id = ?", (series_id,))
+                bar_count, first_ts, last_ts = 0, None, None
+            elif keep_history and last_ts is not None:
+                incoming = incoming[incoming['ts'] >= last_ts]
+
+            added = 0
+            if len(incoming):
+                low, high = int(incoming['ts'][0]), int(incoming['ts'][-1])
+                blocks = connection.execute(
+                    "SELECT first_ts, bars FROM blocks WHERE series_id = ? AND last_ts >= ? AND first_ts <= ? "
+                    "ORDER BY first_ts", (series_id, low, high)).fetchall()
+                # A part-filled block just before the new bars takes them in, so appends don't add a block per bar
+                previous = connection.execute(
+                    "SELECT first_ts, bar_count, bars FROM blocks WHERE series_id = ? AND last_ts < ? "
+                    "ORDER BY first_ts DESC LIMIT 1", (series_id, low)).fetchone()
+                if previous is not None and previous['bar_count'] < self.BLOCK_BARS:
+                    blocks.insert(0, previous)
+
+                stored = self._decode([block['bars'] for block in blocks])
+                merged = self._merge(np.concatenate([stored, incoming]))
+                added = len(merged) - len(stored)
+                if added or merged.tobytes() != stored.tobytes():
+                    connection.executemany("DELETE FROM blocks WHERE series_id = ? AND first_ts = ?",
+                                           [(series_id, block['first_ts']) for block in blocks])
+                    connection.executemany(
+                        "INSERT INTO blocks VALUES (?, ?, ?, ?, ?)",
+                        [(series_id, int(chunk['ts'][0]), int(chunk['ts'][-1]), len(chunk), chunk.tobytes())
+                         for chunk in (merged[position:position + self.BLOCK_BARS]
+                                       for position in range(0, len(merged), self.BLOCK_BARS))])
+                    changed = True
+                bar_count += added
+                first_ts = low if first_ts is None else min(first_ts, low)
+                last_ts = high if last_ts is None else max(last_ts, high)
+
+            connection.execute(
+                "UPDATE series SET bar_count = ?, first_ts = ?, last_ts = ?, tz = ?, index_name = ?, columns = ?, "
+                "metadata = ?, checksum = ?, fetched_at = ? WHERE series_id = ?",
+                (bar_count, first_ts, last_ts, str(index.tz) if index.tz is not None else None, index.name,
+                 json.dumps(columns, default=str), json.dumps(metadata or {}, default=str),
+                 uuid.uuid4().hex if changed else series['checksum'], fetched_at, series_id))
+        return added, bar_count
+
+    def upsert_many(self, frames: Dict[str, pd.DataFrame], timeframe: str, exchange: str,
+                    replace: bool = False) -> Dict[str, Tuple[int, int]]:
+        """Write many symbols' bars in one transaction; returns (bars added, total bars) per symbol"""
+        with self.bulk():
+            return {symbol: self.write(symbol, timeframe, exchange, data, replace=replace)
+                    for symbol, data in frames.items()}
+
+    def _series_rows(self, connection: sqlite3.Connection, timeframe: Optional[str] = None,
+                     exchange: Optional[str] = None) -> List[sqlite3.Row]:
+        if timeframe is None:
+            return connection.execute("SELECT * FROM series ORDER BY series_id").fetchall()
+        return connection.execute("SELECT * FROM series WHERE exchange = ? AND timeframe = ? ORDER BY series_id",
+                                  (exchange, timeframe)).fetchall()
+
+    def _range(self, connection: sqlite3.Connection, series_ids: List[int], start=None,
+               end=None) -> Dict[int, np.ndarray]:
+        """Bars of each series between start and end (inclusive, either optional), read a block at a time"""
+        low = _utc_ns(start) if start is not None else int(np.iinfo(np.int64).min)
+        high = _utc_ns(end) if end is not None else int(np.iinfo(np.int64).max)
+        cursor = connection.cursor()
+        cursor.row_factory = None
+        blobs: Dict[int, List[bytes]] = {}
+        for position in range(0, len(series_ids), self._MAX_PARAMS):
+            chunk = series_ids[position:position + self._MAX_PARAMS]
+            rows = cursor.execute(
+                f"SELECT series_id, bars FROM blocks WHERE series_id IN ({', '.join('?' * len(chunk))}) "
+                "AND last_ts >= ? AND first_ts <= ? ORDER BY series_id, first_ts", [*chunk, low, high])
+            for series_id, blob in rows:
+                blobs.setdefault(series_id, []).append(blob)
+
+        bars = {}
+        for series_id, series_blobs in blobs.items():
+            series_bars = self._decode(series_blobs)
+            if start is not None or end is not None:
+                stamps = series_bars['ts']
+                series_bars = series_bars[np.searchsorted(stamps, low):np.searchsorted(stamps, high, side='right')]
+            bars[series_id] = series_bars
+        return bars
+
+    def _tail(self, connection: sqlite3.Connection, series_id: int, window: int) -> np.ndarray:
+        """Last window bars of a series, reading blocks back from the newest"""
+        cursor = connection.cursor()
+        cursor.row_factory = None
+        blobs, count = [], 0
+        for bar_count, blob in cursor.execute(
+                "SELECT bar_count, bars FROM blocks WHERE series_id = ? ORDER BY first_ts DESC", (series_id,)):
+            if count >= window:
+                break
+            blobs.append(blob)
+            count += bar_count
+        bars = self._decode(blobs[::-1])
+        return bars[len(bars) - min(window, len(bars)):]
+
+    @staticmethod
+    def _arrays(series: sqlite3.Row, bars: np.ndarray) -> OHLCVArrays:
+        columns = {}
+        for column in json.loads(series['columns']):
+            if 'dtype' in column:
+                columns[column['name']] = bars[column['name']].astype(column['dtype'])
+            else:
+                columns[column['name']] = pd.Series([column['constant']]).array.take(np.zeros(len(bars),
+                                                                                                 dtype=np.intp))
+        return OHLCVArrays(np.ascontiguousarray(bars['ts']).view('M8[ns]'), columns, series['tz'],
+                           series['index_name'], series['bar_count'] - len(bars), series['bar_count'],
+                           json.loads(series['metadata']))
+
+    def read_many(self, symbols: List[str], timeframe: str, exchange: str, start=None,
+                  end=None) -> Dict[str, pd.DataFrame]:
+        """Bars of many symbols between start and end (inclusive, either optional) in one query.
+
+        Symbols without a stored series are left out of the result.
+        """
+        wanted = set(symbols)
+        with self._snapshot() as connection:
+            series = {row['series_id']: row for row in self._series_rows(connection, timeframe, exchange)
+                      if row['symbol'] in wanted}
+            bars = self._range(connection, list(series), start, end)
+
+        empty = np.empty(0, dtype=self._BAR_DTYPE)
+        return {row['symbol']: self._arrays(row, bars.get(series_id, empty)).to_frame()
+                for series_id, row in series.items()}
+
+    def arrays(self, symbol: str, timeframe: str, exchange: str,
+               window: Optional[int] = None) -> Optional[OHLCVArrays]:
+        """Column arrays of one series, or of its last window bars"""
+        with self._snapshot() as connection:
+            series = connection.execute("SELECT * FROM series WHERE exchange = ? AND timeframe = ? AND symbol = ?",
+                                        (exchange, timeframe, symbol)).fetchone()
+            if series is None:
+                return None
+            series_id = series['series_id']
+            if window is not None:
+                bars = self._tail(connection, series_id, window)
+            else:
+                bars = self._range(connection, [series_id]).get(series_id, np.empty(0, dtype=self._BAR_DTYPE))
+        return self._arrays(series, bars)
+
+    def read(self, symbol: str, timeframe: str, exchange: str = 'NSE') -> Optional[pd.DataFrame]:
+        """One series as a DataFrame (what FileManager.load_data_from_cache returns)"""
+        arrays = self.arrays(symbol, timeframe, exchange)
+        return arrays.to_frame() if arrays is not None else None
+
+    @staticmethod
+    def _entry(series: sqlite3.Row) -> Dict:
+        """Manifest-style entry (see CacheManifest.build_entry); file_size counts the stored bar values"""
+        has_data = series['bar_count'] > 0
+        tz = series['tz']
+        return {
+            'symbol': series['symbol'],
+            'timeframe': series['timeframe'],
+            'exchange': series['exchange'],
+            'last_bar': _isoformat(series['last_ts'], tz) if has_data else None,
+            'total_candles': series['bar_count'],
+            'date_range': {
+                'start': _isoformat(series['first_ts'], tz),
+                'end': _isoformat(series['last_ts'], tz)
+            } if has_data else None,
+            'file_size': series['bar_count'] * ConsolidatedOHLCVStore._BAR_DTYPE.itemsize,
+            'checksum': series['checksum'],
+            'fetched_at': series['fetched_at']
+        }
+
+    def entry(self, symbol: str, timeframe: str, exchange: str) -> Optional[Dict]:
+        series = self._connection().execute(
+            "SELECT * FROM series WHERE exchange = ? AND timeframe = ? AND symbol = ?",
+            (exchange, timeframe, symbol)).fetchone()
+        return self._entry(series) if series is not None else None
+
+    def entries(self) -> Dict[str, Dict]:
+        """Entries of every stored series keyed like the manifest (SYMBOL_EXCHANGE_TIMEFRAME)"""
+        return {CacheManifest.key(row['symbol'], row['timeframe'], row['exchange']): self._entry(row)
+                for row in self._series_rows(self._connection())}
+
+
+# ============================================================================
+# CACHE MANIFEST
+# ============================================================================
+
+class CacheManifest:
+    """Single sidecar index of every OHLCV cache file.
+
+    One entry per cache file (last bar, bar count, date range, byte size,
+    checksum, last fetch time) so status screens never open the caches
+    themselves. Every update rewrites the manifest atomically; reads are
+    served from memory until the file changes on disk.
+    """
+
+    FILENAME = "manifest.json"
+    VERSION = 1
+
+    _lock = threading.RLock()
+
+    def __init__(self, cache_dir: str):
+        self.path = os.path.join(cache_dir, self.FILENAME)
+        self._entries: Dict[str, Dict] = {}
+        self._signature = None
+        self._pending: Dict[str, Optional[Dict]] = {}
+        self._deferred = 0
+
+    @staticmethod
+    def key(symbol: str, timeframe: str, exchange: str) -> str:
+        return f"{symbol}_{exchange}_{timeframe}"
+
+    @staticmethod
+    def build_entry(symbol: str, timeframe: str, exchange: str, data: pd.DataFrame,
+                    file_size: int, checksum: str, fetched_at: Optional[str] = None) -> Dict:
+        """Manifest entry describing one freshly written cache file"""
+        has_data = len(data) > 0
+        return {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'exchange': exchange,
+            'last_bar': data.index.max().isoformat() if has_data else None,
+            'total_candles': len(data),
+            'date_range': {
+                'start': data.index.min().isoformat(),
+                'end': data.index.max().isoformat()
+            } if has_data else None,
+            'file_size': file_size,
+            'checksum': checksum,
+            'fetched_at': fetched_at or datetime.now().isoformat()
+        }
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self):
+        """Reload the manifest if another process or instance rewrote it"""
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        entries = {}
+        if signature is not None:
+            try:
+                with open(self.path, 'r') as f:
+                    entries = json.load(f).get('entries', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable cache manifest: {e}")
+        self._entries = entries
+        self._signature = signature
+
+    def _write(self):
+        """Merge pending changes into the on-disk manifest and replace it atomically"""
+        self._refresh()
+        for key, entry in self._pending.items():
+            if entry is None:
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = entry
+        self._pending = {}
+
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps({'version': self.VERSION, 'entries': self._entries}, separators=(',', ':')))
+        os.replace(tmp_path, self.path)
+        self._signature = self._file_signature()
+
+    def _current(self) -> Dict[str, Dict]:
+        self._refresh()
+        if not self._pending:
+            return self._entries
+        entries = dict(self._entries)
+        for key, entry in self._pending.items():
+            if entry is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = entry
+        return entries
+
+    def entries(self) -> Dict[str, Dict]:
+        """All entries keyed by SYMBOL_EXCHANGE_TIMEFRAME (one file read at most)"""
+        with self._lock:
+            return dict(self._current())
+
+    def get(self, symbol: str, timeframe: str, exchange: str) -> Optional[Dict]:
+        with self._lock:
+            return self._current().get(self.key(symbol, timeframe, exchange))
+
+    def _stage(self, key: str, entry: Optional[Dict]):
+        with self._lock:
+            self._pending[key] = entry
+            if not self._deferred:
+                self._write()
+
+    def update(self, entry: Dict):
+        """Insert or replace one entry and persist the manifest"""
+        self._stage(self.key(entry['symbol'], entry['timeframe'], entry['exchange']), entry)
+
+    def remove(self, symbol: str, timeframe: str, exchange: str):
+        self._stage(self.key(symbol, timeframe, exchange), None)
+
+    def flush(self):
+        """Persist updates staged so far, even inside deferred() (e.g. at a checkpoint)"""
+        with self._lock:
+            if self._pending:
+                self._write()
+
+    @contextmanager
+    def deferred(self):
+        """Batch many updates (e.g. a full data refresh) into a single manifest write"""
+        with self._lock:
+            self._deferred += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._deferred -= 1
+                if not self._deferred and self._pending:
+                    self._write()
+
+
+# ============================================================================
+# ANALYSIS RESULT CACHE
+# ============================================================================
+
+class AnalysisResultCache:
+    """On-disk LRU of per-unit analysis results.
+
+    Entries are pickled under a key derived from the unit's cached data
+    fingerprint (last bar + checksum) and a hash of the analysis settings, so
+    a rerun over unchanged bars with unchanged parameters skips the unit.
+    Beyond max_entries the least recently used entries are evicted; file
+    mtimes carry the recency order across restarts.
+    """
+
+    VERSION = 1
+
+    _lock = threading.RLock()
+
+    def __init__(self, cache_dir: str, max_entries: int = 2000):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._order: Optional[OrderedDict] = None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def make_key(cls, symbol: str, timeframe: str, exchange: str, fingerprint: str, settings_hash: str) -> str:
+        digest = hashlib.blake2b(json.dumps([cls.VERSION, fingerprint, settings_hash]).encode('utf-8'),
+                                 digest_size=16).hexdigest()
+        return f"{symbol}_{exchange}_{timeframe}_{digest}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _index(self) -> OrderedDict:
+        """Keys from least to most recently used, scanned from disk once"""
+        if self._order is None:
+            Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+            files = sorted(Path(self.cache_dir).glob("*.pkl"), key=lambda p: p.stat().st_mtime_ns)
+            self._order = OrderedDict((p.stem, None) for p in files)
+        return self._order
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for key (None on a miss); marks the entry most recently used"""
+        with self._lock:
+            order = self._index()
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+                os.utime(path)
+            except FileNotFoundError:
+                order.pop(key, None)
+                self.misses += 1
+                return None
+            except Exception as e:
+                print(f"⚠️ Dropping unreadable result cache entry {key}: {e}")
+                self._discard(key)
+                self.misses += 1
+                return None
+            order[key] = None
+            order.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any):
+        """Store value atomically and evict least recently used entries over the limit"""
+        with self._lock:
+            order = self._index()
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"⚠️ Could not store result cache entry {key}: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+            order[key] = None
+            order.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        order = self._index()
+        while len(order) > self.max_entries:
+            self._discard(next(iter(order)))
+
+    def _discard(self, key: str):
+        self._index().pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> int:
+        """Remove every entry; returns how many were removed"""
+        with self._lock:
+            keys = list(self._index())
+            for key in keys:
+                self._discard(key)
+            self.hits = self.misses = 0
+            return len(keys)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            order = self._index()
+            size = sum(os.path.getsize(self._path(key)) for key in order if os.path.exists(self._path(key)))
+            return {'entries': len(order), 'max_entries': self.max_entries, 'size_kb': round(size / 1024, 2),
+                    'hits': self.hits, 'misses': self.misses}
+
+
+# ============================================================================
+# FILE MANAGEMENT SYSTEM
+# ============================================================================
+
+class FileManager:
+    """Manages file operations for instruments and data caching"""
+
+    def __init__(self, reporter: Optional[Reporter] = None, consolidated_store: bool = False):
+        self.reporter = reporter or Reporter()
+        self.instruments_file = "instruments_one.txt"
+        self.data_cache_dir = "data_cache"
+        self.config_file = "analyzer_config.json"
+        self._ensure_directories()
+        self.manifest = CacheManifest(self.data_cache_dir)
+        self.result_cache = AnalysisResultCache(os.path.join(self.data_cache_dir, "results"))
+        self._compactions = set()
+        self._compactions_lock = threading.Lock()
+        self.consolidated: Optional[ConsolidatedOHLCVStore] = None
+        self.use_consolidated_store(consolidated_store)
+
+    def _ensure_directories(self):
+        """Create necessary directories and files"""
+        Path(self.data_cache_dir).mkdir(exist_ok=True)
+
+        if not os.path.exists(self.instruments_file):
+            default_instruments = "BTCUSDT,ETHUSDT,BNBUSDT,ADAUSDT,SOLUSDT,DOTUSDT,LINKUSDT,LTCUSDT,BCHUSDT,XLMUSDT"
+            with open(self.instruments_file, 'w') as f:
+                f.write(default_instruments)
+
+    def load_instruments(self) -> List[str]:
+        """Load instruments from file"""
+        try:
+            with open(self.instruments_file, 'r') as f:
+                content = f.read().strip()
+                if content:
+                    return [s.strip().upper() for s in content.split(',') if s.strip()]
+                return []
+        except FileNotFoundError:
+            return []
+
+    def save_instruments(self, instruments: List[str]):
+        """Save instruments to file"""
+        with open(self.instruments_file, 'w') as f:
+            f.write(','.join(instruments))
+
+    def use_consolidated_store(self, enabled: bool = True):
+        """Keep OHLCV data in the single-file ConsolidatedOHLCVStore instead of one cache file per series.
+
+        The two backends are independent; import_into_store() copies the
+        per-series cache into the store.
+        """
+        self.consolidated = (ConsolidatedOHLCVStore(os.path.join(self.data_cache_dir, ConsolidatedOHLCVStore.FILENAME))
+                      if enabled else None)
+
+    @contextmanager
+    def bulk_write(self):
+        """Batch the cache writes of one fetch round into one manifest write (or store transaction)"""
+        if self.consolidated is None:
+            with self.manifest.deferred():
+                yield
+            return
+        with self.consolidated.bulk():
+            yield
+
+    def get_cache_filename(self, symbol: str, timeframe: str, exchange: str) -> str:
+        """Get cache filename for symbol/timeframe combination"""
+        return os.path.join(self.data_cache_dir, f"{symbol}_{exchange}_{timeframe}.ohlcv")
+
+    def get_legacy_cache_filename(self, symbol: str, timeframe: str, exchange: str) -> str:
+        """Get the pre-binary JSON cache filename"""
+        return os.path.join(self.data_cache_dir, f"{symbol}_{exchange}_{timeframe}.json")
+
+    def get_segment_store(self, symbol: str, timeframe: str, exchange: str) -> SegmentedOHLCVStore:
+        """Append-only segmented store for a series (the directory exists once data was appended)"""
+        return SegmentedOHLCVStore(os.path.join(self.data_cache_dir,
+                                                f"{symbol}_{exchange}_{timeframe}{SegmentedOHLCVStore.SUFFIX}"))
+
+    def save_data_to_cache(self, symbol: str, timeframe: str, exchange: str, data: pd.DataFrame,
+                           metadata: Optional[Dict] = None):
+        """Save data to cache file with complete OHLCV data"""
+        try:
+            cache_file = self.get_cache_filename(symbol, timeframe, exchange)
+            if metadata is None:
+                metadata = {
+                    'timestamp': datetime.now().isoformat(),
+                    'symbol': symbol,
+                    'timeframe': timeframe,
+                    'exchange': exchange,
+                    'total_candles': len(data),
+                    'date_range': {
+                        'start': data.index.min().isoformat(),
+                        'end': data.index.max().isoformat()
+                    } if len(data) > 0 else None
+                }
+            if self.consolidated is not None:
+                self.consolidated.write(symbol, timeframe, exchange, data, metadata, replace=True)
+                return
+            file_size, checksum = OHLCVCacheFormat.write(cache_file, data, metadata)
+            self.manifest.update(CacheManifest.build_entry(
+                symbol, timeframe, exchange, data, file_size, checksum, metadata.get('timestamp')))
+
+            # The binary file supersedes any legacy JSON cache or appended segments
+            legacy_file = self.get_legacy_cache_filename(symbol, timeframe, exchange)
+            if os.path.exists(legacy_file):
+                os.remove(legacy_file)
+            store = self.get_segment_store(symbol, timeframe, exchange)
+            if store.exists():
+                shutil.rmtree(store.path, ignore_errors=True)
+        except Exception as e:
+            self.reporter.warning(f"Failed to cache data for {symbol} {timeframe}: {e}")
+
+    def append_data_to_cache(self, symbol: str, timeframe: str, exchange: str,
+                             new_data: pd.DataFrame) -> Tuple[int, int]:
+        """Append new (possibly overlapping) bars without rewriting history; returns (bars added, total bars).
+
+        The first append turns the series' single cache file into the first
+        sealed segment (all but its last, possibly forming, bar) and tail of
+        a SegmentedOHLCVStore. Compaction of small
+        segments runs on a background thread. The consolidated store upserts
+        the same bars in place.
+        """
+        if self.consolidated is not None:
+            return self.consolidated.write(symbol, timeframe, exchange, new_data, {
+                'timestamp': datetime.now().isoformat(),
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'exchange': exchange
+            }, keep_history=True)
+
+        store = self.get_segment_store(symbol, timeframe, exchange)
+        cache_file = self.get_cache_filename(symbol, timeframe, exchange)
+        if not os.path.exists(cache_file) and not store.exists():
+            self._migrate_legacy_cache(symbol, timeframe, exchange)
+        if os.path.exists(cache_file):
+            store.adopt(cache_file)
+
+        now = datetime.now().isoformat()
+        added = store.append(new_data, {
+            'timestamp': now,
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'exchange': exchange
+        })
+        entry = self._segment_entry(symbol, timeframe, exchange, store, now)
+        self.manifest.update(entry)
+
+        if store.needs_compaction():
+            self._compact_in_background(store)
+        return added, entry['total_candles']
+
+    def _segment_entry(self, symbol: str, timeframe: str, exchange: str, store: SegmentedOHLCVStore,
+                       fetched_at: Optional[str] = None) -> Dict:
+        """Manifest entry for a segmented series, built from segment headers only"""
+        stats = store.stats()
+        tz = self._series_tz(store)
+        has_data = stats['rows'] > 0
+        return {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'exchange': exchange,
+            'last_bar': _isoformat(stats['last'], tz) if has_data else None,
+            'total_candles': stats['rows'],
+            'date_range': {'start': _isoformat(stats['first'], tz), 'end': _isoformat(stats['last'], tz)}
+            if has_data else None,
+            'file_size': stats['size'],
+            'checksum': stats['checksum'],
+            'fetched_at': fetched_at or datetime.now().isoformat()
+        }
+
+    @staticmethod
+    def _series_tz(store: SegmentedOHLCVStore) -> Optional[str]:
+        """Timezone recorded in the series' tail (None for naive series)"""
+        if not os.path.exists(store.tail_path):
+            return None
+        return OHLCVCacheFormat.read_header(store.tail_path).get('tz')
+
+    def _compact_in_background(self, store: SegmentedOHLCVStore):
+        """Start one daemon compaction per series unless one is already running"""
+        with self._compactions_lock:
+            if store.path in self._compactions:
+                return
+            self._compactions.add(store.path)
+
+        def run():
+            try:
+                store.compact()
+            except Exception as e:
+                print(f"⚠️ Compaction of {os.path.basename(store.path)} failed: {e}")
+            finally:
+                with self._compactions_lock:
+                    self._compactions.discard(store.path)
+
+        threading.Thread(target=run, name=f"compact-{os.path.basename(store.path)}", daemon=True).start()
+
+    def compact_cache(self) -> int:
+        """Compact every segmented series in the foreground; returns the number of segments merged away"""
+        merged = 0
+        for series_dir in Path(self.data_cache_dir).glob(f"*{SegmentedOHLCVStore.SUFFIX}"):
+            merged += SegmentedOHLCVStore(str(series_dir)).compact()
+        return merged
+
+    def _migrate_legacy_cache(self, symbol: str, timeframe: str, exchange: str) -> Optional[pd.DataFrame]:
+        """Convert a legacy JSON cache to the binary format, returning its data"""
+        legacy_file = self.get_legacy_cache_filename(symbol, timeframe, exchange)
+        if not os.path.exists(legacy_file):
+            return None
+
+        with open(legacy_file, 'r') as f:
+            cache_data = json.load(f)
+
+        df = pd.read_json(io.StringIO(cache_data['data']), orient='index')
+        df.index = pd.to_datetime(df.index)
+        df = df.sort_index()
+
+        metadata = {key: value for key, value in cache_data.items() if key != 'data'}
+        self.save_data_to_cache(symbol, timeframe, exchange, df, metadata)
+        print(f"📦 Migrated {symbol} {timeframe} cache to binary format")
+        return df
+
+    def load_data_from_cache(self, symbol: str, timeframe: str, exchange: str) -> Optional[pd.DataFrame]:
+        """Load OHLCV data from cache file"""
+        try:
+            if self.consolidated is not None:
+                return self.consolidated.read(symbol, timeframe, exchange)
+            return self._load_cache_file(symbol, timeframe, exchange)
+        except Exception as e:
+            return None
+
+    def _load_cache_file(self, symbol: str, timeframe: str, exchange: str) -> Optional[pd.DataFrame]:
+        """Per-series cache: the single file, else the segmented series, else a legacy JSON cache"""
+        cache_file = self.get_cache_filename(symbol, timeframe, exchange)
+        if os.path.exists(cache_file):
+            df, _ = OHLCVCacheFormat.read(cache_file)
+            return df
+        store = self.get_segment_store(symbol, timeframe, exchange)
+        if store.exists():
+            stored = store.read()
+            return stored[0] if stored is not None else None
+        return self._migrate_legacy_cache(symbol, timeframe, exchange)
+
+    def load_many_from_cache(self, symbols: List[str], timeframe: str, exchange: str, start=None,
+                             end=None) -> Dict[str, pd.DataFrame]:
+        """Cached bars of many symbols between start and end (inclusive, either optional).
+
+        One range query with the consolidated store; per-series files are
+        read one by one. Bounds are on the stored clock (UTC for tz-aware
+        series). Symbols without cached data are left out.
+        """
+        if self.consolidated is not None:
+            return self.consolidated.read_many(symbols, timeframe, exchange, start, end)
+
+        frames = {}
+        for symbol in symbols:
+            df = self.load_data_from_cache(symbol, timeframe, exchange)
+            if df is None:
+                continue
+            if start is not None or end is not None:
+                stamps = pd.DatetimeIndex(df.index).as_unit('ns').asi8
+                keep = np.ones(len(df), dtype=bool)
+                if start is not None:
+                    keep &= stamps >= _utc_ns(start)
+                if end is not None:
+                    keep &= stamps <= _utc_ns(end)
+                df = df[keep]
+            frames[symbol] = df
+        return frames
+
+    def map_data_from_cache(self, symbol: str, timeframe: str, exchange: str,
+                            window: Optional[int] = None) -> Optional[OHLCVArrays]:
+        """Memory-mapped column views of a cached series, or of its last window bars"""
+        try:
+            if self.consolidated is not None:
+                # Rows come out of SQLite, so these are fresh arrays rather than views
+                return self.consolidated.arrays(symbol, timeframe, exchange, window)
+            arrays = map_cached_series(self.data_cache_dir, symbol, timeframe, exchange, window)
+            if arrays is None and self._migrate_legacy_cache(symbol, timeframe, exchange) is not None:
+                arrays = map_cached_series(self.data_cache_dir, symbol, timeframe, exchange, window)
+            return arrays
+        except Exception as e:
+            return None
+
+    def get_swing_state_filename(self, symbol: str, timeframe: str, exchange: str) -> str:
+        """Get swing low state filename stored alongside the data cache"""
+        return os.path.join(self.data_cache_dir, "swing_state", f"{symbol}_{exchange}_{timeframe}.json")
+
+    def save_swing_state(self, symbol: str, timeframe: str, exchange: str, state: IncrementalSwingLowState):
+        """Persist incremental swing low state so restarts resume it"""
+        try:
+            state_file = self.get_swing_state_filename(symbol, timeframe, exchange)
+            Path(state_file).parent.mkdir(exist_ok=True)
+            tmp_file = f"{state_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(state.to_dict(), f)
+            os.replace(tmp_file, state_file)
+        except Exception as e:
+            print(f"Failed to save swing state for {symbol} {timeframe}: {e}")
+
+    def load_swing_state(self, symbol: str, timeframe: str, exchange: str) -> Optional[IncrementalSwingLowState]:
+        """Load incremental swing low state (None if missing or unreadable)"""
+        try:
+            state_file = self.get_swing_state_filename(symbol, timeframe, exchange)
+            if os.path.exists(state_file):
+                with open(state_file, 'r') as f:
+                    return IncrementalSwingLowState.from_dict(json.load(f))
+            return None
+        except Exception:
+            return None
+
+    def _index_cache_file(self, symbol: str, timeframe: str, exchange: str) -> Optional[Dict]:
+        """Add a manifest entry for a cache file written before the manifest existed"""
+        cache_file = self.get_cache_filename(symbol, timeframe, exchange)
+        if not os.path.exists(cache_file):
+            store = self.get_segment_store(symbol, timeframe, exchange)
+            if not store.exists():
+                return None
+            entry = self._segment_entry(symbol, timeframe, exchange, store)
+            self.manifest.update(entry)
+            return entry
+        with open(cache_file, 'rb') as f:
+            payload = f.read()
+        df, metadata = OHLCVCacheFormat.decode(bytearray(payload))
+        entry = CacheManifest.build_entry(symbol, timeframe, exchange, df, len(payload),
+                                          OHLCVCacheFormat.checksum(payload), metadata.get('timestamp'))
+        self.manifest.update(entry)
+        return entry
+
+    def _cached_series(self) -> Iterator[Tuple[str, str, str]]:
+        """(symbol, timeframe, exchange) of every per-series cache file and segmented series on disk"""
+        headers = [(cache_file, str(cache_file)) for cache_file in Path(self.data_cache_dir).glob("*.ohlcv")]
+        headers += [(series_dir, SegmentedOHLCVStore(str(series_dir)).tail_path)
+                    for series_dir in Path(self.data_cache_dir).glob(f"*{SegmentedOHLCVStore.SUFFIX}")]
+        for path, header_path in headers:
+            try:
+                metadata = OHLCVCacheFormat.read_header(header_path)['metadata']
+            except Exception as e:
+                print(f"⚠️ Could not index {path.name}: {e}")
+                continue
+            yield metadata['symbol'], metadata['timeframe'], metadata['exchange']
+
+    def rebuild_manifest(self) -> int:
+        """Index every cache file on disk; returns the number of entries written"""
+        if self.consolidated is not None:
+            # The consolidated store indexes itself
+            return len(self.consolidated.entries())
+        indexed = 0
+        with self.manifest.deferred():
+            for symbol, timeframe, exchange in self._cached_series():
+                try:
+                    if self._index_cache_file(symbol, timeframe, exchange):
+                        indexed += 1
+                except Exception as e:
+                    print(f"⚠️ Could not index {symbol} {timeframe}: {e}")
+        return indexed
+
+    def import_into_store(self) -> int:
+        """Copy every per-series cache into the consolidated store in one transaction; returns the series copied"""
+        if self.consolidated is None:
+            raise ValueError("Consolidated store is not enabled")
+        copied = 0
+        with self.consolidated.bulk():
+            for symbol, timeframe, exchange in self._cached_series():
+                df = self._load_cache_file(symbol, timeframe, exchange)
+                if df is None:
+                    continue
+                entry = self.manifest.get(symbol, timeframe, exchange) or {}
+                self.consolidated.write(symbol, timeframe, exchange, df, {
+                    'timestamp': entry.get('fetched_at') or datetime.now().isoformat(),
+                    'symbol': symbol,
+                    'timeframe': timeframe,
+                    'exchange': exchange
+                }, replace=True)
+                copied += 1
+        print(f"🗃️ Imported {copied} cached series into {self.consolidated.path}")
+        return copied
+
+    def get_cache_info(self, symbol: str, timeframe: str, exchange: str) -> Optional[Dict]:
+        """Get cache metadata from the manifest without opening the cache file"""
+        try:
+            if self.consolidated is not None:
+                entry = self.consolidated.entry(symbol, timeframe, exchange)
+            else:
+                entry = self.manifest.get(symbol, timeframe, exchange)
+            if entry is None and self.consolidated is None:
+                if self._migrate_legacy_cache(symbol, timeframe, exchange) is not None:
+                    entry = self.manifest.get(symbol, timeframe, exchange)
+                else:
+                    entry = self._index_cache_file(symbol, timeframe, exchange)
+            if entry is None:
+                return None
+
+            return {
+                'timestamp': entry.get('fetched_at'),
+                'total_candles': entry.get('total_candles', 0),
+                'date_range': entry.get('date_range'),
+                'last_bar': entry.get('last_bar'),
+                'checksum': entry.get('checksum'),
+                'file_size_kb': round(entry.get('file_size', 0) / 1024, 2)
+            }
+        except:
+            return None
+
+    def get_data_fingerprint(self, symbol: str, timeframe: str, exchange: str) -> Optional[str]:
+        """Last bar + checksum of the cached data, or None if nothing is cached"""
+        info = self.get_cache_info(symbol, timeframe, exchange)
+        if not info or not info.get('checksum'):
+            return None
+        return f"{info['last_bar']}|{info['checksum']}"
+
+    def get_all_cache_info(self) -> Dict[str, Dict]:
+        """Manifest entries for every cached symbol/timeframe in one file read"""
+        if self.consolidated is not None:
+            return self.consolidated.entries()
+        return self.manifest.entries()
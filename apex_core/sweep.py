@@ -0,0 +1,260 @@
+"""
+Parameter sweeps: grid and random search over the staged analysis pipeline
+"""
+
+import copy
+import itertools
+import os
+import random
+from dataclasses import fields, replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .analysis import (
+    AnalysisSettings, _process_pool_context, detect_selected_patterns_with_today, pattern_only_touches,
+    validate_live_entry_capability
+)
+from .data import BackgroundDataManager
+from .models import SwingLow, SwingLowTouch
+from .storage import FileManager
+from .swings import EnhancedSwingLowDetector
+from .touches import EnhancedSwingLowTouchAnalyzer
+from .trades import EnhancedTradeOutcomeAnalyzer
+
+
+# ============================================================================
+# STAGED PIPELINE - EACH STAGE CACHED ON THE PARAMETERS IT READS
+# ============================================================================
+
+SWING_PARAMETERS = ('swing_lookback', 'right_lookback', 'min_swing_size')
+PATTERN_PARAMETERS = ('min_wick_ratio', 'max_body_ratio', 'min_engulfing_ratio', 'min_first_body',
+                      'max_second_body', 'min_third_body')
+TOUCH_PARAMETERS = ('touch_tolerance', 'min_days_between', 'pattern_only_entry')
+OUTCOME_PARAMETERS = ('max_bars_to_analyze', 'capital_per_trade')
+OUTCOME_SETTINGS = ('use_trailing_stop', 'intraday_mode', 'entry_cutoff_time', 'exit_time', 'custom_target_pct',
+                    'use_partial_exits', 'first_exit_pct', 'second_exit_pct', 'first_exit_capital_pct')
+
+SWEEP_METRICS = ('units', 'trades', 'wins', 'losses', 'open', 'win_rate_pct', 'total_pnl_pct', 'avg_pnl_pct')
+
+
+class StagedUnitPipeline:
+    """One (symbol, timeframe) unit of analyze_symbol_timeframe split into cached stages.
+
+    Swing lows are computed once per (swing_lookback, right_lookback,
+    min_swing_size), patterns once per detector threshold set, touches once per
+    (swing, pattern, touch settings) and outcomes once per target/stop config.
+    Stages never share mutable state: touch matching marks swing lows as
+    touched, so it works on copies of the cached swing lows.
+    """
+
+    def __init__(self, symbol: str, timeframe: str, df: Optional[pd.DataFrame], base: AnalysisSettings):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.df = None if df is None or df.empty else df[df.index >= pd.Timestamp(base.start_date)]
+        self.pattern_selection = base.pattern_selection
+        self.swing_cache: Dict[Tuple, List[SwingLow]] = {}
+        self.pattern_cache: Dict[Tuple, Dict[str, List]] = {}
+        self.touch_cache: Dict[Tuple, List[SwingLowTouch]] = {}
+        self.outcome_cache: Dict[Tuple, List[SwingLowTouch]] = {}
+        self.stage_runs = {'swings': 0, 'patterns': 0, 'touches': 0, 'outcomes': 0}
+
+    @staticmethod
+    def _key(parameters: Dict, names: Sequence[str]) -> Tuple:
+        return tuple(parameters.get(name) for name in names)
+
+    def untouched_swing_lows(self, parameters: Dict) -> List[SwingLow]:
+        key = self._key(parameters, SWING_PARAMETERS)
+        if key not in self.swing_cache:
+            self.stage_runs['swings'] += 1
+            detector = EnhancedSwingLowDetector(
+                left_lookback=parameters.get('swing_lookback', 10),
+                right_lookback=parameters.get('right_lookback', 3),
+                min_swing_size_pct=parameters.get('min_swing_size', 0.5)
+            )
+            all_swing_lows = detector.find_swing_lows_with_invalidation(self.df)
+            self.swing_cache[key] = detector.find_untouched_swing_lows(self.df, all_swing_lows)
+        return self.swing_cache[key]
+
+    def patterns(self, parameters: Dict) -> Dict[str, List]:
+        key = self._key(parameters, PATTERN_PARAMETERS)
+        if key not in self.pattern_cache:
+            self.stage_runs['patterns'] += 1
+            self.pattern_cache[key] = detect_selected_patterns_with_today(
+                self.df, self.pattern_selection, parameters, include_today=True)
+        return self.pattern_cache[key]
+
+    def _touch_key(self, parameters: Dict) -> Tuple:
+        pattern_only = parameters.get('pattern_only_entry', False)
+        return (() if pattern_only else self._key(parameters, SWING_PARAMETERS),
+                self._key(parameters, PATTERN_PARAMETERS), self._key(parameters, TOUCH_PARAMETERS))
+
+    def touches(self, parameters: Dict) -> List[SwingLowTouch]:
+        pattern_only = parameters.get('pattern_only_entry', False)
+        key = self._touch_key(parameters)
+        if key not in self.touch_cache:
+            all_patterns = self.patterns(parameters)
+            self.stage_runs['touches'] += 1
+            if pattern_only:
+                self.touch_cache[key] = pattern_only_touches(all_patterns, self.symbol, self.timeframe)
+            else:
+                swing_lows = [copy.copy(swing_low) for swing_low in self.untouched_swing_lows(parameters)]
+                touch_analyzer = EnhancedSwingLowTouchAnalyzer(
+                    touch_tolerance_pct=parameters.get('touch_tolerance', 0.5),
+                    min_days_between=parameters.get('min_days_between', 2)
+                )
+                touches = touch_analyzer.analyze_touches(self.df, swing_lows, all_patterns,
+                                                         self.symbol, self.timeframe)
+                self.touch_cache[key] = validate_live_entry_capability(self.df, touches, None, parameters, {})
+        return self.touch_cache[key]
+
+    def outcomes(self, settings: AnalysisSettings) -> List[SwingLowTouch]:
+        parameters = settings.parameters
+        key = (self._touch_key(parameters), self._key(parameters, OUTCOME_PARAMETERS),
+               tuple(getattr(settings, name) for name in OUTCOME_SETTINGS))
+        if key not in self.outcome_cache:
+            touches = self.touches(parameters)
+            self.stage_runs['outcomes'] += 1
+            trade_analyzer = EnhancedTradeOutcomeAnalyzer(
+                parameters.get('max_bars_to_analyze', 100),
+                parameters.get('capital_per_trade', 10000)
+            )
+            self.outcome_cache[key] = trade_analyzer.analyze_trade_outcomes_with_timeframe(
+                self.df, touches, self.timeframe,
+                settings.use_trailing_stop, settings.intraday_mode, settings.entry_cutoff_time, settings.exit_time,
+                settings.custom_target_pct, settings.use_partial_exits,
+                settings.first_exit_pct, settings.second_exit_pct, settings.first_exit_capital_pct
+            )
+        return self.outcome_cache[key]
+
+    def evaluate(self, settings: AnalysisSettings) -> Dict:
+        """Trade counts and P&L sums of this unit under one combination"""
+        totals = {'units': 0, 'trades': 0, 'wins': 0, 'losses': 0, 'open': 0, 'total_pnl_pct': 0.0}
+        if self.df is None or self.df.empty:
+            return totals
+
+        totals['units'] = 1
+        for touch in self.outcomes(settings):
+            outcome = touch.trade_outcome
+            if outcome is None:
+                continue
+            totals['trades'] += 1
+            if outcome.success:
+                totals['wins'] += 1
+            elif outcome.sl_hit:
+                totals['losses'] += 1
+            else:
+                totals['open'] += 1
+            totals['total_pnl_pct'] += outcome.total_pnl_pct if outcome.partial_exits_enabled \
+                else outcome.current_profit_pct
+        return totals
+
+
+# ============================================================================
+# SWEEP DRIVER
+# ============================================================================
+
+def parameter_grid(space: Dict[str, Iterable]) -> List[Dict]:
+    """Every combination of the values in space (last key varies fastest)"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(list(space[name]) for name in names))]
+
+
+def random_parameter_samples(space: Dict[str, Iterable], n_samples: int, seed: Optional[int] = None) -> List[Dict]:
+    """n_samples distinct combinations drawn uniformly from the grid of space"""
+    grid = parameter_grid(space)
+    return random.Random(seed).sample(grid, min(n_samples, len(grid)))
+
+
+def combination_settings(base: AnalysisSettings, combination: Dict) -> AnalysisSettings:
+    """base with the combination applied: AnalysisSettings fields directly, anything else as a parameter"""
+    setting_names = {field.name for field in fields(AnalysisSettings)}
+    overrides = {name: value for name, value in combination.items() if name in setting_names}
+    parameters = dict(base.parameters)
+    parameters.update({name: value for name, value in combination.items() if name not in setting_names})
+    return replace(base, parameters=parameters, **overrides)
+
+
+def _sweep_unit_chunk(units: List[Tuple[str, str, Optional[pd.DataFrame]]], base: AnalysisSettings,
+                      combinations: List[Dict]) -> List[Tuple[List[Dict], Dict]]:
+    """Process-pool task: evaluate every combination on a chunk of units"""
+    evaluated = []
+    for symbol, timeframe, df in units:
+        pipeline = StagedUnitPipeline(symbol, timeframe, df, base)
+        unit_totals = [pipeline.evaluate(combination_settings(base, combination)) for combination in combinations]
+        evaluated.append((unit_totals, pipeline.stage_runs))
+    return evaluated
+
+
+def run_parameter_sweep(symbols: List[str], timeframes: List[str], base: AnalysisSettings,
+                        combinations: List[Dict], exchange: str = 'NSE',
+                        data_manager: Optional[BackgroundDataManager] = None, executor: str = 'serial',
+                        max_workers: Optional[int] = None, chunk_size: int = 1,
+                        output_path: Optional[str] = None) -> pd.DataFrame:
+    """Evaluate every combination over all (symbol, timeframe) units; one summary row per combination.
+
+    Each unit keeps its own stage caches across all combinations, so units
+    are independent and executor='process' spreads them over a process pool.
+    Columns are the combination's parameters followed by SWEEP_METRICS; the
+    table is also written to output_path (CSV) when given. Stage run counts
+    are available in the returned frame's attrs['stage_runs'].
+    """
+    data_manager = data_manager or BackgroundDataManager(FileManager())
+    units = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+    sums = [{'units': 0, 'trades': 0, 'wins': 0, 'losses': 0, 'open': 0, 'total_pnl_pct': 0.0}
+            for _ in combinations]
+    stage_runs = {'swings': 0, 'patterns': 0, 'touches': 0, 'outcomes': 0}
+
+    print(f"🧪 Parameter sweep: {len(combinations)} combinations x {len(units)} units")
+
+    def load(chunk):
+        return [(symbol, timeframe, data_manager.get_cached_data(symbol, timeframe, exchange))
+                for symbol, timeframe in chunk]
+
+    chunk_size = max(1, chunk_size)
+    chunks = [units[i:i + chunk_size] for i in range(0, len(units), chunk_size)]
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(chunks)))
+    evaluated = []
+
+    if executor == 'process' and max_workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from collections import deque
+
+        # Like iter_analysis_units: at most two chunks of data per worker in flight
+        in_flight = deque()
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=_process_pool_context()) as pool:
+            for chunk in chunks:
+                in_flight.append(pool.submit(_sweep_unit_chunk, load(chunk), base, combinations))
+                while len(in_flight) >= 2 * max_workers:
+                    evaluated.extend(in_flight.popleft().result())
+            while in_flight:
+                evaluated.extend(in_flight.popleft().result())
+    else:
+        for chunk in chunks:
+            evaluated.extend(_sweep_unit_chunk(load(chunk), base, combinations))
+
+    for unit_totals, unit_stage_runs in evaluated:
+        for combination_sums, totals in zip(sums, unit_totals):
+            for name, value in totals.items():
+                combination_sums[name] += value
+        for stage, runs in unit_stage_runs.items():
+            stage_runs[stage] += runs
+
+    rows = []
+    for combination, totals in zip(combinations, sums):
+        trades = totals['trades']
+        rows.append({
+            **combination,
+            **totals,
+            'win_rate_pct': totals['wins'] / trades * 100 if trades else 0.0,
+            'avg_pnl_pct': totals['total_pnl_pct'] / trades if trades else 0.0
+        })
+
+    parameter_names = list(dict.fromkeys(name for combination in combinations for name in combination))
+    summary = pd.DataFrame(rows, columns=parameter_names + list(SWEEP_METRICS))
+    summary.attrs['stage_runs'] = stage_runs
+    print(f"✅ Sweep complete - stage runs: {stage_runs}")
+
+    if output_path:
+        summary.to_csv(output_path, index=False)
+    return summary
@@ -0,0 +1,449 @@
+"""
+Swing low detection, batch and incremental
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .models import SwingLow
+
+
+# ============================================================================
+# ENHANCED SWING LOW DETECTOR - PROFESSIONAL VERSION
+# ============================================================================
+
+class EnhancedSwingLowDetector:
+    """Enhanced swing low detector with customizable asymmetric parameters - COMPLETE VERSION"""
+
+    def __init__(self, left_lookback: int = 10, right_lookback: int = None, min_swing_size_pct: float = 0.5,
+                 engine: str = 'numpy'):
+        self.left_lookback = left_lookback
+
+        # CUSTOMIZABLE RIGHT LOOKBACK - User can set explicitly
+        if right_lookback is not None:
+            self.right_lookback = max(1, right_lookback)  # Minimum 1 bar
+        else:
+            # Default formula: right = left/3, minimum 2
+            self.right_lookback = max(2, left_lookback // 3)
+
+        self.min_swing_size_pct = min_swing_size_pct
+
+        # Detection engine: 'numpy' (vectorized) or 'loop' (reference implementation)
+        self.engine = engine
+
+    def find_swing_lows_with_invalidation(self, df: pd.DataFrame) -> List[SwingLow]:
+        """Find swing lows and track their invalidation professionally - ASYMMETRIC VERSION"""
+        swing_lows = []
+
+        # ASYMMETRIC PARAMETERS - Key change from original
+        left_lookback = self.left_lookback  # Full historical context
+        right_lookback = self.right_lookback  # User customizable confirmation
+
+        print(f"🔧 Asymmetric swing detection: {left_lookback} left + {right_lookback} right bars")
+
+        # ASYMMETRIC RANGE - This is the crucial change
+        start_idx = left_lookback
+        end_idx = len(df) - right_lookback  # Much earlier detection possible
+
+        if end_idx <= start_idx:
+            print(f"❌ Not enough data: need {left_lookback + right_lookback} bars, have {len(df)}")
+            return swing_lows
+
+        print(f"🔍 Checking bars {start_idx} to {end_idx - 1} (total: {end_idx - start_idx} bars)")
+
+        # Step 1: Find all potential swing lows using asymmetric logic
+        if self.engine == 'loop':
+            swing_lows = self._find_swing_candidates_loop(df, start_idx, end_idx)
+        else:
+            swing_lows = self._find_swing_candidates_numpy(df, start_idx, end_idx)
+
+        print(f"✅ Found {len(swing_lows)} asymmetric swing lows")
+
+        # Step 2: Check invalidation for each swing low
+        if self.engine == 'loop':
+            invalidated_count = self._apply_invalidation_loop(df, swing_lows)
+        else:
+            invalidated_count = self._apply_invalidation_stack(df, swing_lows)
+
+        valid_count = len(swing_lows) - invalidated_count
+        print(f"📊 Invalidation check: {valid_count} valid, {invalidated_count} invalidated")
+
+        return swing_lows
+
+    @staticmethod
+    def next_lower_low_indices(lows: np.ndarray) -> np.ndarray:
+        """For every bar, index of the first later bar with a strictly lower low (-1 if none).
+
+        Single monotonic-stack pass: the stack holds bars still waiting for a lower low,
+        with non-decreasing lows from bottom to top. NaN bars can neither break nor be broken.
+        """
+        values = lows.tolist()
+        next_lower = np.full(len(values), -1, dtype=np.int64)
+        stack = []
+
+        for j, low in enumerate(values):
+            if low != low:  # NaN
+                continue
+            while stack and low < values[stack[-1]]:
+                next_lower[stack.pop()] = j
+            stack.append(j)
+
+        return next_lower
+
+    def _apply_invalidation_stack(self, df: pd.DataFrame, swing_lows: List[SwingLow]) -> int:
+        """Fill invalidation fields from a precomputed next-smaller-element index"""
+        if not swing_lows:
+            return 0
+
+        next_lower = self.next_lower_low_indices(df['low'].to_numpy(dtype=np.float64))
+        timestamps = df.index
+
+        invalidated_count = 0
+        for swing_low in swing_lows:
+            breaker = next_lower[swing_low.index]
+            if breaker >= 0:
+                swing_low.is_invalidated = True
+                swing_low.invalidation_timestamp = timestamps[breaker]
+                swing_low.invalidation_index = int(breaker)
+                invalidated_count += 1
+
+        return invalidated_count
+
+    def _apply_invalidation_loop(self, df: pd.DataFrame, swing_lows: List[SwingLow]) -> int:
+        """Reference invalidation scan over future bars (kept for equivalence checks)"""
+        invalidated_count = 0
+        for swing_low in swing_lows:
+            # Look at all future data after this swing low
+            future_data = df[df.index > swing_low.timestamp]
+
+            for future_index, (future_timestamp, future_row) in enumerate(future_data.iterrows()):
+                # If any future candle's low breaks below swing low, invalidate it
+                if future_row['low'] < swing_low.price:
+                    swing_low.is_invalidated = True
+                    swing_low.invalidation_timestamp = future_timestamp
+                    swing_low.invalidation_index = swing_low.index + future_index + 1
+                    invalidated_count += 1
+                    break
+
+        return invalidated_count
+
+    def swing_candidate_mask(self, lows: np.ndarray, start_idx: int, end_idx: int) -> np.ndarray:
+        """Boolean mask over bars start_idx..end_idx-1 marking asymmetric swing lows.
+
+        Requires start_idx >= left_lookback and end_idx <= len(lows) - right_lookback.
+        """
+        candidate_lows = lows[start_idx:end_idx]
+
+        # A bar is a swing low when no bar in either window is strictly lower.
+        # fmin ignores NaN the same way the loop's '<' comparisons do.
+        is_swing = np.ones(len(candidate_lows), dtype=bool)
+
+        if self.left_lookback > 0:
+            left_windows = np.lib.stride_tricks.sliding_window_view(lows, self.left_lookback)
+            left_min = np.fmin.reduce(left_windows[start_idx - self.left_lookback:end_idx - self.left_lookback],
+                                      axis=1)
+            is_swing &= ~(left_min < candidate_lows)
+
+        right_windows = np.lib.stride_tricks.sliding_window_view(lows, self.right_lookback)
+        right_min = np.fmin.reduce(right_windows[start_idx + 1:end_idx + 1], axis=1)
+        is_swing &= ~(right_min < candidate_lows)
+
+        return is_swing
+
+    def _find_swing_candidates_numpy(self, df: pd.DataFrame, start_idx: int, end_idx: int) -> List[SwingLow]:
+        """Vectorized swing low detection using rolling-window minima over the raw low array"""
+        lows = df['low'].to_numpy(dtype=np.float64)
+        is_swing = self.swing_candidate_mask(lows, start_idx, end_idx)
+
+        timestamps = df.index
+        return [
+            SwingLow(index=int(i), timestamp=timestamps[i], price=lows[i])
+            for i in np.flatnonzero(is_swing) + start_idx
+        ]
+
+    def _find_swing_candidates_loop(self, df: pd.DataFrame, start_idx: int, end_idx: int) -> List[SwingLow]:
+        """Reference bar-by-bar swing low detection (kept for equivalence checks)"""
+        swing_lows = []
+        left_lookback = self.left_lookback
+        right_lookback = self.right_lookback
+
+        for i in range(start_idx, end_idx):
+            if i >= len(df):
+                break
+
+            current_low = df['low'].iloc[i]
+
+            # LEFT SIDE CHECK (Historical Context - Full lookback)
+            left_valid = True
+            for j in range(max(0, i - left_lookback), i):
+                if j < len(df) and df['low'].iloc[j] < current_low:
+                    left_valid = False
+                    break
+
+            # RIGHT SIDE CHECK (Forward Confirmation - Customizable lookback)
+            right_valid = True
+            for j in range(i + 1, min(i + right_lookback + 1, len(df))):
+                if j < len(df) and df['low'].iloc[j] < current_low:
+                    right_valid = False
+                    break
+
+            if left_valid and right_valid:
+                swing_low = SwingLow(
+                    index=i,
+                    timestamp=df.index[i],
+                    price=current_low,
+                    is_invalidated=False,
+                    invalidation_timestamp=None,
+                    invalidation_index=None,
+                    is_touched=False,
+                    touch_timestamp=None,
+                    touch_pattern=None,
+                    touch_index=None
+                )
+                swing_lows.append(swing_low)
+
+        return swing_lows
+
+    def find_swing_lows_incremental(self, df: pd.DataFrame,
+                                    state: Optional['IncrementalSwingLowState'] = None
+                                    ) -> Tuple[List[SwingLow], 'IncrementalSwingLowState']:
+        """Find swing lows by updating a persistent state with newly appended bars"""
+        if (state is None or state.left_lookback != self.left_lookback or
+                state.right_lookback != self.right_lookback):
+            state = IncrementalSwingLowState(self.left_lookback, self.right_lookback)
+
+        bars_before = state.bars_committed
+        swing_lows = state.update(df, self)
+
+        invalidated_count = sum(1 for sl in swing_lows if sl.is_invalidated)
+        print(f"🔧 Incremental swing detection: {state.bars_committed - bars_before} new bars committed, "
+              f"{len(swing_lows) - invalidated_count} valid, {invalidated_count} invalidated")
+
+        return swing_lows, state
+
+    def get_valid_swing_lows_at_timestamp(self, swing_lows: List[SwingLow],
+                                          check_timestamp: pd.Timestamp) -> List[SwingLow]:
+        """Get swing lows that are still valid at a specific timestamp"""
+        valid_lows = []
+
+        for swing_low in swing_lows:
+            # Swing low must exist before the check timestamp
+            if swing_low.timestamp >= check_timestamp:
+                continue
+
+            # If swing low is invalidated, check if invalidation happened after check_timestamp
+            if swing_low.is_invalidated:
+                if swing_low.invalidation_timestamp and swing_low.invalidation_timestamp <= check_timestamp:
+                    continue  # Was already invalidated at check time
+
+            valid_lows.append(swing_low)
+
+        return valid_lows
+
+    def find_swing_lows(self, df: pd.DataFrame) -> List[SwingLow]:
+        """Legacy method for compatibility"""
+        return self.find_swing_lows_with_invalidation(df)
+
+    def find_untouched_swing_lows(self, df: pd.DataFrame, swing_lows: List[SwingLow]) -> List[SwingLow]:
+        """Find swing lows that remain untouched by future price action"""
+        untouched_lows = []
+
+        for swing_low in swing_lows:
+            if not swing_low.is_touched and not swing_low.is_invalidated:
+                untouched_lows.append(swing_low)
+
+        return untouched_lows
+
+
+# ============================================================================
+# INCREMENTAL SWING LOW STATE - UPDATES ON BAR APPEND
+# ============================================================================
+
+class IncrementalSwingLowState:
+    """Persistent swing low state for one symbol/exchange/timeframe series.
+
+    Bars are committed once and never revisited: appending N bars costs
+    O(N + left_lookback + right_lookback). The last bar of every update is treated
+    as provisional (it may still be forming) and is re-applied on each call
+    without being committed. Results match a full find_swing_lows_with_invalidation run.
+    """
+
+    STATE_VERSION = 1
+
+    def __init__(self, left_lookback: int, right_lookback: int):
+        self.left_lookback = left_lookback
+        self.right_lookback = right_lookback
+        self.reset()
+
+    def reset(self):
+        """Drop all committed bars"""
+        self.first_timestamp_ns: Optional[int] = None
+        self.bars_committed = 0
+        self.last_committed_timestamp_ns: Optional[int] = None
+        self.last_committed_low: Optional[float] = None
+
+        # Confirmed swing lows in index order (parallel lists)
+        self.swing_indices: List[int] = []
+        self.swing_prices: List[float] = []
+        self.invalidation_indices: List[int] = []  # -1 while still valid
+
+        # Positions (into the swing lists) of unbroken swing lows; prices are non-decreasing
+        self.active_stack: List[int] = []
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """Check that the committed bars are still an unchanged prefix of df"""
+        if self.bars_committed == 0:
+            return True
+        if len(df) < self.bars_committed:
+            return False
+
+        last_pos = self.bars_committed - 1
+        last_low = float(df['low'].iat[last_pos])
+        same_low = last_low == self.last_committed_low or (
+                last_low != last_low and self.last_committed_low != self.last_committed_low)
+
+        return (df.index[0].value == self.first_timestamp_ns and
+                df.index[last_pos].value == self.last_committed_timestamp_ns and
+                same_low)
+
+    def update(self, df: pd.DataFrame, detector: 'EnhancedSwingLowDetector') -> List[SwingLow]:
+        """Commit new bars from df and return fresh SwingLow objects for the whole series"""
+        if not self.matches(df):
+            print(f"♻️ Swing state out of sync with data - rebuilding from bar 0")
+            self.reset()
+
+        n = len(df)
+        if n == 0:
+            return []
+
+        lows = df['low'].to_numpy(dtype=np.float64)
+        if self.bars_committed == 0:
+            self.first_timestamp_ns = df.index[0].value
+
+        # Commit everything except the last (possibly still forming) bar
+        commit_to = n - 1
+        if commit_to > self.bars_committed:
+            self._commit_bars(lows, self.bars_committed, commit_to, detector)
+            self.bars_committed = commit_to
+            self.last_committed_timestamp_ns = df.index[commit_to - 1].value
+            self.last_committed_low = float(lows[commit_to - 1])
+
+        return self._build_swing_lows(df, lows, detector)
+
+    def _candidate_window(self, first_bar: int, end_bar: int, n: int) -> Tuple[int, int]:
+        """Candidate bar range confirmed by bars first_bar..end_bar-1"""
+        start_idx = max(self.left_lookback, first_bar - self.right_lookback)
+        end_idx = min(end_bar - self.right_lookback, n - self.right_lookback)
+        return start_idx, end_idx
+
+    def _commit_bars(self, lows: np.ndarray, first_bar: int, end_bar: int,
+                     detector: 'EnhancedSwingLowDetector'):
+        """Apply bars first_bar..end_bar-1: invalidate broken swings, confirm new ones"""
+        start_idx, end_idx = self._candidate_window(first_bar, end_bar, len(lows))
+        if end_idx > start_idx:
+            is_swing = detector.swing_candidate_mask(lows, start_idx, end_idx)
+        else:
+            is_swing = np.zeros(0, dtype=bool)
+
+        # Only the new bars and the candidates they confirm are touched
+        offset = max(0, first_bar - self.right_lookback)
+        values = lows[offset:end_bar].tolist()
+        prices = self.swing_prices
+        active = self.active_stack
+
+        for j in range(first_bar, end_bar):
+            low = values[j - offset]
+
+            # Bar j breaks every unbroken swing low priced strictly above it
+            if low == low:
+                while active and low < prices[active[-1]]:
+                    self.invalidation_indices[active.pop()] = j
+
+            # Bar j completes the right-side window of candidate j - right_lookback
+            candidate = j - self.right_lookback
+            if start_idx <= candidate < end_idx and is_swing[candidate - start_idx]:
+                candidate_low = values[candidate - offset]
+                self.swing_indices.append(candidate)
+                prices.append(candidate_low)
+                self.invalidation_indices.append(-1)
+                if candidate_low == candidate_low:
+                    active.append(len(prices) - 1)
+
+    def _build_swing_lows(self, df: pd.DataFrame, lows: np.ndarray,
+                          detector: 'EnhancedSwingLowDetector') -> List[SwingLow]:
+        """Materialize swing lows, applying the provisional last bar without committing it"""
+        n = len(df)
+        timestamps = df.index
+        last_bar = n - 1
+
+        swing_indices = list(self.swing_indices)
+        swing_prices = list(self.swing_prices)
+        invalidation_indices = list(self.invalidation_indices)
+
+        if self.bars_committed == last_bar:
+            last_low = float(lows[last_bar])
+            if last_low == last_low:
+                for position in reversed(self.active_stack):
+                    if not last_low < self.swing_prices[position]:
+                        break
+                    invalidation_indices[position] = last_bar
+
+            start_idx, end_idx = self._candidate_window(last_bar, n, n)
+            if end_idx > start_idx and detector.swing_candidate_mask(lows, start_idx, end_idx)[-1]:
+                swing_indices.append(end_idx - 1)
+                swing_prices.append(lows[end_idx - 1])
+                invalidation_indices.append(-1)
+
+        # Box timestamps in two vectorized lookups instead of one per swing
+        swing_timestamps = list(timestamps[np.asarray(swing_indices, dtype=np.int64)])
+        invalidation_timestamps = list(timestamps[np.maximum(np.asarray(invalidation_indices, dtype=np.int64), 0)])
+
+        swing_lows = []
+        for index, price, invalidation_index, swing_timestamp, invalidation_timestamp in zip(
+                swing_indices, swing_prices, invalidation_indices, swing_timestamps, invalidation_timestamps):
+            is_invalidated = invalidation_index >= 0
+            swing_lows.append(SwingLow(
+                index=index,
+                timestamp=swing_timestamp,
+                price=np.float64(price),
+                is_invalidated=is_invalidated,
+                invalidation_timestamp=invalidation_timestamp if is_invalidated else None,
+                invalidation_index=invalidation_index if is_invalidated else None
+            ))
+
+        return swing_lows
+
+    def to_dict(self) -> Dict:
+        """Serialize state to a JSON-compatible dict"""
+        return {
+            'version': self.STATE_VERSION,
+            'left_lookback': self.left_lookback,
+            'right_lookback': self.right_lookback,
+            'first_timestamp_ns': self.first_timestamp_ns,
+            'bars_committed': self.bars_committed,
+            'last_committed_timestamp_ns': self.last_committed_timestamp_ns,
+            'last_committed_low': self.last_committed_low,
+            'swing_indices': self.swing_indices,
+            'swing_prices': self.swing_prices,
+            'invalidation_indices': self.invalidation_indices,
+            'active_stack': self.active_stack
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> Optional['IncrementalSwingLowState']:
+        """Restore state from to_dict() output (None if the format is unknown)"""
+        if data.get('version') != cls.STATE_VERSION:
+            return None
+
+        state = cls(data['left_lookback'], data['right_lookback'])
+        state.first_timestamp_ns = data['first_timestamp_ns']
+        state.bars_committed = data['bars_committed']
+        state.last_committed_timestamp_ns = data['last_committed_timestamp_ns']
+        state.last_committed_low = data['last_committed_low']
+        state.swing_indices = data['swing_indices']
+        state.swing_prices = [float('nan') if p is None else p for p in data['swing_prices']]
+        state.invalidation_indices = data['invalidation_indices']
+        state.active_stack = data['active_stack']
+        return state
@@ -0,0 +1,174 @@
+"""
+Seeded synthetic OHLCV series with planted candlestick patterns, for benchmarks
+and offline runs of the analysis pipeline
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .resample import NSE_SESSION_MINUTES, NSE_SESSION_OPEN, TIMEFRAME_MINUTES
+from .swings import EnhancedSwingLowDetector
+
+
+# ============================================================================
+# NSE SESSION CALENDAR
+# ============================================================================
+
+def nse_session_index(n_bars: int, timeframe: str = '15m', end=None) -> pd.DatetimeIndex:
+    """Bar open times of the last n_bars NSE bars up to end (weekday sessions from 09:15).
+
+    Intraday bars are counted from the session open, so 1H bars open at
+    09:15, 10:15, ... and 4H bars at 09:15 and 13:15; the last bar of a
+    session is cut short at 15:30.
+    """
+    minutes = TIMEFRAME_MINUTES[timeframe]
+    bars_per_session = -(-NSE_SESSION_MINUTES // minutes)
+    end_day = pd.Timestamp(end if end is not None else '2025-01-01').normalize()
+    sessions = pd.bdate_range(end=end_day, periods=-(-n_bars // bars_per_session))
+
+    offsets = NSE_SESSION_OPEN + pd.to_timedelta(np.arange(bars_per_session) * minutes, unit='min')
+    stamps = sessions.as_unit('ns').asi8[:, None] + offsets.as_unit('ns').asi8[None, :]
+    return pd.DatetimeIndex(stamps.ravel()[-n_bars:].view('M8[ns]'), name='datetime')
+
+
+# ============================================================================
+# PLANTED PATTERNS
+# ============================================================================
+
+# Candle templates as (open, high, low, close) offsets from a reference price, in units of
+# the bar volatility; each is shaped to pass its detector at the default thresholds
+PLANTED_PATTERNS: Dict[str, List[tuple]] = {
+    'pin_bar': [(0.0, 0.3, -1.5, 0.2)],
+    'dragonfly_doji': [(0.0, 0.07, -1.5, 0.02)],
+    'bullish_marubozu': [(0.0, 1.52, -0.02, 1.5)],
+    'bullish_engulfing': [(0.0, 0.1, -0.9, -0.8), (-0.9, 0.4, -1.0, 0.3)],
+    'three_candle': [(0.0, 0.05, -1.05, -1.0), (-1.1, -0.9, -1.3, -1.05), (-1.0, 0.05, -1.05, 0.0)],
+    'three_white_soldiers': [(0.0, 0.85, -0.05, 0.8), (0.4, 1.65, 0.35, 1.6), (1.2, 2.45, 1.15, 2.4)]
+}
+
+
+def generate_synthetic_ohlcv(n_bars: int, seed: Optional[int] = None, timeframe: str = '15m',
+                             volatility: float = 0.01, trend: float = 0.0, start_price: float = 100.0,
+                             pattern_rate: float = 0.01, patterns: Optional[Sequence[str]] = None,
+                             retest_rate: float = 0.5, retest_window: int = 200, end=None,
+                             swing_lookback: int = 9, right_lookback: Optional[int] = 1) -> pd.DataFrame:
+    """Geometric random walk of n_bars OHLCV bars on the NSE session calendar.
+
+    volatility is the per-bar standard deviation of log returns and trend the
+    total drift in log price over the series (0.7 roughly doubles it).
+
+    About pattern_rate * n_bars bars start a planted pattern (drawn from
+    patterns, default all of PLANTED_PATTERNS) whose last close is the walk's
+    own close, so planting never shifts the price level. A retest_rate share
+    of the plants is stretched so the pattern low lands on a swing low from
+    the preceding retest_window bars that the swing_lookback/right_lookback
+    swing detector reports, that nothing later undercuts. The retest is moved
+    to the bar, at least a day after that low, where the walk comes closest
+    above it. Each low is retested once and later plants are kept off it, so
+    every retest is a swing-low touch for the touch analyzer.
+    Planted (timestamp, pattern) pairs are listed in attrs['planted'].
+    The same seed always gives the same series.
+    """
+    rng = np.random.default_rng(seed)
+    names = list(patterns if patterns is not None else PLANTED_PATTERNS)
+    index = nse_session_index(n_bars, timeframe, end)
+    timestamps_ns = index.asi8
+
+    close = start_price * np.exp(np.cumsum(rng.normal(trend / n_bars, volatility, n_bars)))
+    open_ = np.concatenate([[start_price], close[:-1]]) * np.exp(rng.normal(0.0, volatility / 4, n_bars))
+    spread = np.abs(rng.normal(0.0, volatility / 2, (2, n_bars))) * close
+    high = np.maximum(open_, close) + spread[0]
+    low = np.minimum(open_, close) - spread[1]
+    volume = rng.integers(1_000, 100_000, n_bars).astype(float)
+
+    # Retest anchors: swing lows of the walk that it never trades below again
+    detector = EnhancedSwingLowDetector(swing_lookback, right_lookback)
+    first_swing, end_swing = detector.left_lookback, n_bars - detector.right_lookback
+    anchors = low <= np.minimum.accumulate(low[::-1])[::-1]
+    anchors[:first_swing] = anchors[max(first_swing, end_swing):] = False
+    if end_swing > first_swing:
+        anchors[first_swing:end_swing] &= detector.swing_candidate_mask(low, first_swing, end_swing)
+    one_day_ns = 86_400 * 10 ** 9
+
+    # Lows at or above the highest retested anchor keep every retested swing low intact
+    floor = -np.inf
+
+    # Non-overlapping plant positions, each leaving room for its template and a bar of context
+    starts = np.flatnonzero(rng.random(n_bars) < pattern_rate) if names else np.array([], dtype=int)
+    choices = rng.integers(0, max(len(names), 1), len(starts))
+    retests = rng.random(len(starts)) < retest_rate
+    planted = []
+    next_free = 0
+    for start, choice, retest in zip(starts, choices, retests):
+        template = PLANTED_PATTERNS[names[choice]]
+        stop = start + len(template)
+        if start <= next_free or stop > n_bars:
+            continue
+
+        unit = close[start - 1] * volatility
+        low_offset = min(candle[2] for candle in template)
+        close_offset = template[-1][3]
+        reference = close[stop - 1] - close_offset * unit
+
+        anchor = None
+        if retest:
+            window_start = max(0, start - retest_window)
+            candidates = window_start + np.flatnonzero(anchors[window_start:start] &
+                                                       (low[window_start:start] >= floor))
+            # Newest first; earlier plants may since have undercut a candidate or broken its swing
+            for candidate in candidates[::-1]:
+                target = low[candidate]
+                if low[candidate + 1:start].min(initial=np.inf) < target:
+                    continue
+                if not detector.swing_candidate_mask(low, candidate, candidate + 1)[0]:
+                    continue
+
+                # The plant moves to the bar where the walk comes closest above the anchor, a day or
+                # more after it (and at most a quarter window past the drawn start), so the stretch
+                # needed to reach the anchor stays small even on a trending walk
+                first = max(next_free + 1,
+                            int(np.searchsorted(timestamps_ns, timestamps_ns[candidate] + one_day_ns)))
+                positions = np.arange(first, min(start + retest_window // 4, n_bars - len(template)) + 1)
+                if not len(positions):
+                    continue
+                units = close[positions - 1] * volatility
+                retest_units = (close[positions + len(template) - 1] - target) / (close_offset - low_offset)
+                feasible = (retest_units >= 0.3 * units) & (retest_units <= 5 * units)
+                if not feasible.any():
+                    continue
+                best = np.flatnonzero(feasible)[np.argmin((retest_units / units)[feasible])]
+                anchor, unit = candidate, retest_units[best]
+                start = int(positions[best])
+                stop = start + len(template)
+                reference = target - low_offset * unit
+                break
+
+        if anchor is None and reference + low_offset * unit < floor:
+            continue
+
+        for row, (o, h, l, c) in enumerate(template, start):
+            open_[row], high[row], low[row], close[row] = (reference + o * unit, reference + h * unit,
+                                                           reference + l * unit, reference + c * unit)
+        if anchor is not None:
+            # The pattern low may sit a rounding error off the anchor; never let it undercut
+            low[start:stop] = np.maximum(low[start:stop], low[anchor])
+            anchors[anchor] = False
+            floor = max(floor, low[anchor])
+        anchors[start:stop] = False
+        planted.append((stop - 1, names[choice]))
+        next_free = stop
+
+    df = pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}, index=index)
+    df.attrs['planted'] = [(df.index[row], name) for row, name in planted]
+    return df
+
+
+def generate_synthetic_universe(n_symbols: int, n_bars: int, seed: Optional[int] = None,
+                                timeframe: str = '15m', **kwargs) -> Dict[str, pd.DataFrame]:
+    """n_symbols independent series (SYN0000, SYN0001, ...) with per-symbol seeds derived from seed"""
+    children = np.random.SeedSequence(seed).spawn(n_symbols)
+    return {f"SYN{number:04d}": generate_synthetic_ohlcv(n_bars, int(child.generate_state(1)[0]), timeframe,
+                                                         **kwargs)
+            for number, child in enumerate(children)}
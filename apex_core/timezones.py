@@ -0,0 +1,73 @@
+"""
+Indian Standard Time helpers shared by the UI and the scheduler
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import pytz
+
+
+def get_ist_now():
+    """Get current time in IST"""
+    utc = pytz.UTC
+    ist = pytz.timezone('Asia/Kolkata')
+    return datetime.now(utc).astimezone(ist)
+
+
+def convert_to_ist(timestamp):
+    """Convert any timestamp to IST"""
+    if isinstance(timestamp, str):
+        timestamp = pd.Timestamp(timestamp)
+
+    # Handle both datetime.datetime and pandas.Timestamp
+    if hasattr(timestamp, 'tzinfo'):
+        # Standard datetime object
+        if timestamp.tzinfo is None:
+            # Assume UTC if no timezone
+            timestamp = pytz.UTC.localize(timestamp)
+    elif hasattr(timestamp, 'tz'):
+        # Pandas Timestamp
+        if timestamp.tz is None:
+            # Assume UTC if no timezone
+            timestamp = timestamp.tz_localize('UTC')
+    else:
+        # Fallback - assume UTC
+        try:
+            timestamp = pytz.UTC.localize(timestamp)
+        except:
+            timestamp = pd.Timestamp(timestamp).tz_localize('UTC')
+
+    ist = pytz.timezone('Asia/Kolkata')
+    return timestamp.astimezone(ist)
+
+
+def format_ist_timestamp(timestamp=None):
+    """Format timestamp in IST for display"""
+    if timestamp is None:
+        timestamp = get_ist_now()
+    else:
+        timestamp = convert_to_ist(timestamp)
+
+    return timestamp.strftime('%Y-%m-%d %H:%M:%S IST')
+
+
+def safe_convert_to_ist(timestamp):
+    """Safely convert timestamp to IST with error handling"""
+    try:
+        return convert_to_ist(timestamp)
+    except Exception as e:
+        # If conversion fails, return current IST time
+        print(f"Warning: Timestamp conversion failed: {e}")
+        return get_ist_now()
+
+
+def safe_format_ist_timestamp(timestamp):
+    """Safely format timestamp in IST with error handling"""
+    try:
+        if pd.isna(timestamp) or timestamp in ['N/A', '']:
+            return 'N/A'
+        return format_ist_timestamp(timestamp)
+    except Exception as e:
+        print(f"Warning: Timestamp formatting failed: {e}")
+        return 'N/A'
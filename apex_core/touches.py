@@ -0,0 +1,184 @@
+"""
+Swing low touch analysis: matching patterns to untouched swing lows
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .models import SwingLow, SwingLowTouch
+
+
+# ============================================================================
+# ENHANCED SWING LOW TOUCH ANALYZER - PROFESSIONAL VERSION
+# ============================================================================
+
+class SwingLowIndex:
+    """Swing lows indexed by timestamp and by price for fast touch candidate lookup.
+
+    Candidates for a pattern are the swing lows formed before the pattern inside a
+    price band; whichever of the two bisected ranges is smaller is scanned.
+    Returned positions refer to the original list order.
+    """
+
+    NO_INVALIDATION = np.iinfo(np.int64).max
+
+    def __init__(self, swing_lows: List[SwingLow]):
+        self.swing_lows = swing_lows
+
+        self.timestamps_ns = np.array([pd.Timestamp(sl.timestamp).value for sl in swing_lows], dtype=np.int64)
+        self.prices = np.array([sl.price for sl in swing_lows], dtype=np.float64)
+        self.invalidation_ns = np.array([
+            pd.Timestamp(sl.invalidation_timestamp).value
+            if sl.is_invalidated and sl.invalidation_timestamp is not None else self.NO_INVALIDATION
+            for sl in swing_lows
+        ], dtype=np.int64)
+
+        # Stable sorts keep list order among equal keys
+        self.time_order = np.argsort(self.timestamps_ns, kind='stable')
+        self.sorted_timestamps_ns = self.timestamps_ns[self.time_order]
+        self.price_order = np.argsort(self.prices, kind='stable')
+        self.sorted_prices = self.prices[self.price_order]
+
+        # Touch bands are derived for positive prices; non-positive swing lows are always checked
+        self.unbanded_positions = np.flatnonzero(self.prices <= 0)
+
+    def candidates(self, check_timestamp: pd.Timestamp, price_low: float, price_high: float) -> np.ndarray:
+        """Positions of swing lows before check_timestamp, still valid at it, with price in [price_low, price_high]"""
+        check_ns = pd.Timestamp(check_timestamp).value
+
+        time_end = np.searchsorted(self.sorted_timestamps_ns, check_ns, side='left')
+        band_start = np.searchsorted(self.sorted_prices, price_low, side='left')
+        band_end = np.searchsorted(self.sorted_prices, price_high, side='right')
+
+        if time_end <= band_end - band_start:
+            positions = self.time_order[:time_end]
+            prices = self.prices[positions]
+            positions = positions[(prices >= price_low) & (prices <= price_high)]
+        else:
+            positions = self.price_order[band_start:band_end]
+            positions = positions[self.timestamps_ns[positions] < check_ns]
+
+        if len(self.unbanded_positions) and price_low > 0:
+            unbanded = self.unbanded_positions[self.timestamps_ns[self.unbanded_positions] < check_ns]
+            positions = np.union1d(positions, unbanded)
+
+        positions = positions[self.invalidation_ns[positions] > check_ns]
+        return np.sort(positions)
+
+
+class EnhancedSwingLowTouchAnalyzer:
+    """Enhanced analyzer that only counts valid swing low touches with strict validation"""
+
+    def __init__(self, touch_tolerance_pct: float = 0.1, min_days_between: int = 1):
+        self.touch_tolerance_pct = touch_tolerance_pct
+        self.min_days_between = min_days_between
+
+    def touch_price_band(self, pattern_low: float) -> Tuple[float, float]:
+        """Range of swing low prices a pattern low can strictly touch (slightly widened for float rounding)"""
+        if not pattern_low > 0:
+            return -np.inf, np.inf
+
+        below_pct = self.touch_tolerance_pct
+        above_pct = self.touch_tolerance_pct * 0.3
+
+        price_low = pattern_low / (1 + above_pct / 100)
+        price_high = pattern_low / (1 - below_pct / 100) if below_pct < 100 else np.inf
+        return price_low * (1 - 1e-9), price_high * (1 + 1e-9)
+
+    def analyze_touches(self, df: pd.DataFrame, untouched_swing_lows: List[SwingLow],
+                        all_patterns: Dict[str, List], symbol: str = "", timeframe: str = "") -> List[SwingLowTouch]:
+        """Analyze when patterns touch untouched swing lows - ENHANCED WITH DAYS FILTER AND STRICT TOUCH VALIDATION"""
+        touches = []
+
+        # Index swing lows by time and price so each pattern only checks nearby candidates
+        swing_index = SwingLowIndex(untouched_swing_lows)
+
+        # Combine all patterns
+        combined_patterns = []
+        for pattern_type, patterns in all_patterns.items():
+            for pattern in patterns:
+                combined_patterns.append((pattern_type, pattern))
+
+        for pattern_type, pattern in combined_patterns:
+            pattern_timestamp = pd.Timestamp(pattern.timestamp)
+
+            # Get pattern low for strict touch validation
+            if hasattr(pattern, 'pattern_low'):
+                pattern_low = pattern.pattern_low
+            elif hasattr(pattern, 'low_price'):
+                pattern_low = pattern.low_price
+            else:
+                pattern_low = getattr(pattern, 'close_price', 0)
+
+            # Swing lows formed before the pattern, valid at pattern time and within the touch band
+            price_low, price_high = self.touch_price_band(pattern_low)
+            candidate_positions = swing_index.candidates(pattern_timestamp, price_low, price_high)
+
+            for position in candidate_positions:
+                swing_low = untouched_swing_lows[position]
+
+                # Skip if swing low was already touched by another pattern
+                if swing_low.is_touched:
+                    continue
+
+                # NEW: Check minimum days between swing low and pattern
+                days_between = (pattern_timestamp - swing_low.timestamp).days
+                if days_between < self.min_days_between:
+                    continue
+
+                # ENHANCED: Strict swing low touch validation
+                # The pattern low must actually touch (equal to or slightly penetrate) the swing low
+                swing_low_price = swing_low.price
+
+                # Calculate if pattern actually touches the swing low
+                price_difference = pattern_low - swing_low_price
+
+                # For a valid touch:
+                # 1. Pattern low should be equal to or slightly below swing low (price_difference <= 0)
+                # 2. If above swing low, must be within very tight tolerance
+                is_actual_touch = False
+
+                if price_difference <= 0:
+                    # Pattern low is at or below swing low - this is a valid touch
+                    # Allow slight penetration below (up to tolerance)
+                    penetration_pct = abs(price_difference / swing_low_price) * 100
+                    if penetration_pct <= self.touch_tolerance_pct:
+                        is_actual_touch = True
+                else:
+                    # Pattern low is above swing low - only allow if within very small tolerance
+                    distance_above_pct = (price_difference / swing_low_price) * 100
+                    # Use much tighter tolerance for cases where pattern is above swing low
+                    if distance_above_pct <= (self.touch_tolerance_pct * 0.3):  # 30% of normal tolerance
+                        is_actual_touch = True
+
+                # Only proceed if we have an actual touch
+                if is_actual_touch:
+                    # Calculate final distance percentage for reporting
+                    final_distance_pct = abs(price_difference / swing_low_price) * 100
+
+                    touch = SwingLowTouch(
+                        swing_low=swing_low,
+                        pattern=pattern,
+                        touch_type='strict_touch',
+                        pattern_type=pattern_type,
+                        distance_pips=price_difference,  # Can be negative (penetration) or positive (slight gap)
+                        days_between=days_between,
+                        price_difference=final_distance_pct,
+                        is_live=getattr(pattern, 'is_live', False),
+                        pattern_strength=getattr(pattern, 'pattern_strength', 50.0),
+                        symbol=symbol,
+                        timeframe=timeframe,
+                        is_swing_low_valid=True  # It was valid at touch time
+                    )
+
+                    touches.append(touch)
+
+                    # Mark swing low as touched
+                    swing_low.is_touched = True
+                    swing_low.touch_timestamp = pattern_timestamp
+                    swing_low.touch_pattern = pattern_type
+                    swing_low.touch_index = pattern.index
+
+        return touches
@@ -0,0 +1,877 @@
+"""
+Trade outcome analysis: per-trade reference loops and the batched NumPy simulator
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .models import SwingLowTouch, TradeOutcome
+
+
+# ============================================================================
+# ENHANCED TRADE OUTCOME ANALYZER - PROFESSIONAL VERSION
+# ============================================================================
+
+@dataclass
+class TradeWindowBatch:
+    """Forward windows for a batch of trades: one row per trade, max_bars_to_analyze columns"""
+    columns: np.ndarray  # 0..width-1 bar offsets after the pattern
+    timestamps: pd.Index
+    starts: np.ndarray  # first bar after each pattern
+    lengths: np.ndarray  # bars actually available in each window
+    in_window: np.ndarray
+    highs: np.ndarray
+    lows: np.ndarray
+    entry: np.ndarray  # per-trade prices as (rows, 1) columns
+    sl: np.ndarray
+    target: np.ndarray
+    first_forced: Optional[np.ndarray] = None  # first intraday exit bar (width when none)
+
+
+
+class EnhancedTradeOutcomeAnalyzer:
+    """Enhanced analyzer with professional current status tracking, flexible targets, and partial exits"""
+
+    def __init__(self, max_bars_to_analyze: int = 100, capital_per_trade: float = 10000):
+        self.max_bars_to_analyze = max_bars_to_analyze
+        self.capital_per_trade = capital_per_trade
+
+        # Default timeframe-specific targets for optimized trading
+        self.default_timeframe_targets = {
+            '1m': 0.5,  # 0.5% for 1-minute scalping
+            '5m': 0.75,  # 0.75% for 5-minute quick trades
+            '15m': 1.0,  # 1% for 15-minute intraday
+            '30m': 1.5,  # 1.5% for 30-minute intraday
+            '1H': 2.5,  # 2.5% for 1-hour short swings
+            '4H': 5.0,  # 5% for 4-hour swing trades
+            '1D': 8.0  # 8% for daily position trades
+        }
+
+        # Partial exit configuration
+        self.partial_exit_config = {
+            'first_exit_pct': 0.5,  # Exit at 0.5%
+            'second_exit_pct': 0.9,  # Exit at 0.9%
+            'first_exit_capital_pct': 50.0,  # 50% of capital
+            'second_exit_capital_pct': 50.0  # Remaining 50%
+        }
+
+    def get_target_for_timeframe(self, timeframe: str, custom_target: float = None) -> float:
+        """Get appropriate target percentage for timeframe or use custom target"""
+        if custom_target is not None and custom_target > 0:
+            return custom_target
+        return self.default_timeframe_targets.get(timeframe, 2.0)  # Default 2%
+
+    def analyze_trade_outcomes_with_timeframe(self, df: pd.DataFrame, touches: List[SwingLowTouch],
+                                              timeframe: str, use_trailing_stop: bool = False,
+                                              intraday_mode: bool = False,
+                                              entry_cutoff_time: str = '11:45',
+                                              exit_time: str = '15:15',
+                                              custom_target_pct: float = None,
+                                              use_partial_exits: bool = False,
+                                              first_exit_pct: float = 0.5,
+                                              second_exit_pct: float = 0.9,
+                                              first_exit_capital_pct: float = 50.0,
+                                              engine: str = 'batched') -> List[SwingLowTouch]:
+        """Analyze trade outcomes with flexible targets, partial exits, and configurable options
+
+        engine: 'batched' (all trades of the symbol at once on NumPy windows) or 'loop' (bar-by-bar per trade)
+        """
+        enhanced_touches = []
+        target_pct = self.get_target_for_timeframe(timeframe, custom_target_pct)
+
+        # Touches that need an outcome: (position in enhanced_touches, touch, entry, sl, target)
+        trades = []
+
+        for touch in touches:
+            # Skip live patterns for outcome analysis
+            if touch.is_live:
+                enhanced_touches.append(touch)
+                continue
+
+            # Check intraday entry cutoff if in intraday mode
+            if intraday_mode:
+                pattern_time = pd.Timestamp(touch.pattern.timestamp)
+                pattern_hour_min = pattern_time.strftime('%H:%M')
+
+                # Skip patterns that occur after entry cutoff time
+                if pattern_hour_min > entry_cutoff_time:
+                    continue
+
+            # Get entry and stop loss prices based on pattern type
+            entry_price, sl_price = self._get_entry_and_sl_prices(touch)
+
+            # Calculate target price using flexible target
+            target_price = entry_price * (1 + target_pct / 100)
+
+            # Store prices in touch for capital management
+            touch.entry_price = entry_price
+            touch.sl_price = sl_price
+            touch.target_price = target_price
+
+            trades.append((len(enhanced_touches), touch, entry_price, sl_price, target_price))
+            enhanced_touches.append(None)
+
+        if engine == 'batched':
+            trade_outcomes = self.simulate_trades_batch(
+                df,
+                [touch.pattern.index for _, touch, _, _, _ in trades],
+                [entry_price for _, _, entry_price, _, _ in trades],
+                [sl_price for _, _, _, sl_price, _ in trades],
+                [target_price for _, _, _, _, target_price in trades],
+                target_pct, use_trailing_stop, intraday_mode,
+                [pd.Timestamp(touch.pattern.timestamp) for _, touch, _, _, _ in trades],
+                exit_time, use_partial_exits,
+                first_exit_pct, second_exit_pct, first_exit_capital_pct
+            )
+        else:
+            trade_outcomes = []
+            for _, touch, entry_price, sl_price, target_price in trades:
+                # Get future data after the pattern
+                pattern_index = touch.pattern.index
+                future_data = df.iloc[pattern_index + 1:pattern_index + 1 + self.max_bars_to_analyze]
+
+                if future_data.empty:
+                    trade_outcome = None
+                elif use_partial_exits:
+                    trade_outcome = self._analyze_single_trade_with_partial_exits(
+                        future_data, entry_price, target_price, sl_price, target_pct,
+                        use_trailing_stop, intraday_mode,
+                        pd.Timestamp(touch.pattern.timestamp), exit_time,
+                        first_exit_pct, second_exit_pct, first_exit_capital_pct
+                    )
+                else:
+                    trade_outcome = self._analyze_single_trade_enhanced(
+                        future_data, entry_price, target_price, sl_price, target_pct,
+                        use_trailing_stop, intraday_mode,
+                        pd.Timestamp(touch.pattern.timestamp), exit_time
+                    )
+                trade_outcomes.append(trade_outcome)
+
+        for (position, touch, entry_price, sl_price, target_price), trade_outcome in zip(trades, trade_outcomes):
+            if trade_outcome is None:
+                trade_outcome = TradeOutcome(
+                    success=False, target_reached=False, sl_hit=False,
+                    max_profit_pct=0.0, max_drawdown_pct=0.0, current_profit_pct=0.0,
+                    bars_to_resolution=0, resolution_type='no_data',
+                    target_price=target_price, sl_price=sl_price,
+                    target_pct_used=target_pct,
+                    entry_price=entry_price, current_price=entry_price,
+                    partial_exits_enabled=use_partial_exits,
+                    first_exit_pct=first_exit_pct,
+                    second_exit_pct=second_exit_pct,
+                    first_exit_capital_pct=first_exit_capital_pct,
+                    second_exit_capital_pct=100.0 - first_exit_capital_pct
+                )
+
+            # Create enhanced touch with trade outcome
+            enhanced_touches[position] = SwingLowTouch(
+                swing_low=touch.swing_low,
+                pattern=touch.pattern,
+                touch_type=touch.touch_type,
+                pattern_type=touch.pattern_type,
+                distance_pips=touch.distance_pips,
+                days_between=touch.days_between,
+                price_difference=touch.price_difference,
+                trade_outcome=trade_outcome,
+                is_live=touch.is_live,
+                pattern_strength=touch.pattern_strength,
+                symbol=touch.symbol,
+                timeframe=touch.timeframe,
+                entry_price=entry_price,
+                sl_price=sl_price,
+                target_price=target_price,
+                is_swing_low_valid=touch.is_swing_low_valid
+            )
+
+        return enhanced_touches
+
+    def forward_windows(self, values: np.ndarray, starts: np.ndarray, fill=np.nan) -> np.ndarray:
+        """Rows of max_bars_to_analyze consecutive values beginning at each start (padded past the end)"""
+        width = self.max_bars_to_analyze
+        padded = np.concatenate([values, np.full(width, fill, dtype=values.dtype)])
+        return np.lib.stride_tricks.sliding_window_view(padded, width)[starts]
+
+    @staticmethod
+    def first_true(mask: np.ndarray) -> np.ndarray:
+        """Column of the first True in each row (row width when there is none)"""
+        return np.where(mask.any(axis=1), mask.argmax(axis=1), mask.shape[1])
+
+    def simulate_trades_batch(self, df: pd.DataFrame, pattern_indices: List[int],
+                              entry_prices: List[float], sl_prices: List[float], target_prices: List[float],
+                              target_pct: float, use_trailing_stop: bool = False,
+                              intraday_mode: bool = False,
+                              entry_timestamps: List[pd.Timestamp] = None,
+                              exit_time: str = '15:15',
+                              use_partial_exits: bool = False,
+                              first_exit_pct: float = 0.5,
+                              second_exit_pct: float = 0.9,
+                              first_exit_capital_pct: float = 50.0,
+                              batch_size: int = 2048) -> List[Optional[TradeOutcome]]:
+        """Outcomes for many trades at once (None where no bars follow the pattern).
+
+        Each trade's forward window is a row of a strided view over the high/low
+        arrays; exits are first crossings found with argmax over boolean masks.
+        Results match _analyze_single_trade_enhanced / _analyze_single_trade_with_partial_exits.
+        """
+        n = len(df)
+        width = self.max_bars_to_analyze
+        outcomes: List[Optional[TradeOutcome]] = [None] * len(pattern_indices)
+        if not pattern_indices or width <= 0:
+            return outcomes
+
+        highs = df['high'].to_numpy(dtype=np.float64)
+        lows = df['low'].to_numpy(dtype=np.float64)
+        closes = df['close'].to_numpy(dtype=np.float64)
+        timestamps = df.index
+
+        if intraday_mode:
+            # Wall-clock session day and minute of every bar
+            bar_index = pd.DatetimeIndex(timestamps).as_unit('ns')
+            bar_days = bar_index.tz_localize(None).normalize().asi8 if bar_index.tz is not None \
+                else bar_index.normalize().asi8
+            bar_minutes = np.asarray(bar_index.hour * 60 + bar_index.minute, dtype=np.int64)
+            exit_hour, exit_minute = map(int, exit_time.split(':'))
+            exit_minutes = exit_hour * 60 + exit_minute
+
+        columns = np.arange(width)
+
+        for batch_start in range(0, len(pattern_indices), batch_size):
+            batch = slice(batch_start, batch_start + batch_size)
+            starts = np.asarray(pattern_indices[batch], dtype=np.int64) + 1
+            lengths = np.clip(n - starts, 0, width)
+            starts = np.minimum(starts, n)
+
+            window = TradeWindowBatch(
+                columns=columns,
+                timestamps=timestamps,
+                starts=starts,
+                lengths=lengths,
+                in_window=columns < lengths[:, None],
+                highs=self.forward_windows(highs, starts),
+                lows=self.forward_windows(lows, starts),
+                entry=np.asarray(entry_prices[batch], dtype=np.float64)[:, None],
+                sl=np.asarray(sl_prices[batch], dtype=np.float64)[:, None],
+                target=np.asarray(target_prices[batch], dtype=np.float64)[:, None]
+            )
+
+            if intraday_mode:
+                entry_days = np.array([
+                    (ts.tz_localize(None) if ts.tz is not None else ts).normalize().value
+                    for ts in entry_timestamps[batch]
+                ], dtype=np.int64)[:, None]
+                forced = ((self.forward_windows(bar_days, starts, fill=0) == entry_days) &
+                          (self.forward_windows(bar_minutes, starts, fill=0) >= exit_minutes) & window.in_window)
+                window.first_forced = self.first_true(forced)
+            else:
+                window.first_forced = np.full(len(starts), width)
+
+            if use_partial_exits:
+                resolved_batch = self._resolve_partial_exit_batch(
+                    window, first_exit_pct, second_exit_pct, first_exit_capital_pct)
+            elif use_trailing_stop:
+                resolved_batch = self._resolve_trailing_stop_batch(window)
+            else:
+                resolved_batch = self._resolve_fixed_stop_batch(window)
+
+            exit_bar, resolved, is_forced, row_fields = resolved_batch
+
+            # Bars that update max profit/drawdown: up to the exit bar (excluding a forced exit bar)
+            tracked = columns < np.where(resolved, np.where(is_forced, exit_bar, exit_bar + 1), lengths)[:, None]
+            high_profit = ((window.highs - window.entry) / window.entry) * 100
+            low_drawdown = ((window.lows - window.entry) / window.entry) * 100
+            max_profit = np.fmax.reduce(np.where(tracked, high_profit, -np.inf), axis=1, initial=0.0)
+            max_drawdown = np.fmin.reduce(np.where(tracked, low_drawdown, np.inf), axis=1, initial=0.0)
+
+            # Close of the exit bar (or last bar) is the current price; a forced exit bar is not an update
+            price_bar = starts + np.where(resolved, exit_bar, lengths - 1)
+            update_offset = np.where(resolved, np.where(is_forced, exit_bar - 1, exit_bar), lengths - 1)
+            price_timestamps = list(timestamps[np.maximum(price_bar, 0)])
+            update_timestamps = list(timestamps[np.maximum(starts + update_offset, 0)])
+
+            for k in range(len(starts)):
+                if lengths[k] == 0:
+                    continue
+
+                entry_price = entry_prices[batch_start + k]
+                current_price = closes[price_bar[k]]
+
+                outcome_fields = dict(
+                    max_profit_pct=max_profit[k],
+                    max_drawdown_pct=max_drawdown[k],
+                    current_profit_pct=((current_price - entry_price) / entry_price) * 100,
+                    bars_to_resolution=int(exit_bar[k]) + 1 if resolved[k] else 0,
+                    target_price=target_prices[batch_start + k],
+                    sl_price=sl_prices[batch_start + k],
+                    target_pct_used=target_pct,
+                    exit_timestamp=price_timestamps[k] if resolved[k] else None,
+                    entry_price=entry_price,
+                    current_price=current_price,
+                    last_update_timestamp=update_timestamps[k] if update_offset[k] >= 0 else None
+                )
+                outcome_fields.update(row_fields(k, outcome_fields))
+                outcomes[batch_start + k] = TradeOutcome(**outcome_fields)
+
+        return outcomes
+
+    def _resolve_fixed_stop_batch(self, w: TradeWindowBatch):
+        """Fixed target/stop: first target hit vs first stop hit"""
+        first_target = self.first_true((w.highs >= w.target) & w.in_window)
+        first_stop = self.first_true((w.lows <= w.sl) & w.in_window)
+
+        # Same-bar priority follows the loop: intraday exit, then target, then stop
+        exit_bar = np.minimum(np.minimum(w.first_forced, first_target), first_stop)
+        resolved = exit_bar < w.lengths
+        is_forced = resolved & (w.first_forced == exit_bar)
+        is_target = resolved & ~is_forced & (first_target == exit_bar)
+        is_stop = resolved & ~is_forced & ~is_target
+
+        def row_fields(k: int, o: Dict) -> Dict:
+            if is_target[k]:
+                resolution_type, final_profit_pct = 'target_hit', o['target_pct_used']
+            elif is_stop[k]:
+                resolution_type = 'stop_loss'
+                final_profit_pct = ((o['sl_price'] - o['entry_price']) / o['entry_price']) * 100
+            else:
+                resolution_type = 'intraday_exit' if is_forced[k] else 'ongoing'
+                final_profit_pct = o['current_profit_pct']
+            return dict(success=bool(is_target[k]), target_reached=bool(is_target[k]), sl_hit=bool(is_stop[k]),
+                        resolution_type=resolution_type, trailing_active=False, trailing_sl_price=o['sl_price'],
+                        highest_price_reached=o['entry_price'], trailing_profit_pct=final_profit_pct,
+                        partial_exits_enabled=False)
+
+        return exit_bar, resolved, is_forced, row_fields
+
+    def _resolve_trailing_stop_batch(self, w: TradeWindowBatch):
+        """Trailing stop: after the target bar the stop trails the low of the highest-high bar"""
+        width = len(w.columns)
+        first_target = self.first_true((w.highs >= w.target) & w.in_window)
+        first_stop = self.first_true((w.lows <= w.sl) & w.in_window)
+
+        # Phase 1 (fixed stop) ends at the first intraday exit, target (activation) or stop
+        phase1_bar = np.minimum(np.minimum(w.first_forced, first_target), first_stop)
+        phase1_resolved = phase1_bar < w.lengths
+        phase1_forced = phase1_resolved & (w.first_forced == phase1_bar)
+        activated = phase1_resolved & ~phase1_forced & (first_target == phase1_bar)
+        is_stop = phase1_resolved & ~phase1_forced & ~activated
+
+        # Phase 2: running maximum of highs from the activation bar; the trailing stop is the
+        # low of the bar that last set a new high, carried forward until the next new high
+        activation = np.where(activated, first_target, width)[:, None]
+        after_activation = w.columns > activation
+        running_high = np.fmax.accumulate(np.where(w.columns >= activation, w.highs, -np.inf), axis=1)
+        previous_high = np.concatenate([np.full((len(w.starts), 1), -np.inf), running_high[:, :-1]], axis=1)
+        sets_high = (after_activation & (w.highs > previous_high)) | (w.columns == activation)
+        high_bar = np.maximum.accumulate(np.where(sets_high, w.columns, 0), axis=1)
+        trailing_sl = np.take_along_axis(w.lows, high_bar, axis=1)
+        first_trail = self.first_true(after_activation & (w.lows <= trailing_sl) & w.in_window)
+
+        phase2_bar = np.minimum(w.first_forced, first_trail)
+        phase2_resolved = phase2_bar < w.lengths
+        phase2_forced = phase2_resolved & (w.first_forced == phase2_bar)
+        is_trailed = activated & phase2_resolved & ~phase2_forced
+
+        exit_bar = np.where(activated, phase2_bar, phase1_bar)
+        resolved = np.where(activated, phase2_resolved, phase1_resolved)
+        is_forced = phase1_forced | (activated & phase2_forced)
+
+        # Trailing state as of the last bar processed before the trade ended
+        rows = np.arange(len(w.starts))
+        state_bar = np.where(resolved, np.where(is_forced, exit_bar - 1, exit_bar), w.lengths - 1)
+        state_bar = np.clip(state_bar, 0, width - 1)
+        final_trailing_sl = trailing_sl[rows, state_bar]
+        final_highest = running_high[rows, state_bar]
+
+        def row_fields(k: int, o: Dict) -> Dict:
+            entry_price = o['entry_price']
+            if is_stop[k]:
+                resolution_type = 'stop_loss'
+                final_profit_pct = ((o['sl_price'] - entry_price) / entry_price) * 100
+            elif is_trailed[k]:
+                resolution_type = 'trailing_stop'
+                final_profit_pct = ((final_trailing_sl[k] - entry_price) / entry_price) * 100
+            elif is_forced[k]:
+                resolution_type, final_profit_pct = 'intraday_exit', o['current_profit_pct']
+            else:
+                resolution_type = 'ongoing'
+                final_profit_pct = 0.0 if activated[k] else o['current_profit_pct']
+
+            # A profitable intraday exit clears target_reached even after activation (loop behaviour)
+            target_reached = bool(activated[k]) and not (is_forced[k] and o['current_profit_pct'] > 0)
+            return dict(success=target_reached, target_reached=target_reached,
+                        sl_hit=bool(is_stop[k] or is_trailed[k]), resolution_type=resolution_type,
+                        trailing_active=bool(activated[k]),
+                        trailing_sl_price=final_trailing_sl[k] if activated[k] else o['sl_price'],
+                        highest_price_reached=final_highest[k] if activated[k] else entry_price,
+                        trailing_profit_pct=final_profit_pct, partial_exits_enabled=False)
+
+        return exit_bar, resolved, is_forced, row_fields
+
+    def _resolve_partial_exit_batch(self, w: TradeWindowBatch, first_exit_pct: float,
+                                    second_exit_pct: float, first_exit_capital_pct: float):
+        """Partial exits: two first-crossing exit bars plus a stop on the remaining position"""
+        second_exit_capital_pct = 100.0 - first_exit_capital_pct
+        first_exit_price = w.entry * (1 + first_exit_pct / 100)
+        second_exit_price = w.entry * (1 + second_exit_pct / 100)
+
+        first_exit = self.first_true((w.highs >= first_exit_price) & w.in_window)
+        second_exit = self.first_true((w.highs >= second_exit_price) & w.in_window)
+
+        # The stop only applies while part of the position is still open
+        remaining = (100.0 - np.where(w.columns > first_exit[:, None], first_exit_capital_pct, 0.0)
+                     - np.where(w.columns > second_exit[:, None], second_exit_capital_pct, 0.0))
+        first_stop = self.first_true((w.lows <= w.sl) & (remaining > 0) & w.in_window)
+
+        # The position closes on the second exit only if the first exit already happened
+        completion = np.where(first_exit <= second_exit, second_exit, len(w.columns))
+
+        exit_bar = np.minimum(np.minimum(w.first_forced, first_stop), completion)
+        resolved = exit_bar < w.lengths
+        is_forced = resolved & (w.first_forced == exit_bar)
+        is_stop = resolved & ~is_forced & (first_stop == exit_bar)
+        is_complete = resolved & ~is_forced & ~is_stop
+
+        last_bar = np.where(resolved, exit_bar, w.lengths)
+        first_triggered = (first_exit < last_bar) | is_complete
+        second_triggered = (second_exit < last_bar) | is_complete
+        first_exit_offsets = w.starts + np.minimum(first_exit, len(w.columns) - 1)
+        second_exit_offsets = w.starts + np.minimum(second_exit, len(w.columns) - 1)
+
+        def row_fields(k: int, o: Dict) -> Dict:
+            first_hit, second_hit = bool(first_triggered[k]), bool(second_triggered[k])
+            current_profit_pct = o['current_profit_pct']
+
+            if is_stop[k]:
+                # Stop loss hit - entire remaining position exits at stop loss
+                loss_pct = ((o['sl_price'] - o['entry_price']) / o['entry_price']) * 100
+                if first_hit:
+                    weighted_profit_pct = (first_exit_pct * first_exit_capital_pct +
+                                           loss_pct * second_exit_capital_pct) / 100.0
+                else:
+                    weighted_profit_pct = loss_pct
+            elif first_hit and second_hit:
+                weighted_profit_pct = (first_exit_pct * first_exit_capital_pct +
+                                       second_exit_pct * second_exit_capital_pct) / 100.0
+            elif first_hit:
+                weighted_profit_pct = (first_exit_pct * first_exit_capital_pct +
+                                       current_profit_pct * second_exit_capital_pct) / 100.0
+            else:
+                weighted_profit_pct = current_profit_pct
+
+            if is_stop[k]:
+                resolution_type = 'stop_loss'
+            elif is_complete[k]:
+                resolution_type = 'partial_exits_complete'
+            else:
+                resolution_type = 'intraday_exit' if is_forced[k] else 'ongoing'
+
+            return dict(
+                success=first_hit or second_hit,
+                target_reached=second_hit,
+                sl_hit=bool(is_stop[k]),
+                resolution_type=resolution_type,
+                partial_exits_enabled=True,
+                first_exit_triggered=first_hit,
+                first_exit_price=first_exit_price[k, 0],
+                first_exit_pct=first_exit_pct,
+                first_exit_timestamp=w.timestamps[first_exit_offsets[k]] if first_hit else None,
+                first_exit_bars=int(first_exit[k]) + 1 if first_hit else 0,
+                second_exit_triggered=second_hit,
+                second_exit_price=second_exit_price[k, 0],
+                second_exit_pct=second_exit_pct,
+                second_exit_timestamp=w.timestamps[second_exit_offsets[k]] if second_hit else None,
+                second_exit_bars=int(second_exit[k]) + 1 if second_hit else 0,
+                first_exit_capital_pct=first_exit_capital_pct,
+                second_exit_capital_pct=second_exit_capital_pct,
+                weighted_profit_pct=weighted_profit_pct,
+                total_pnl_pct=weighted_profit_pct
+            )
+
+        return exit_bar, resolved, is_forced, row_fields
+
+    def _analyze_single_trade_with_partial_exits(self, future_data: pd.DataFrame, entry_price: float,
+                                                 target_price: float, sl_price: float, target_pct: float,
+                                                 use_trailing_stop: bool = False,
+                                                 intraday_mode: bool = False,
+                                                 entry_timestamp: pd.Timestamp = None,
+                                                 exit_time: str = '15:15',
+                                                 first_exit_pct: float = 0.5,
+                                                 second_exit_pct: float = 0.9,
+                                                 first_exit_capital_pct: float = 50.0) -> TradeOutcome:
+        """Analyze single trade with partial exit support"""
+
+        # Calculate partial exit prices
+        first_exit_price = entry_price * (1 + first_exit_pct / 100)
+        second_exit_price = entry_price * (1 + second_exit_pct / 100)
+        second_exit_capital_pct = 100.0 - first_exit_capital_pct
+
+        # Initialize tracking variables
+        first_exit_triggered = False
+        first_exit_timestamp = None
+        first_exit_bars = 0
+
+        second_exit_triggered = False
+        second_exit_timestamp = None
+        second_exit_bars = 0
+
+        sl_hit = False
+        bars_to_resolution = 0
+        resolution_type = 'ongoing'
+        max_profit_pct = 0.0
+        max_drawdown_pct = 0.0
+        exit_timestamp = None
+        current_profit_pct = 0.0
+        current_price = entry_price
+        last_update_timestamp = None
+
+        # Position tracking
+        remaining_position_pct = 100.0  # Start with 100% position
+
+        # Parse intraday exit time
+        if intraday_mode and exit_time:
+            exit_hour, exit_minute = map(int, exit_time.split(':'))
+
+        for i, (timestamp, row) in enumerate(future_data.iterrows()):
+            high_price = row['high']
+            low_price = row['low']
+            close_price = row['close']
+
+            # Check for intraday exit
+            if intraday_mode and entry_timestamp:
+                if timestamp.date() == entry_timestamp.date():
+                    if timestamp.hour > exit_hour or (timestamp.hour == exit_hour and timestamp.minute >= exit_minute):
+                        # Force exit at close price
+                        bars_to_resolution = i + 1
+                        resolution_type = 'intraday_exit'
+                        exit_timestamp = timestamp
+                        current_price = close_price
+                        current_profit_pct = ((close_price - entry_price) / entry_price) * 100
+                        break
+
+            # Update current price and profit
+            current_price = close_price
+            last_update_timestamp = timestamp
+            current_profit_pct = ((close_price - entry_price) / entry_price) * 100
+
+            # Calculate max profit and drawdown
+            current_high_profit = ((high_price - entry_price) / entry_price) * 100
+            current_low_drawdown = ((low_price - entry_price) / entry_price) * 100
+            max_profit_pct = max(max_profit_pct, current_high_profit)
+            max_drawdown_pct = min(max_drawdown_pct, current_low_drawdown)
+
+            # Check for stop loss (applies to entire remaining position)
+            if low_price <= sl_price and remaining_position_pct > 0:
+                sl_hit = True
+                bars_to_resolution = i + 1
+                resolution_type = 'stop_loss'
+                exit_timestamp = timestamp
+                break
+
+            # Check for first partial exit
+            if not first_exit_triggered and high_price >= first_exit_price:
+                first_exit_triggered = True
+                first_exit_timestamp = timestamp
+                first_exit_bars = i + 1
+                remaining_position_pct -= first_exit_capital_pct
+
+                # Don't break, continue to check for second exit
+
+            # Check for second partial exit
+            if not second_exit_triggered and high_price >= second_exit_price:
+                second_exit_triggered = True
+                second_exit_timestamp = timestamp
+                second_exit_bars = i + 1
+                remaining_position_pct -= second_exit_capital_pct
+
+                # If both exits triggered, position is closed
+                if first_exit_triggered and second_exit_triggered:
+                    bars_to_resolution = i + 1
+                    resolution_type = 'partial_exits_complete'
+                    exit_timestamp = timestamp
+                    break
+
+        # Calculate weighted results
+        weighted_profit_pct = 0.0
+        total_pnl_pct = 0.0
+
+        if sl_hit:
+            # Stop loss hit - entire remaining position exits at stop loss
+            loss_pct = ((sl_price - entry_price) / entry_price) * 100
+            if first_exit_triggered:
+                # First exit successful, remaining position hit stop loss
+                weighted_profit_pct = (first_exit_pct * first_exit_capital_pct +
+                                       loss_pct * second_exit_capital_pct) / 100.0
+                total_pnl_pct = weighted_profit_pct
+            else:
+                # Full position hit stop loss
+                weighted_profit_pct = loss_pct
+                total_pnl_pct = loss_pct
+        else:
+            # Calculate based on partial exits
+            if first_exit_triggered and second_exit_triggered:
+                # Both targets hit
+                weighted_profit_pct = (first_exit_pct * first_exit_capital_pct +
+                                       second_exit_pct * second_exit_capital_pct) / 100.0
+                total_pnl_pct = weighted_profit_pct
+            elif first_exit_triggered:
+                # Only first target hit, rest still open
+                weighted_profit_pct = (first_exit_pct * first_exit_capital_pct +
+                                       current_profit_pct * second_exit_capital_pct) / 100.0
+                total_pnl_pct = weighted_profit_pct
+            else:
+                # No targets hit yet
+                weighted_profit_pct = current_profit_pct
+                total_pnl_pct = current_profit_pct
+
+        # Determine success
+        success = first_exit_triggered or second_exit_triggered
+        target_reached = second_exit_triggered  # Full target is second exit
+
+        return TradeOutcome(
+            success=success,
+            target_reached=target_reached,
+            sl_hit=sl_hit,
+            max_profit_pct=max_profit_pct,
+            max_drawdown_pct=max_drawdown_pct,
+            current_profit_pct=current_profit_pct,
+            bars_to_resolution=bars_to_resolution,
+            resolution_type=resolution_type,
+            target_price=target_price,
+            sl_price=sl_price,
+            target_pct_used=target_pct,
+            exit_timestamp=exit_timestamp,
+            entry_price=entry_price,
+            current_price=current_price,
+            last_update_timestamp=last_update_timestamp,
+
+            # Partial exit data
+            partial_exits_enabled=True,
+            first_exit_triggered=first_exit_triggered,
+            first_exit_price=first_exit_price,
+            first_exit_pct=first_exit_pct,
+            first_exit_timestamp=first_exit_timestamp,
+            first_exit_bars=first_exit_bars,
+
+            second_exit_triggered=second_exit_triggered,
+            second_exit_price=second_exit_price,
+            second_exit_pct=second_exit_pct,
+            second_exit_timestamp=second_exit_timestamp,
+            second_exit_bars=second_exit_bars,
+
+            first_exit_capital_pct=first_exit_capital_pct,
+            second_exit_capital_pct=second_exit_capital_pct,
+
+            weighted_profit_pct=weighted_profit_pct,
+            total_pnl_pct=total_pnl_pct
+        )
+
+    def _analyze_single_trade_enhanced(self, future_data: pd.DataFrame, entry_price: float,
+                                       target_price: float, sl_price: float,
+                                       target_pct: float, use_trailing_stop: bool = False,
+                                       intraday_mode: bool = False,
+                                       entry_timestamp: pd.Timestamp = None,
+                                       exit_time: str = '15:15') -> TradeOutcome:
+        """Enhanced single trade analysis with configurable stop loss and intraday mode (original logic)"""
+        target_reached = False
+        sl_hit = False
+        bars_to_resolution = 0
+        resolution_type = 'ongoing'
+        max_profit_pct = 0.0
+        max_drawdown_pct = 0.0
+        exit_timestamp = None
+        current_profit_pct = 0.0
+        current_price = entry_price
+        last_update_timestamp = None
+
+        # Trailing stop variables
+        trailing_active = False
+        trailing_sl_price = sl_price
+        highest_price_reached = entry_price
+        final_profit_pct = 0.0
+
+        # Parse intraday exit time
+        if intraday_mode and exit_time:
+            exit_hour, exit_minute = map(int, exit_time.split(':'))
+
+        for i, (timestamp, row) in enumerate(future_data.iterrows()):
+            high_price = row['high']
+            low_price = row['low']
+            close_price = row['close']
+
+            # Check for intraday exit if enabled
+            if intraday_mode and entry_timestamp:
+                if timestamp.date() == entry_timestamp.date():
+                    if timestamp.hour > exit_hour or (timestamp.hour == exit_hour and timestamp.minute >= exit_minute):
+                        bars_to_resolution = i + 1
+                        resolution_type = 'intraday_exit'
+                        exit_timestamp = timestamp
+                        current_price = close_price
+                        current_profit_pct = ((close_price - entry_price) / entry_price) * 100
+                        final_profit_pct = current_profit_pct
+
+                        if current_profit_pct > 0:
+                            target_reached = False
+                            success = True
+                        else:
+                            sl_hit = False
+                            success = False
+                        break
+
+            # Update current price and profit
+            current_price = close_price
+            last_update_timestamp = timestamp
+            current_profit_pct = ((close_price - entry_price) / entry_price) * 100
+
+            # Calculate max profit and drawdown from high/low
+            current_high_profit = ((high_price - entry_price) / entry_price) * 100
+            current_low_drawdown = ((low_price - entry_price) / entry_price) * 100
+
+            max_profit_pct = max(max_profit_pct, current_high_profit)
+            max_drawdown_pct = min(max_drawdown_pct, current_low_drawdown)
+
+            if use_trailing_stop:
+                # TRAILING STOP LOGIC
+                if not trailing_active:
+                    if high_price >= target_price:
+                        target_reached = True
+                        trailing_active = True
+                        trailing_sl_price = low_price
+                        highest_price_reached = high_price
+                        continue
+
+                    if low_price <= sl_price:
+                        sl_hit = True
+                        bars_to_resolution = i + 1
+                        resolution_type = 'stop_loss'
+                        exit_timestamp = timestamp
+                        final_profit_pct = ((sl_price - entry_price) / entry_price) * 100
+                        break
+                else:
+                    if high_price > highest_price_reached:
+                        highest_price_reached = high_price
+                        trailing_sl_price = low_price
+
+                    if low_price <= trailing_sl_price:
+                        sl_hit = True
+                        bars_to_resolution = i + 1
+                        resolution_type = 'trailing_stop'
+                        exit_timestamp = timestamp
+                        final_profit_pct = ((trailing_sl_price - entry_price) / entry_price) * 100
+                        break
+            else:
+                # FIXED STOP LOSS LOGIC
+                if high_price >= target_price:
+                    target_reached = True
+                    bars_to_resolution = i + 1
+                    resolution_type = 'target_hit'
+                    exit_timestamp = timestamp
+                    final_profit_pct = target_pct
+                    break
+
+                if low_price <= sl_price:
+                    sl_hit = True
+                    bars_to_resolution = i + 1
+                    resolution_type = 'stop_loss'
+                    exit_timestamp = timestamp
+                    final_profit_pct = ((sl_price - entry_price) / entry_price) * 100
+                    break
+
+        # Determine success based on stop loss type
+        if use_trailing_stop:
+            success = target_reached or (not sl_hit)
+            if target_reached:
+                success = True
+            elif sl_hit and not trailing_active:
+                success = False
+            else:
+                success = False
+        else:
+            success = target_reached
+
+        # Handle ongoing trades
+        if not target_reached and not sl_hit and resolution_type == 'ongoing':
+            final_profit_pct = current_profit_pct
+
+        return TradeOutcome(
+            success=success,
+            target_reached=target_reached,
+            sl_hit=sl_hit,
+            max_profit_pct=max_profit_pct,
+            max_drawdown_pct=max_drawdown_pct,
+            current_profit_pct=current_profit_pct,
+            bars_to_resolution=bars_to_resolution,
+            resolution_type=resolution_type,
+            target_price=target_price,
+            sl_price=sl_price,
+            target_pct_used=target_pct,
+            exit_timestamp=exit_timestamp,
+            entry_price=entry_price,
+            current_price=current_price,
+            last_update_timestamp=last_update_timestamp,
+            trailing_active=trailing_active if use_trailing_stop else False,
+            trailing_sl_price=trailing_sl_price if use_trailing_stop else sl_price,
+            highest_price_reached=highest_price_reached if use_trailing_stop else entry_price,
+            trailing_profit_pct=final_profit_pct,
+            partial_exits_enabled=False
+        )
+
+    def _get_entry_and_sl_prices(self, touch: SwingLowTouch) -> Tuple[float, float]:
+        """Get entry and stop loss prices based on pattern type"""
+        pattern = touch.pattern
+        pattern_type = touch.pattern_type
+
+        if pattern_type == 'pin_bar':
+            entry_price = pattern.close_price
+            sl_price = pattern.low_price
+        elif pattern_type == 'bullish_engulfing':
+            entry_price = pattern.second_candle_close
+            sl_price = pattern.pattern_low
+        elif pattern_type == 'three_candle':
+            entry_price = pattern.third_candle_close
+            sl_price = pattern.pattern_low
+        elif pattern_type == 'dragonfly_doji':
+            entry_price = pattern.close_price
+            sl_price = pattern.low_price
+        elif pattern_type == 'three_white_soldiers':
+            entry_price = pattern.third_candle_close
+            sl_price = pattern.pattern_low
+        elif pattern_type == 'bullish_marubozu':
+            entry_price = pattern.close_price
+            sl_price = pattern.open_price
+        elif pattern_type == 'bullish_harami':
+            entry_price = pattern.second_candle_close
+            sl_price = pattern.pattern_low
+        elif pattern_type == 'bullish_abandoned_baby':
+            entry_price = pattern.third_candle_close
+            sl_price = pattern.pattern_low
+        elif pattern_type == 'tweezer_bottom':
+            entry_price = pattern.second_candle_close
+            sl_price = pattern.pattern_low
+        elif pattern_type == 'bullish_kicker':
+            entry_price = pattern.second_candle_close
+            sl_price = pattern.pattern_low
+        else:
+            entry_price = getattr(pattern, 'close_price', getattr(pattern, 'third_candle_close', 0))
+            sl_price = getattr(pattern, 'pattern_low', getattr(pattern, 'low_price', entry_price * 0.98))
+
+        return entry_price, sl_price
+
+    def calculate_pnl(self, entry_price: float, trade_outcome: TradeOutcome, capital: float = None) -> float:
+        """Calculate P&L for a trade based on outcome with partial exit support"""
+        if capital is None:
+            capital = self.capital_per_trade
+
+        if trade_outcome.partial_exits_enabled:
+            # Use weighted profit for partial exits
+            return capital * (trade_outcome.total_pnl_pct / 100)
+        elif trade_outcome.trailing_active and trade_outcome.sl_hit:
+            return capital * (trade_outcome.trailing_profit_pct / 100)
+        elif trade_outcome.success and not trade_outcome.sl_hit:
+            return capital * (trade_outcome.current_profit_pct / 100)
+        elif trade_outcome.sl_hit:
+            loss_pct = ((trade_outcome.sl_price - entry_price) / entry_price) * 100
+            return capital * (loss_pct / 100)
+        else:
+            return capital * (trade_outcome.current_profit_pct / 100)
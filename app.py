@@ -12,25 +12,54 @@ import os
 import json
 import time
 import io
-from datetime import datetime, timedelta, date
-from dataclasses import dataclass, asdict, field
-from typing import List, Optional, Dict, Tuple, Union, Any
+from datetime import datetime, timedelta
+from typing import List, Dict, Tuple
 import warnings
 from pathlib import Path
 
+from apex_core import (
+    TV_AVAILABLE, Reporter, get_ist_now, convert_to_ist, format_ist_timestamp, safe_convert_to_ist,
+    safe_format_ist_timestamp, SwingLowTouch, EnhancedSwingLowDetector, EnhancedSwingLowTouchAnalyzer,
+    EnhancedTradeOutcomeAnalyzer, CapitalManager, MonteCarloCapitalSimulator, FileManager, BackgroundDataManager,
+    LivePatternAnalyzer, AnalysisSettings, stream_comprehensive_analysis, detect_selected_patterns_with_today,
+    parameter_grid, random_parameter_samples, run_parameter_sweep, StageMetrics
+)
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
 
 # Check for TradingView availability
-try:
-    from tvDatafeed import TvDatafeed, Interval
-
-    TV_AVAILABLE = True
-except ImportError:
-    TV_AVAILABLE = False
+if not TV_AVAILABLE:
     st.error("❌ TradingView DataFeed not available. Install with: pip install tvDatafeed")
 
-import pytz
+
+class StreamlitReporter(Reporter):
+    """Routes engine status messages and progress to Streamlit widgets"""
+
+    def __init__(self):
+        self._progress_bar = None
+
+    def info(self, message: str):
+        st.info(message)
+
+    def success(self, message: str):
+        st.success(message)
+
+    def warning(self, message: str):
+        st.warning(message)
+
+    def error(self, message: str):
+        st.error(message)
+
+    def progress(self, fraction: float):
+        if self._progress_bar is None:
+            self._progress_bar = st.progress(0)
+        self._progress_bar.progress(fraction)
+
+    def progress_done(self):
+        if self._progress_bar is not None:
+            self._progress_bar.empty()
+            self._progress_bar = None
 
 
 def save_analysis_results_to_scheduler_format(results):
@@ -67,69 +96,6 @@ def save_analysis_results_to_scheduler_format(results):
         json.dump(metadata, f, indent=2)
 
     return latest_file, timestamped_file
-def get_ist_now():
-    """Get current time in IST"""
-    utc = pytz.UTC
-    ist = pytz.timezone('Asia/Kolkata')
-    return datetime.now(utc).astimezone(ist)
-
-
-def convert_to_ist(timestamp):
-    """Convert any timestamp to IST"""
-    if isinstance(timestamp, str):
-        timestamp = pd.Timestamp(timestamp)
-
-    # Handle both datetime.datetime and pandas.Timestamp
-    if hasattr(timestamp, 'tzinfo'):
-        # Standard datetime object
-        if timestamp.tzinfo is None:
-            # Assume UTC if no timezone
-            timestamp = pytz.UTC.localize(timestamp)
-    elif hasattr(timestamp, 'tz'):
-        # Pandas Timestamp
-        if timestamp.tz is None:
-            # Assume UTC if no timezone
-            timestamp = timestamp.tz_localize('UTC')
-    else:
-        # Fallback - assume UTC
-        try:
-            timestamp = pytz.UTC.localize(timestamp)
-        except:
-            timestamp = pd.Timestamp(timestamp).tz_localize('UTC')
-
-    ist = pytz.timezone('Asia/Kolkata')
-    return timestamp.astimezone(ist)
-
-
-def format_ist_timestamp(timestamp=None):
-    """Format timestamp in IST for display"""
-    if timestamp is None:
-        timestamp = get_ist_now()
-    else:
-        timestamp = convert_to_ist(timestamp)
-
-    return timestamp.strftime('%Y-%m-%d %H:%M:%S IST')
-
-
-def safe_convert_to_ist(timestamp):
-    """Safely convert timestamp to IST with error handling"""
-    try:
-        return convert_to_ist(timestamp)
-    except Exception as e:
-        # If conversion fails, return current IST time
-        print(f"Warning: Timestamp conversion failed: {e}")
-        return get_ist_now()
-
-
-def safe_format_ist_timestamp(timestamp):
-    """Safely format timestamp in IST with error handling"""
-    try:
-        if pd.isna(timestamp) or timestamp in ['N/A', '']:
-            return 'N/A'
-        return format_ist_timestamp(timestamp)
-    except Exception as e:
-        print(f"Warning: Timestamp formatting failed: {e}")
-        return 'N/A'
 def check_login():
     """Handle login authentication - Enhanced with viewer support"""
     if 'authenticated' not in st.session_state:
@@ -868,6 +834,8 @@ def main():
     with tab6:
         st.header("📈 Professional Analytics Dashboard")
 
+        render_stage_metrics_section()
+
         if st.session_state.debug_info:
             st.subheader("🔍 AI Analysis Performance Metrics")
 
@@ -908,3438 +876,161 @@ def main():
 
     # Professional sidebar with logout button
     with st.sidebar:
-        st.header("🎛️ APEX AI SYSTEM")
-
-        # Logout button at the top
-        if st.button("🚪 Logout", use_container_width=True, key="sidebar_logout"):
-            logout()
-
-        st.divider()
-
-        # Professional AI features status
-        st.markdown("""
-        <div class="professional-card">
-        <h4 style="color: #0066cc; margin: 0;">🧠 APEX AI FEATURES</h4>
-        <p style="color: #5a6c7d; font-size: 12px; margin: 5px 0;">
-        ✅ Date Picker Downloads<br>
-        ✅ Real-Time Analysis<br>
-        ✅ Pattern Recognition<br>
-        ✅ Smart Capital Management<br>
-        ✅ Advanced Validation
-        </p>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.divider()
-
-        # Date picker status
-        use_date_picker = st.session_state.get('use_date_picker', False)
-        if use_date_picker:
-            download_start_date = st.session_state.get('data_download_start_date', datetime.now() - timedelta(days=30))
-            st.success(f"📅 Date Picker: {download_start_date.strftime('%Y-%m-%d')}")
-        else:
-            st.info("📅 Default bar counts")
-
-        # Professional status indicators
-        st.markdown("""
-        <div class="professional-card">
-        <h4 style="color: #00cc88; margin: 0;">🔧 SYSTEM STATUS</h4>
-        <p style="color: #5a6c7d; font-size: 12px; margin: 5px 0;">
-        ✅ Advanced Swing Low Validation<br>
-        ✅ Real-Time Trade Monitoring<br>
-        ✅ Precision Entry/Exit Detection<br>
-        ✅ AI Signal Validation<br>
-        ✅ Date-Based Data Downloads
-        </p>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.divider()
-
-        # Instruments status
-        if st.session_state.instruments_list:
-            st.success(f"✅ {len(st.session_state.instruments_list)} instruments loaded")
-        else:
-            st.warning("⚠️ No instruments loaded")
-
-        # Pattern selection status
-        selected_patterns_count = sum(st.session_state.pattern_selection.values())
-        if selected_patterns_count > 0:
-            st.success(f"🧠 {selected_patterns_count}/10 AI patterns selected")
-        else:
-            st.warning("⚠️ No patterns selected")
-
-        # Professional Capital Management Status
-        st.divider()
-        st.subheader("💰 Capital Management")
-
-        if st.session_state.capital_manager:
-            summary = st.session_state.capital_manager.get_performance_summary()
-            st.success(f"✅ AI Capital System Active")
-            st.metric("Total Capital", f"${summary['total_capital_current']:,.0f}")
-            st.metric("AI ROI", f"{summary['total_roi_pct']:.1f}%")
-            st.metric("Trades", f"{summary['trades_executed']}")
-        else:
-            st.info("💰 AI capital system ready")
-            st.metric("Total Capital", f"${st.session_state.total_capital:,.0f}")
-            st.metric("Per Trade", f"${st.session_state.capital_per_trade:,.0f}")
-
-        # Today's date and status
-        st.divider()
-        today_str = datetime.now().strftime('%Y-%m-%d')
-        st.metric("Today's Date", today_str)
-        st.success("✅ Real-time data active")
-
-        # Data update status
-        if st.session_state.last_data_update:
-            time_diff = datetime.now() - st.session_state.last_data_update
-            minutes_ago = int(time_diff.total_seconds() / 60)
-            st.info(f"🕒 Data updated: {minutes_ago}min ago")
-        else:
-            st.info("🕒 Ready for first update")
-
-        # Analysis status
-        if st.session_state.analysis_complete:
-            if st.session_state.analysis_results:
-                today_patterns = len(
-                    [r for r in st.session_state.analysis_results if r.get("Is Today's Pattern") == "YES"])
-                st.success(f"📊 {len(st.session_state.analysis_results)} opportunities found")
-                if today_patterns > 0:
-                    st.success(f"🎯 {today_patterns} from TODAY!")
-            else:
-                st.info("📊 Analysis complete - no opportunities")
-        else:
-            st.info("📊 Ready for AI analysis")
-
-        st.divider()
-
-        # Professional Patterns showcase
-        st.subheader("🧠 AI Pattern Recognition")
-        pattern_emojis = {
-            'pin_bar': '📍',
-            'bullish_engulfing': '🔥',
-            'three_candle': '🌟',
-            'dragonfly_doji': '🐉',
-            'three_white_soldiers': '⚔️',
-            'bullish_marubozu': '💪',
-            'bullish_harami': '🤰',
-            'bullish_abandoned_baby': '👶',
-            'tweezer_bottom': '🔧',
-            'bullish_kicker': '🚀'
-        }
-
-        for pattern_key, emoji in pattern_emojis.items():
-            is_selected = st.session_state.pattern_selection.get(pattern_key, False)
-            status = "✅" if is_selected else "⭕"
-            pattern_name = pattern_key.replace('_', ' ').title()
-            st.write(f"{status} {emoji} {pattern_name}")
-
-        st.divider()
-
-        # Professional quick actions
-        st.subheader("⚡ Quick Actions")
-
-        if st.button("🔄 Refresh Platform", use_container_width=True):
-            st.rerun()
-
-        if st.button("🧹 Reset Session", use_container_width=True):
-            for key in list(st.session_state.keys()):
-                if key not in ['file_manager', 'authenticated', 'login_username', 'is_viewer']:  # Keep essential keys
-                    del st.session_state[key]
-            st.success("Session reset!")
-            st.rerun()
-
-        st.divider()
-
-        # Professional summary
-        st.markdown("""
-        <div class="professional-card">
-        <h5 style="color: #0066cc; margin: 0;">🧠 APEX AI PLATFORM</h5>
-        <p style="color: #5a6c7d; font-size: 11px; margin: 3px 0;">
-        Professional AI Market Analysis Platform with real-time pattern detection, 
-        advanced capital management, and comprehensive trading analytics.
-        </p>
-        </div>
-        """, unsafe_allow_html=True)
-
-
-
-
-@dataclass
-class SwingLow:
-    """Represents a swing low point in price data - ENHANCED WITH INVALIDATION TRACKING"""
-    index: int
-    timestamp: pd.Timestamp
-    price: float
-    is_invalidated: bool = False
-    invalidation_timestamp: Optional[pd.Timestamp] = None
-    invalidation_index: Optional[int] = None
-    is_touched: bool = False
-    touch_timestamp: Optional[pd.Timestamp] = None
-    touch_pattern: Optional[str] = None
-    touch_index: Optional[int] = None
-
-
-@dataclass
-class PinBar:
-    """Represents a pin bar candlestick pattern"""
-    index: int
-    timestamp: pd.Timestamp
-    open_price: float
-    high_price: float
-    low_price: float
-    close_price: float
-    pattern_type: str = 'pin_bar'
-    body_ratio: float = 0.0
-    wick_ratio: float = 0.0
-    is_bullish: bool = True
-    is_live: bool = False
-    pattern_strength: float = 0.0
-
-
-@dataclass
-class BullishEngulfing:
-    """Represents a bullish engulfing candlestick pattern"""
-    index: int
-    timestamp: pd.Timestamp
-    first_candle_open: float
-    first_candle_high: float
-    first_candle_low: float
-    first_candle_close: float
-    second_candle_open: float
-    second_candle_high: float
-    second_candle_low: float
-    second_candle_close: float
-    pattern_type: str = 'bullish_engulfing'
-    engulfing_ratio: float = 0.0
-    pattern_low: float = 0.0
-    is_bullish: bool = True
-    is_live: bool = False
-    pattern_strength: float = 0.0
-
-
-@dataclass
-class ThreeCandle:
-    """Represents a three candle (Morning Star) pattern"""
-    index: int
-    timestamp: pd.Timestamp
-    first_candle_open: float
-    first_candle_high: float
-    first_candle_low: float
-    first_candle_close: float
-    second_candle_open: float
-    second_candle_high: float
-    second_candle_low: float
-    second_candle_close: float
-    third_candle_open: float
-    third_candle_high: float
-    third_candle_low: float
-    third_candle_close: float
-    pattern_type: str = 'three_candle'
-    pattern_low: float = 0.0
-    pattern_strength: float = 0.0
-    is_bullish: bool = True
-    is_live: bool = False
-
-
-@dataclass
-class DragonflyDoji:
-    """Represents a dragonfly doji pattern"""
-    index: int
-    timestamp: pd.Timestamp
-    open_price: float
-    high_price: float
-    low_price: float
-    close_price: float
-    pattern_type: str = 'dragonfly_doji'
-    body_ratio: float = 0.0
-    lower_wick_ratio: float = 0.0
-    is_bullish: bool = True
-    is_live: bool = False
-    pattern_strength: float = 0.0
-
-
-@dataclass
-class ThreeWhiteSoldiers:
-    """Represents a three white soldiers pattern"""
-    index: int
-    timestamp: pd.Timestamp
-    first_candle_open: float
-    first_candle_high: float
-    first_candle_low: float
-    first_candle_close: float
-    second_candle_open: float
-    second_candle_high: float
-    second_candle_low: float
-    second_candle_close: float
-    third_candle_open: float
-    third_candle_high: float
-    third_candle_low: float
-    third_candle_close: float
-    pattern_type: str = 'three_white_soldiers'
-    pattern_low: float = 0.0
-    average_body_size: float = 0.0
-    is_bullish: bool = True
-    is_live: bool = False
-    pattern_strength: float = 0.0
-
-
-@dataclass
-class BullishMarubozu:
-    """Represents a bullish marubozu pattern"""
-    index: int
-    timestamp: pd.Timestamp
-    open_price: float
-    high_price: float
-    low_price: float
-    close_price: float
-    pattern_type: str = 'bullish_marubozu'
-    body_size: float = 0.0
-    upper_wick_ratio: float = 0.0
-    lower_wick_ratio: float = 0.0
-    is_bullish: bool = True
-    is_live: bool = False
-    pattern_strength: float = 0.0
-
-
-@dataclass
-class BullishHarami:
-    """Represents a bullish harami pattern"""
-    index: int
-    timestamp: pd.Timestamp
-    first_candle_open: float
-    first_candle_high: float
-    first_candle_low: float
-    first_candle_close: float
-    second_candle_open: float
-    second_candle_high: float
-    second_candle_low: float
-    second_candle_close: float
-    pattern_type: str = 'bullish_harami'
-    pattern_low: float = 0.0
-    containment_ratio: float = 0.0
-    is_bullish: bool = True
-    is_live: bool = False
-    pattern_strength: float = 0.0
-
-
-@dataclass
-class BullishAbandonedBaby:
-    """Represents a bullish abandoned baby pattern"""
-    index: int
-    timestamp: pd.Timestamp
-    first_candle_open: float
-    first_candle_high: float
-    first_candle_low: float
-    first_candle_close: float
-    doji_open: float
-    doji_high: float
-    doji_low: float
-    doji_close: float
-    third_candle_open: float
-    third_candle_high: float
-    third_candle_low: float
-    third_candle_close: float
-    pattern_type: str = 'bullish_abandoned_baby'
-    pattern_low: float = 0.0
-    gap_down_size: float = 0.0
-    gap_up_size: float = 0.0
-    is_bullish: bool = True
-    is_live: bool = False
-    pattern_strength: float = 0.0
-
-
-@dataclass
-class TweezerBottom:
-    """Represents a tweezer bottom pattern"""
-    index: int
-    timestamp: pd.Timestamp
-    first_candle_open: float
-    first_candle_high: float
-    first_candle_low: float
-    first_candle_close: float
-    second_candle_open: float
-    second_candle_high: float
-    second_candle_low: float
-    second_candle_close: float
-    pattern_type: str = 'tweezer_bottom'
-    pattern_low: float = 0.0
-    low_match_precision: float = 0.0
-    is_bullish: bool = True
-    is_live: bool = False
-    pattern_strength: float = 0.0
-
-
-@dataclass
-class BullishKicker:
-    """Represents a bullish kicker pattern"""
-    index: int
-    timestamp: pd.Timestamp
-    first_candle_open: float
-    first_candle_high: float
-    first_candle_low: float
-    first_candle_close: float
-    second_candle_open: float
-    second_candle_high: float
-    second_candle_low: float
-    second_candle_close: float
-    pattern_type: str = 'bullish_kicker'
-    pattern_low: float = 0.0
-    gap_size: float = 0.0
-    is_bullish: bool = True
-    is_live: bool = False
-    pattern_strength: float = 0.0
-
-
-@dataclass
-class TradeOutcome:
-    """Enhanced trade outcome with trailing stop and partial exit support"""
-    success: bool
-    target_reached: bool
-    sl_hit: bool
-    max_profit_pct: float
-    max_drawdown_pct: float
-    current_profit_pct: float
-    bars_to_resolution: int
-    resolution_type: str
-    target_price: float
-    sl_price: float
-    target_pct_used: float = 0.0
-    exit_timestamp: Optional[pd.Timestamp] = None
-    exit_price: float = 0.0
-    entry_price: float = 0.0
-    current_price: float = 0.0
-    last_update_timestamp: Optional[pd.Timestamp] = None
-
-    # Trailing stop fields
-    trailing_active: bool = False
-    trailing_sl_price: float = 0.0
-    highest_price_reached: float = 0.0
-    trailing_profit_pct: float = 0.0
-
-    # Partial exit fields
-    partial_exits_enabled: bool = False
-    first_exit_triggered: bool = False
-    first_exit_price: float = 0.0
-    first_exit_pct: float = 0.5  # Default 0.5%
-    first_exit_timestamp: Optional[pd.Timestamp] = None
-    first_exit_bars: int = 0
-
-    second_exit_triggered: bool = False
-    second_exit_price: float = 0.0
-    second_exit_pct: float = 0.9  # Default 0.9%
-    second_exit_timestamp: Optional[pd.Timestamp] = None
-    second_exit_bars: int = 0
-
-    # Partial exit capital tracking
-    first_exit_capital_pct: float = 50.0  # 50% of capital
-    second_exit_capital_pct: float = 50.0  # Remaining 50%
-
-    # Weighted average exit
-    weighted_exit_price: float = 0.0
-    weighted_profit_pct: float = 0.0
-    total_pnl_pct: float = 0.0
-
-
-@dataclass
-class SwingLowTouch:
-    """Represents a pattern touching an untouched swing low - ENHANCED"""
-    swing_low: SwingLow
-    pattern: Union[PinBar, BullishEngulfing, ThreeCandle, DragonflyDoji, ThreeWhiteSoldiers,
-    BullishMarubozu, BullishHarami, BullishAbandonedBaby, TweezerBottom, BullishKicker]
-    touch_type: str
-    pattern_type: str
-    distance_pips: float
-    days_between: int
-    price_difference: float
-    trade_outcome: Optional[TradeOutcome] = None
-    is_live: bool = False
-    pattern_strength: float = 0.0
-    symbol: str = ""
-    timeframe: str = ""
-    entry_price: float = 0.0
-    sl_price: float = 0.0
-    target_price: float = 0.0
-    is_swing_low_valid: bool = True  # Track if swing low was valid at touch time
-
-
-# ============================================================================
-# COMPLETE CAPITAL MANAGEMENT DATA STRUCTURES
-# ============================================================================
-
-@dataclass
-class CapitalEvent:
-    """Represents a capital event (lock/release)"""
-    timestamp: pd.Timestamp
-    event_type: str  # 'lock', 'release'
-    amount: float
-    trade_id: str
-    symbol: str
-    pattern_type: str
-    entry_price: float
-    exit_price: Optional[float] = None
-    pnl: Optional[float] = None
-    available_capital_after: float = 0.0
-    locked_capital_after: float = 0.0
-
-
-@dataclass
-class Trade:
-    """Enhanced trade structure with complete capital management"""
-    trade_id: str
-    symbol: str
-    timeframe: str
-    pattern_type: str
-    entry_timestamp: pd.Timestamp
-    entry_price: float
-    capital_allocated: float
-    target_price: float
-    sl_price: float
-    target_pct: float
-
-    # Trade status
-    status: str = 'open'  # 'open', 'closed'
-    exit_timestamp: Optional[pd.Timestamp] = None
-    exit_price: Optional[float] = None
-    pnl: Optional[float] = None
-    roi_pct: Optional[float] = None
-
-    # Touch details
-    swing_low_touch: Optional[SwingLowTouch] = None
-    trade_outcome: Optional[TradeOutcome] = None
-
-    # Capital tracking
-    capital_locked_timestamp: Optional[pd.Timestamp] = None
-    capital_released_timestamp: Optional[pd.Timestamp] = None
-
-    # Additional tracking
-    days_held: int = 0
-    bars_held: int = 0
-
-
-# ============================================================================
-# ENHANCED SWING LOW DETECTOR - PROFESSIONAL VERSION
-# ============================================================================
-
-class EnhancedSwingLowDetector:
-    """Enhanced swing low detector with customizable asymmetric parameters - COMPLETE VERSION"""
-
-    def __init__(self, left_lookback: int = 10, right_lookback: int = None, min_swing_size_pct: float = 0.5):
-        self.left_lookback = left_lookback
-
-        # CUSTOMIZABLE RIGHT LOOKBACK - User can set explicitly
-        if right_lookback is not None:
-            self.right_lookback = max(1, right_lookback)  # Minimum 1 bar
-        else:
-            # Default formula: right = left/3, minimum 2
-            self.right_lookback = max(2, left_lookback // 3)
-
-        self.min_swing_size_pct = min_swing_size_pct
-
-    def find_swing_lows_with_invalidation(self, df: pd.DataFrame) -> List[SwingLow]:
-        """Find swing lows and track their invalidation professionally - ASYMMETRIC VERSION"""
-        swing_lows = []
-
-        # ASYMMETRIC PARAMETERS - Key change from original
-        left_lookback = self.left_lookback  # Full historical context
-        right_lookback = self.right_lookback  # User customizable confirmation
-
-        print(f"🔧 Asymmetric swing detection: {left_lookback} left + {right_lookback} right bars")
-
-        # ASYMMETRIC RANGE - This is the crucial change
-        start_idx = left_lookback
-        end_idx = len(df) - right_lookback  # Much earlier detection possible
-
-        if end_idx <= start_idx:
-            print(f"❌ Not enough data: need {left_lookback + right_lookback} bars, have {len(df)}")
-            return swing_lows
-
-        print(f"🔍 Checking bars {start_idx} to {end_idx - 1} (total: {end_idx - start_idx} bars)")
-
-        # Step 1: Find all potential swing lows using asymmetric logic
-        for i in range(start_idx, end_idx):
-            if i >= len(df):
-                break
-
-            current_low = df['low'].iloc[i]
-
-            # LEFT SIDE CHECK (Historical Context - Full lookback)
-            left_valid = True
-            for j in range(max(0, i - left_lookback), i):
-                if j < len(df) and df['low'].iloc[j] < current_low:
-                    left_valid = False
-                    break
-
-            # RIGHT SIDE CHECK (Forward Confirmation - Customizable lookback)
-            right_valid = True
-            for j in range(i + 1, min(i + right_lookback + 1, len(df))):
-                if j < len(df) and df['low'].iloc[j] < current_low:
-                    right_valid = False
-                    break
-
-            if left_valid and right_valid:
-                swing_low = SwingLow(
-                    index=i,
-                    timestamp=df.index[i],
-                    price=current_low,
-                    is_invalidated=False,
-                    invalidation_timestamp=None,
-                    invalidation_index=None,
-                    is_touched=False,
-                    touch_timestamp=None,
-                    touch_pattern=None,
-                    touch_index=None
-                )
-                swing_lows.append(swing_low)
-
-        print(f"✅ Found {len(swing_lows)} asymmetric swing lows")
-
-        # Step 2: Check invalidation for each swing low
-        invalidated_count = 0
-        for swing_low in swing_lows:
-            # Look at all future data after this swing low
-            future_data = df[df.index > swing_low.timestamp]
-
-            for future_index, (future_timestamp, future_row) in enumerate(future_data.iterrows()):
-                # If any future candle's low breaks below swing low, invalidate it
-                if future_row['low'] < swing_low.price:
-                    swing_low.is_invalidated = True
-                    swing_low.invalidation_timestamp = future_timestamp
-                    swing_low.invalidation_index = swing_low.index + future_index + 1
-                    invalidated_count += 1
-                    break
-
-        valid_count = len(swing_lows) - invalidated_count
-        print(f"📊 Invalidation check: {valid_count} valid, {invalidated_count} invalidated")
-
-        return swing_lows
-
-    def get_valid_swing_lows_at_timestamp(self, swing_lows: List[SwingLow],
-                                          check_timestamp: pd.Timestamp) -> List[SwingLow]:
-        """Get swing lows that are still valid at a specific timestamp"""
-        valid_lows = []
-
-        for swing_low in swing_lows:
-            # Swing low must exist before the check timestamp
-            if swing_low.timestamp >= check_timestamp:
-                continue
-
-            # If swing low is invalidated, check if invalidation happened after check_timestamp
-            if swing_low.is_invalidated:
-                if swing_low.invalidation_timestamp and swing_low.invalidation_timestamp <= check_timestamp:
-                    continue  # Was already invalidated at check time
-
-            valid_lows.append(swing_low)
-
-        return valid_lows
-
-    def find_swing_lows(self, df: pd.DataFrame) -> List[SwingLow]:
-        """Legacy method for compatibility"""
-        return self.find_swing_lows_with_invalidation(df)
-
-    def find_untouched_swing_lows(self, df: pd.DataFrame, swing_lows: List[SwingLow]) -> List[SwingLow]:
-        """Find swing lows that remain untouched by future price action"""
-        untouched_lows = []
-
-        for swing_low in swing_lows:
-            if not swing_low.is_touched and not swing_low.is_invalidated:
-                untouched_lows.append(swing_low)
-
-        return untouched_lows
-
-
-# ============================================================================
-# ENHANCED TRADE OUTCOME ANALYZER - PROFESSIONAL VERSION
-# ============================================================================
-
-class EnhancedTradeOutcomeAnalyzer:
-    """Enhanced analyzer with professional current status tracking, flexible targets, and partial exits"""
-
-    def __init__(self, max_bars_to_analyze: int = 100, capital_per_trade: float = 10000):
-        self.max_bars_to_analyze = max_bars_to_analyze
-        self.capital_per_trade = capital_per_trade
-
-        # Default timeframe-specific targets for optimized trading
-        self.default_timeframe_targets = {
-            '1m': 0.5,  # 0.5% for 1-minute scalping
-            '5m': 0.75,  # 0.75% for 5-minute quick trades
-            '15m': 1.0,  # 1% for 15-minute intraday
-            '30m': 1.5,  # 1.5% for 30-minute intraday
-            '1H': 2.5,  # 2.5% for 1-hour short swings
-            '4H': 5.0,  # 5% for 4-hour swing trades
-            '1D': 8.0  # 8% for daily position trades
-        }
-
-        # Partial exit configuration
-        self.partial_exit_config = {
-            'first_exit_pct': 0.5,  # Exit at 0.5%
-            'second_exit_pct': 0.9,  # Exit at 0.9%
-            'first_exit_capital_pct': 50.0,  # 50% of capital
-            'second_exit_capital_pct': 50.0  # Remaining 50%
-        }
-
-    def get_target_for_timeframe(self, timeframe: str, custom_target: float = None) -> float:
-        """Get appropriate target percentage for timeframe or use custom target"""
-        if custom_target is not None and custom_target > 0:
-            return custom_target
-        return self.default_timeframe_targets.get(timeframe, 2.0)  # Default 2%
-
-    def analyze_trade_outcomes_with_timeframe(self, df: pd.DataFrame, touches: List[SwingLowTouch],
-                                              timeframe: str, use_trailing_stop: bool = False,
-                                              intraday_mode: bool = False,
-                                              entry_cutoff_time: str = '11:45',
-                                              exit_time: str = '15:15',
-                                              custom_target_pct: float = None,
-                                              use_partial_exits: bool = False,
-                                              first_exit_pct: float = 0.5,
-                                              second_exit_pct: float = 0.9,
-                                              first_exit_capital_pct: float = 50.0) -> List[SwingLowTouch]:
-        """Analyze trade outcomes with flexible targets, partial exits, and configurable options"""
-        enhanced_touches = []
-        target_pct = self.get_target_for_timeframe(timeframe, custom_target_pct)
-
-        for touch in touches:
-            # Skip live patterns for outcome analysis
-            if touch.is_live:
-                enhanced_touches.append(touch)
-                continue
-
-            # Check intraday entry cutoff if in intraday mode
-            if intraday_mode:
-                pattern_time = pd.Timestamp(touch.pattern.timestamp)
-                pattern_hour_min = pattern_time.strftime('%H:%M')
-
-                # Skip patterns that occur after entry cutoff time
-                if pattern_hour_min > entry_cutoff_time:
-                    continue
-
-            # Get entry and stop loss prices based on pattern type
-            entry_price, sl_price = self._get_entry_and_sl_prices(touch)
-
-            # Calculate target price using flexible target
-            target_price = entry_price * (1 + target_pct / 100)
-
-            # Store prices in touch for capital management
-            touch.entry_price = entry_price
-            touch.sl_price = sl_price
-            touch.target_price = target_price
-
-            # Get future data after the pattern
-            pattern_index = touch.pattern.index
-            future_data = df.iloc[pattern_index + 1:pattern_index + 1 + self.max_bars_to_analyze]
-
-            if future_data.empty:
-                trade_outcome = TradeOutcome(
-                    success=False, target_reached=False, sl_hit=False,
-                    max_profit_pct=0.0, max_drawdown_pct=0.0, current_profit_pct=0.0,
-                    bars_to_resolution=0, resolution_type='no_data',
-                    target_price=target_price, sl_price=sl_price,
-                    target_pct_used=target_pct,
-                    entry_price=entry_price, current_price=entry_price,
-                    partial_exits_enabled=use_partial_exits,
-                    first_exit_pct=first_exit_pct,
-                    second_exit_pct=second_exit_pct,
-                    first_exit_capital_pct=first_exit_capital_pct,
-                    second_exit_capital_pct=100.0 - first_exit_capital_pct
-                )
-            else:
-                if use_partial_exits:
-                    trade_outcome = self._analyze_single_trade_with_partial_exits(
-                        future_data, entry_price, target_price, sl_price, target_pct,
-                        use_trailing_stop, intraday_mode,
-                        pd.Timestamp(touch.pattern.timestamp), exit_time,
-                        first_exit_pct, second_exit_pct, first_exit_capital_pct
-                    )
-                else:
-                    trade_outcome = self._analyze_single_trade_enhanced(
-                        future_data, entry_price, target_price, sl_price, target_pct,
-                        use_trailing_stop, intraday_mode,
-                        pd.Timestamp(touch.pattern.timestamp), exit_time
-                    )
-
-            # Create enhanced touch with trade outcome
-            enhanced_touch = SwingLowTouch(
-                swing_low=touch.swing_low,
-                pattern=touch.pattern,
-                touch_type=touch.touch_type,
-                pattern_type=touch.pattern_type,
-                distance_pips=touch.distance_pips,
-                days_between=touch.days_between,
-                price_difference=touch.price_difference,
-                trade_outcome=trade_outcome,
-                is_live=touch.is_live,
-                pattern_strength=touch.pattern_strength,
-                symbol=touch.symbol,
-                timeframe=touch.timeframe,
-                entry_price=entry_price,
-                sl_price=sl_price,
-                target_price=target_price,
-                is_swing_low_valid=touch.is_swing_low_valid
-            )
-
-            enhanced_touches.append(enhanced_touch)
-
-        return enhanced_touches
-
-    def _analyze_single_trade_with_partial_exits(self, future_data: pd.DataFrame, entry_price: float,
-                                                 target_price: float, sl_price: float, target_pct: float,
-                                                 use_trailing_stop: bool = False,
-                                                 intraday_mode: bool = False,
-                                                 entry_timestamp: pd.Timestamp = None,
-                                                 exit_time: str = '15:15',
-                                                 first_exit_pct: float = 0.5,
-                                                 second_exit_pct: float = 0.9,
-                                                 first_exit_capital_pct: float = 50.0) -> TradeOutcome:
-        """Analyze single trade with partial exit support"""
-
-        # Calculate partial exit prices
-        first_exit_price = entry_price * (1 + first_exit_pct / 100)
-        second_exit_price = entry_price * (1 + second_exit_pct / 100)
-        second_exit_capital_pct = 100.0 - first_exit_capital_pct
-
-        # Initialize tracking variables
-        first_exit_triggered = False
-        first_exit_timestamp = None
-        first_exit_bars = 0
-
-        second_exit_triggered = False
-        second_exit_timestamp = None
-        second_exit_bars = 0
-
-        sl_hit = False
-        bars_to_resolution = 0
-        resolution_type = 'ongoing'
-        max_profit_pct = 0.0
-        max_drawdown_pct = 0.0
-        exit_timestamp = None
-        current_profit_pct = 0.0
-        current_price = entry_price
-        last_update_timestamp = None
-
-        # Position tracking
-        remaining_position_pct = 100.0  # Start with 100% position
-
-        # Parse intraday exit time
-        if intraday_mode and exit_time:
-            exit_hour, exit_minute = map(int, exit_time.split(':'))
-
-        for i, (timestamp, row) in enumerate(future_data.iterrows()):
-            high_price = row['high']
-            low_price = row['low']
-            close_price = row['close']
-
-            # Check for intraday exit
-            if intraday_mode and entry_timestamp:
-                if timestamp.date() == entry_timestamp.date():
-                    if timestamp.hour > exit_hour or (timestamp.hour == exit_hour and timestamp.minute >= exit_minute):
-                        # Force exit at close price
-                        bars_to_resolution = i + 1
-                        resolution_type = 'intraday_exit'
-                        exit_timestamp = timestamp
-                        current_price = close_price
-                        current_profit_pct = ((close_price - entry_price) / entry_price) * 100
-                        break
-
-            # Update current price and profit
-            current_price = close_price
-            last_update_timestamp = timestamp
-            current_profit_pct = ((close_price - entry_price) / entry_price) * 100
-
-            # Calculate max profit and drawdown
-            current_high_profit = ((high_price - entry_price) / entry_price) * 100
-            current_low_drawdown = ((low_price - entry_price) / entry_price) * 100
-            max_profit_pct = max(max_profit_pct, current_high_profit)
-            max_drawdown_pct = min(max_drawdown_pct, current_low_drawdown)
-
-            # Check for stop loss (applies to entire remaining position)
-            if low_price <= sl_price and remaining_position_pct > 0:
-                sl_hit = True
-                bars_to_resolution = i + 1
-                resolution_type = 'stop_loss'
-                exit_timestamp = timestamp
-                break
-
-            # Check for first partial exit
-            if not first_exit_triggered and high_price >= first_exit_price:
-                first_exit_triggered = True
-                first_exit_timestamp = timestamp
-                first_exit_bars = i + 1
-                remaining_position_pct -= first_exit_capital_pct
-
-                # Don't break, continue to check for second exit
-
-            # Check for second partial exit
-            if not second_exit_triggered and high_price >= second_exit_price:
-                second_exit_triggered = True
-                second_exit_timestamp = timestamp
-                second_exit_bars = i + 1
-                remaining_position_pct -= second_exit_capital_pct
-
-                # If both exits triggered, position is closed
-                if first_exit_triggered and second_exit_triggered:
-                    bars_to_resolution = i + 1
-                    resolution_type = 'partial_exits_complete'
-                    exit_timestamp = timestamp
-                    break
-
-        # Calculate weighted results
-        weighted_profit_pct = 0.0
-        total_pnl_pct = 0.0
-
-        if sl_hit:
-            # Stop loss hit - entire remaining position exits at stop loss
-            loss_pct = ((sl_price - entry_price) / entry_price) * 100
-            if first_exit_triggered:
-                # First exit successful, remaining position hit stop loss
-                weighted_profit_pct = (first_exit_pct * first_exit_capital_pct +
-                                       loss_pct * second_exit_capital_pct) / 100.0
-                total_pnl_pct = weighted_profit_pct
-            else:
-                # Full position hit stop loss
-                weighted_profit_pct = loss_pct
-                total_pnl_pct = loss_pct
-        else:
-            # Calculate based on partial exits
-            if first_exit_triggered and second_exit_triggered:
-                # Both targets hit
-                weighted_profit_pct = (first_exit_pct * first_exit_capital_pct +
-                                       second_exit_pct * second_exit_capital_pct) / 100.0
-                total_pnl_pct = weighted_profit_pct
-            elif first_exit_triggered:
-                # Only first target hit, rest still open
-                weighted_profit_pct = (first_exit_pct * first_exit_capital_pct +
-                                       current_profit_pct * second_exit_capital_pct) / 100.0
-                total_pnl_pct = weighted_profit_pct
-            else:
-                # No targets hit yet
-                weighted_profit_pct = current_profit_pct
-                total_pnl_pct = current_profit_pct
-
-        # Determine success
-        success = first_exit_triggered or second_exit_triggered
-        target_reached = second_exit_triggered  # Full target is second exit
-
-        return TradeOutcome(
-            success=success,
-            target_reached=target_reached,
-            sl_hit=sl_hit,
-            max_profit_pct=max_profit_pct,
-            max_drawdown_pct=max_drawdown_pct,
-            current_profit_pct=current_profit_pct,
-            bars_to_resolution=bars_to_resolution,
-            resolution_type=resolution_type,
-            target_price=target_price,
-            sl_price=sl_price,
-            target_pct_used=target_pct,
-            exit_timestamp=exit_timestamp,
-            entry_price=entry_price,
-            current_price=current_price,
-            last_update_timestamp=last_update_timestamp,
-
-            # Partial exit data
-            partial_exits_enabled=True,
-            first_exit_triggered=first_exit_triggered,
-            first_exit_price=first_exit_price,
-            first_exit_pct=first_exit_pct,
-            first_exit_timestamp=first_exit_timestamp,
-            first_exit_bars=first_exit_bars,
-
-            second_exit_triggered=second_exit_triggered,
-            second_exit_price=second_exit_price,
-            second_exit_pct=second_exit_pct,
-            second_exit_timestamp=second_exit_timestamp,
-            second_exit_bars=second_exit_bars,
-
-            first_exit_capital_pct=first_exit_capital_pct,
-            second_exit_capital_pct=second_exit_capital_pct,
-
-            weighted_profit_pct=weighted_profit_pct,
-            total_pnl_pct=total_pnl_pct
-        )
-
-    def _analyze_single_trade_enhanced(self, future_data: pd.DataFrame, entry_price: float,
-                                       target_price: float, sl_price: float,
-                                       target_pct: float, use_trailing_stop: bool = False,
-                                       intraday_mode: bool = False,
-                                       entry_timestamp: pd.Timestamp = None,
-                                       exit_time: str = '15:15') -> TradeOutcome:
-        """Enhanced single trade analysis with configurable stop loss and intraday mode (original logic)"""
-        target_reached = False
-        sl_hit = False
-        bars_to_resolution = 0
-        resolution_type = 'ongoing'
-        max_profit_pct = 0.0
-        max_drawdown_pct = 0.0
-        exit_timestamp = None
-        current_profit_pct = 0.0
-        current_price = entry_price
-        last_update_timestamp = None
-
-        # Trailing stop variables
-        trailing_active = False
-        trailing_sl_price = sl_price
-        highest_price_reached = entry_price
-        final_profit_pct = 0.0
-
-        # Parse intraday exit time
-        if intraday_mode and exit_time:
-            exit_hour, exit_minute = map(int, exit_time.split(':'))
-
-        for i, (timestamp, row) in enumerate(future_data.iterrows()):
-            high_price = row['high']
-            low_price = row['low']
-            close_price = row['close']
-
-            # Check for intraday exit if enabled
-            if intraday_mode and entry_timestamp:
-                if timestamp.date() == entry_timestamp.date():
-                    if timestamp.hour > exit_hour or (timestamp.hour == exit_hour and timestamp.minute >= exit_minute):
-                        bars_to_resolution = i + 1
-                        resolution_type = 'intraday_exit'
-                        exit_timestamp = timestamp
-                        current_price = close_price
-                        current_profit_pct = ((close_price - entry_price) / entry_price) * 100
-                        final_profit_pct = current_profit_pct
-
-                        if current_profit_pct > 0:
-                            target_reached = False
-                            success = True
-                        else:
-                            sl_hit = False
-                            success = False
-                        break
-
-            # Update current price and profit
-            current_price = close_price
-            last_update_timestamp = timestamp
-            current_profit_pct = ((close_price - entry_price) / entry_price) * 100
-
-            # Calculate max profit and drawdown from high/low
-            current_high_profit = ((high_price - entry_price) / entry_price) * 100
-            current_low_drawdown = ((low_price - entry_price) / entry_price) * 100
-
-            max_profit_pct = max(max_profit_pct, current_high_profit)
-            max_drawdown_pct = min(max_drawdown_pct, current_low_drawdown)
-
-            if use_trailing_stop:
-                # TRAILING STOP LOGIC
-                if not trailing_active:
-                    if high_price >= target_price:
-                        target_reached = True
-                        trailing_active = True
-                        trailing_sl_price = low_price
-                        highest_price_reached = high_price
-                        continue
-
-                    if low_price <= sl_price:
-                        sl_hit = True
-                        bars_to_resolution = i + 1
-                        resolution_type = 'stop_loss'
-                        exit_timestamp = timestamp
-                        final_profit_pct = ((sl_price - entry_price) / entry_price) * 100
-                        break
-                else:
-                    if high_price > highest_price_reached:
-                        highest_price_reached = high_price
-                        trailing_sl_price = low_price
-
-                    if low_price <= trailing_sl_price:
-                        sl_hit = True
-                        bars_to_resolution = i + 1
-                        resolution_type = 'trailing_stop'
-                        exit_timestamp = timestamp
-                        final_profit_pct = ((trailing_sl_price - entry_price) / entry_price) * 100
-                        break
-            else:
-                # FIXED STOP LOSS LOGIC
-                if high_price >= target_price:
-                    target_reached = True
-                    bars_to_resolution = i + 1
-                    resolution_type = 'target_hit'
-                    exit_timestamp = timestamp
-                    final_profit_pct = target_pct
-                    break
-
-                if low_price <= sl_price:
-                    sl_hit = True
-                    bars_to_resolution = i + 1
-                    resolution_type = 'stop_loss'
-                    exit_timestamp = timestamp
-                    final_profit_pct = ((sl_price - entry_price) / entry_price) * 100
-                    break
-
-        # Determine success based on stop loss type
-        if use_trailing_stop:
-            success = target_reached or (not sl_hit)
-            if target_reached:
-                success = True
-            elif sl_hit and not trailing_active:
-                success = False
-            else:
-                success = False
-        else:
-            success = target_reached
-
-        # Handle ongoing trades
-        if not target_reached and not sl_hit and resolution_type == 'ongoing':
-            final_profit_pct = current_profit_pct
-
-        return TradeOutcome(
-            success=success,
-            target_reached=target_reached,
-            sl_hit=sl_hit,
-            max_profit_pct=max_profit_pct,
-            max_drawdown_pct=max_drawdown_pct,
-            current_profit_pct=current_profit_pct,
-            bars_to_resolution=bars_to_resolution,
-            resolution_type=resolution_type,
-            target_price=target_price,
-            sl_price=sl_price,
-            target_pct_used=target_pct,
-            exit_timestamp=exit_timestamp,
-            entry_price=entry_price,
-            current_price=current_price,
-            last_update_timestamp=last_update_timestamp,
-            trailing_active=trailing_active if use_trailing_stop else False,
-            trailing_sl_price=trailing_sl_price if use_trailing_stop else sl_price,
-            highest_price_reached=highest_price_reached if use_trailing_stop else entry_price,
-            trailing_profit_pct=final_profit_pct,
-            partial_exits_enabled=False
-        )
-
-    def _get_entry_and_sl_prices(self, touch: SwingLowTouch) -> Tuple[float, float]:
-        """Get entry and stop loss prices based on pattern type"""
-        pattern = touch.pattern
-        pattern_type = touch.pattern_type
-
-        if pattern_type == 'pin_bar':
-            entry_price = pattern.close_price
-            sl_price = pattern.low_price
-        elif pattern_type == 'bullish_engulfing':
-            entry_price = pattern.second_candle_close
-            sl_price = pattern.pattern_low
-        elif pattern_type == 'three_candle':
-            entry_price = pattern.third_candle_close
-            sl_price = pattern.pattern_low
-        elif pattern_type == 'dragonfly_doji':
-            entry_price = pattern.close_price
-            sl_price = pattern.low_price
-        elif pattern_type == 'three_white_soldiers':
-            entry_price = pattern.third_candle_close
-            sl_price = pattern.pattern_low
-        elif pattern_type == 'bullish_marubozu':
-            entry_price = pattern.close_price
-            sl_price = pattern.open_price
-        elif pattern_type == 'bullish_harami':
-            entry_price = pattern.second_candle_close
-            sl_price = pattern.pattern_low
-        elif pattern_type == 'bullish_abandoned_baby':
-            entry_price = pattern.third_candle_close
-            sl_price = pattern.pattern_low
-        elif pattern_type == 'tweezer_bottom':
-            entry_price = pattern.second_candle_close
-            sl_price = pattern.pattern_low
-        elif pattern_type == 'bullish_kicker':
-            entry_price = pattern.second_candle_close
-            sl_price = pattern.pattern_low
-        else:
-            entry_price = getattr(pattern, 'close_price', getattr(pattern, 'third_candle_close', 0))
-            sl_price = getattr(pattern, 'pattern_low', getattr(pattern, 'low_price', entry_price * 0.98))
-
-        return entry_price, sl_price
-
-    def calculate_pnl(self, entry_price: float, trade_outcome: TradeOutcome, capital: float = None) -> float:
-        """Calculate P&L for a trade based on outcome with partial exit support"""
-        if capital is None:
-            capital = self.capital_per_trade
-
-        if trade_outcome.partial_exits_enabled:
-            # Use weighted profit for partial exits
-            return capital * (trade_outcome.total_pnl_pct / 100)
-        elif trade_outcome.trailing_active and trade_outcome.sl_hit:
-            return capital * (trade_outcome.trailing_profit_pct / 100)
-        elif trade_outcome.success and not trade_outcome.sl_hit:
-            return capital * (trade_outcome.current_profit_pct / 100)
-        elif trade_outcome.sl_hit:
-            loss_pct = ((trade_outcome.sl_price - entry_price) / entry_price) * 100
-            return capital * (loss_pct / 100)
-        else:
-            return capital * (trade_outcome.current_profit_pct / 100)
-
-
-# ============================================================================
-# ENHANCED SWING LOW TOUCH ANALYZER - PROFESSIONAL VERSION
-# ============================================================================
-
-class EnhancedSwingLowTouchAnalyzer:
-    """Enhanced analyzer that only counts valid swing low touches with strict validation"""
-
-    def __init__(self, touch_tolerance_pct: float = 0.1, min_days_between: int = 1):
-        self.touch_tolerance_pct = touch_tolerance_pct
-        self.min_days_between = min_days_between
-
-    def analyze_touches(self, df: pd.DataFrame, untouched_swing_lows: List[SwingLow],
-                        all_patterns: Dict[str, List], symbol: str = "", timeframe: str = "") -> List[SwingLowTouch]:
-        """Analyze when patterns touch untouched swing lows - ENHANCED WITH DAYS FILTER AND STRICT TOUCH VALIDATION"""
-        touches = []
-
-        # Create enhanced swing low detector for validation
-        swing_detector = EnhancedSwingLowDetector()
-
-        # Combine all patterns
-        combined_patterns = []
-        for pattern_type, patterns in all_patterns.items():
-            for pattern in patterns:
-                combined_patterns.append((pattern_type, pattern))
-
-        for pattern_type, pattern in combined_patterns:
-            pattern_timestamp = pd.Timestamp(pattern.timestamp)
-
-            # Get swing lows that were valid at the time of pattern formation
-            valid_swing_lows = swing_detector.get_valid_swing_lows_at_timestamp(
-                untouched_swing_lows, pattern_timestamp
-            )
-
-            for swing_low in valid_swing_lows:
-                # Only consider swing lows that occurred before this pattern
-                if swing_low.timestamp >= pattern_timestamp:
-                    continue
-
-                # Skip if swing low was already touched by another pattern
-                if swing_low.is_touched:
-                    continue
-
-                # NEW: Check minimum days between swing low and pattern
-                days_between = (pattern_timestamp - swing_low.timestamp).days
-                if days_between < self.min_days_between:
-                    continue
-
-                # Get pattern low for strict touch validation
-                if hasattr(pattern, 'pattern_low'):
-                    pattern_low = pattern.pattern_low
-                elif hasattr(pattern, 'low_price'):
-                    pattern_low = pattern.low_price
-                else:
-                    pattern_low = getattr(pattern, 'close_price', 0)
-
-                # ENHANCED: Strict swing low touch validation
-                # The pattern low must actually touch (equal to or slightly penetrate) the swing low
-                swing_low_price = swing_low.price
-
-                # Calculate if pattern actually touches the swing low
-                price_difference = pattern_low - swing_low_price
-
-                # For a valid touch:
-                # 1. Pattern low should be equal to or slightly below swing low (price_difference <= 0)
-                # 2. If above swing low, must be within very tight tolerance
-                is_actual_touch = False
-
-                if price_difference <= 0:
-                    # Pattern low is at or below swing low - this is a valid touch
-                    # Allow slight penetration below (up to tolerance)
-                    penetration_pct = abs(price_difference / swing_low_price) * 100
-                    if penetration_pct <= self.touch_tolerance_pct:
-                        is_actual_touch = True
-                else:
-                    # Pattern low is above swing low - only allow if within very small tolerance
-                    distance_above_pct = (price_difference / swing_low_price) * 100
-                    # Use much tighter tolerance for cases where pattern is above swing low
-                    if distance_above_pct <= (self.touch_tolerance_pct * 0.3):  # 30% of normal tolerance
-                        is_actual_touch = True
-
-                # Only proceed if we have an actual touch
-                if is_actual_touch:
-                    # Calculate final distance percentage for reporting
-                    final_distance_pct = abs(price_difference / swing_low_price) * 100
-
-                    touch = SwingLowTouch(
-                        swing_low=swing_low,
-                        pattern=pattern,
-                        touch_type='strict_touch',
-                        pattern_type=pattern_type,
-                        distance_pips=price_difference,  # Can be negative (penetration) or positive (slight gap)
-                        days_between=days_between,
-                        price_difference=final_distance_pct,
-                        is_live=getattr(pattern, 'is_live', False),
-                        pattern_strength=getattr(pattern, 'pattern_strength', 50.0),
-                        symbol=symbol,
-                        timeframe=timeframe,
-                        is_swing_low_valid=True  # It was valid at touch time
-                    )
-
-                    touches.append(touch)
-
-                    # Mark swing low as touched
-                    swing_low.is_touched = True
-                    swing_low.touch_timestamp = pattern_timestamp
-                    swing_low.touch_pattern = pattern_type
-                    swing_low.touch_index = pattern.index
-
-        return touches
-
-
-# ============================================================================
-# COMPLETE CAPITAL MANAGEMENT SYSTEM - PROFESSIONAL
-# ============================================================================
-
-class CapitalManager:
-    """Complete Capital Management System with professional chronological simulation"""
-
-    def __init__(self, total_capital: float, capital_per_trade: float, start_date: datetime):
-        self.total_capital = total_capital
-        self.capital_per_trade = capital_per_trade
-        self.start_date = pd.Timestamp(start_date)
-        self.available_capital = total_capital
-        self.locked_capital = 0.0
-
-        # Tracking
-        self.trades: List[Trade] = []
-        self.open_trades: List[Trade] = []
-        self.closed_trades: List[Trade] = []
-        self.capital_events: List[CapitalEvent] = []
-        self.capital_history: List[Dict] = []
-        self.daily_snapshots: Dict[pd.Timestamp, Dict] = {}
-
-        # Statistics
-        self.total_trades_attempted = 0
-        self.total_trades_executed = 0
-        self.total_trades_rejected = 0
-        self.max_concurrent_trades = 0
-        self.max_drawdown = 0.0
-        self.peak_capital = total_capital
-
-        # Performance metrics
-        self.total_pnl = 0.0
-        self.winning_trades = 0
-        self.losing_trades = 0
-
-        # Debug tracking
-        self.debug_info = []
-        self.rejected_trades_log = []
-
-        # Initialize first snapshot
-        self.record_capital_snapshot(self.start_date, "Initialization")
-
-    def can_enter_trade(self, timestamp: pd.Timestamp) -> bool:
-        """Check if we have enough capital for a new trade at given timestamp"""
-        # Check if timestamp is after start date
-        if timestamp < self.start_date:
-            return False
-        return self.available_capital >= self.capital_per_trade
-
-    def process_trade_opportunity(self, touch: SwingLowTouch, df: pd.DataFrame) -> Optional[Trade]:
-        """Process a trade opportunity with professional capital management"""
-        pattern_timestamp = pd.Timestamp(touch.pattern.timestamp)
-
-        # Check if pattern is after start date
-        if pattern_timestamp < self.start_date:
-            self.debug_info.append(f"⏭️ Skipping pattern before start date: {pattern_timestamp}")
-            return None
-
-        self.total_trades_attempted += 1
-
-        # Check capital availability
-        if not self.can_enter_trade(pattern_timestamp):
-            self.total_trades_rejected += 1
-            self.rejected_trades_log.append({
-                'timestamp': pattern_timestamp,
-                'symbol': touch.symbol,
-                'pattern': touch.pattern_type,
-                'reason': f'Insufficient capital (Available: ${self.available_capital:.0f})'
-            })
-            self.debug_info.append(f"❌ Rejected: {touch.symbol} at {pattern_timestamp} - Insufficient capital")
-            return None
-
-        # Create trade
-        trade_id = f"{touch.symbol}_{touch.pattern_type}_{pattern_timestamp.strftime('%Y%m%d_%H%M%S')}"
-
-        trade = Trade(
-            trade_id=trade_id,
-            symbol=touch.symbol,
-            timeframe=touch.timeframe,
-            pattern_type=touch.pattern_type,
-            entry_timestamp=pattern_timestamp,
-            entry_price=touch.entry_price,
-            capital_allocated=self.capital_per_trade,
-            target_price=touch.target_price,
-            sl_price=touch.sl_price,
-            target_pct=touch.trade_outcome.target_pct_used if touch.trade_outcome else 0,
-            swing_low_touch=touch,
-            trade_outcome=touch.trade_outcome
-        )
-
-        # Lock capital
-        self.lock_capital(trade)
-
-        # Process trade outcome
-        if touch.trade_outcome:
-            self.process_trade_exit(trade, df)
-
-        return trade
-
-    def lock_capital(self, trade: Trade) -> bool:
-        """Lock capital for a trade entry"""
-        # Double-check capital availability
-        if self.available_capital < self.capital_per_trade:
-            return False
-
-        # Lock the capital
-        self.available_capital -= self.capital_per_trade
-        self.locked_capital += self.capital_per_trade
-        trade.capital_locked_timestamp = trade.entry_timestamp
-        trade.status = 'open'
-
-        # Track open trades
-        self.open_trades.append(trade)
-        self.max_concurrent_trades = max(self.max_concurrent_trades, len(self.open_trades))
-
-        # Record capital event
-        event = CapitalEvent(
-            timestamp=trade.entry_timestamp,
-            event_type='lock',
-            amount=self.capital_per_trade,
-            trade_id=trade.trade_id,
-            symbol=trade.symbol,
-            pattern_type=trade.pattern_type,
-            entry_price=trade.entry_price,
-            available_capital_after=self.available_capital,
-            locked_capital_after=self.locked_capital
-        )
-        self.capital_events.append(event)
-
-        # Add to trades
-        self.trades.append(trade)
-        self.total_trades_executed += 1
-
-        # Record snapshot
-        self.record_capital_snapshot(trade.entry_timestamp, f"Entry: {trade.symbol}")
-
-        self.debug_info.append(f"✅ Locked ${self.capital_per_trade:.0f} for {trade.trade_id}")
-
-        return True
-
-    def process_trade_exit(self, trade: Trade, df: pd.DataFrame):
-        """Process trade exit based on outcome"""
-        if not trade.trade_outcome:
-            return
-
-        outcome = trade.trade_outcome
-
-        # Determine exit details
-        if outcome.exit_timestamp:
-            exit_timestamp = pd.Timestamp(outcome.exit_timestamp)
-        else:
-            # Estimate exit based on bars
-            hours = self._estimate_hours_from_bars(outcome.bars_to_resolution, trade.timeframe)
-            exit_timestamp = trade.entry_timestamp + pd.Timedelta(hours=hours)
-
-        # Determine exit price and P&L - ENHANCED WITH CURRENT STATUS
-        if outcome.target_reached:
-            exit_price = trade.target_price
-            pnl = self.capital_per_trade * (trade.target_pct / 100)
-        elif outcome.sl_hit:
-            exit_price = trade.sl_price
-            pnl = self.capital_per_trade * ((trade.sl_price - trade.entry_price) / trade.entry_price)
-        else:
-            # Use current price for ongoing trades
-            exit_price = outcome.current_price
-            pnl = self.capital_per_trade * (outcome.current_profit_pct / 100)
-
-        # Release capital
-        self.release_capital(trade, exit_timestamp, exit_price, pnl)
-
-    def release_capital(self, trade: Trade, exit_timestamp: pd.Timestamp,
-                        exit_price: float, pnl: float) -> None:
-        """Release capital when trade exits"""
-        if trade.status != 'open':
-            return
-
-        # Update trade
-        trade.exit_timestamp = exit_timestamp
-        trade.exit_price = exit_price
-        trade.pnl = pnl
-        trade.roi_pct = (pnl / trade.capital_allocated) * 100 if trade.capital_allocated > 0 else 0
-        trade.status = 'closed'
-        trade.capital_released_timestamp = exit_timestamp
-        trade.days_held = (exit_timestamp - trade.entry_timestamp).days
-
-        # Remove from open trades, add to closed
-        if trade in self.open_trades:
-            self.open_trades.remove(trade)
-        self.closed_trades.append(trade)
-
-        # Release capital with P&L
-        released_amount = trade.capital_allocated + pnl
-        self.available_capital += released_amount
-        self.locked_capital -= trade.capital_allocated
-
-        # Update statistics
-        self.total_pnl += pnl
-        if pnl > 0:
-            self.winning_trades += 1
-        else:
-            self.losing_trades += 1
-
-        # Track peak and drawdown
-        current_total = self.available_capital + self.locked_capital
-        if current_total > self.peak_capital:
-            self.peak_capital = current_total
-
-        drawdown_pct = ((self.peak_capital - current_total) / self.peak_capital) * 100
-        if drawdown_pct > self.max_drawdown:
-            self.max_drawdown = drawdown_pct
-
-        # Record capital event
-        event = CapitalEvent(
-            timestamp=exit_timestamp,
-            event_type='release',
-            amount=released_amount,
-            trade_id=trade.trade_id,
-            symbol=trade.symbol,
-            pattern_type=trade.pattern_type,
-            entry_price=trade.entry_price,
-            exit_price=exit_price,
-            pnl=pnl,
-            available_capital_after=self.available_capital,
-            locked_capital_after=self.locked_capital
-        )
-        self.capital_events.append(event)
-
-        # Record snapshot
-        self.record_capital_snapshot(exit_timestamp, f"Exit: {trade.symbol} P&L: ${pnl:.2f}")
-
-        self.debug_info.append(f"💰 Released ${released_amount:.0f} for {trade.trade_id} (P&L: ${pnl:.2f})")
-
-    def _estimate_hours_from_bars(self, bars: int, timeframe: str) -> float:
-        """Estimate hours from number of bars and timeframe"""
-        timeframe_hours = {
-            '1m': 1 / 60, '5m': 5 / 60, '15m': 15 / 60, '30m': 0.5,
-            '1H': 1, '4H': 4, '1D': 24
-        }
-        return bars * timeframe_hours.get(timeframe, 4)
-
-    def record_capital_snapshot(self, timestamp: pd.Timestamp, event_description: str = ""):
-        """Record current capital state"""
-        total_capital = self.available_capital + self.locked_capital
-        utilization_pct = (self.locked_capital / self.total_capital) * 100 if self.total_capital > 0 else 0
-
-        snapshot = {
-            'timestamp': timestamp,
-            'available_capital': self.available_capital,
-            'locked_capital': self.locked_capital,
-            'total_capital': total_capital,
-            'utilization_pct': utilization_pct,
-            'total_pnl': self.total_pnl,
-            'open_trades': len(self.open_trades),
-            'closed_trades': len(self.closed_trades),
-            'event': event_description
-        }
-
-        self.capital_history.append(snapshot)
-
-        # Store daily snapshot
-        date_key = pd.Timestamp(timestamp.date())
-        self.daily_snapshots[date_key] = snapshot
-
-    def simulate_chronological_trading(self, all_touches: List[SwingLowTouch],
-                                       data_cache: Dict[str, pd.DataFrame]) -> None:
-        """Main simulation method - process all trades chronologically"""
-
-        if not all_touches:
-            st.warning("⚠️ No pattern touches to simulate")
-            return
-
-        # Filter touches after start date
-        valid_touches = []
-        for touch in all_touches:
-            pattern_timestamp = pd.Timestamp(touch.pattern.timestamp)
-            if pattern_timestamp >= self.start_date:
-                valid_touches.append(touch)
-
-        if not valid_touches:
-            st.error(f"❌ No patterns found after {self.start_date.strftime('%Y-%m-%d')}")
-
-            # Show available date range
-            all_dates = [pd.Timestamp(t.pattern.timestamp) for t in all_touches]
-            if all_dates:
-                earliest = min(all_dates)
-                latest = max(all_dates)
-                st.info(f"📅 Available patterns: {earliest.strftime('%Y-%m-%d')} to {latest.strftime('%Y-%m-%d')}")
-                st.warning(f"💡 Set start date to {earliest.strftime('%Y-%m-%d')} or earlier")
-            return
-
-        # Sort touches chronologically
-        valid_touches.sort(key=lambda x: x.pattern.timestamp)
-
-        st.info(f"📊 Processing {len(valid_touches)} patterns from {self.start_date.strftime('%Y-%m-%d')}")
-
-        # Process each touch
-        progress_bar = st.progress(0)
-        for i, touch in enumerate(valid_touches):
-            # Get the data for this symbol/timeframe
-            cache_key = f"{touch.symbol}_{touch.timeframe}"
-            df = data_cache.get(cache_key)
-
-            if df is not None:
-                self.process_trade_opportunity(touch, df)
-
-            # Update progress
-            progress_bar.progress((i + 1) / len(valid_touches))
-
-        progress_bar.empty()
-
-        # Final summary
-        st.success(f"✅ Simulation complete: {self.total_trades_executed} trades executed")
-
-        if self.total_trades_rejected > 0:
-            st.warning(f"⚠️ {self.total_trades_rejected} trades rejected due to insufficient capital")
-
-    def get_performance_summary(self) -> Dict:
-        """Get comprehensive performance summary"""
-        total_capital_current = self.available_capital + self.locked_capital
-        total_roi = ((total_capital_current - self.total_capital) / self.total_capital) * 100
-
-        win_rate = (self.winning_trades / (self.winning_trades + self.losing_trades) * 100) if (
-                                                                                                       self.winning_trades + self.losing_trades) > 0 else 0
-
-        return {
-            'total_capital_start': self.total_capital,
-            'total_capital_current': total_capital_current,
-            'available_capital': self.available_capital,
-            'locked_capital': self.locked_capital,
-            'total_pnl': self.total_pnl,
-            'total_roi_pct': total_roi,
-            'trades_attempted': self.total_trades_attempted,
-            'trades_executed': self.total_trades_executed,
-            'trades_rejected': self.total_trades_rejected,
-            'winning_trades': self.winning_trades,
-            'losing_trades': self.losing_trades,
-            'win_rate_pct': win_rate,
-            'max_drawdown_pct': self.max_drawdown,
-            'max_concurrent_trades': self.max_concurrent_trades,
-            'capital_utilization_pct': (self.locked_capital / self.total_capital) * 100,
-            'open_trades': len(self.open_trades),
-            'closed_trades': len(self.closed_trades)
-        }
-
-    def get_capital_timeline_df(self) -> pd.DataFrame:
-        """Get capital timeline as DataFrame"""
-        if not self.capital_history:
-            return pd.DataFrame()
-
-        df = pd.DataFrame(self.capital_history)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        return df.sort_values('timestamp')
-
-    def get_trades_df(self) -> pd.DataFrame:
-        """Get all trades as DataFrame"""
-        if not self.trades:
-            return pd.DataFrame()
-
-        trades_data = []
-        for trade in self.trades:
-            trade_dict = {
-                'Trade ID': trade.trade_id,
-                'Symbol': trade.symbol,
-                'Timeframe': trade.timeframe,
-                'Pattern': trade.pattern_type,
-                'Entry Date': trade.entry_timestamp.strftime('%Y-%m-%d %H:%M'),
-                'Entry Price': f"{trade.entry_price:.4f}",
-                'Target': f"{trade.target_price:.4f}",
-                'Stop Loss': f"{trade.sl_price:.4f}",
-                'Capital': f"${trade.capital_allocated:,.0f}",
-                'Status': trade.status,
-                'Exit Date': trade.exit_timestamp.strftime('%Y-%m-%d %H:%M') if trade.exit_timestamp else 'Open',
-                'Exit Price': f"{trade.exit_price:.4f}" if trade.exit_price else 'N/A',
-                'P&L': f"${trade.pnl:.2f}" if trade.pnl is not None else 'Open',
-                'ROI %': f"{trade.roi_pct:.2f}%" if trade.roi_pct is not None else 'Open',
-                'Days Held': trade.days_held if trade.status == 'closed' else 'Open'
-            }
-            trades_data.append(trade_dict)
-
-        return pd.DataFrame(trades_data)
-
-    def get_rejected_trades_df(self) -> pd.DataFrame:
-        """Get rejected trades as DataFrame"""
-        if not self.rejected_trades_log:
-            return pd.DataFrame()
-        return pd.DataFrame(self.rejected_trades_log)
-
-    def get_capital_events_df(self) -> pd.DataFrame:
-        """Get capital events as DataFrame"""
-        if not self.capital_events:
-            return pd.DataFrame()
-
-        events_data = []
-        for event in self.capital_events:
-            event_dict = {
-                'Timestamp': event.timestamp,
-                'Event Type': event.event_type.title(),
-                'Amount': f"${event.amount:,.2f}",
-                'Trade ID': event.trade_id,
-                'Symbol': event.symbol,
-                'Pattern': event.pattern_type,
-                'Entry Price': f"{event.entry_price:.4f}",
-                'Exit Price': f"{event.exit_price:.4f}" if event.exit_price else 'N/A',
-                'P&L': f"${event.pnl:.2f}" if event.pnl is not None else 'N/A',
-                'Available After': f"${event.available_capital_after:,.0f}",
-                'Locked After': f"${event.locked_capital_after:,.0f}"
-            }
-            events_data.append(event_dict)
-
-        return pd.DataFrame(events_data)
-
-
-# ============================================================================
-# FILE MANAGEMENT SYSTEM
-# ============================================================================
-
-class FileManager:
-    """Manages file operations for instruments and data caching"""
-
-    def __init__(self):
-        self.instruments_file = "instruments_one.txt"
-        self.data_cache_dir = "data_cache"
-        self.config_file = "analyzer_config.json"
-        self._ensure_directories()
-
-    def _ensure_directories(self):
-        """Create necessary directories and files"""
-        Path(self.data_cache_dir).mkdir(exist_ok=True)
-
-        if not os.path.exists(self.instruments_file):
-            default_instruments = "BTCUSDT,ETHUSDT,BNBUSDT,ADAUSDT,SOLUSDT,DOTUSDT,LINKUSDT,LTCUSDT,BCHUSDT,XLMUSDT"
-            with open(self.instruments_file, 'w') as f:
-                f.write(default_instruments)
-
-    def load_instruments(self) -> List[str]:
-        """Load instruments from file"""
-        try:
-            with open(self.instruments_file, 'r') as f:
-                content = f.read().strip()
-                if content:
-                    return [s.strip().upper() for s in content.split(',') if s.strip()]
-                return []
-        except FileNotFoundError:
-            return []
-
-    def save_instruments(self, instruments: List[str]):
-        """Save instruments to file"""
-        with open(self.instruments_file, 'w') as f:
-            f.write(','.join(instruments))
-
-    def get_cache_filename(self, symbol: str, timeframe: str, exchange: str) -> str:
-        """Get cache filename for symbol/timeframe combination"""
-        return os.path.join(self.data_cache_dir, f"{symbol}_{exchange}_{timeframe}.json")
-
-    def save_data_to_cache(self, symbol: str, timeframe: str, exchange: str, data: pd.DataFrame):
-        """Save data to cache file with complete OHLCV data"""
-        try:
-            cache_file = self.get_cache_filename(symbol, timeframe, exchange)
-            cache_data = {
-                'data': data.to_json(orient='index', date_format='iso'),
-                'timestamp': datetime.now().isoformat(),
-                'symbol': symbol,
-                'timeframe': timeframe,
-                'exchange': exchange,
-                'total_candles': len(data),
-                'date_range': {
-                    'start': data.index.min().isoformat(),
-                    'end': data.index.max().isoformat()
-                } if len(data) > 0 else None
-            }
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
-        except Exception as e:
-            st.warning(f"Failed to cache data for {symbol} {timeframe}: {e}")
-
-    def load_data_from_cache(self, symbol: str, timeframe: str, exchange: str) -> Optional[pd.DataFrame]:
-        """Load OHLCV data from cache file"""
-        try:
-            cache_file = self.get_cache_filename(symbol, timeframe, exchange)
-            if os.path.exists(cache_file):
-                with open(cache_file, 'r') as f:
-                    cache_data = json.load(f)
-
-                df = pd.read_json(cache_data['data'], orient='index')
-                df.index = pd.to_datetime(df.index)
-                return df.sort_index()
-            return None
-        except Exception as e:
-            return None
-
-    def get_cache_info(self, symbol: str, timeframe: str, exchange: str) -> Optional[Dict]:
-        """Get cache metadata without loading data"""
-        try:
-            cache_file = self.get_cache_filename(symbol, timeframe, exchange)
-            if os.path.exists(cache_file):
-                with open(cache_file, 'r') as f:
-                    cache_data = json.load(f)
-                return {
-                    'timestamp': cache_data.get('timestamp'),
-                    'total_candles': cache_data.get('total_candles', 0),
-                    'date_range': cache_data.get('date_range'),
-                    'file_size_kb': round(os.path.getsize(cache_file) / 1024, 2)
-                }
-            return None
-        except:
-            return None
-
-
-# ============================================================================
-# ENHANCED BACKGROUND DATA MANAGER WITH SMART UPDATES + DATE PICKER SUPPORT
-# ============================================================================
-
-class BackgroundDataManager:
-    """Enhanced data manager with intelligent incremental updates and date picker support"""
-
-    def __init__(self, file_manager: FileManager):
-        self.file_manager = file_manager
-        self.tv = TvDatafeed() if TV_AVAILABLE else None
-        self.timeframes = ['1m', '5m', '15m', '30m', '1H', '4H', '1D']
-        self.last_update_times = {}
-
-    def get_interval_from_timeframe(self, timeframe: str):
-        """Convert timeframe to TradingView interval"""
-        interval_map = {
-            '1m': Interval.in_1_minute,
-            '5m': Interval.in_5_minute,
-            '15m': Interval.in_15_minute,
-            '30m': Interval.in_30_minute,
-            '1H': Interval.in_1_hour,
-            '4H': Interval.in_4_hour,
-            '1D': Interval.in_daily
-        }
-        return interval_map.get(timeframe, Interval.in_15_minute)
-
-    def should_update_timeframe(self, timeframe: str) -> bool:
-        """Check if timeframe needs updating based on its frequency"""
-        update_intervals = {
-            '1m': timedelta(minutes=2),
-            '5m': timedelta(minutes=3),
-            '15m': timedelta(minutes=5),
-            '30m': timedelta(minutes=10),
-            '1H': timedelta(minutes=15),
-            '4H': timedelta(hours=1),
-            '1D': timedelta(hours=4)
-        }
-
-        last_update = self.last_update_times.get(timeframe)
-        if not last_update:
-            return True
-
-        return datetime.now() - last_update >= update_intervals.get(timeframe, timedelta(minutes=5))
-
-    def calculate_bars_from_date(self, start_date: datetime, timeframe: str) -> int:
-        """Calculate number of bars needed from start date to now - ENHANCED WITH DATE PICKER SUPPORT"""
-        if not start_date:
-            return self._calculate_bars_needed(timeframe)
-
-        # Calculate time difference
-        now = datetime.now()
-        time_diff = now - start_date
-
-        # Calculate bars based on timeframe
-        timeframe_minutes = {
-            '1m': 1,
-            '5m': 5,
-            '15m': 15,
-            '30m': 30,
-            '1H': 60,
-            '4H': 240,
-            '1D': 1440
-        }
-
-        tf_minutes = timeframe_minutes.get(timeframe, 60)
-        total_minutes = time_diff.total_seconds() / 60
-        bars_needed = int(total_minutes / tf_minutes) + 50  # Add buffer for gaps/weekends
-
-        # Apply reasonable limits
-        max_bars = {
-            '1m': 5000,  # ~3.5 days max
-            '5m': 4000,  # ~2 weeks max
-            '15m': 3000,  # ~1 month max
-            '30m': 2500,  # ~2 months max
-            '1H': 2000,  # ~3 months max
-            '4H': 1500,  # ~9 months max
-            '1D': 1000  # ~3 years max
-        }
-
-        limit = max_bars.get(timeframe, 2000)
-        bars_needed = min(bars_needed, limit)
-
-        # Minimum bars for analysis
-        min_bars = {
-            '1m': 100,
-            '5m': 200,
-            '15m': 300,
-            '30m': 250,
-            '1H': 200,
-            '4H': 150,
-            '1D': 100
-        }
-
-        minimum = min_bars.get(timeframe, 200)
-        bars_needed = max(bars_needed, minimum)
-
-        return bars_needed
-
-    def update_data_incrementally(self, symbols: List[str], timeframes: List[str],
-                                  exchange: str = 'NSE', force_update: bool = False,
-                                  start_date: Optional[datetime] = None) -> Dict[str, Dict[str, str]]:
-        """Smart incremental data updates with date picker support - ENHANCED"""
-        if not self.tv:
-            return {"error": "TradingView not available"}
-
-        results = {}
-
-        for symbol in symbols:
-            results[symbol] = {}
-            for timeframe in timeframes:
-                try:
-                    cached_data = self.file_manager.load_data_from_cache(symbol, timeframe, exchange)
-
-                    # Determine bars needed
-                    if start_date:
-                        # Use date picker to calculate bars
-                        bars_needed = self.calculate_bars_from_date(start_date, timeframe)
-                        use_date_based = True
-                    else:
-                        # Use default bars
-                        bars_needed = self._calculate_bars_needed(timeframe)
-                        use_date_based = False
-
-                    if cached_data is not None and not cached_data.empty and not force_update and not use_date_based:
-                        # Standard incremental update logic
-                        last_timestamp = cached_data.index.max()
-                        current_time = datetime.now()
-                        time_diff = current_time - last_timestamp
-                        incremental_bars = self._calculate_incremental_bars(timeframe, time_diff)
-
-                        if incremental_bars <= 1:
-                            age_minutes = int(time_diff.total_seconds() / 60)
-                            results[symbol][timeframe] = f"✅ Current ({len(cached_data)} bars, {age_minutes}m old)"
-                            continue
-
-                        interval = self.get_interval_from_timeframe(timeframe)
-                        new_data = self.tv.get_hist(symbol, exchange, interval, n_bars=incremental_bars)
-
-                        if new_data is not None and not new_data.empty:
-                            new_data = self._clean_data(new_data)
-                            combined_data = self._merge_data(cached_data, new_data)
-                            self.file_manager.save_data_to_cache(symbol, timeframe, exchange, combined_data)
-                            new_bars = len(combined_data) - len(cached_data)
-                            results[symbol][timeframe] = f"✅ Updated +{new_bars} bars ({len(combined_data)} total)"
-                            self.last_update_times[timeframe] = datetime.now()
-                        else:
-                            results[symbol][timeframe] = f"✅ Current ({len(cached_data)} bars)"
-
-                    elif start_date and cached_data is not None and not cached_data.empty and not force_update:
-                        # Check if cached data covers the requested date range
-                        cached_start = cached_data.index.min()
-                        if cached_start <= pd.Timestamp(start_date):
-                            # We have enough data
-                            age = datetime.now() - cached_data.index.max()
-                            age_hours = int(age.total_seconds() / 3600)
-                            results[symbol][
-                                timeframe] = f"✅ Date range covered ({len(cached_data)} bars, {age_hours}h old)"
-                            continue
-                        else:
-                            # Need more historical data
-                            interval = self.get_interval_from_timeframe(timeframe)
-                            new_data = self.tv.get_hist(symbol, exchange, interval, n_bars=bars_needed)
-
-                            if new_data is not None and not new_data.empty:
-                                cleaned_data = self._clean_data(new_data)
-                                self.file_manager.save_data_to_cache(symbol, timeframe, exchange, cleaned_data)
-                                start_coverage = "✅" if cleaned_data.index.min() <= pd.Timestamp(start_date) else "⚠️"
-                                results[symbol][
-                                    timeframe] = f"{start_coverage} Historical download ({len(cleaned_data)} bars from {cleaned_data.index.min().strftime('%Y-%m-%d')})"
-                                self.last_update_times[timeframe] = datetime.now()
-                            else:
-                                results[symbol][timeframe] = "❌ No historical data received"
-
-                    else:
-                        # Full download
-                        interval = self.get_interval_from_timeframe(timeframe)
-
-                        data = self.tv.get_hist(symbol, exchange, interval, n_bars=bars_needed)
-
-                        if data is not None and not data.empty:
-                            cleaned_data = self._clean_data(data)
-                            self.file_manager.save_data_to_cache(symbol, timeframe, exchange, cleaned_data)
-
-                            # Check date coverage if start_date provided
-                            if start_date:
-                                start_coverage = "✅" if cleaned_data.index.min() <= pd.Timestamp(start_date) else "⚠️"
-                                results[symbol][
-                                    timeframe] = f"{start_coverage} Full download ({len(cleaned_data)} bars from {cleaned_data.index.min().strftime('%Y-%m-%d')})"
-                            else:
-                                results[symbol][timeframe] = f"✅ Full download ({len(cleaned_data)} bars)"
-
-                            self.last_update_times[timeframe] = datetime.now()
-                        else:
-                            results[symbol][timeframe] = "❌ No data received"
-
-                except Exception as e:
-                    results[symbol][timeframe] = f"❌ Error: {str(e)[:30]}"
-
-        return results
-
-    def _calculate_incremental_bars(self, timeframe: str, time_diff: timedelta) -> int:
-        """Calculate how many bars needed based on time difference"""
-        minutes_diff = time_diff.total_seconds() / 60
-
-        timeframe_minutes = {
-            '1m': 1, '5m': 5, '15m': 15, '30m': 30,
-            '1H': 60, '4H': 240, '1D': 1440
-        }
-
-        tf_minutes = timeframe_minutes.get(timeframe, 15)
-        bars_needed = int(minutes_diff / tf_minutes) + 5
-
-        return min(bars_needed, 100)
-
-    def _merge_data(self, old_data: pd.DataFrame, new_data: pd.DataFrame) -> pd.DataFrame:
-        """Merge old cached data with new data, removing overlaps"""
-        combined = pd.concat([old_data, new_data])
-        combined = combined[~combined.index.duplicated(keep='last')]
-        combined = combined.sort_index()
-        return combined
-
-    def update_data_for_timeframes(self, symbols: List[str], timeframes: List[str],
-                                   exchange: str = 'NSE', force_update: bool = False,
-                                   start_date: Optional[datetime] = None) -> Dict[str, Dict[str, str]]:
-        """Legacy method that now uses incremental updates with date support"""
-        return self.update_data_incrementally(symbols, timeframes, exchange, force_update, start_date)
-
-    def get_cached_data(self, symbol: str, timeframe: str, exchange: str = 'NSE') -> Optional[pd.DataFrame]:
-        """Get cached OHLCV data for symbol/timeframe"""
-        return self.file_manager.load_data_from_cache(symbol, timeframe, exchange)
-
-    def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean and prepare the fetched OHLCV data"""
-        if df is None or df.empty:
-            raise ValueError("Empty data received during cleaning.")
-
-        df.index = pd.to_datetime(df.index)
-        df = df.sort_index()
-
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-
-        df = df.dropna()
-        return df
-
-    def _calculate_bars_needed(self, timeframe: str) -> int:
-        """Calculate number of bars needed for analysis (default method)"""
-        bars_map = {
-            '1m': 500, '5m': 400, '15m': 300, '30m': 250,
-            '1H': 200, '4H': 150, '1D': 100
-        }
-        return bars_map.get(timeframe, 200)
-
-
-# ============================================================================
-# PATTERN DETECTION ENGINES - ALL PROFESSIONAL PATTERNS
-# ============================================================================
-
-class PinBarDetector:
-    """Detects pin bar candlestick patterns"""
-
-    def __init__(self, min_wick_ratio: float = 2.0, max_body_ratio: float = 0.3):
-        self.min_wick_ratio = min_wick_ratio
-        self.max_body_ratio = max_body_ratio
-
-    def detect_pinbars(self, df: pd.DataFrame, include_live: bool = False) -> List[PinBar]:
-        """Detect pin bar patterns in OHLCV data"""
-        patterns = []
-        end_index = len(df) if include_live else len(df) - 1
-
-        for i in range(end_index):
-            candle = df.iloc[i]
-            open_price = candle['open']
-            high_price = candle['high']
-            low_price = candle['low']
-            close_price = candle['close']
-
-            total_range = high_price - low_price
-            body_size = abs(close_price - open_price)
-            upper_wick = high_price - max(open_price, close_price)
-            lower_wick = min(open_price, close_price) - low_price
-
-            if total_range == 0 or body_size == 0:
-                continue
-
-            body_ratio = body_size / total_range
-            lower_wick_ratio = lower_wick / body_size
-            upper_wick_ratio = upper_wick / body_size
-
-            has_long_lower_wick = lower_wick_ratio >= self.min_wick_ratio
-            has_small_body = body_ratio <= self.max_body_ratio
-            has_small_upper_wick = upper_wick_ratio <= 1.0
-
-            if has_long_lower_wick and has_small_body and has_small_upper_wick:
-                is_bullish = close_price > open_price
-                is_live = (i == len(df) - 1) and include_live
-
-                # Calculate pattern strength (success rate based)
-                pattern_strength = 65.0  # Base success rate for pin bars
-
-                pattern = PinBar(
-                    index=i,
-                    timestamp=df.index[i],
-                    open_price=open_price,
-                    high_price=high_price,
-                    low_price=low_price,
-                    close_price=close_price,
-                    pattern_type='pin_bar',
-                    body_ratio=body_ratio,
-                    wick_ratio=lower_wick_ratio,
-                    is_bullish=is_bullish,
-                    is_live=is_live,
-                    pattern_strength=pattern_strength
-                )
-                patterns.append(pattern)
-
-        return patterns
-
-
-class BullishEngulfingDetector:
-    """Detects bullish engulfing candlestick patterns"""
-
-    def __init__(self, min_engulfing_ratio: float = 1.1):
-        self.min_engulfing_ratio = min_engulfing_ratio
-
-    def detect_bullish_engulfing(self, df: pd.DataFrame, include_live: bool = False) -> List[BullishEngulfing]:
-        """Detect bullish engulfing patterns in OHLCV data"""
-        patterns = []
-        end_index = len(df) if include_live else len(df) - 1
-
-        for i in range(1, end_index):
-            current = df.iloc[i]
-            previous = df.iloc[i - 1]
-
-            first_is_bearish = previous['close'] < previous['open']
-            second_is_bullish = current['close'] > current['open']
-
-            if not (first_is_bearish and second_is_bullish):
-                continue
-
-            first_body_size = abs(previous['close'] - previous['open'])
-            second_body_size = abs(current['close'] - current['open'])
-
-            if first_body_size == 0:
-                continue
-
-            opens_below_first_close = current['open'] < previous['close']
-            closes_above_first_open = current['close'] > previous['open']
-            engulfing_ratio = second_body_size / first_body_size
-            is_larger_body = engulfing_ratio >= self.min_engulfing_ratio
-
-            if opens_below_first_close and closes_above_first_open and is_larger_body:
-                pattern_low = min(previous['low'], current['low'])
-                is_live = (i == len(df) - 1) and include_live
-
-                # Calculate pattern strength
-                pattern_strength = 70.0  # Base success rate for bullish engulfing
-
-                pattern = BullishEngulfing(
-                    index=i,
-                    timestamp=df.index[i],
-                    first_candle_open=previous['open'],
-                    first_candle_high=previous['high'],
-                    first_candle_low=previous['low'],
-                    first_candle_close=previous['close'],
-                    second_candle_open=current['open'],
-                    second_candle_high=current['high'],
-                    second_candle_low=current['low'],
-                    second_candle_close=current['close'],
-                    pattern_type='bullish_engulfing',
-                    engulfing_ratio=engulfing_ratio,
-                    pattern_low=pattern_low,
-                    is_bullish=True,
-                    is_live=is_live,
-                    pattern_strength=pattern_strength
-                )
-                patterns.append(pattern)
-
-        return patterns
-
-
-class ThreeCandleDetector:
-    """Detects three candle (Morning Star) patterns"""
-
-    def __init__(self, min_first_body: float = 0.6, max_second_body: float = 0.4, min_third_body: float = 0.6):
-        self.min_first_body = min_first_body
-        self.max_second_body = max_second_body
-        self.min_third_body = min_third_body
-
-    def detect_three_candle(self, df: pd.DataFrame, include_live: bool = False) -> List[ThreeCandle]:
-        """Detect three candle (Morning Star) patterns in OHLCV data"""
-        patterns = []
-        end_index = len(df) if include_live else len(df) - 1
-
-        for i in range(2, end_index):
-            first = df.iloc[i - 2]
-            second = df.iloc[i - 1]
-            third = df.iloc[i]
-
-            first_range = first['high'] - first['low']
-            second_range = second['high'] - second['low']
-            third_range = third['high'] - third['low']
-
-            if first_range == 0 or second_range == 0 or third_range == 0:
-                continue
-
-            first_body = abs(first['close'] - first['open'])
-            second_body = abs(second['close'] - second['open'])
-            third_body = abs(third['close'] - third['open'])
-
-            first_body_ratio = first_body / first_range
-            second_body_ratio = second_body / second_range
-            third_body_ratio = third_body / third_range
-
-            first_is_bearish = first['close'] < first['open']
-            first_has_body = first_body_ratio >= self.min_first_body
-
-            second_is_small = second_body_ratio <= self.max_second_body
-
-            third_is_bullish = third['close'] > third['open']
-            third_has_body = third_body_ratio >= self.min_third_body
-
-            first_midpoint = (first['open'] + first['close']) / 2
-            third_closes_above_midpoint = third['close'] > first_midpoint
-
-            if (first_is_bearish and first_has_body and
-                    second_is_small and
-                    third_is_bullish and third_has_body and
-                    third_closes_above_midpoint):
-                pattern_low = min(first['low'], second['low'], third['low'])
-                is_live = (i == len(df) - 1) and include_live
-
-                pattern_strength = (first_body_ratio + third_body_ratio - second_body_ratio) / 2
-                # Convert to success rate percentage
-                base_strength = 68.0  # Base success rate for three candle patterns
-
-                pattern = ThreeCandle(
-                    index=i,
-                    timestamp=df.index[i],
-                    first_candle_open=first['open'],
-                    first_candle_high=first['high'],
-                    first_candle_low=first['low'],
-                    first_candle_close=first['close'],
-                    second_candle_open=second['open'],
-                    second_candle_high=second['high'],
-                    second_candle_low=second['low'],
-                    second_candle_close=second['close'],
-                    third_candle_open=third['open'],
-                    third_candle_high=third['high'],
-                    third_candle_low=third['low'],
-                    third_candle_close=third['close'],
-                    pattern_type='three_candle',
-                    pattern_low=pattern_low,
-                    pattern_strength=base_strength,
-                    is_bullish=True,
-                    is_live=is_live
-                )
-                patterns.append(pattern)
-
-        return patterns
-
-
-class DragonflyDojiDetector:
-    """Detects dragonfly doji patterns"""
-
-    def __init__(self, max_body_ratio: float = 0.1, min_lower_wick_ratio: float = 2.0):
-        self.max_body_ratio = max_body_ratio
-        self.min_lower_wick_ratio = min_lower_wick_ratio
-
-    def detect_dragonfly_doji(self, df: pd.DataFrame, include_live: bool = False) -> List[DragonflyDoji]:
-        """Detect dragonfly doji patterns in OHLCV data"""
-        patterns = []
-        end_index = len(df) if include_live else len(df) - 1
-
-        for i in range(end_index):
-            candle = df.iloc[i]
-            open_price = candle['open']
-            high_price = candle['high']
-            low_price = candle['low']
-            close_price = candle['close']
-
-            total_range = high_price - low_price
-            body_size = abs(close_price - open_price)
-            upper_wick = high_price - max(open_price, close_price)
-            lower_wick = min(open_price, close_price) - low_price
-
-            if total_range == 0:
-                continue
-
-            body_ratio = body_size / total_range
-            upper_wick_ratio = upper_wick / total_range
-            lower_wick_ratio = lower_wick / total_range
-
-            # Dragonfly doji criteria
-            has_small_body = body_ratio <= self.max_body_ratio
-            has_long_lower_wick = lower_wick_ratio >= (
-                        self.min_lower_wick_ratio * body_ratio) or lower_wick_ratio >= 0.6
-            has_small_upper_wick = upper_wick_ratio <= 0.1
-
-            if has_small_body and has_long_lower_wick and has_small_upper_wick:
-                is_live = (i == len(df) - 1) and include_live
-
-                # Calculate pattern strength - Dragonfly Doji has 60% success rate
-                pattern_strength = 60.0
-
-                pattern = DragonflyDoji(
-                    index=i,
-                    timestamp=df.index[i],
-                    open_price=open_price,
-                    high_price=high_price,
-                    low_price=low_price,
-                    close_price=close_price,
-                    pattern_type='dragonfly_doji',
-                    body_ratio=body_ratio,
-                    lower_wick_ratio=lower_wick_ratio,
-                    is_bullish=True,
-                    is_live=is_live,
-                    pattern_strength=pattern_strength
-                )
-                patterns.append(pattern)
-
-        return patterns
-
-
-class ThreeWhiteSoldiersDetector:
-    """Detects three white soldiers patterns"""
-
-    def __init__(self, min_body_ratio: float = 0.6, max_wick_ratio: float = 0.2):
-        self.min_body_ratio = min_body_ratio
-        self.max_wick_ratio = max_wick_ratio
-
-    def detect_three_white_soldiers(self, df: pd.DataFrame, include_live: bool = False) -> List[ThreeWhiteSoldiers]:
-        """Detect three white soldiers patterns in OHLCV data"""
-        patterns = []
-        end_index = len(df) if include_live else len(df) - 1
-
-        for i in range(2, end_index):
-            first = df.iloc[i - 2]
-            second = df.iloc[i - 1]
-            third = df.iloc[i]
-
-            # All three candles must be bullish
-            first_is_bullish = first['close'] > first['open']
-            second_is_bullish = second['close'] > second['open']
-            third_is_bullish = third['close'] > third['open']
-
-            if not (first_is_bullish and second_is_bullish and third_is_bullish):
-                continue
-
-            # Check body sizes
-            first_range = first['high'] - first['low']
-            second_range = second['high'] - second['low']
-            third_range = third['high'] - third['low']
-
-            if first_range == 0 or second_range == 0 or third_range == 0:
-                continue
-
-            first_body = first['close'] - first['open']
-            second_body = second['close'] - second['open']
-            third_body = third['close'] - third['open']
-
-            first_body_ratio = first_body / first_range
-            second_body_ratio = second_body / second_range
-            third_body_ratio = third_body / third_range
-
-            # All bodies should be significant
-            if not (first_body_ratio >= self.min_body_ratio and
-                    second_body_ratio >= self.min_body_ratio and
-                    third_body_ratio >= self.min_body_ratio):
-                continue
-
-            # Each candle should open within the previous candle's body
-            second_opens_in_first = first['open'] < second['open'] < first['close']
-            third_opens_in_second = second['open'] < third['open'] < second['close']
-
-            # Each candle should close higher than the previous
-            closes_progressively_higher = first['close'] < second['close'] < third['close']
-
-            if second_opens_in_first and third_opens_in_second and closes_progressively_higher:
-                pattern_low = min(first['low'], second['low'], third['low'])
-                is_live = (i == len(df) - 1) and include_live
-
-                average_body_size = (first_body + second_body + third_body) / 3
-
-                # Three White Soldiers has 82% success rate
-                pattern_strength = 82.0
-
-                pattern = ThreeWhiteSoldiers(
-                    index=i,
-                    timestamp=df.index[i],
-                    first_candle_open=first['open'],
-                    first_candle_high=first['high'],
-                    first_candle_low=first['low'],
-                    first_candle_close=first['close'],
-                    second_candle_open=second['open'],
-                    second_candle_high=second['high'],
-                    second_candle_low=second['low'],
-                    second_candle_close=second['close'],
-                    third_candle_open=third['open'],
-                    third_candle_high=third['high'],
-                    third_candle_low=third['low'],
-                    third_candle_close=third['close'],
-                    pattern_type='three_white_soldiers',
-                    pattern_low=pattern_low,
-                    average_body_size=average_body_size,
-                    is_bullish=True,
-                    is_live=is_live,
-                    pattern_strength=pattern_strength
-                )
-                patterns.append(pattern)
-
-        return patterns
-
-
-class BullishMarubozuDetector:
-    """Detects bullish marubozu patterns"""
-
-    def __init__(self, max_wick_ratio: float = 0.05, min_body_ratio: float = 0.8):
-        self.max_wick_ratio = max_wick_ratio
-        self.min_body_ratio = min_body_ratio
-
-    def detect_bullish_marubozu(self, df: pd.DataFrame, include_live: bool = False) -> List[BullishMarubozu]:
-        """Detect bullish marubozu patterns in OHLCV data"""
-        patterns = []
-        end_index = len(df) if include_live else len(df) - 1
-
-        for i in range(end_index):
-            candle = df.iloc[i]
-            open_price = candle['open']
-            high_price = candle['high']
-            low_price = candle['low']
-            close_price = candle['close']
-
-            # Must be bullish
-            if close_price <= open_price:
-                continue
-
-            total_range = high_price - low_price
-            body_size = close_price - open_price
-            upper_wick = high_price - close_price
-            lower_wick = open_price - low_price
-
-            if total_range == 0:
-                continue
-
-            body_ratio = body_size / total_range
-            upper_wick_ratio = upper_wick / total_range
-            lower_wick_ratio = lower_wick / total_range
-
-            # Marubozu criteria: large body, minimal wicks
-            has_large_body = body_ratio >= self.min_body_ratio
-            has_small_wicks = (upper_wick_ratio <= self.max_wick_ratio and
-                               lower_wick_ratio <= self.max_wick_ratio)
-
-            if has_large_body and has_small_wicks:
-                is_live = (i == len(df) - 1) and include_live
-
-                # Bullish Marubozu has 69% success rate
-                pattern_strength = 69.0
-
-                pattern = BullishMarubozu(
-                    index=i,
-                    timestamp=df.index[i],
-                    open_price=open_price,
-                    high_price=high_price,
-                    low_price=low_price,
-                    close_price=close_price,
-                    pattern_type='bullish_marubozu',
-                    body_size=body_size,
-                    upper_wick_ratio=upper_wick_ratio,
-                    lower_wick_ratio=lower_wick_ratio,
-                    is_bullish=True,
-                    is_live=is_live,
-                    pattern_strength=pattern_strength
-                )
-                patterns.append(pattern)
-
-        return patterns
-
-
-class BullishHaramiDetector:
-    """Detects bullish harami patterns"""
-
-    def __init__(self, min_first_body_ratio: float = 0.6):
-        self.min_first_body_ratio = min_first_body_ratio
-
-    def detect_bullish_harami(self, df: pd.DataFrame, include_live: bool = False) -> List[BullishHarami]:
-        """Detect bullish harami patterns in OHLCV data"""
-        patterns = []
-        end_index = len(df) if include_live else len(df) - 1
-
-        for i in range(1, end_index):
-            previous = df.iloc[i - 1]
-            current = df.iloc[i]
-
-            # First candle must be bearish with significant body
-            first_is_bearish = previous['close'] < previous['open']
-            if not first_is_bearish:
-                continue
-
-            first_range = previous['high'] - previous['low']
-            first_body = previous['open'] - previous['close']
-
-            if first_range == 0:
-                continue
-
-            first_body_ratio = first_body / first_range
-            if first_body_ratio < self.min_first_body_ratio:
-                continue
-
-            # Second candle must be bullish and contained within first candle's body
-            second_is_bullish = current['close'] > current['open']
-            if not second_is_bullish:
-                continue
-
-            # Check containment
-            second_open_in_first = previous['close'] < current['open'] < previous['open']
-            second_close_in_first = previous['close'] < current['close'] < previous['open']
-
-            if second_open_in_first and second_close_in_first:
-                pattern_low = min(previous['low'], current['low'])
-                is_live = (i == len(df) - 1) and include_live
-
-                second_body = current['close'] - current['open']
-                containment_ratio = second_body / first_body
-
-                # Bullish Harami has 54% success rate
-                pattern_strength = 54.0
-
-                pattern = BullishHarami(
-                    index=i,
-                    timestamp=df.index[i],
-                    first_candle_open=previous['open'],
-                    first_candle_high=previous['high'],
-                    first_candle_low=previous['low'],
-                    first_candle_close=previous['close'],
-                    second_candle_open=current['open'],
-                    second_candle_high=current['high'],
-                    second_candle_low=current['low'],
-                    second_candle_close=current['close'],
-                    pattern_type='bullish_harami',
-                    pattern_low=pattern_low,
-                    containment_ratio=containment_ratio,
-                    is_bullish=True,
-                    is_live=is_live,
-                    pattern_strength=pattern_strength
-                )
-                patterns.append(pattern)
-
-        return patterns
-
-
-class BullishAbandonedBabyDetector:
-    """Detects bullish abandoned baby patterns"""
-
-    def __init__(self, min_gap_ratio: float = 0.2, max_doji_body_ratio: float = 0.1):
-        self.min_gap_ratio = min_gap_ratio
-        self.max_doji_body_ratio = max_doji_body_ratio
-
-    def detect_bullish_abandoned_baby(self, df: pd.DataFrame, include_live: bool = False) -> List[BullishAbandonedBaby]:
-        """Detect bullish abandoned baby patterns in OHLCV data"""
-        patterns = []
-        end_index = len(df) if include_live else len(df) - 1
-
-        for i in range(2, end_index):
-            first = df.iloc[i - 2]
-            doji = df.iloc[i - 1]
-            third = df.iloc[i]
-
-            # First candle must be bearish
-            first_is_bearish = first['close'] < first['open']
-            if not first_is_bearish:
-                continue
-
-            # Third candle must be bullish
-            third_is_bullish = third['close'] > third['open']
-            if not third_is_bullish:
-                continue
-
-            # Middle candle must be doji-like
-            doji_range = doji['high'] - doji['low']
-            doji_body = abs(doji['close'] - doji['open'])
-
-            if doji_range == 0:
-                continue
-
-            doji_body_ratio = doji_body / doji_range
-            if doji_body_ratio > self.max_doji_body_ratio:
-                continue
-
-            # Check for gaps
-            gap_down = first['close'] > doji['high']  # Gap down to doji
-            gap_up = doji['low'] > third['open']  # Gap up from doji
-
-            if gap_down and gap_up:
-                pattern_low = min(first['low'], doji['low'], third['low'])
-                is_live = (i == len(df) - 1) and include_live
-
-                gap_down_size = first['close'] - doji['high']
-                gap_up_size = third['open'] - doji['low']
-
-                # Abandoned Baby is rare but very powerful
-                pattern_strength = 75.0
-
-                pattern = BullishAbandonedBaby(
-                    index=i,
-                    timestamp=df.index[i],
-                    first_candle_open=first['open'],
-                    first_candle_high=first['high'],
-                    first_candle_low=first['low'],
-                    first_candle_close=first['close'],
-                    doji_open=doji['open'],
-                    doji_high=doji['high'],
-                    doji_low=doji['low'],
-                    doji_close=doji['close'],
-                    third_candle_open=third['open'],
-                    third_candle_high=third['high'],
-                    third_candle_low=third['low'],
-                    third_candle_close=third['close'],
-                    pattern_type='bullish_abandoned_baby',
-                    pattern_low=pattern_low,
-                    gap_down_size=gap_down_size,
-                    gap_up_size=gap_up_size,
-                    is_bullish=True,
-                    is_live=is_live,
-                    pattern_strength=pattern_strength
-                )
-                patterns.append(pattern)
-
-        return patterns
-
-
-class TweezerBottomDetector:
-    """Detects tweezer bottom patterns"""
-
-    def __init__(self, max_low_difference_pct: float = 0.1):
-        self.max_low_difference_pct = max_low_difference_pct
-
-    def detect_tweezer_bottom(self, df: pd.DataFrame, include_live: bool = False) -> List[TweezerBottom]:
-        """Detect tweezer bottom patterns in OHLCV data"""
-        patterns = []
-        end_index = len(df) if include_live else len(df) - 1
-
-        for i in range(1, end_index):
-            first = df.iloc[i - 1]
-            second = df.iloc[i]
-
-            # Check if lows are approximately equal
-            low_difference_pct = abs(first['low'] - second['low']) / min(first['low'], second['low']) * 100
-
-            if low_difference_pct <= self.max_low_difference_pct:
-                # Ideally, first candle should be bearish and second bullish
-                first_is_bearish = first['close'] < first['open']
-                second_is_bullish = second['close'] > second['open']
-
-                # But we'll accept any combination as long as lows match
-                pattern_low = min(first['low'], second['low'])
-                is_live = (i == len(df) - 1) and include_live
-
-                low_match_precision = 100 - low_difference_pct
-
-                # Tweezer Bottom has 61% success rate
-                pattern_strength = 61.0
-
-                pattern = TweezerBottom(
-                    index=i,
-                    timestamp=df.index[i],
-                    first_candle_open=first['open'],
-                    first_candle_high=first['high'],
-                    first_candle_low=first['low'],
-                    first_candle_close=first['close'],
-                    second_candle_open=second['open'],
-                    second_candle_high=second['high'],
-                    second_candle_low=second['low'],
-                    second_candle_close=second['close'],
-                    pattern_type='tweezer_bottom',
-                    pattern_low=pattern_low,
-                    low_match_precision=low_match_precision,
-                    is_bullish=True,
-                    is_live=is_live,
-                    pattern_strength=pattern_strength
-                )
-                patterns.append(pattern)
-
-        return patterns
-
-
-class BullishKickerDetector:
-    """Detects bullish kicker patterns"""
-
-    def __init__(self, min_gap_ratio: float = 0.5):
-        self.min_gap_ratio = min_gap_ratio
-
-    def detect_bullish_kicker(self, df: pd.DataFrame, include_live: bool = False) -> List[BullishKicker]:
-        """Detect bullish kicker patterns in OHLCV data"""
-        patterns = []
-        end_index = len(df) if include_live else len(df) - 1
-
-        for i in range(1, end_index):
-            first = df.iloc[i - 1]
-            second = df.iloc[i]
-
-            # First candle must be bearish
-            first_is_bearish = first['close'] < first['open']
-            if not first_is_bearish:
-                continue
-
-            # Second candle must be bullish
-            second_is_bullish = second['close'] > second['open']
-            if not second_is_bullish:
-                continue
-
-            # Must have a gap up (second opens above first's high)
-            has_gap_up = second['open'] > first['high']
-            if not has_gap_up:
-                continue
-
-            # Calculate gap size
-            gap_size = second['open'] - first['high']
-            first_range = first['high'] - first['low']
-
-            if first_range == 0:
-                continue
-
-            gap_ratio = gap_size / first_range
-
-            if gap_ratio >= self.min_gap_ratio:
-                pattern_low = min(first['low'], second['low'])
-                is_live = (i == len(df) - 1) and include_live
-
-                # Bullish Kicker is very powerful - high success rate
-                pattern_strength = 78.0
-
-                pattern = BullishKicker(
-                    index=i,
-                    timestamp=df.index[i],
-                    first_candle_open=first['open'],
-                    first_candle_high=first['high'],
-                    first_candle_low=first['low'],
-                    first_candle_close=first['close'],
-                    second_candle_open=second['open'],
-                    second_candle_high=second['high'],
-                    second_candle_low=second['low'],
-                    second_candle_close=second['close'],
-                    pattern_type='bullish_kicker',
-                    pattern_low=pattern_low,
-                    gap_size=gap_size,
-                    is_bullish=True,
-                    is_live=is_live,
-                    pattern_strength=pattern_strength
-                )
-                patterns.append(pattern)
-
-        return patterns
-
-
-# ============================================================================
-# LIVE PATTERN ANALYZER
-# ============================================================================
-
-class LivePatternAnalyzer:
-    """Analyzes patterns in real-time with live monitoring"""
-
-    def __init__(self, data_manager: BackgroundDataManager, file_manager: FileManager):
-        self.data_manager = data_manager
-        self.file_manager = file_manager
-
-    def analyze_live_patterns(self, symbols: List[str], timeframes: List[str],
-                              parameters: Dict, pattern_selection: Dict, exchange: str = 'NSE') -> Dict:
-        """Analyze patterns in real-time across multiple symbols and timeframes"""
-        results = {
-            'live_patterns': [],
-            'confirmed_patterns': [],
-            'summary': {}
-        }
-
-        total_live = 0
-        total_confirmed = 0
-
-        for symbol in symbols:
-            for timeframe in timeframes:
-                # Get cached data
-                df = self.data_manager.get_cached_data(symbol, timeframe, exchange)
-                if df is None or df.empty:
-                    continue
-
-                try:
-                    # Analyze patterns for this symbol/timeframe
-                    pattern_results = self._analyze_symbol_timeframe(
-                        symbol, timeframe, df, parameters, pattern_selection
-                    )
-
-                    # Add to results
-                    for pattern in pattern_results['live']:
-                        pattern['symbol'] = symbol
-                        pattern['timeframe'] = timeframe
-                        results['live_patterns'].append(pattern)
-                        total_live += 1
-
-                    for pattern in pattern_results['confirmed']:
-                        pattern['symbol'] = symbol
-                        pattern['timeframe'] = timeframe
-                        results['confirmed_patterns'].append(pattern)
-                        total_confirmed += 1
-
-                except Exception as e:
-                    continue
-
-        results['summary'] = {
-            'total_live': total_live,
-            'total_confirmed': total_confirmed,
-            'symbols_analyzed': len(symbols),
-            'timeframes_analyzed': len(timeframes),
-            'last_update': datetime.now().isoformat()
-        }
-
-        return results
-
-    def _analyze_symbol_timeframe(self, symbol: str, timeframe: str, df: pd.DataFrame,
-                                  parameters: Dict, pattern_selection: Dict) -> Dict:
-        """Analyze patterns for a specific symbol/timeframe combination - FIXED FOR NSE LIVE"""
-
-        # Check NSE market hours
-        try:
-            import pytz
-            ist = pytz.timezone('Asia/Kolkata')
-            now_ist = datetime.now(ist)
-            current_time = now_ist.time()
-            is_nse_trading = (time(9, 15) <= current_time <= time(15, 30) and
-                              now_ist.weekday() < 5)
-        except:
-            is_nse_trading = True  # Default to True if can't determine
-
-        # Use more aggressive parameters during NSE trading hours
-        if is_nse_trading:
-            swing_lookback = max(3, parameters.get('swing_lookback', 10) // 2)
-            touch_tolerance = parameters.get('touch_tolerance', 1.0) * 2.0  # More tolerant
-            min_swing_size = parameters.get('min_swing_size', 0.5) * 0.5  # More sensitive
-        else:
-            swing_lookback = parameters.get('swing_lookback', 10)
-            touch_tolerance = parameters.get('touch_tolerance', 1.0)
-            min_swing_size = parameters.get('min_swing_size', 0.5)
-
-        # Initialize detectors with live-optimized settings
-        swing_detector = EnhancedSwingLowDetector(swing_lookback, min_swing_size)
-        touch_analyzer = EnhancedSwingLowTouchAnalyzer(touch_tolerance)
-
-        results = {'live': [], 'confirmed': []}
-
-        try:
-            # Find swing lows with FIXED method
-            all_swing_lows = swing_detector.find_swing_lows_with_invalidation(df)
-            untouched_swing_lows = swing_detector.find_untouched_swing_lows(df, all_swing_lows)
-
-            # CRITICAL: Always include live patterns
-            include_live = True
-
-            # Detect selected patterns with live support
-            all_patterns = {}
-
-            if pattern_selection.get('pin_bar', False):
-                # More sensitive settings for live trading
-                min_wick = parameters.get('min_wick_ratio', 2.0)
-                max_body = parameters.get('max_body_ratio', 0.3)
-                if is_nse_trading:
-                    min_wick = min_wick * 0.9  # 10% more sensitive
-                    max_body = max_body * 1.2  # 20% more permissive
-
-                pinbar_detector = PinBarDetector(min_wick, max_body)
-                all_patterns['pin_bar'] = pinbar_detector.detect_pinbars(df, include_live=include_live)
-
-            if pattern_selection.get('bullish_engulfing', False):
-                min_ratio = parameters.get('min_engulfing_ratio', 1.1)
-                if is_nse_trading:
-                    min_ratio = min_ratio * 0.9  # More sensitive
-                engulfing_detector = BullishEngulfingDetector(min_ratio)
-                all_patterns['bullish_engulfing'] = engulfing_detector.detect_bullish_engulfing(df,
-                                                                                                include_live=include_live)
-
-            if pattern_selection.get('three_candle', False):
-                min_first = parameters.get('min_first_body', 0.6)
-                max_second = parameters.get('max_second_body', 0.4)
-                min_third = parameters.get('min_third_body', 0.6)
-                if is_nse_trading:
-                    min_first = min_first * 0.8
-                    max_second = max_second * 1.3
-                    min_third = min_third * 0.8
-                three_candle_detector = ThreeCandleDetector(min_first, max_second, min_third)
-                all_patterns['three_candle'] = three_candle_detector.detect_three_candle(df, include_live=include_live)
-
-            if pattern_selection.get('dragonfly_doji', False):
-                doji_detector = DragonflyDojiDetector()
-                all_patterns['dragonfly_doji'] = doji_detector.detect_dragonfly_doji(df, include_live=include_live)
-
-            if pattern_selection.get('three_white_soldiers', False):
-                soldiers_detector = ThreeWhiteSoldiersDetector()
-                all_patterns['three_white_soldiers'] = soldiers_detector.detect_three_white_soldiers(df,
-                                                                                                     include_live=include_live)
-
-            if pattern_selection.get('bullish_marubozu', False):
-                marubozu_detector = BullishMarubozuDetector()
-                all_patterns['bullish_marubozu'] = marubozu_detector.detect_bullish_marubozu(df,
-                                                                                             include_live=include_live)
-
-            if pattern_selection.get('bullish_harami', False):
-                harami_detector = BullishHaramiDetector()
-                all_patterns['bullish_harami'] = harami_detector.detect_bullish_harami(df, include_live=include_live)
-
-            if pattern_selection.get('bullish_abandoned_baby', False):
-                baby_detector = BullishAbandonedBabyDetector()
-                all_patterns['bullish_abandoned_baby'] = baby_detector.detect_bullish_abandoned_baby(df,
-                                                                                                     include_live=include_live)
-
-            if pattern_selection.get('tweezer_bottom', False):
-                tweezer_detector = TweezerBottomDetector()
-                all_patterns['tweezer_bottom'] = tweezer_detector.detect_tweezer_bottom(df, include_live=include_live)
-
-            if pattern_selection.get('bullish_kicker', False):
-                kicker_detector = BullishKickerDetector()
-                all_patterns['bullish_kicker'] = kicker_detector.detect_bullish_kicker(df, include_live=include_live)
-
-            # Analyze touches with enhanced validation
-            touches = touch_analyzer.analyze_touches(df, untouched_swing_lows, all_patterns, symbol, timeframe)
-
-            # Enhanced classification for NSE trading
-            current_time = datetime.now()
-            today = current_time.date()
-
-            for touch in touches:
-                entry_price = self._get_entry_price(touch.pattern, touch.pattern_type)
-                pattern_timestamp = pd.Timestamp(touch.pattern.timestamp)
-                pattern_date = pattern_timestamp.date()
-
-                # More aggressive live classification during market hours
-                is_today = pattern_date == today
-                time_diff = (current_time - pattern_timestamp).total_seconds()
-                is_recent = time_diff < (1800 if is_nse_trading else 3600)  # 30min during trading, 1hr otherwise
-
-                pattern_data = {
-                    'pattern_type': self._get_pattern_display_name(touch.pattern_type, touch.is_live),
-                    'timestamp': touch.pattern.timestamp.strftime('%Y-%m-%d %H:%M'),
-                    'entry_price': f"{entry_price:.4f}",
-                    'swing_low_price': f"{touch.swing_low.price:.4f}",
-                    'swing_low_valid': 'Yes' if touch.is_swing_low_valid else 'No',
-                    'distance_pct': f"{touch.price_difference:.2f}%",
-                    'days_between': touch.days_between,
-                    'is_bullish': 'Yes' if touch.pattern.is_bullish else 'No',
-                    'pattern_strength': f"{touch.pattern_strength:.1f}%",
-                    'nse_status': 'LIVE' if is_nse_trading else 'CLOSED',
-                    'is_today': 'YES' if is_today else 'No',
-                    'minutes_ago': f"{int(time_diff / 60)}"
-                }
-
-                # Enhanced live vs confirmed classification
-                if ((is_today and is_recent) or touch.is_live or
-                        (is_nse_trading and is_recent and time_diff < 3600)):  # 1 hour during trading
-                    results['live'].append(pattern_data)
-                else:
-                    results['confirmed'].append(pattern_data)
-
-        except Exception as e:
-            print(f"Error analyzing {symbol} {timeframe}: {e}")
-            import traceback
-            traceback.print_exc()
-
-        return results
-
-    def _get_entry_price(self, pattern, pattern_type: str) -> float:
-        """Get entry price for pattern"""
-        if pattern_type == 'pin_bar':
-            return pattern.close_price
-        elif pattern_type == 'bullish_engulfing':
-            return pattern.second_candle_close
-        elif pattern_type == 'three_candle':
-            return pattern.third_candle_close
-        elif pattern_type == 'dragonfly_doji':
-            return pattern.close_price
-        elif pattern_type == 'three_white_soldiers':
-            return pattern.third_candle_close
-        elif pattern_type == 'bullish_marubozu':
-            return pattern.close_price
-        elif pattern_type == 'bullish_harami':
-            return pattern.second_candle_close
-        elif pattern_type == 'bullish_abandoned_baby':
-            return pattern.third_candle_close
-        elif pattern_type == 'tweezer_bottom':
-            return pattern.second_candle_close
-        elif pattern_type == 'bullish_kicker':
-            return pattern.second_candle_close
-        else:
-            return getattr(pattern, 'close_price', 0)
-
-    def _get_pattern_display_name(self, pattern_type: str, is_live: bool) -> str:
-        """Get display name for pattern"""
-        display_names = {
-            'pin_bar': 'Pin Bar',
-            'bullish_engulfing': 'Bullish Engulfing',
-            'three_candle': 'Three Candle',
-            'dragonfly_doji': 'Dragonfly Doji',
-            'three_white_soldiers': 'Three White Soldiers',
-            'bullish_marubozu': 'Bullish Marubozu',
-            'bullish_harami': 'Bullish Harami',
-            'bullish_abandoned_baby': 'Bullish Abandoned Baby',
-            'tweezer_bottom': 'Tweezer Bottom',
-            'bullish_kicker': 'Bullish Kicker'
-        }
-
-        name = display_names.get(pattern_type, pattern_type.replace('_', ' ').title())
-        return f"{name} (Live)" if is_live else name
-
-
-# ============================================================================
-# COMPREHENSIVE ANALYSIS WITH CAPITAL INTEGRATION - INCLUDING TODAY'S CANDLE
-# ============================================================================
-
-def run_comprehensive_analysis(symbols: List[str], timeframes: List[str], parameters: Dict,
-                               pattern_selection: Dict, start_date: datetime, exchange: str = 'NSE',
-                               use_trailing_stop: bool = False, intraday_mode: bool = False,
-                               entry_cutoff_time: str = '11:45', exit_time: str = '15:15',
-                               custom_target_pct: float = None, use_partial_exits: bool = False,
-                               first_exit_pct: float = 0.5, second_exit_pct: float = 0.9,
-                               first_exit_capital_pct: float = 50.0) -> Tuple[List[Dict], Dict]:
-    """Run comprehensive pattern analysis with CUSTOMIZABLE ASYMMETRIC detection - COMPLETE VERSION"""
-
-    if not TV_AVAILABLE:
-        raise Exception("TradingView DataFeed not available")
-
-    try:
-        results = []
-
-        # Enhanced debug info with customizable asymmetric tracking
-        left_lookback = parameters.get('swing_lookback', 10)
-        right_lookback = parameters.get('right_lookback', 3)
-        pattern_only_entry = parameters.get('pattern_only_entry', False)
-        require_swing_touch = parameters.get('require_swing_touch', True)
-
-        debug_info = {
-            'start_date': start_date.strftime('%Y-%m-%d'),
-            'symbols_analyzed': 0,
-            'total_swing_lows': 0,
-            'total_invalidated_swing_lows': 0,
-            'total_valid_touches': 0,
-            'total_patterns_detected': 0,
-            'today_patterns_detected': 0,
-            'historical_trades_filtered': 0,
-            'live_detectable_trades': 0,
-            'asymmetric_detection': True,
-            'left_lookback': left_lookback,
-            'right_lookback': right_lookback,
-            'include_today_candle': True,
-            'use_trailing_stop': use_trailing_stop,
-            'intraday_mode': intraday_mode,
-            'intraday_entry_cutoff': entry_cutoff_time if intraday_mode else 'N/A',
-            'intraday_exit_time': exit_time if intraday_mode else 'N/A',
-            'custom_target_pct': custom_target_pct if custom_target_pct else 'Default',
-            'use_partial_exits': use_partial_exits,
-            'partial_exit_config': f"{first_exit_capital_pct}%@{first_exit_pct}%, {100 - first_exit_capital_pct}%@{second_exit_pct}%" if use_partial_exits else 'Disabled',
-            'pattern_only_entry': pattern_only_entry,
-            'require_swing_touch': require_swing_touch
-        }
-
-        # Initialize enhanced analyzers with custom parameters
-        swing_detector = EnhancedSwingLowDetector(
-            left_lookback=left_lookback,
-            right_lookback=right_lookback,
-            min_swing_size_pct=parameters.get('min_swing_size', 0.5)
-        )
-
-        touch_analyzer = EnhancedSwingLowTouchAnalyzer(
-            touch_tolerance_pct=parameters.get('touch_tolerance', 0.5),
-            min_days_between=parameters.get('min_days_between', 2)
-        )
-
-        trade_analyzer = EnhancedTradeOutcomeAnalyzer(
-            parameters.get('max_bars_to_analyze', 100),
-            parameters.get('capital_per_trade', 10000)
-        )
-
-        data_manager = st.session_state.data_manager
-        today_date = datetime.now().date()
-
-        print(f"🚀 Starting customizable asymmetric analysis: {left_lookback}+{right_lookback} lookback")
-        print(f"🎯 Entry mode: {'Pattern Only' if pattern_only_entry else 'Pattern + Swing Touch'}")
-
-        for symbol in symbols:
-            for timeframe in timeframes:
-                try:
-                    print(f"\n=== Analyzing {symbol} {timeframe} ===")
-
-                    # Get cached data
-                    df = data_manager.get_cached_data(symbol, timeframe, exchange)
-                    if df is None or df.empty:
-                        debug_info[f'{symbol}_{timeframe}_error'] = "No cached data"
-                        continue
-
-                    # Check if data includes today
-                    latest_data_date = df.index.max().date()
-                    has_today_data = latest_data_date >= today_date
-                    debug_info[f'{symbol}_{timeframe}_has_today'] = has_today_data
-
-                    # Filter data based on start_date
-                    df_filtered = df[df.index >= pd.Timestamp(start_date)]
-                    debug_info[f'{symbol}_{timeframe}_candles'] = len(df_filtered)
-
-                    if df_filtered.empty:
-                        print(f"  ❌ No data after {start_date.strftime('%Y-%m-%d')}")
-                        continue
-
-                    debug_info['symbols_analyzed'] += 1
+        st.header("🎛️ APEX AI SYSTEM")
 
-                    # Find selected patterns - INCLUDING TODAY'S CANDLE
-                    all_patterns = detect_selected_patterns_with_today(df_filtered, pattern_selection, parameters,
-                                                                       include_today=True)
+        # Logout button at the top
+        if st.button("🚪 Logout", use_container_width=True, key="sidebar_logout"):
+            logout()
 
-                    # Count today's patterns
-                    today_patterns = 0
-                    for pattern_list in all_patterns.values():
-                        for pattern in pattern_list:
-                            pattern_date = pd.Timestamp(pattern.timestamp).date()
-                            if pattern_date == today_date:
-                                today_patterns += 1
+        st.divider()
 
-                    debug_info['today_patterns_detected'] += today_patterns
-                    pattern_count = sum(len(patterns) for patterns in all_patterns.values())
-                    debug_info['total_patterns_detected'] += pattern_count
+        # Professional AI features status
+        st.markdown("""
+        <div class="professional-card">
+        <h4 style="color: #0066cc; margin: 0;">🧠 APEX AI FEATURES</h4>
+        <p style="color: #5a6c7d; font-size: 12px; margin: 5px 0;">
+        ✅ Date Picker Downloads<br>
+        ✅ Real-Time Analysis<br>
+        ✅ Pattern Recognition<br>
+        ✅ Smart Capital Management<br>
+        ✅ Advanced Validation
+        </p>
+        </div>
+        """, unsafe_allow_html=True)
 
-                    # Handle different entry modes
-                    if pattern_only_entry:
-                        # PATTERN ONLY MODE
-                        print(f"  📈 Pattern-only mode: processing {pattern_count} patterns directly")
-
-                        touches = []
-                        for pattern_type, patterns in all_patterns.items():
-                            for pattern in patterns:
-                                mock_swing_low = SwingLow(
-                                    index=pattern.index - 5,
-                                    timestamp=pattern.timestamp - pd.Timedelta(hours=5),
-                                    price=getattr(pattern, 'low_price', pattern.close_price * 0.99),
-                                    is_invalidated=False,
-                                    is_touched=False
-                                )
-
-                                touch = SwingLowTouch(
-                                    swing_low=mock_swing_low,
-                                    pattern=pattern,
-                                    touch_type='pattern_only',
-                                    pattern_type=pattern_type,
-                                    distance_pips=0.0,
-                                    days_between=0,
-                                    price_difference=0.0,
-                                    is_live=getattr(pattern, 'is_live', False),
-                                    pattern_strength=getattr(pattern, 'pattern_strength', 50.0),
-                                    symbol=symbol,
-                                    timeframe=timeframe,
-                                    is_swing_low_valid=True
-                                )
-                                touches.append(touch)
-
-                        debug_info[f'{symbol}_{timeframe}_touches'] = len(touches)
-                        validated_touches = touches
+        st.divider()
 
-                    else:
-                        # TRADITIONAL MODE - Require swing low touch
-                        print(f"  📈 Traditional mode: requiring swing low touch")
+        # Date picker status
+        use_date_picker = st.session_state.get('use_date_picker', False)
+        if use_date_picker:
+            download_start_date = st.session_state.get('data_download_start_date', datetime.now() - timedelta(days=30))
+            st.success(f"📅 Date Picker: {download_start_date.strftime('%Y-%m-%d')}")
+        else:
+            st.info("📅 Default bar counts")
 
-                        all_swing_lows = swing_detector.find_swing_lows_with_invalidation(df_filtered)
-                        debug_info['total_swing_lows'] += len(all_swing_lows)
+        # Professional status indicators
+        st.markdown("""
+        <div class="professional-card">
+        <h4 style="color: #00cc88; margin: 0;">🔧 SYSTEM STATUS</h4>
+        <p style="color: #5a6c7d; font-size: 12px; margin: 5px 0;">
+        ✅ Advanced Swing Low Validation<br>
+        ✅ Real-Time Trade Monitoring<br>
+        ✅ Precision Entry/Exit Detection<br>
+        ✅ AI Signal Validation<br>
+        ✅ Date-Based Data Downloads
+        </p>
+        </div>
+        """, unsafe_allow_html=True)
 
-                        invalidated_count = sum(1 for sl in all_swing_lows if sl.is_invalidated)
-                        debug_info['total_invalidated_swing_lows'] += invalidated_count
+        st.divider()
 
-                        untouched_swing_lows = swing_detector.find_untouched_swing_lows(df_filtered, all_swing_lows)
-                        print(f"  🎯 Swing lows: {len(all_swing_lows)} total, {len(untouched_swing_lows)} untouched")
+        # Instruments status
+        if st.session_state.instruments_list:
+            st.success(f"✅ {len(st.session_state.instruments_list)} instruments loaded")
+        else:
+            st.warning("⚠️ No instruments loaded")
 
-                        touches = touch_analyzer.analyze_touches(df_filtered, untouched_swing_lows, all_patterns,
-                                                                 symbol, timeframe)
-                        debug_info['total_valid_touches'] += len(touches)
-                        debug_info[f'{symbol}_{timeframe}_touches'] = len(touches)
-                        print(f"  🎯 Pattern touches: {len(touches)}")
+        # Pattern selection status
+        selected_patterns_count = sum(st.session_state.pattern_selection.values())
+        if selected_patterns_count > 0:
+            st.success(f"🧠 {selected_patterns_count}/10 AI patterns selected")
+        else:
+            st.warning("⚠️ No patterns selected")
 
-                        # Live entry validation
-                        validated_touches = validate_live_entry_capability(
-                            df_filtered, touches, swing_detector, parameters, debug_info
-                        )
+        # Professional Capital Management Status
+        st.divider()
+        st.subheader("💰 Capital Management")
 
-                    print(f"  ✅ Final validated touches: {len(validated_touches)}")
+        if st.session_state.capital_manager:
+            summary = st.session_state.capital_manager.get_performance_summary()
+            st.success(f"✅ AI Capital System Active")
+            st.metric("Total Capital", f"${summary['total_capital_current']:,.0f}")
+            st.metric("AI ROI", f"{summary['total_roi_pct']:.1f}%")
+            st.metric("Trades", f"{summary['trades_executed']}")
+        else:
+            st.info("💰 AI capital system ready")
+            st.metric("Total Capital", f"${st.session_state.total_capital:,.0f}")
+            st.metric("Per Trade", f"${st.session_state.capital_per_trade:,.0f}")
 
-                    # Analyze trade outcomes
-                    enhanced_touches = trade_analyzer.analyze_trade_outcomes_with_timeframe(
-                        df_filtered, validated_touches, timeframe,
-                        use_trailing_stop, intraday_mode, entry_cutoff_time, exit_time,
-                        custom_target_pct, use_partial_exits,
-                        first_exit_pct, second_exit_pct, first_exit_capital_pct
-                    )
+        # Today's date and status
+        st.divider()
+        today_str = datetime.now().strftime('%Y-%m-%d')
+        st.metric("Today's Date", today_str)
+        st.success("✅ Real-time data active")
 
-                    target_pct = trade_analyzer.get_target_for_timeframe(timeframe, custom_target_pct)
+        # Data update status
+        if st.session_state.last_data_update:
+            time_diff = datetime.now() - st.session_state.last_data_update
+            minutes_ago = int(time_diff.total_seconds() / 60)
+            st.info(f"🕒 Data updated: {minutes_ago}min ago")
+        else:
+            st.info("🕒 Ready for first update")
 
-                    # Process results
-                    for touch in enhanced_touches:
-                        pattern = touch.pattern
-                        pattern_type = touch.pattern_type
-                        entry_price = touch.entry_price
-                        pattern_low = getattr(pattern, 'pattern_low', getattr(pattern, 'low_price', entry_price))
-
-                        pattern_display_names = {
-                            'pin_bar': 'Pin Bar',
-                            'bullish_engulfing': 'Bullish Engulfing',
-                            'three_candle': 'Three Candle',
-                            'dragonfly_doji': 'Dragonfly Doji',
-                            'three_white_soldiers': 'Three White Soldiers',
-                            'bullish_marubozu': 'Bullish Marubozu',
-                            'bullish_harami': 'Bullish Harami',
-                            'bullish_abandoned_baby': 'Abandoned Baby',
-                            'tweezer_bottom': 'Tweezer Bottom',
-                            'bullish_kicker': 'Bullish Kicker'
-                        }
+        # Analysis status
+        if st.session_state.analysis_complete:
+            if st.session_state.analysis_results:
+                today_patterns = len(
+                    [r for r in st.session_state.analysis_results if r.get("Is Today's Pattern") == "YES"])
+                st.success(f"📊 {len(st.session_state.analysis_results)} opportunities found")
+                if today_patterns > 0:
+                    st.success(f"🎯 {today_patterns} from TODAY!")
+            else:
+                st.info("📊 Analysis complete - no opportunities")
+        else:
+            st.info("📊 Ready for AI analysis")
 
-                        pattern_type_display = pattern_display_names.get(pattern_type,
-                                                                         pattern_type.replace('_', ' ').title())
-                        pattern_date = pattern.timestamp.strftime("%Y-%m-%d %H:%M")
-                        is_today_pattern = pd.Timestamp(pattern.timestamp).date() == today_date
-
-                        # Get pattern strength info
-                        if pattern_type == 'pin_bar':
-                            strength_display = f"{pattern.wick_ratio:.1f}x"
-                        elif pattern_type == 'bullish_engulfing':
-                            strength_display = f"{pattern.engulfing_ratio:.1f}x"
-                        elif pattern_type == 'three_candle':
-                            strength_display = f"{pattern.pattern_strength:.1f}"
-                        elif pattern_type == 'dragonfly_doji':
-                            strength_display = f"{pattern.lower_wick_ratio:.1f}"
-                        elif pattern_type == 'three_white_soldiers':
-                            strength_display = f"{pattern.average_body_size:.4f}"
-                        elif pattern_type == 'bullish_marubozu':
-                            strength_display = f"{pattern.body_size:.4f}"
-                        elif pattern_type == 'bullish_harami':
-                            strength_display = f"{pattern.containment_ratio:.1f}"
-                        elif pattern_type == 'bullish_abandoned_baby':
-                            strength_display = f"{pattern.gap_up_size:.4f}"
-                        elif pattern_type == 'tweezer_bottom':
-                            strength_display = f"{pattern.low_match_precision:.1f}%"
-                        elif pattern_type == 'bullish_kicker':
-                            strength_display = f"{pattern.gap_size:.4f}"
-                        else:
-                            strength_display = "N/A"
-
-                        # Get trade outcome
-                        outcome = touch.trade_outcome
-                        if outcome:
-                            if outcome.partial_exits_enabled:
-                                if outcome.first_exit_triggered and outcome.second_exit_triggered:
-                                    trade_outcome_display = "Both Exits Complete"
-                                    current_status = f"Weighted P&L: {outcome.weighted_profit_pct:.2f}%"
-                                elif outcome.first_exit_triggered:
-                                    trade_outcome_display = f"1st Exit @ {outcome.first_exit_pct:.1f}%"
-                                    current_status = f"Partial Exit: {outcome.weighted_profit_pct:.2f}%"
-                                elif outcome.sl_hit:
-                                    trade_outcome_display = "Stop Loss"
-                                    current_status = f"SL Hit: {outcome.total_pnl_pct:.2f}%"
-                                else:
-                                    trade_outcome_display = "Ongoing"
-                                    current_status = f"Current: {outcome.current_profit_pct:.2f}%"
-                            elif outcome.resolution_type == 'intraday_exit':
-                                trade_outcome_display = "Intraday Exit"
-                                current_status = f"Exit@{exit_time}: {outcome.current_profit_pct:.2f}%"
-                            elif outcome.success:
-                                trade_outcome_display = "Success"
-                                current_status = f"Target: {outcome.current_profit_pct:.2f}%"
-                            elif outcome.sl_hit:
-                                if use_trailing_stop and outcome.trailing_active:
-                                    trade_outcome_display = "Trailing Stop"
-                                else:
-                                    trade_outcome_display = "Stop Loss"
-                                current_status = f"SL Hit: {outcome.current_profit_pct:.2f}%"
-                            else:
-                                trade_outcome_display = "Ongoing"
-                                current_status = f"Current: {outcome.current_profit_pct:.2f}%"
-                        else:
-                            trade_outcome_display = "No Data"
-                            current_status = "N/A"
-
-                        # COMPLETE result_dict with ALL required fields
-                        result_dict = {
-                            "Symbol": symbol,
-                            "Timeframe": timeframe,
-                            "Pattern Type": pattern_type_display,
-                            "Swing Low Date": touch.swing_low.timestamp.strftime("%Y-%m-%d %H:%M"),
-                            "Swing Low Price": f"{touch.swing_low.price:.4f}",
-                            "Swing Low Valid": "Yes" if touch.is_swing_low_valid else "No",
-                            "Swing Low Invalidated": "Yes" if touch.swing_low.is_invalidated else "No",
-                            "Pattern Date": pattern_date,
-                            "Is Today's Pattern": "YES" if is_today_pattern else "No",
-                            "Live Entry Detectable": "YES",  # FIXED: This was missing
-                            "Detection Mode": f"{left_lookback}+{right_lookback}",
-                            "Entry Price": f"{entry_price:.4f}",
-                            "Pattern Low": f"{pattern_low:.4f}",
-                            "Days Between": touch.days_between,
-                            "Distance %": f"{touch.price_difference:.3f}%",
-                            "Pattern Strength": f"{touch.pattern_strength:.1f}%",
-                            "Strength/Ratio": strength_display,
-                            "Bullish": "Yes" if pattern.is_bullish else "No",
-                            "Trade Outcome": trade_outcome_display,
-                            "Current Status": current_status,
-                            "Target Used": f"{target_pct:.1f}%",
-                            "Stop Loss Type": "Trailing" if use_trailing_stop else "Fixed",
-                            "_entry_price_numeric": entry_price,
-                            "_trade_outcome": outcome,
-                            "_trade_analyzer": trade_analyzer
-                        }
+        st.divider()
 
-                        if outcome:
-                            result_dict.update({
-                                "Target Price": f"{outcome.target_price:.4f}",
-                                "Stop Loss": f"{outcome.sl_price:.4f}",
-                                "Current Price": f"{outcome.current_price:.4f}",
-                                "Max Profit %": f"{outcome.max_profit_pct:.2f}%",
-                                "Max Drawdown %": f"{outcome.max_drawdown_pct:.2f}%",
-                                "Bars to Resolution": outcome.bars_to_resolution,
-                                "Resolution Type": outcome.resolution_type,
-                                "Last Update": outcome.last_update_timestamp.strftime(
-                                    "%Y-%m-%d %H:%M") if outcome.last_update_timestamp else "N/A"
-                            })
-
-                            if outcome.partial_exits_enabled:
-                                result_dict.update({
-                                    "Partial Exits": "Enabled",
-                                    "1st Exit Target": f"{outcome.first_exit_pct:.2f}%",
-                                    "1st Exit Hit": "Yes" if outcome.first_exit_triggered else "No",
-                                    "1st Exit Price": f"{outcome.first_exit_price:.4f}" if outcome.first_exit_triggered else "N/A",
-                                    "2nd Exit Target": f"{outcome.second_exit_pct:.2f}%",
-                                    "2nd Exit Hit": "Yes" if outcome.second_exit_triggered else "No",
-                                    "2nd Exit Price": f"{outcome.second_exit_price:.4f}" if outcome.second_exit_triggered else "N/A",
-                                    "Weighted P&L %": f"{outcome.weighted_profit_pct:.2f}%",
-                                    "Total P&L %": f"{outcome.total_pnl_pct:.2f}%"
-                                })
-
-                            if use_trailing_stop:
-                                result_dict.update({
-                                    "Trailing Active": "Yes" if outcome.trailing_active else "No",
-                                    "Trailing SL": f"{outcome.trailing_sl_price:.4f}" if outcome.trailing_active else "N/A",
-                                    "Highest Price": f"{outcome.highest_price_reached:.4f}" if outcome.trailing_active else "N/A"
-                                })
-
-                        results.append(result_dict)
+        # Professional Patterns showcase
+        st.subheader("🧠 AI Pattern Recognition")
+        pattern_emojis = {
+            'pin_bar': '📍',
+            'bullish_engulfing': '🔥',
+            'three_candle': '🌟',
+            'dragonfly_doji': '🐉',
+            'three_white_soldiers': '⚔️',
+            'bullish_marubozu': '💪',
+            'bullish_harami': '🤰',
+            'bullish_abandoned_baby': '👶',
+            'tweezer_bottom': '🔧',
+            'bullish_kicker': '🚀'
+        }
 
-                except Exception as e:
-                    debug_info[f'{symbol}_{timeframe}_error'] = str(e)
-                    print(f"  ❌ Error: {str(e)}")
+        for pattern_key, emoji in pattern_emojis.items():
+            is_selected = st.session_state.pattern_selection.get(pattern_key, False)
+            status = "✅" if is_selected else "⭕"
+            pattern_name = pattern_key.replace('_', ' ').title()
+            st.write(f"{status} {emoji} {pattern_name}")
 
-        total_filtered = debug_info.get('historical_trades_filtered', 0)
-        total_live = debug_info.get('live_detectable_trades', 0)
+        st.divider()
 
-        print(f"\n🎉 CUSTOMIZABLE ANALYSIS COMPLETE:")
-        print(f"  📊 Detection: {left_lookback}+{right_lookback} bars")
-        print(f"  🎯 Entry mode: {'Pattern Only' if pattern_only_entry else 'Pattern + Swing Touch'}")
-        print(f"  ✅ Results: {len(results)}")
+        # Professional quick actions
+        st.subheader("⚡ Quick Actions")
 
-        return results, debug_info
+        if st.button("🔄 Refresh Platform", use_container_width=True):
+            st.rerun()
 
-    except Exception as e:
-        raise Exception(f"Enhanced customizable analysis error: {str(e)}")
+        if st.button("🧹 Reset Session", use_container_width=True):
+            for key in list(st.session_state.keys()):
+                if key not in ['file_manager', 'authenticated', 'login_username', 'is_viewer']:  # Keep essential keys
+                    del st.session_state[key]
+            st.success("Session reset!")
+            st.rerun()
 
+        st.divider()
 
-def detect_selected_patterns_with_today(df: pd.DataFrame, pattern_selection: Dict,
-                                        parameters: Dict, include_today: bool = True) -> Dict:
-    """
-    Detect all selected patterns - FIXED FOR NSE LIVE TRADING
+        # Professional summary
+        st.markdown("""
+        <div class="professional-card">
+        <h5 style="color: #0066cc; margin: 0;">🧠 APEX AI PLATFORM</h5>
+        <p style="color: #5a6c7d; font-size: 11px; margin: 3px 0;">
+        Professional AI Market Analysis Platform with real-time pattern detection, 
+        advanced capital management, and comprehensive trading analytics.
+        </p>
+        </div>
+        """, unsafe_allow_html=True)
 
-    Args:
-        df: OHLCV DataFrame
-        pattern_selection: Dictionary of selected patterns
-        parameters: Analysis parameters
-        include_today: Whether to include today's patterns (default True)
-    """
-    all_patterns = {}
 
-    # Check if we're in NSE trading hours for parameter adjustment
-    try:
-        import pytz
-        ist = pytz.timezone('Asia/Kolkata')
-        now_ist = datetime.now(ist)
-        is_nse_trading = (time(9, 15) <= now_ist.time() <= time(15, 30) and
-                          now_ist.weekday() < 5)
-    except:
-        is_nse_trading = True
-
-    # Always include live patterns, especially during trading hours
-    include_live = include_today or is_nse_trading
-
-    if pattern_selection.get('pin_bar', False):
-        # Adjust sensitivity for live trading
-        min_wick = parameters.get('min_wick_ratio', 2.0)
-        max_body = parameters.get('max_body_ratio', 0.3)
-        if is_nse_trading:
-            min_wick = min_wick * 0.85  # More sensitive
-            max_body = max_body * 1.3  # More permissive
-
-        detector = PinBarDetector(min_wick, max_body)
-        all_patterns['pin_bar'] = detector.detect_pinbars(df, include_live=include_live)
-
-    if pattern_selection.get('bullish_engulfing', False):
-        min_ratio = parameters.get('min_engulfing_ratio', 1.1)
-        if is_nse_trading:
-            min_ratio = max(0.95, min_ratio * 0.9)  # More sensitive but not below 0.95
-        detector = BullishEngulfingDetector(min_ratio)
-        all_patterns['bullish_engulfing'] = detector.detect_bullish_engulfing(df, include_live=include_live)
-
-    if pattern_selection.get('three_candle', False):
-        min_first = parameters.get('min_first_body', 0.6)
-        max_second = parameters.get('max_second_body', 0.4)
-        min_third = parameters.get('min_third_body', 0.6)
-        if is_nse_trading:
-            min_first = min_first * 0.8
-            max_second = max_second * 1.4
-            min_third = min_third * 0.8
-        detector = ThreeCandleDetector(min_first, max_second, min_third)
-        all_patterns['three_candle'] = detector.detect_three_candle(df, include_live=include_live)
-
-    if pattern_selection.get('dragonfly_doji', False):
-        detector = DragonflyDojiDetector()
-        all_patterns['dragonfly_doji'] = detector.detect_dragonfly_doji(df, include_live=include_live)
-
-    if pattern_selection.get('three_white_soldiers', False):
-        detector = ThreeWhiteSoldiersDetector()
-        all_patterns['three_white_soldiers'] = detector.detect_three_white_soldiers(df, include_live=include_live)
-
-    if pattern_selection.get('bullish_marubozu', False):
-        detector = BullishMarubozuDetector()
-        all_patterns['bullish_marubozu'] = detector.detect_bullish_marubozu(df, include_live=include_live)
-
-    if pattern_selection.get('bullish_harami', False):
-        detector = BullishHaramiDetector()
-        all_patterns['bullish_harami'] = detector.detect_bullish_harami(df, include_live=include_live)
-
-    if pattern_selection.get('bullish_abandoned_baby', False):
-        detector = BullishAbandonedBabyDetector()
-        all_patterns['bullish_abandoned_baby'] = detector.detect_bullish_abandoned_baby(df, include_live=include_live)
-
-    if pattern_selection.get('tweezer_bottom', False):
-        detector = TweezerBottomDetector()
-        all_patterns['tweezer_bottom'] = detector.detect_tweezer_bottom(df, include_live=include_live)
-
-    if pattern_selection.get('bullish_kicker', False):
-        detector = BullishKickerDetector()
-        all_patterns['bullish_kicker'] = detector.detect_bullish_kicker(df, include_live=include_live)
-
-    return all_patterns
-
-
-# For backward compatibility, keep the old function name but use the new implementation
-def detect_selected_patterns(df: pd.DataFrame, pattern_selection: Dict, parameters: Dict) -> Dict:
-    """Detect all selected patterns - INCLUDING TODAY'S CANDLE"""
-    return detect_selected_patterns_with_today(df, pattern_selection, parameters, include_today=True)
 
 
 # ============================================================================
@@ -4506,7 +1197,7 @@ def test_live_nse_patterns():
 def init_session_state():
     """Initialize all session state variables - ENHANCED WITH CUSTOM SWING PARAMETERS"""
     defaults = {
-        'file_manager': FileManager(),
+        'file_manager': FileManager(StreamlitReporter()),
         'data_manager': None,
         'live_analyzer': None,
         'analysis_results': None,
@@ -4554,6 +1245,18 @@ def init_session_state():
         'second_exit_pct': 0.9,  # Second exit at 0.9%
         'first_exit_capital_pct': 50.0,  # 50% of capital on first exit
 
+        # Parallel Analysis Configuration
+        'parallel_analysis': (os.cpu_count() or 1) > 1,
+        'analysis_workers': os.cpu_count() or 1,
+        'analysis_chunk_size': 4,
+
+        # Result Cache Configuration
+        'reuse_analysis_results': True,
+
+        # Stage Timing Configuration
+        'collect_stage_metrics': True,
+        'stage_metrics': None,
+
         # Telegram Alert Settings (WEBHOOK ONLY - NO CHAT ID)
         'telegram_enabled': False,
         'telegram_webhook_url': '',
@@ -5241,6 +1944,77 @@ def apply_professional_theme():
     """, unsafe_allow_html=True)
 
 
+def render_stage_metrics_section():
+    """Per-stage timings and counters of the last analysis run"""
+    metrics = st.session_state.get('stage_metrics')
+    if metrics is None or not (metrics.stages or metrics.counters):
+        return
+
+    st.subheader("⏱️ Pipeline Performance")
+    summary = metrics.summary()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Wall Time", f"{summary['wall_seconds']:.2f}s")
+    with col2:
+        st.metric("Units", summary['units'], help=f"{summary['symbols']} symbols, {summary['bars']:,} bars")
+    with col3:
+        bars_per_second = summary['bars_per_second']
+        st.metric("Bars/sec", f"{bars_per_second:,.0f}" if bars_per_second else "-")
+    with col4:
+        hit_rate = summary['result_cache_hit_rate_pct']
+        st.metric("Result Cache Hits", f"{hit_rate:.0f}%" if hit_rate is not None else "-")
+
+    if metrics.stages:
+        stage_df = metrics.stage_table()
+        create_download_buttons(stage_df, "ai_stage_timings", "Stage Timings")
+        st.dataframe(stage_df, use_container_width=True)
+
+    symbol_df = metrics.symbol_table()
+    if not symbol_df.empty:
+        with st.expander("🐢 Slowest Symbols"):
+            create_download_buttons(symbol_df, "ai_symbol_timings", "Symbol Timings")
+            st.dataframe(symbol_df.head(20), use_container_width=True)
+
+    st.divider()
+
+
+def consume_analysis_stream(stream, progress_bar, status, progress_start: float = 0.7,
+                            progress_end: float = 0.95, redraw_seconds: float = 0.5) -> Tuple[List[Dict], Dict]:
+    """Show an analysis stream's rows in a live table as units finish; returns (results, debug_info).
+
+    Today's patterns are listed first and redrawn the moment they arrive;
+    other rows at most every redraw_seconds. The table is cleared at the end
+    for the full results display.
+    """
+    live_columns = ["Symbol", "Timeframe", "Pattern Type", "Pattern Date", "Is Today's Pattern", "Entry Price",
+                    "Trade Outcome", "Current Status"]
+    table = st.empty()
+    today_rows, other_rows = [], []
+    last_draw = 0.0
+
+    for symbol, timeframe, unit_results in stream:
+        today_found = False
+        for row in unit_results:
+            if row.get("Is Today's Pattern") == "YES":
+                today_rows.append(row)
+                today_found = True
+            else:
+                other_rows.append(row)
+
+        done, total = stream.done_units, stream.total_units
+        progress_bar.progress(progress_start + (progress_end - progress_start) * done / max(total, 1))
+        status.text(f"Analyzed {symbol} {timeframe} ({done}/{total}) - "
+                    f"{len(today_rows) + len(other_rows)} opportunities, {len(today_rows)} today")
+
+        if unit_results and (today_found or time.time() - last_draw >= redraw_seconds):
+            table.dataframe(pd.DataFrame(today_rows + other_rows, columns=live_columns),
+                            use_container_width=True, height=300, hide_index=True)
+            last_draw = time.time()
+
+    table.empty()
+    return stream.results, stream.debug_info
+
+
 def render_instrument_management():
     """Render instrument management section with professional styling"""
     st.subheader("🎯 Instrument Portfolio Management")
@@ -5401,6 +2175,27 @@ def render_data_management_tab():
                 if st.checkbox(tf, key=f"tf_{tf}", value=(tf in ['15m', '1H', '4H'])):
                     selected_timeframes.append(tf)
 
+        st.session_state.data_manager.resample_higher_timeframes = st.checkbox(
+            "🔁 Build 15m/30m/1H/4H from finer cached data",
+            value=st.session_state.data_manager.resample_higher_timeframes,
+            help="Resample higher timeframes locally (NSE session aligned, 09:15 open) from the finest up-to-date "
+                 "cached series that covers the range; fetch from TradingView only when none does"
+        )
+
+        file_manager = st.session_state.file_manager
+        use_store = st.checkbox(
+            "🗃️ Consolidated SQLite store",
+            value=file_manager.consolidated is not None,
+            help="Keep every cached series in one data_cache/market_data.sqlite file indexed by (symbol, "
+                 "timestamp) instead of one file per series; each update round is written in one transaction"
+        )
+        if use_store != (file_manager.consolidated is not None):
+            file_manager.use_consolidated_store(use_store)
+        if use_store and st.button("📥 Import per-series cache into store"):
+            with st.spinner("Importing cached series..."):
+                imported = file_manager.import_into_store()
+            st.success(f"✅ Imported {imported} series")
+
         st.session_state.selected_timeframes = selected_timeframes
 
         exchange = st.selectbox("Exchange Platform", ['NSE', 'BINANCE', 'BSE', 'NASDAQ', 'NYSE'],
@@ -5416,12 +2211,15 @@ def render_data_management_tab():
                     start_date_for_download = download_start_datetime if use_date_picker else None
 
                     with st.spinner("AI processing data with smart updates..."):
+                        progress_bar = st.progress(0.0)
                         results = st.session_state.data_manager.update_data_incrementally(
                             st.session_state.instruments_list,
                             selected_timeframes,
                             exchange,
                             force_update=False,
-                            start_date=start_date_for_download
+                            start_date=start_date_for_download,
+                            progress_callback=lambda done, total, symbol, tf, status: progress_bar.progress(
+                                done / total, text=f"{done}/{total} • {symbol} {tf}: {status}")
                         )
                         st.session_state.update_status = results
                         st.session_state.last_data_update = datetime.now()
@@ -5442,12 +2240,15 @@ def render_data_management_tab():
                     start_date_for_download = download_start_datetime if use_date_picker else None
 
                     with st.spinner("Full data refresh in progress..."):
+                        progress_bar = st.progress(0.0)
                         results = st.session_state.data_manager.update_data_incrementally(
                             st.session_state.instruments_list,
                             selected_timeframes,
                             exchange,
                             force_update=True,
-                            start_date=start_date_for_download
+                            start_date=start_date_for_download,
+                            progress_callback=lambda done, total, symbol, tf, status: progress_bar.progress(
+                                done / total, text=f"{done}/{total} • {symbol} {tf}: {status}")
                         )
                         st.session_state.update_status = results
                         st.session_state.last_data_update = datetime.now()
@@ -5527,6 +2328,35 @@ def render_data_management_tab():
             create_download_buttons(status_df, "ai_update_status_with_dates", "AI Status Report")
             st.dataframe(status_df, use_container_width=True, height=300)
 
+    st.subheader("🗄️ Cache Status")
+
+    cache_entries = st.session_state.file_manager.get_all_cache_info()
+    col_a, col_b = st.columns([3, 1])
+    with col_b:
+        if st.button("🔁 Rebuild Cache Index", use_container_width=True):
+            with st.spinner("Indexing cache files..."):
+                indexed = st.session_state.file_manager.rebuild_manifest()
+            st.success(f"✅ Indexed {indexed} cache files")
+            st.rerun()
+
+    with col_a:
+        if cache_entries:
+            cache_df = pd.DataFrame([{
+                'Symbol': entry['symbol'],
+                'Exchange': entry['exchange'],
+                'Timeframe': entry['timeframe'],
+                'Bars': entry['total_candles'],
+                'First Bar': (entry.get('date_range') or {}).get('start'),
+                'Last Bar': entry.get('last_bar'),
+                'Size (KB)': round(entry.get('file_size', 0) / 1024, 2),
+                'Last Fetch': entry.get('fetched_at'),
+                'Checksum': entry.get('checksum')
+            } for entry in cache_entries.values()]).sort_values(['Symbol', 'Timeframe'])
+            st.caption(f"{len(cache_df)} cached series • {cache_df['Size (KB)'].sum() / 1024:.1f} MB on disk")
+            st.dataframe(cache_df, use_container_width=True, height=300, hide_index=True)
+        else:
+            st.info("No cached data indexed yet")
+
     # Enhanced information section
     st.info(
         "🚀 **AI-Powered Updates with Date Picker**: Choose between date-based downloads (specify exact start date) or default bar counts. Date-based downloads automatically calculate the optimal number of bars needed from your selected start date to present, including today's real-time candles!")
@@ -6251,7 +3081,8 @@ Your webhook alerts are working correctly!
                     f"AI analyzing {len(st.session_state.instruments_list)} instruments across {len(analysis_timeframes)} timeframes...")
                 main_progress.progress(0.7)
 
-                results, debug_info = run_comprehensive_analysis(
+                metrics = StageMetrics(enabled=st.session_state.get('collect_stage_metrics', True))
+                stream = stream_comprehensive_analysis(
                     st.session_state.instruments_list,
                     analysis_timeframes,
                     st.session_state.analysis_parameters,
@@ -6266,16 +3097,23 @@ Your webhook alerts are working correctly!
                     use_partial_exits=st.session_state.get('use_partial_exits', False),
                     first_exit_pct=st.session_state.get('first_exit_pct', 0.5),
                     second_exit_pct=st.session_state.get('second_exit_pct', 0.9),
-                    first_exit_capital_pct=st.session_state.get('first_exit_capital_pct', 50.0)
+                    first_exit_capital_pct=st.session_state.get('first_exit_capital_pct', 50.0),
+                    executor='process' if st.session_state.get('parallel_analysis', False) else 'serial',
+                    max_workers=st.session_state.get('analysis_workers'),
+                    chunk_size=st.session_state.get('analysis_chunk_size', 4),
+                    data_manager=st.session_state.data_manager,
+                    use_result_cache=st.session_state.get('reuse_analysis_results', True),
+                    metrics=metrics
                 )
+                results, debug_info = consume_analysis_stream(stream, main_progress, phase_status)
 
-                main_progress.progress(0.95)
                 analysis_elapsed_time = time.time() - analysis_start_time
 
                 # Store results
                 st.session_state.analysis_results = results
                 st.session_state.analysis_complete = True
                 st.session_state.debug_info = debug_info
+                st.session_state.stage_metrics = metrics if metrics.enabled else None
 
                 # PHASE 3: TELEGRAM ALERTS (if enabled)
                 if st.session_state.get('telegram_enabled', False) and results:
@@ -6430,7 +3268,7 @@ Your webhook alerts are working correctly!
         if st.session_state.instruments_list and analysis_timeframes:
             symbol = st.session_state.instruments_list[0]
             timeframe = analysis_timeframes[0] if analysis_timeframes else '1H'
-            df = st.session_state.data_manager.get_cached_data(symbol, timeframe, exchange)
+            df = st.session_state.data_manager.get_cached_data(symbol, timeframe, exchange, window=1)
             if df is not None and not df.empty:
                 latest_time = df.index.max()
                 age_hours = (datetime.now() - latest_time).total_seconds() / 3600
@@ -6561,7 +3399,8 @@ def execute_combined_analysis(analysis_timeframes, selected_patterns, analysis_s
             f"AI analyzing {len(st.session_state.instruments_list)} instruments across {len(analysis_timeframes)} timeframes...")
         main_progress.progress(0.7)
 
-        results, debug_info = run_comprehensive_analysis(
+        metrics = StageMetrics(enabled=st.session_state.get('collect_stage_metrics', True))
+        stream = stream_comprehensive_analysis(
             st.session_state.instruments_list,
             analysis_timeframes,
             st.session_state.analysis_parameters,
@@ -6576,16 +3415,23 @@ def execute_combined_analysis(analysis_timeframes, selected_patterns, analysis_s
             use_partial_exits=st.session_state.get('use_partial_exits', False),
             first_exit_pct=st.session_state.get('first_exit_pct', 0.5),
             second_exit_pct=st.session_state.get('second_exit_pct', 0.9),
-            first_exit_capital_pct=st.session_state.get('first_exit_capital_pct', 50.0)
+            first_exit_capital_pct=st.session_state.get('first_exit_capital_pct', 50.0),
+            executor='process' if st.session_state.get('parallel_analysis', False) else 'serial',
+            max_workers=st.session_state.get('analysis_workers'),
+            chunk_size=st.session_state.get('analysis_chunk_size', 4),
+            data_manager=st.session_state.data_manager,
+            use_result_cache=st.session_state.get('reuse_analysis_results', True),
+            metrics=metrics
         )
+        results, debug_info = consume_analysis_stream(stream, main_progress, phase_status)
 
-        main_progress.progress(0.95)
         analysis_elapsed_time = time.time() - analysis_start_time
 
         # Store results
         st.session_state.analysis_results = results
         st.session_state.analysis_complete = True
         st.session_state.debug_info = debug_info
+        st.session_state.stage_metrics = metrics if metrics.enabled else None
 
         # PHASE 3: COMPLETE
         main_progress.progress(1.0)
@@ -6718,7 +3564,7 @@ def execute_combined_analysis(analysis_timeframes, selected_patterns, analysis_s
         if st.session_state.instruments_list and analysis_timeframes:
             symbol = st.session_state.instruments_list[0]
             timeframe = analysis_timeframes[0] if analysis_timeframes else '1H'
-            df = st.session_state.data_manager.get_cached_data(symbol, timeframe, exchange)
+            df = st.session_state.data_manager.get_cached_data(symbol, timeframe, exchange, window=1)
             if df is not None and not df.empty:
                 latest_time = df.index.max()
                 age_hours = (datetime.now() - latest_time).total_seconds() / 3600
@@ -7350,7 +4196,8 @@ def run_comprehensive_analysis_with_capital(symbols: List[str], timeframes: List
         capital_manager = CapitalManager(
             total_capital=capital_settings.get('total_capital', 100000),
             capital_per_trade=capital_settings.get('capital_per_trade', 10000),
-            start_date=start_date
+            start_date=start_date,
+            reporter=StreamlitReporter()
         )
 
         # Run capital simulation
@@ -7629,6 +4476,10 @@ def display_capital_results():
 
     st.divider()
 
+    render_monte_carlo_section(capital_manager, all_touches)
+
+    st.divider()
+
     # Complete Analysis Details Section
     st.subheader("📋 Complete Professional Analysis Details")
 
@@ -7802,6 +4653,66 @@ def display_capital_results():
         st.dataframe(events_df.tail(30), use_container_width=True, height=300)
 
 
+def render_monte_carlo_section(capital_manager: CapitalManager, all_touches: List[SwingLowTouch]):
+    """Monte Carlo distribution of the capital simulation over resampled trade sequences"""
+    st.subheader("🎲 Monte Carlo Capital Simulation")
+    st.caption("Replays the same trade outcomes in shuffled or resampled order to show the range of "
+               "final capital, drawdown and rejections the pattern set could have produced")
+
+    mc_col1, mc_col2, mc_col3, mc_col4 = st.columns(4)
+
+    with mc_col1:
+        n_paths = st.number_input("Paths", 100, 50000, st.session_state.get('monte_carlo_paths', 10000), 1000,
+                                  key="monte_carlo_paths_input")
+        st.session_state['monte_carlo_paths'] = n_paths
+
+    with mc_col2:
+        method = st.selectbox("Resampling", ['permute', 'bootstrap'],
+                              format_func=lambda m: "Shuffle order" if m == 'permute' else "Bootstrap (with replacement)",
+                              key="monte_carlo_method")
+
+    with mc_col3:
+        seed = st.number_input("Random Seed", 0, 1_000_000, 42, 1, key="monte_carlo_seed")
+
+    with mc_col4:
+        st.write("")
+        run_clicked = st.button("🎲 Run Monte Carlo", use_container_width=True)
+
+    if run_clicked:
+        simulator = MonteCarloCapitalSimulator(capital_manager.total_capital, capital_manager.capital_per_trade,
+                                               capital_manager.start_date)
+        if simulator.load_touches(all_touches) == 0:
+            st.warning("⚠️ No trades after the start date to resample")
+        else:
+            with st.spinner(f"Simulating {n_paths:,} paths..."):
+                start_time = time.time()
+                paths_df = simulator.run(
+                    n_paths, method, seed,
+                    executor='process' if st.session_state.get('parallel_analysis', False) else 'serial',
+                    max_workers=st.session_state.get('analysis_workers')
+                )
+                st.session_state['monte_carlo_results'] = paths_df
+            st.success(f"✅ {len(paths_df):,} paths simulated in {time.time() - start_time:.1f}s")
+
+    paths_df = st.session_state.get('monte_carlo_results')
+    if paths_df is None or paths_df.empty:
+        return
+
+    summary_df = MonteCarloCapitalSimulator.summarize(paths_df)
+    st.dataframe(summary_df.style.format("{:,.2f}"), use_container_width=True)
+
+    hist_col1, hist_col2, hist_col3 = st.columns(3)
+    for column, metric, label in ((hist_col1, 'final_capital', "Final Capital"),
+                                  (hist_col2, 'max_drawdown_pct', "Max Drawdown %"),
+                                  (hist_col3, 'trades_rejected', "Trades Rejected")):
+        with column:
+            st.write(f"**{label}**")
+            counts, edges = np.histogram(paths_df[metric], bins=30)
+            st.bar_chart(pd.DataFrame({'Paths': counts}, index=np.round((edges[:-1] + edges[1:]) / 2, 2)))
+
+    create_download_buttons(paths_df, "ai_monte_carlo_paths", "Monte Carlo Paths")
+
+
 def render_live_monitoring_tab():
     """Render the professional live monitoring tab with progress tracking and Telegram alerts"""
     st.header("🔴 Professional Real-Time Pattern Monitoring")
@@ -8066,6 +4977,93 @@ def render_live_monitoring_tab():
         st.info("🔍 No real-time patterns scanned yet. Click 'AI Live Scan' to start professional monitoring.")
 
 
+def _parse_sweep_values(text: str, cast) -> List:
+    """Comma-separated sweep values; 'default' maps to None (timeframe default target)"""
+    values = []
+    for item in text.split(','):
+        item = item.strip()
+        if item:
+            values.append(None if item.lower() == 'default' else cast(item))
+    return values
+
+
+def render_parameter_sweep_section():
+    """Grid / random search over the main detection parameters with staged caching"""
+    st.subheader("🧪 Parameter Sweep")
+    st.caption("Swing lows, patterns, touches and outcomes are each computed once per distinct setting "
+               "and shared across combinations")
+
+    parameters = st.session_state.analysis_parameters
+    sweep_col1, sweep_col2 = st.columns(2)
+
+    with sweep_col1:
+        swing_values = st.text_input("Left Lookback values", str(parameters.get('swing_lookback', 10)),
+                                     key="sweep_swing_lookback")
+        right_values = st.text_input("Right Lookback values", str(parameters.get('right_lookback', 3)),
+                                     key="sweep_right_lookback")
+        tolerance_values = st.text_input("Touch Tolerance % values", str(parameters.get('touch_tolerance', 0.5)),
+                                         key="sweep_touch_tolerance")
+        wick_values = st.text_input("Pin Bar Min Wick Ratio values", str(parameters.get('min_wick_ratio', 2.0)),
+                                    key="sweep_min_wick_ratio")
+        target_values = st.text_input("Target % values ('default' = per-timeframe target)", "default",
+                                      key="sweep_custom_target_pct")
+
+    with sweep_col2:
+        sweep_timeframes = st.multiselect("Timeframes", ['1m', '5m', '15m', '30m', '1H', '4H', '1D'],
+                                          default=['4H', '1D'], key="sweep_timeframes")
+        search_mode = st.radio("Search", ["Grid", "Random"], horizontal=True, key="sweep_mode")
+        n_samples = st.number_input("Random samples", 1, 1000, 20, 1, key="sweep_samples",
+                                    disabled=search_mode == "Grid")
+        sweep_seed = st.number_input("Random seed", 0, 1_000_000, 42, 1, key="sweep_seed",
+                                     disabled=search_mode == "Grid")
+
+    try:
+        space = {
+            'swing_lookback': _parse_sweep_values(swing_values, int),
+            'right_lookback': _parse_sweep_values(right_values, int),
+            'touch_tolerance': _parse_sweep_values(tolerance_values, float),
+            'min_wick_ratio': _parse_sweep_values(wick_values, float),
+            'custom_target_pct': _parse_sweep_values(target_values, float)
+        }
+    except ValueError as e:
+        st.error(f"❌ Invalid sweep value: {e}")
+        return
+
+    space = {name: values for name, values in space.items() if values}
+    combinations = parameter_grid(space) if search_mode == "Grid" else \
+        random_parameter_samples(space, n_samples, sweep_seed)
+    st.info(f"🧪 {len(combinations)} combinations x {len(st.session_state.instruments_list)} instruments x "
+            f"{len(sweep_timeframes)} timeframes")
+
+    if st.button("🧪 Run Parameter Sweep", use_container_width=True,
+                 disabled=not combinations or not sweep_timeframes or not st.session_state.instruments_list):
+        base = AnalysisSettings(
+            dict(parameters), st.session_state.pattern_selection,
+            st.session_state.get('analysis_start_date', datetime.now() - timedelta(days=180)), datetime.now().date(),
+            st.session_state.get('use_trailing_stop', False), st.session_state.get('intraday_mode', False),
+            st.session_state.get('intraday_entry_cutoff', '11:45'), st.session_state.get('intraday_exit_time', '15:15'),
+            st.session_state.get('custom_target_pct', None), st.session_state.get('use_partial_exits', False),
+            st.session_state.get('first_exit_pct', 0.5), st.session_state.get('second_exit_pct', 0.9),
+            st.session_state.get('first_exit_capital_pct', 50.0)
+        )
+        with st.spinner(f"Sweeping {len(combinations)} combinations..."):
+            start_time = time.time()
+            st.session_state['sweep_results'] = run_parameter_sweep(
+                st.session_state.instruments_list, sweep_timeframes, base, combinations,
+                data_manager=st.session_state.data_manager,
+                executor='process' if st.session_state.get('parallel_analysis', False) else 'serial',
+                max_workers=st.session_state.get('analysis_workers'),
+                chunk_size=st.session_state.get('analysis_chunk_size', 4)
+            )
+        st.success(f"✅ Sweep complete in {time.time() - start_time:.1f}s")
+
+    sweep_df = st.session_state.get('sweep_results')
+    if sweep_df is not None and not sweep_df.empty:
+        sweep_df = sweep_df.sort_values('total_pnl_pct', ascending=False)
+        create_download_buttons(sweep_df, "ai_parameter_sweep", "Parameter Sweep")
+        st.dataframe(sweep_df, use_container_width=True, height=300)
+
+
 def render_settings_tab():
     """Enhanced settings tab with customizable swing detection parameters"""
     st.header("⚙️ Professional Settings & Configuration")
@@ -8241,6 +5239,62 @@ def render_settings_tab():
             "Engulfing: Min Ratio", 1.0, 3.0, st.session_state.analysis_parameters['min_engulfing_ratio'], 0.1
         )
 
+    # Parallel Analysis
+    st.subheader("⚡ Parallel Analysis")
+    cpu_count = os.cpu_count() or 1
+    par_col1, par_col2, par_col3 = st.columns(3)
+
+    with par_col1:
+        st.session_state['parallel_analysis'] = st.checkbox(
+            "Use process pool",
+            value=st.session_state.get('parallel_analysis', cpu_count > 1),
+            help="Analyze symbol/timeframe units in parallel worker processes (results are identical to a serial run)"
+        )
+
+    with par_col2:
+        st.session_state['analysis_workers'] = st.number_input(
+            "Worker Processes", 1, cpu_count, min(st.session_state.get('analysis_workers', cpu_count), cpu_count), 1,
+            disabled=not st.session_state['parallel_analysis'],
+            help=f"{cpu_count} CPU cores detected"
+        )
+
+    with par_col3:
+        st.session_state['analysis_chunk_size'] = st.number_input(
+            "Units per Task", 1, 64, st.session_state.get('analysis_chunk_size', 4), 1,
+            disabled=not st.session_state['parallel_analysis'],
+            help="Symbol/timeframe units sent to a worker at once; larger chunks cut overhead for short series"
+        )
+
+    # Result Cache
+    st.subheader("♻️ Result Cache")
+    result_cache = st.session_state.file_manager.result_cache
+    cache_col1, cache_col2, cache_col3 = st.columns(3)
+
+    with cache_col1:
+        st.session_state['reuse_analysis_results'] = st.checkbox(
+            "Reuse unchanged results",
+            value=st.session_state.get('reuse_analysis_results', True),
+            help="Skip symbol/timeframe units whose cached bars and analysis settings are unchanged since the last run"
+        )
+
+    with cache_col2:
+        cache_stats = result_cache.stats()
+        st.metric("Cached Units", f"{cache_stats['entries']}/{cache_stats['max_entries']}",
+                  help=f"{cache_stats['size_kb']} KB on disk")
+
+    with cache_col3:
+        if st.button("🗑️ Clear Result Cache"):
+            removed = result_cache.clear()
+            st.success(f"✅ Removed {removed} cached results")
+
+    # Stage Timing
+    st.subheader("⏱️ Stage Timing")
+    st.session_state['collect_stage_metrics'] = st.checkbox(
+        "Collect per-stage timings",
+        value=st.session_state.get('collect_stage_metrics', True),
+        help="Time data load, swing, pattern, touch, outcome and formatting stages per symbol (shown in the Analytics Dashboard)"
+    )
+
     # Touch Validation Info
     st.subheader("📏 Strict Touch Validation Settings")
     col_info1, col_info2 = st.columns(2)
@@ -8261,6 +5315,10 @@ def render_settings_tab():
         - Days gap < {st.session_state.analysis_parameters.get('min_days_between', 1)}: ❌ Rejected
         """)
 
+    st.divider()
+    render_parameter_sweep_section()
+    st.divider()
+
     # Save Configuration
     if st.button("💾 Save All Configuration", type="primary", use_container_width=True):
         st.success("✅ All configuration saved successfully!")
@@ -8289,45 +5347,6 @@ def render_settings_tab():
     st.dataframe(config_df, use_container_width=True)
 
 
-def validate_live_entry_capability(df: pd.DataFrame, touches: List[SwingLowTouch],
-                                   swing_detector: EnhancedSwingLowDetector,
-                                   parameters: Dict, debug_info: Dict) -> List[SwingLowTouch]:
-    """Filter touches to only include those detectable as live entries"""
-    validated_touches = []
-    filtered_count = 0
-
-    left_lookback = parameters.get('swing_lookback', 10)
-    right_lookback = parameters.get('right_lookback', 3)
-
-    print(f"🔍 Live entry validation: checking {len(touches)} historical touches")
-
-    for touch in touches:
-        try:
-            pattern_timestamp = pd.Timestamp(touch.pattern.timestamp)
-            pattern_index = touch.pattern.index
-            swing_low_index = touch.swing_low.index
-
-            # Swing low must be detectable before pattern formed
-            swing_low_detection_point = swing_low_index + right_lookback
-
-            if swing_low_detection_point < pattern_index:
-                validated_touches.append(touch)
-            else:
-                filtered_count += 1
-
-        except Exception as e:
-            filtered_count += 1
-            continue
-
-    print(f"✅ Live validation: {len(touches)} original → {len(validated_touches)} live-detectable")
-    print(f"❌ Filtered out: {filtered_count} trades that wouldn't be detectable live")
-
-    debug_info['historical_trades_filtered'] = debug_info.get('historical_trades_filtered', 0) + filtered_count
-    debug_info['live_detectable_trades'] = debug_info.get('live_detectable_trades', 0) + len(validated_touches)
-
-    return validated_touches
-
-
 def render_ascending_trendline_tab():
     """NEW: Ascending trendline support analysis - connects swing higher lows"""
     st.header("📐 Ascending Trendline Analysis (NEW)")
@@ -8528,6 +5547,8 @@ def main():
     with tab6:
         st.header("📈 Professional Analytics Dashboard")
 
+        render_stage_metrics_section()
+
         if st.session_state.debug_info:
             st.subheader("🔍 AI Analysis Performance Metrics")
 
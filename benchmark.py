@@ -0,0 +1,375 @@
+"""
+APEX AI BENCHMARK SUITE - per-stage timings of the analysis pipeline on seeded synthetic data
+
+Times swing detection, every pattern detector, touch analysis, trade outcomes,
+capital simulation and cache save/load, once over single series of growing
+length and once over universes of growing symbol count. Results are written as
+JSON so runs on different commits can be compared.
+
+Usage:
+    python benchmark.py                                   # 1k/10k/100k bars, 10/100/1500 symbols
+    python benchmark.py --bars 1000 10000 --symbols 10    # smaller matrix
+    python benchmark.py --compare benchmark_results/benchmark_abc1234_20250101_120000.json
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to import the apex_core package
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from apex_core import (
+    get_ist_now, format_ist_timestamp,
+    EnhancedSwingLowDetector, EnhancedSwingLowTouchAnalyzer, EnhancedTradeOutcomeAnalyzer, CapitalManager,
+    FileManager, FusedPatternDetector, PinBarDetector, BullishEngulfingDetector, ThreeCandleDetector,
+    DragonflyDojiDetector, ThreeWhiteSoldiersDetector, BullishMarubozuDetector, BullishHaramiDetector,
+    BullishAbandonedBabyDetector, TweezerBottomDetector, BullishKickerDetector, generate_synthetic_universe
+)
+
+BENCHMARK_VERSION = 1
+
+# Stages faster than this in both runs are too noisy to flag as regressions
+MIN_COMPARED_SECONDS = 0.001
+
+# Defaults of the app's analysis settings
+ANALYSIS_PARAMETERS = {
+    'swing_lookback': 9,
+    'right_lookback': 1,
+    'min_swing_size': 0.5,
+    'touch_tolerance': 0.10,
+    'min_days_between': 1,
+    'max_bars_to_analyze': 200,
+    'capital_per_trade': 10000
+}
+
+DETECTOR_CLASSES = {
+    'pin_bar': PinBarDetector,
+    'bullish_engulfing': BullishEngulfingDetector,
+    'three_candle': ThreeCandleDetector,
+    'dragonfly_doji': DragonflyDojiDetector,
+    'three_white_soldiers': ThreeWhiteSoldiersDetector,
+    'bullish_marubozu': BullishMarubozuDetector,
+    'bullish_harami': BullishHaramiDetector,
+    'bullish_abandoned_baby': BullishAbandonedBabyDetector,
+    'tweezer_bottom': TweezerBottomDetector,
+    'bullish_kicker': BullishKickerDetector,
+}
+
+
+def git_revision():
+    """Short commit hash of the working tree and whether it has uncommitted changes"""
+    try:
+        root = os.path.dirname(os.path.abspath(__file__))
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except Exception:
+        return None, None
+
+
+class PipelineBenchmark:
+    """Times each analysis stage over a synthetic universe"""
+
+    def __init__(self, timeframe='15m', repeat=3, seed=42, loop_max_bars=10_000, volatility=0.01, trend=1.0,
+                 pattern_rate=0.02):
+        self.timeframe = timeframe
+        self.repeat = repeat
+        self.seed = seed
+        self.loop_max_bars = loop_max_bars
+        self.volatility = volatility
+        self.trend = trend
+        self.pattern_rate = pattern_rate
+        self.records = []
+
+    def time_stage(self, suite, stage, universe, fn):
+        """Run fn repeat times (output suppressed); record best and median wall time.
+
+        fn returns the number of items it produced, which is recorded so that
+        timings are only compared between runs that did the same work.
+        """
+        timings = []
+        items = None
+        for _ in range(self.repeat):
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                items = fn()
+                timings.append(time.perf_counter() - start)
+
+        bars = sum(len(df) for df in universe.values())
+        record = {
+            'suite': suite,
+            'stage': stage,
+            'symbols': len(universe),
+            'bars_per_symbol': bars // max(len(universe), 1),
+            'best_s': min(timings),
+            'median_s': statistics.median(timings),
+            'runs': len(timings),
+            'items': items,
+            'bars_per_s': bars / min(timings) if min(timings) > 0 else None
+        }
+        self.records.append(record)
+        print(f"  {stage:<36} {record['best_s'] * 1000:>10.1f} ms  {items if items is not None else '':>8}")
+        return record
+
+    def run_stages(self, suite, universe):
+        """Time every stage over all symbols of the universe, each stage fed by the previous one"""
+        total_bars = sum(len(df) for df in universe.values())
+        parameters = ANALYSIS_PARAMETERS
+        swing_detector = EnhancedSwingLowDetector(parameters['swing_lookback'], parameters['right_lookback'],
+                                                  parameters['min_swing_size'])
+        detectors = {name: cls() for name, cls in DETECTOR_CLASSES.items()}
+        fused_detector = FusedPatternDetector(detectors)
+
+        swing_lows = {}
+
+        def swings():
+            for symbol, df in universe.items():
+                all_swing_lows = swing_detector.find_swing_lows_with_invalidation(df)
+                swing_lows[symbol] = swing_detector.find_untouched_swing_lows(df, all_swing_lows)
+            return sum(len(lows) for lows in swing_lows.values())
+
+        self.time_stage(suite, 'swing_detection', universe, swings)
+
+        if total_bars <= self.loop_max_bars:
+            for name, detector in detectors.items():
+                method = getattr(detector, FusedPatternDetector.LOOP_METHODS[name])
+                self.time_stage(suite, f"pattern_loop:{name}", universe,
+                                lambda method=method: sum(len(method(df, include_live=True))
+                                                          for df in universe.values()))
+        else:
+            print(f"  {'pattern_loop:*':<36} skipped ({total_bars:,} bars > --loop-max-bars)")
+
+        patterns = {}
+
+        def fused():
+            for symbol, df in universe.items():
+                patterns[symbol] = fused_detector.detect(df, include_live=True)
+            return sum(len(table) for tables in patterns.values() for table in tables.values())
+
+        self.time_stage(suite, 'pattern_fused', universe, fused)
+
+        touches = {}
+
+        def touch_analysis():
+            touch_analyzer = EnhancedSwingLowTouchAnalyzer(parameters['touch_tolerance'],
+                                                           parameters['min_days_between'])
+            for symbol, df in universe.items():
+                # Touch matching marks swing lows as touched, so every run starts from fresh copies
+                fresh_lows = [copy.copy(swing_low) for swing_low in swing_lows[symbol]]
+                touches[symbol] = touch_analyzer.analyze_touches(df, fresh_lows, patterns[symbol], symbol,
+                                                                 self.timeframe)
+            return sum(len(symbol_touches) for symbol_touches in touches.values())
+
+        self.time_stage(suite, 'touch_analysis', universe, touch_analysis)
+
+        outcomes = []
+
+        def outcome_analysis():
+            trade_analyzer = EnhancedTradeOutcomeAnalyzer(parameters['max_bars_to_analyze'],
+                                                          parameters['capital_per_trade'])
+            outcomes.clear()
+            for symbol, df in universe.items():
+                outcomes.extend(trade_analyzer.analyze_trade_outcomes_with_timeframe(
+                    df, touches[symbol], self.timeframe))
+            return sum(1 for touch in outcomes if touch.trade_outcome is not None)
+
+        self.time_stage(suite, 'outcome_analysis', universe, outcome_analysis)
+
+        data_cache = {f"{symbol}_{self.timeframe}": df for symbol, df in universe.items()}
+        start_date = min(df.index[0] for df in universe.values())
+
+        def capital_simulation():
+            capital_manager = CapitalManager(100_000, parameters['capital_per_trade'], start_date)
+            capital_manager.simulate_chronological_trading(sorted(outcomes, key=lambda t: t.pattern.timestamp),
+                                                           data_cache)
+            return len(capital_manager.closed_trades) + len(capital_manager.open_trades)
+
+        self.time_stage(suite, 'capital_simulation', universe, capital_simulation)
+
+        with tempfile.TemporaryDirectory() as cache_root:
+            previous_dir = os.getcwd()
+            os.chdir(cache_root)
+            try:
+                file_manager = FileManager()
+
+                def cache_save():
+                    for symbol, df in universe.items():
+                        file_manager.save_data_to_cache(symbol, self.timeframe, 'NSE', df)
+                    return len(universe)
+
+                def cache_load():
+                    return sum(len(file_manager.load_data_from_cache(symbol, self.timeframe, 'NSE'))
+                               for symbol in universe)
+
+                def cache_map():
+                    return sum(len(file_manager.map_data_from_cache(symbol, self.timeframe, 'NSE').to_frame())
+                               for symbol in universe)
+
+                def cache_map_window():
+                    return sum(len(file_manager.map_data_from_cache(symbol, self.timeframe, 'NSE', window=100))
+                               for symbol in universe)
+
+                self.time_stage(suite, 'cache_save', universe, cache_save)
+                self.time_stage(suite, 'cache_load', universe, cache_load)
+                self.time_stage(suite, 'cache_map', universe, cache_map)
+                self.time_stage(suite, 'cache_map_window', universe, cache_map_window)
+            finally:
+                os.chdir(previous_dir)
+
+    def universe(self, n_symbols, n_bars):
+        # Retests are anchored on the swing lows the benchmarked detector reports
+        return generate_synthetic_universe(n_symbols, n_bars, self.seed, self.timeframe, volatility=self.volatility,
+                                           trend=self.trend, pattern_rate=self.pattern_rate,
+                                           swing_lookback=ANALYSIS_PARAMETERS['swing_lookback'],
+                                           right_lookback=ANALYSIS_PARAMETERS['right_lookback'])
+
+    def run(self, bar_counts, symbol_counts, symbol_bars):
+        """Bar-scaling suite (one symbol per length) then symbol-scaling suite (symbol_bars each)"""
+        for n_bars in bar_counts:
+            print(f"\n📏 {n_bars:,} bars x 1 symbol")
+            self.run_stages('bars', self.universe(1, n_bars))
+
+        for n_symbols in symbol_counts:
+            print(f"\n📚 {n_symbols:,} symbols x {symbol_bars:,} bars")
+            self.run_stages('symbols', self.universe(n_symbols, symbol_bars))
+
+        return self.records
+
+    def save(self, output_path, args):
+        """Write the records plus run environment as JSON"""
+        commit, dirty = git_revision()
+        report = {
+            'benchmark_version': BENCHMARK_VERSION,
+            'created_at': get_ist_now().isoformat(),
+            'commit': commit,
+            'dirty': dirty,
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count()
+            },
+            'config': {
+                'bars': args.bars,
+                'symbols': args.symbols,
+                'symbol_bars': args.symbol_bars,
+                'timeframe': self.timeframe,
+                'repeat': self.repeat,
+                'seed': self.seed,
+                'loop_max_bars': self.loop_max_bars,
+                'volatility': self.volatility,
+                'trend': self.trend,
+                'pattern_rate': self.pattern_rate,
+                'parameters': ANALYSIS_PARAMETERS
+            },
+            'results': self.records
+        }
+
+        if output_path is None:
+            stamp = get_ist_now().strftime('%Y%m%d_%H%M%S')
+            output_path = Path("benchmark_results") / f"benchmark_{commit or 'nogit'}_{stamp}.json"
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Results: {output_path}")
+        return output_path
+
+
+def compare_results(baseline_path, records, tolerance):
+    """Print current vs baseline best times per stage; returns the stages slower than tolerance x baseline"""
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+
+    def key(record):
+        return record['suite'], record['stage'], record['symbols'], record['bars_per_symbol']
+
+    baseline_records = {key(record): record for record in baseline['results']}
+    print(f"\n📊 Compared with {baseline_path} (commit {baseline.get('commit')})")
+
+    regressions = []
+    for record in records:
+        previous = baseline_records.get(key(record))
+        if previous is None:
+            continue
+        ratio = record['best_s'] / previous['best_s'] if previous['best_s'] > 0 else float('inf')
+        label = f"{record['suite']}/{record['stage']} {record['symbols']}x{record['bars_per_symbol']}"
+        marker = ''
+        if max(record['best_s'], previous['best_s']) < MIN_COMPARED_SECONDS:
+            pass
+        elif ratio > tolerance:
+            marker = '  ⚠️ slower'
+            regressions.append(label)
+        elif ratio < 1 / tolerance:
+            marker = '  🚀 faster'
+        if previous.get('items') != record['items']:
+            marker += f"  (items {previous.get('items')} -> {record['items']})"
+        print(f"  {label:<60} {previous['best_s'] * 1000:>10.1f} -> {record['best_s'] * 1000:>10.1f} ms "
+              f"x{ratio:.2f}{marker}")
+    return regressions
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="APEX AI analysis pipeline benchmark")
+    parser.add_argument('--bars', type=int, nargs='*', default=[1_000, 10_000, 100_000],
+                        help="series lengths for the single-symbol suite")
+    parser.add_argument('--symbols', type=int, nargs='*', default=[10, 100, 1_500],
+                        help="universe sizes for the multi-symbol suite")
+    parser.add_argument('--symbol-bars', type=int, default=1_000,
+                        help="bars per symbol in the multi-symbol suite")
+    parser.add_argument('--timeframe', default='15m', help="bar timeframe of the synthetic series")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per stage (best and median are kept)")
+    parser.add_argument('--seed', type=int, default=42, help="synthetic data seed")
+    parser.add_argument('--volatility', type=float, default=0.01, help="per-bar log-return standard deviation")
+    parser.add_argument('--trend', type=float, default=1.0, help="total log-price drift of each synthetic series")
+    parser.add_argument('--pattern-rate', type=float, default=0.02,
+                        help="fraction of bars starting a planted pattern")
+    parser.add_argument('--loop-max-bars', type=int, default=10_000,
+                        help="skip the row-by-row reference detectors above this many total bars")
+    parser.add_argument('--output', default=None, help="results file (defaults to benchmark_results/)")
+    parser.add_argument('--compare', default=None, metavar='BASELINE', help="earlier results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help="with --compare, fail when a stage is this many times slower than the baseline")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 80)
+    print("APEX AI ANALYSIS PIPELINE BENCHMARK")
+    print("=" * 80)
+    print(f"🕐 Indian Standard Time (IST): {format_ist_timestamp()}")
+    print("=" * 80)
+
+    benchmark = PipelineBenchmark(args.timeframe, args.repeat, args.seed, args.loop_max_bars, args.volatility,
+                                  args.trend, args.pattern_rate)
+    records = benchmark.run(args.bars, args.symbols, args.symbol_bars)
+    benchmark.save(args.output, args)
+
+    if args.compare:
+        regressions = compare_results(args.compare, records, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage(s) slower than {args.tolerance}x baseline")
+            return 1
+        print("\n✅ No stage slower than baseline tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
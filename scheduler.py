@@ -1,6 +1,11 @@
 """
 APEX AI TECHNICAL ANALYSIS - AUTOMATED SCHEDULER WITH REAL ANALYSIS
 Runs full analysis and saves results to CSV with Indian Standard Time
+
+Usage:
+    python scheduler.py                    # whole universe, writes latest_results.csv
+    python scheduler.py --shard 2/4        # every 4th instrument starting at the 2nd
+    python scheduler.py --merge --shards 4 # combine shard outputs into latest_results.csv
 """
 
 import pandas as pd
@@ -11,28 +16,28 @@ import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 import time
+import argparse
 import warnings
 import pytz
 
 warnings.filterwarnings('ignore')
 
-# Add parent directory to path to import from app.py
+# Add parent directory to path to import the apex_core package
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Import from your main app - only what we need
 from tvDatafeed import TvDatafeed, Interval
 
-# Import core analysis functions from app.py
+# Import the headless analysis engine (no Streamlit needed)
 try:
-    from app import (
+    from apex_core import (
         get_ist_now, format_ist_timestamp,
         EnhancedSwingLowDetector, EnhancedSwingLowTouchAnalyzer,
         EnhancedTradeOutcomeAnalyzer, detect_selected_patterns_with_today,
-        SwingLowTouch
+        SwingLowTouch, FileManager, ConcurrentDataFetcher, FetchRequest, StageMetrics, NULL_METRICS
     )
     IMPORTS_AVAILABLE = True
 except ImportError as e:
-    print(f"⚠️ Could not import from app.py: {e}")
+    print(f"⚠️ Could not import apex_core: {e}")
     print("Scheduler will use simplified mode")
     IMPORTS_AVAILABLE = False
 
@@ -48,16 +53,111 @@ except ImportError as e:
         return timestamp.strftime('%Y-%m-%d %H:%M:%S IST')
 
 
+class ShardCheckpoint:
+    """Per-shard progress on disk so an interrupted run resumes where it stopped"""
+
+    def __init__(self, shard_dir: Path, run_id=None):
+        self.shard_dir = shard_dir
+        self.symbols_dir = shard_dir / "symbols"
+        self.file = shard_dir / "checkpoint.json"
+        self.run_id = run_id
+        self.started_at = get_ist_now().isoformat()
+        self.fetched = set()
+        self.analyzed = set()
+        self.finished = False
+
+    @classmethod
+    def load(cls, shard_dir: Path, run_id=None, resume_window_hours: float = 3):
+        """Resume the stored checkpoint if it belongs to this run, otherwise start fresh.
+
+        With a run id (e.g. GITHUB_RUN_ID, stable across re-runs) the stored
+        checkpoint must carry the same id; without one, an unfinished
+        checkpoint younger than resume_window_hours is resumed.
+        """
+        checkpoint = cls(shard_dir, run_id)
+        try:
+            with open(checkpoint.file, 'r') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = None
+
+        if stored is not None:
+            if run_id is not None:
+                resume = stored.get('run_id') == str(run_id)
+            else:
+                age = get_ist_now() - datetime.fromisoformat(stored['started_at'])
+                resume = not stored.get('finished') and age < timedelta(hours=resume_window_hours)
+
+            if resume:
+                checkpoint.run_id = stored.get('run_id')
+                checkpoint.started_at = stored['started_at']
+                checkpoint.fetched = set(stored.get('fetched', []))
+                checkpoint.analyzed = set(stored.get('analyzed', []))
+                checkpoint.finished = stored.get('finished', False)
+                return checkpoint
+
+        # Fresh run: drop results left over from an older run
+        if checkpoint.symbols_dir.exists():
+            for old_file in checkpoint.symbols_dir.glob("*.json"):
+                old_file.unlink()
+        checkpoint.save()
+        return checkpoint
+
+    def save(self):
+        self.symbols_dir.mkdir(parents=True, exist_ok=True)
+        state = {
+            'run_id': None if self.run_id is None else str(self.run_id),
+            'started_at': self.started_at,
+            'updated_at': get_ist_now().isoformat(),
+            'finished': self.finished,
+            'fetched': sorted(self.fetched),
+            'analyzed': sorted(self.analyzed)
+        }
+        tmp_file = self.file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_file, self.file)
+
+    def mark_fetched(self, symbol):
+        self.fetched.add(symbol)
+        self.save()
+
+    def record_symbol(self, symbol, results):
+        """Write one symbol's results, then mark it analyzed (both atomic)"""
+        self.symbols_dir.mkdir(parents=True, exist_ok=True)
+        symbol_file = self.symbols_dir / f"{symbol}.json"
+        tmp_file = symbol_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(results, f)
+        os.replace(tmp_file, symbol_file)
+        self.analyzed.add(symbol)
+        self.save()
+
+    def load_symbol_results(self, symbol):
+        symbol_file = self.symbols_dir / f"{symbol}.json"
+        if not symbol_file.exists():
+            return None
+        with open(symbol_file, 'r') as f:
+            return json.load(f)
+
+
 class ScheduledAnalyzer:
     """Automated analysis runner with real pattern detection"""
 
-    def __init__(self):
+    def __init__(self, shard_index: int = 1, shard_count: int = 1, run_id=None, time_budget_minutes=None,
+                 consolidated_store: bool = False):
         self.tv = TvDatafeed()
         self.results_dir = Path("scheduled_results")
         self.results_dir.mkdir(exist_ok=True)
+        self.shards_dir = self.results_dir / "shards"
         self.cache_dir = Path("data_cache")
         self.cache_dir.mkdir(exist_ok=True)
 
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.run_id = run_id
+        self.deadline = time.monotonic() + time_budget_minutes * 60 if time_budget_minutes else None
+
         # Configuration
         self.config = {
             'timeframes': ['4H'],
@@ -87,48 +187,104 @@ class ScheduledAnalyzer:
                 'max_bars_to_analyze': 200,
             },
             'analysis_start_date': get_ist_now() - timedelta(days=180),
-            'capital_per_trade': 10000
+            'capital_per_trade': 10000,
+            'fetch_workers': 4,
+            'requests_per_second': 3.0,
+            'fetch_timeout': 30.0,
+            'resume_window_hours': 3,
+            'consolidated_store': consolidated_store
         }
 
+        # Round-robin split of the universe; shard i of N takes every N-th instrument
+        self.shard_instruments = self.config['instruments'][shard_index - 1::shard_count]
+
     def load_instruments(self):
         """Load instruments from file"""
         try:
             with open('instruments_one.txt', 'r') as f:
                 content = f.read().strip()
-                instruments = [s.strip().upper() for s in content.split(',') if s.strip()]
-                # Limit to first 50 for scheduler performance
-                return instruments[:50]
+                return [s.strip().upper() for s in content.split(',') if s.strip()]
         except:
             return ['RELIANCE', 'TCS', 'HDFCBANK', 'INFY', 'ICICIBANK']
 
+    @property
+    def shard_label(self):
+        return f"{self.shard_index}/{self.shard_count}"
+
+    def shard_dir(self, shard_index=None, shard_count=None):
+        return self.shards_dir / f"shard_{shard_index or self.shard_index}_of_{shard_count or self.shard_count}"
+
+    def out_of_time(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
     def run_scheduled_analysis(self):
         """Run full pattern analysis with real detection"""
         ist_start = get_ist_now()
         print(f"\n🚀 APEX AI Scheduler Starting at {format_ist_timestamp(ist_start)}")
+        print(f"🧩 Shard {self.shard_label}: {len(self.shard_instruments)} of "
+              f"{len(self.config['instruments'])} instruments")
         print("=" * 80)
 
         try:
+            if not IMPORTS_AVAILABLE:
+                return self.run_fallback_analysis()
+
+            checkpoint = ShardCheckpoint.load(self.shard_dir(), self.run_id, self.config['resume_window_hours'])
+            if checkpoint.analyzed:
+                print(f"♻️ Resuming run started {checkpoint.started_at}: "
+                      f"{len(checkpoint.analyzed)} instruments already analyzed")
+
+            # Stage timings accumulate across resumed attempts of the same run
+            metrics_file = checkpoint.shard_dir / StageMetrics.FILENAME
+            metrics = None
+            if checkpoint.fetched or checkpoint.analyzed:
+                metrics = StageMetrics.load(metrics_file)
+            metrics = metrics or StageMetrics()
+            run_start = time.perf_counter()
+
             # Step 1: Update data
             print("\n📊 Step 1/3: Updating market data...")
-            update_count = self.update_all_data()
+            # A resumed attempt may run on a fresh machine whose data cache did not survive, so
+            # symbols fetched earlier are fetched again when any of their series is missing
+            uncached = self.missing_cached_data(checkpoint.fetched - checkpoint.analyzed)
+            to_fetch = [s for s in self.shard_instruments
+                        if s not in checkpoint.analyzed and (s not in checkpoint.fetched or s in uncached)]
+            update_count = self.update_all_data(to_fetch, checkpoint, metrics)
             print(f"✅ Updated {update_count} instrument/timeframe combinations")
 
             # Step 2: Run analysis
             print("\n🧠 Step 2/3: Running pattern analysis...")
-            if IMPORTS_AVAILABLE:
-                results = self.run_real_pattern_analysis()
-            else:
-                results = self.run_simple_analysis()
-
-            if not results:
-                print("⚠️ No patterns found")
+            to_analyze = [s for s in self.shard_instruments if s not in checkpoint.analyzed]
+            self.run_real_pattern_analysis(to_analyze, checkpoint, metrics)
+
+            metrics.wall_seconds += time.perf_counter() - run_start
+            metrics.save(metrics_file)
+            self.print_stage_summary(metrics)
+
+            if len(checkpoint.analyzed) < len(self.shard_instruments):
+                remaining = len(self.shard_instruments) - len(checkpoint.analyzed)
+                if self.out_of_time():
+                    print(f"\n⏸️ Time budget reached with {remaining} instruments left; "
+                          f"re-run shard {self.shard_label} to resume")
+                else:
+                    print(f"\n⚠️ {remaining} instruments have no cached data for some timeframes; "
+                          f"re-run shard {self.shard_label} to retry them")
                 return False
 
-            print(f"✅ Found {len(results)} pattern opportunities")
+            checkpoint.finished = True
+            checkpoint.save()
 
             # Step 3: Save results
             print("\n💾 Step 3/3: Saving results...")
-            self.save_results(results)
+            if self.shard_count == 1:
+                results = self.merge_shard_results()
+                if not results:
+                    print("⚠️ No patterns found")
+                    return False
+                print(f"✅ Found {len(results)} pattern opportunities")
+            else:
+                print(f"  ✅ Shard {self.shard_label} complete: {checkpoint.shard_dir}")
+                print("  ℹ️ Run with --merge once all shards are done to update latest_results.csv")
 
             ist_end = get_ist_now()
             duration = (ist_end - ist_start).total_seconds()
@@ -144,8 +300,144 @@ class ScheduledAnalyzer:
             traceback.print_exc()
             return False
 
-    def update_all_data(self):
+    def run_fallback_analysis(self):
+        """Simplified single-pass run used when apex_core cannot be imported"""
+        print("\n📊 Step 1/3: Updating market data...")
+        update_count = self.update_all_data_sequential()
+        print(f"✅ Updated {update_count} instrument/timeframe combinations")
+
+        print("\n🧠 Step 2/3: Running pattern analysis...")
+        results = self.run_simple_analysis()
+        if not results:
+            print("⚠️ No patterns found")
+            return False
+        print(f"✅ Found {len(results)} pattern opportunities")
+
+        print("\n💾 Step 3/3: Saving results...")
+        self.save_results(results)
+        return True
+
+    def merge_shard_results(self, shard_count=None):
+        """Combine per-symbol shard outputs (in instruments file order) into latest_results.csv"""
+        shard_count = shard_count or self.shard_count
+        checkpoints = {}
+        for shard_index in range(1, shard_count + 1):
+            shard_dir = self.shard_dir(shard_index, shard_count)
+            if not (shard_dir / "checkpoint.json").exists():
+                print(f"  ⚠️ Shard {shard_index}/{shard_count} has no output")
+                continue
+            with open(shard_dir / "checkpoint.json", 'r') as f:
+                state = json.load(f)
+            if not state.get('finished'):
+                print(f"  ⚠️ Shard {shard_index}/{shard_count} is incomplete "
+                      f"({len(state.get('analyzed', []))} instruments analyzed)")
+            checkpoints[shard_index] = ShardCheckpoint(shard_dir, state.get('run_id'))
+
+        run_ids = {checkpoint.run_id for checkpoint in checkpoints.values()}
+        if len(run_ids) > 1:
+            print(f"  ⚠️ Merging shards from different runs: {sorted(map(str, run_ids))}")
+
+        results = []
+        covered = 0
+        for position, symbol in enumerate(self.config['instruments']):
+            checkpoint = checkpoints.get(position % shard_count + 1)
+            symbol_results = checkpoint.load_symbol_results(symbol) if checkpoint else None
+            if symbol_results is not None:
+                covered += 1
+                results.extend(symbol_results)
+
+        print(f"  🧩 Merged {len(checkpoints)}/{shard_count} shards covering "
+              f"{covered}/{len(self.config['instruments'])} instruments")
+
+        # Combined stage timings of all shards, written next to metadata.json
+        metrics = StageMetrics()
+        for checkpoint in checkpoints.values():
+            metrics.merge(StageMetrics.load(checkpoint.shard_dir / StageMetrics.FILENAME))
+        if metrics.stages:
+            metrics_file = self.results_dir / StageMetrics.FILENAME
+            metrics.save(metrics_file)
+            print(f"  ✅ Stage metrics: {metrics_file}")
+
+        if results:
+            self.save_results(results, extra_metadata={
+                'shards': shard_count,
+                'shards_merged': len(checkpoints),
+                'instruments_covered': covered,
+                'instruments_total': len(self.config['instruments']),
+                'status': 'success' if covered == len(self.config['instruments']) else 'partial'
+            })
+        return results
+
+    def missing_cached_data(self, symbols):
+        """Symbols with at least one configured timeframe absent from the data cache"""
+        file_manager = FileManager(consolidated_store=self.config['consolidated_store'])
+        return {symbol for symbol in symbols
+                if any(file_manager.get_cache_info(symbol, timeframe, self.config['exchange']) is None
+                       for timeframe in self.config['timeframes'])}
+
+    def update_all_data(self, symbols=None, checkpoint=None, metrics=None):
         """Update data for configured instruments/timeframes"""
+        if not IMPORTS_AVAILABLE:
+            return self.update_all_data_sequential()
+
+        metrics = metrics or NULL_METRICS
+        symbols = self.config['instruments'] if symbols is None else symbols
+        count = 0
+        total = len(symbols) * len(self.config['timeframes'])
+        pending = {symbol: len(self.config['timeframes']) for symbol in symbols}
+        failed = set()
+        file_manager = FileManager(consolidated_store=self.config['consolidated_store'])
+        fetcher = ConcurrentDataFetcher(
+            TvDatafeed,
+            max_workers=self.config['fetch_workers'],
+            requests_per_second=self.config['requests_per_second'],
+            timeout=self.config['fetch_timeout']
+        )
+        requests = [
+            FetchRequest(symbol, self.config['exchange'], timeframe, self.get_interval(timeframe), 200)
+            for symbol in symbols
+            for timeframe in self.config['timeframes']
+        ]
+
+        # The fetcher overlaps requests, so fetching is timed as a whole rather than per symbol
+        # The manifest is written once at the end, and at each checkpoint so it never lags one
+        with metrics.stage('data_fetch'), file_manager.manifest.deferred():
+            for done, fetched in enumerate(fetcher.fetch(requests), 1):
+                symbol, timeframe = fetched.request.symbol, fetched.request.timeframe
+                data = fetched.data
+                if fetched.error is not None:
+                    failed.add(symbol)
+                    metrics.count('fetch_errors', 1, symbol)
+                    print(f"  ⚠️ Failed {symbol} {timeframe}: {fetched.error[:50]}")
+                elif data is not None and not data.empty:
+                    cache_data = {
+                        'timestamp': get_ist_now().isoformat(),
+                        'symbol': symbol,
+                        'timeframe': timeframe,
+                        'total_candles': len(data),
+                        'timezone': 'Asia/Kolkata'
+                    }
+                    with metrics.stage('cache_write', symbol, len(data)):
+                        file_manager.save_data_to_cache(symbol, timeframe, self.config['exchange'], data, cache_data)
+                    metrics.count('bars_fetched', len(data), symbol)
+                    count += 1
+
+                pending[symbol] -= 1
+                if checkpoint is not None and pending[symbol] == 0 and symbol not in failed:
+                    file_manager.manifest.flush()
+                    checkpoint.mark_fetched(symbol)
+
+                if done % 10 == 0:
+                    print(f"  Progress: {done}/{total} fetched, {count} updated")
+
+                if self.out_of_time():
+                    print("  ⏸️ Time budget reached during data update")
+                    break
+
+        return count
+
+    def update_all_data_sequential(self):
+        """Fetch one symbol/timeframe at a time (fallback when apex_core cannot be imported)"""
         count = 0
         total = len(self.config['instruments']) * len(self.config['timeframes'])
 
@@ -156,9 +448,7 @@ class ScheduledAnalyzer:
                     data = self.tv.get_hist(symbol, self.config['exchange'], interval, n_bars=200)
 
                     if data is not None and not data.empty:
-                        cache_file = self.cache_dir / f"{symbol}_{self.config['exchange']}_{timeframe}.json"
                         cache_data = {
-                            'data': data.to_json(orient='index', date_format='iso'),
                             'timestamp': get_ist_now().isoformat(),
                             'symbol': symbol,
                             'timeframe': timeframe,
@@ -166,6 +456,8 @@ class ScheduledAnalyzer:
                             'timezone': 'Asia/Kolkata'
                         }
 
+                        cache_file = self.cache_dir / f"{symbol}_{self.config['exchange']}_{timeframe}.json"
+                        cache_data['data'] = data.to_json(orient='index', date_format='iso')
                         with open(cache_file, 'w') as f:
                             json.dump(cache_data, f)
 
@@ -180,8 +472,16 @@ class ScheduledAnalyzer:
 
         return count
 
-    def run_real_pattern_analysis(self):
-        """Run actual pattern analysis using imported functions"""
+    def run_real_pattern_analysis(self, symbols=None, checkpoint=None, metrics=None):
+        """Run actual pattern analysis using imported functions
+
+        With a checkpoint, each symbol's results are recorded as soon as all
+        of its timeframes are analyzed; a symbol with a timeframe missing
+        from the cache (e.g. its fetch failed) is left unrecorded so a re-run
+        retries it. Stage timings and counters go to metrics when given.
+        """
+        metrics = metrics or NULL_METRICS
+        symbols = self.config['instruments'] if symbols is None else symbols
         results = []
 
         swing_detector = EnhancedSwingLowDetector(
@@ -200,68 +500,95 @@ class ScheduledAnalyzer:
             self.config['capital_per_trade']
         )
 
+        file_manager = FileManager(consolidated_store=self.config['consolidated_store'])
+
         today_date = get_ist_now().date()
 
-        for symbol in self.config['instruments']:
+        for position, symbol in enumerate(symbols, 1):
+            if self.out_of_time():
+                break
+
+            symbol_results = []
+            missing_timeframes = []
             for timeframe in self.config['timeframes']:
-                cache_file = self.cache_dir / f"{symbol}_{self.config['exchange']}_{timeframe}.json"
+                with metrics.stage('data_load', symbol):
+                    arrays = file_manager.map_data_from_cache(symbol, timeframe, self.config['exchange'])
+                    df = arrays.to_frame() if arrays is not None else None
 
-                if not cache_file.exists():
+                if df is None:
+                    missing_timeframes.append(timeframe)
                     continue
 
-                try:
-                    with open(cache_file, 'r') as f:
-                        cache_data = json.load(f)
+                bars = len(df)
+                metrics.count('units', 1, symbol)
+                metrics.count('bars', bars, symbol)
 
-                    df = pd.read_json(cache_data['data'], orient='index')
-                    df.index = pd.to_datetime(df.index)
-                    df = df.sort_index()
+                try:
 
-                    # Find swing lows
-                    all_swing_lows = swing_detector.find_swing_lows_with_invalidation(df)
-                    untouched_swing_lows = swing_detector.find_untouched_swing_lows(df, all_swing_lows)
+                    # Find swing lows in one pass: each run re-fetches a fresh window of bars, so there is
+                    # no stable prefix for a persisted incremental state to resume from
+                    with metrics.stage('swing_detection', symbol, bars):
+                        all_swing_lows = swing_detector.find_swing_lows_with_invalidation(df)
+                        untouched_swing_lows = swing_detector.find_untouched_swing_lows(df, all_swing_lows)
+                    metrics.count('swing_lows', len(all_swing_lows), symbol)
 
                     # Detect patterns
-                    all_patterns = detect_selected_patterns_with_today(
-                        df, self.config['patterns'], self.config['parameters'], include_today=True
-                    )
+                    with metrics.stage('pattern_detection', symbol, bars):
+                        all_patterns = detect_selected_patterns_with_today(
+                            df, self.config['patterns'], self.config['parameters'], include_today=True
+                        )
+                    metrics.count('patterns', sum(len(patterns) for patterns in all_patterns.values()), symbol)
 
                     # Analyze touches
-                    touches = touch_analyzer.analyze_touches(df, untouched_swing_lows, all_patterns, symbol, timeframe)
+                    with metrics.stage('touch_analysis', symbol, bars):
+                        touches = touch_analyzer.analyze_touches(df, untouched_swing_lows, all_patterns, symbol,
+                                                                 timeframe)
+                    metrics.count('touches', len(touches), symbol)
 
                     # Analyze outcomes
-                    enhanced_touches = trade_analyzer.analyze_trade_outcomes_with_timeframe(
-                        df, touches, timeframe, use_trailing_stop=False, custom_target_pct=None
-                    )
+                    with metrics.stage('outcome_analysis', symbol, bars):
+                        enhanced_touches = trade_analyzer.analyze_trade_outcomes_with_timeframe(
+                            df, touches, timeframe, use_trailing_stop=False, custom_target_pct=None
+                        )
 
                     # Convert to results
-                    for touch in enhanced_touches:
-                        pattern_date_ist = pd.Timestamp(touch.pattern.timestamp, tz='UTC').tz_convert('Asia/Kolkata')
-                        is_today = pattern_date_ist.date() == today_date
-
-                        result = {
-                            "Symbol": symbol,
-                            "Timeframe": timeframe,
-                            "Pattern Type": touch.pattern_type.replace('_', ' ').title(),
-                            "Pattern Date": format_ist_timestamp(pattern_date_ist),
-                            "Swing Low Date": format_ist_timestamp(touch.swing_low.timestamp),
-                            "Is Today's Pattern": "YES" if is_today else "NO",
-                            "Entry Price": f"{touch.entry_price:.4f}",
-                            "Target Price": f"{touch.target_price:.4f}",
-                            "Stop Loss": f"{touch.sl_price:.4f}",
-                            "Swing Low Price": f"{touch.swing_low.price:.4f}",
-                            "Days Between": touch.days_between,
-                            "Distance %": f"{touch.price_difference:.3f}%",
-                            "Pattern Strength": f"{touch.pattern_strength:.1f}%",
-                            "Trade Outcome": "Active" if is_today else ("Success" if touch.trade_outcome and touch.trade_outcome.success else "Stop Loss"),
-                            "Current Status": f"P&L: {touch.trade_outcome.current_profit_pct:.2f}%" if touch.trade_outcome else "N/A",
-                            "Analysis Time": format_ist_timestamp()
-                        }
-                        results.append(result)
+                    with metrics.stage('result_formatting', symbol):
+                        for touch in enhanced_touches:
+                            pattern_date_ist = pd.Timestamp(touch.pattern.timestamp, tz='UTC').tz_convert('Asia/Kolkata')
+                            is_today = pattern_date_ist.date() == today_date
+
+                            result = {
+                                "Symbol": symbol,
+                                "Timeframe": timeframe,
+                                "Pattern Type": touch.pattern_type.replace('_', ' ').title(),
+                                "Pattern Date": format_ist_timestamp(pattern_date_ist),
+                                "Swing Low Date": format_ist_timestamp(touch.swing_low.timestamp),
+                                "Is Today's Pattern": "YES" if is_today else "NO",
+                                "Entry Price": f"{touch.entry_price:.4f}",
+                                "Target Price": f"{touch.target_price:.4f}",
+                                "Stop Loss": f"{touch.sl_price:.4f}",
+                                "Swing Low Price": f"{touch.swing_low.price:.4f}",
+                                "Days Between": touch.days_between,
+                                "Distance %": f"{touch.price_difference:.3f}%",
+                                "Pattern Strength": f"{touch.pattern_strength:.1f}%",
+                                "Trade Outcome": "Active" if is_today else ("Success" if touch.trade_outcome and touch.trade_outcome.success else "Stop Loss"),
+                                "Current Status": f"P&L: {touch.trade_outcome.current_profit_pct:.2f}%" if touch.trade_outcome else "N/A",
+                                "Analysis Time": format_ist_timestamp()
+                            }
+                            symbol_results.append(result)
+                    metrics.count('results', len(enhanced_touches), symbol)
 
                 except Exception as e:
                     print(f"  ⚠️ Analysis error {symbol}: {str(e)[:50]}")
 
+            results.extend(symbol_results)
+            if missing_timeframes:
+                print(f"  ⚠️ No cached data for {symbol} {', '.join(missing_timeframes)}; not marked analyzed")
+            elif checkpoint is not None:
+                checkpoint.record_symbol(symbol, symbol_results)
+            if position % 25 == 0:
+                print(f"  Progress: {position}/{len(symbols)} instruments analyzed")
+
         return results
 
     def run_simple_analysis(self):
@@ -294,7 +621,16 @@ class ScheduledAnalyzer:
 
         return results
 
-    def save_results(self, results):
+    def print_stage_summary(self, metrics):
+        """Print per-stage totals of a run (or of all attempts of a resumed run)"""
+        summary = metrics.summary()
+        print(f"\n⏱️ Stage timings: {summary['units']} units, {summary['bars']:,} bars, "
+              f"{summary['wall_seconds']:.1f}s wall")
+        for row in metrics.stage_table().to_dict('records'):
+            print(f"  {row['Stage']:<18} {row['Total (s)']:>9.3f}s  {row['Share %']:>5.1f}%  "
+                  f"{row['Calls']:>6} calls")
+
+    def save_results(self, results, extra_metadata=None):
         """Save results to CSV files"""
         df = pd.DataFrame(results)
 
@@ -317,6 +653,7 @@ class ScheduledAnalyzer:
             'timeframe': self.config['timeframes'][0],
             'timezone': 'Asia/Kolkata'
         }
+        metadata.update(extra_metadata or {})
 
         metadata_file = self.results_dir / "metadata.json"
         with open(metadata_file, 'w') as f:
@@ -337,16 +674,48 @@ class ScheduledAnalyzer:
         return interval_map.get(timeframe, Interval.in_4_hour)
 
 
+def parse_shard(value):
+    """Parse --shard i/N (1-based)"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected i/N, e.g. 2/4")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError("shard index must be between 1 and N")
+    return index, count
+
+
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="APEX AI scheduled pattern analysis")
+    parser.add_argument('--shard', type=parse_shard, default=(1, 1), metavar='i/N',
+                        help="analyze every N-th instrument starting at i (1-based)")
+    parser.add_argument('--merge', action='store_true',
+                        help="combine finished shard outputs into latest_results.csv")
+    parser.add_argument('--shards', type=int, default=None,
+                        help="number of shards to merge (defaults to N from --shard)")
+    parser.add_argument('--run-id', default=os.environ.get('GITHUB_RUN_ID'),
+                        help="resume only checkpoints from this run (defaults to $GITHUB_RUN_ID)")
+    parser.add_argument('--time-budget', type=float, default=None, metavar='MINUTES',
+                        help="stop starting new instruments after this many minutes")
+    parser.add_argument('--consolidated-store', action='store_true',
+                        help="keep cached market data in data_cache/market_data.sqlite instead of per-series files")
+    args = parser.parse_args()
+
     print("\n" + "=" * 80)
     print("APEX AI TECHNICAL ANALYSIS - AUTOMATED SCHEDULER")
     print("=" * 80)
     print(f"🕐 Indian Standard Time (IST): {format_ist_timestamp()}")
     print("=" * 80)
 
-    analyzer = ScheduledAnalyzer()
-    success = analyzer.run_scheduled_analysis()
+    shard_index, shard_count = args.shard
+    analyzer = ScheduledAnalyzer(shard_index, shard_count, args.run_id, args.time_budget, args.consolidated_store)
+
+    if args.merge:
+        print("\n🧩 Merging shard results...")
+        success = bool(analyzer.merge_shard_results(args.shards or shard_count))
+    else:
+        success = analyzer.run_scheduled_analysis()
 
     if success:
         print("\n✅ SUCCESS: Analysis completed and results saved")
@@ -358,4 +727,4 @@ def main():
 
 if __name__ == "__main__":
     exit_code = main()
-    sys.exit(exit_code)
\ No newline at end of file
+    sys.exit(exit_code)
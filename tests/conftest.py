@@ -0,0 +1,62 @@
+"""
+Shared fixtures: seeded synthetic series, so the optimized engines can be
+checked against their reference implementations offline
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apex_core import (  # noqa: E402
+    FusedPatternDetector, SwingLow, SwingLowTouch, detect_selected_patterns_with_today, generate_synthetic_ohlcv
+)
+
+SEEDS = [1, 7, 42]
+
+
+@pytest.fixture(params=SEEDS)
+def seed(request):
+    return request.param
+
+
+@pytest.fixture
+def synthetic_df(seed):
+    """2,000 15m bars with a dense sprinkle of planted patterns and swing-low retests"""
+    return generate_synthetic_ohlcv(2_000, seed, pattern_rate=0.03, retest_rate=0.7)
+
+
+@pytest.fixture
+def short_df(seed):
+    """400 bars, for the slow loop references that scan a window per bar"""
+    return generate_synthetic_ohlcv(400, seed, pattern_rate=0.03, retest_rate=0.7)
+
+
+def touches_for_every_pattern(df, symbol='SYN0000', timeframe='15m'):
+    """One touch per completed pattern, each against the low 20 bars earlier.
+
+    The real touch filter leaves only a handful of trades per series; touching
+    every pattern gives the trade and capital engines a few hundred to resolve.
+    """
+    selection = dict.fromkeys(FusedPatternDetector.LOOP_METHODS, True)
+    all_patterns = detect_selected_patterns_with_today(df, selection, {}, include_today=False)
+
+    touches = []
+    for pattern_type, patterns in all_patterns.items():
+        for pattern in patterns:
+            swing_index = max(0, pattern.index - 20)
+            swing_low = SwingLow(swing_index, df.index[swing_index], float(df['low'].iloc[swing_index]))
+            touches.append(SwingLowTouch(
+                swing_low=swing_low, pattern=pattern.to_dataclass(), touch_type='strict_touch',
+                pattern_type=pattern_type, distance_pips=0.0, days_between=1, price_difference=0.0,
+                pattern_strength=pattern.pattern_strength, symbol=symbol, timeframe=timeframe
+            ))
+    touches.sort(key=lambda touch: touch.pattern.index)
+    return touches
+
+
+@pytest.fixture
+def synthetic_touches(synthetic_df):
+    return touches_for_every_pattern(synthetic_df)
@@ -0,0 +1,116 @@
+"""Capital simulation: the discrete-event engine against the sequential reference, and
+the vectorized Monte Carlo paths against the event engine"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from apex_core import (
+    MONTE_CARLO_METRICS, CapitalManager, EnhancedTradeOutcomeAnalyzer, MonteCarloCapitalSimulator,
+    generate_synthetic_universe, simulate_capital_paths
+)
+
+from conftest import touches_for_every_pattern
+
+
+@pytest.fixture
+def universe_trades(seed):
+    """Touches with trade outcomes for three synthetic symbols, and their data cache"""
+    analyzer = EnhancedTradeOutcomeAnalyzer(max_bars_to_analyze=100, capital_per_trade=10000)
+    all_touches, data_cache = [], {}
+    for symbol, df in generate_synthetic_universe(3, 1_500, seed, pattern_rate=0.03).items():
+        touches = touches_for_every_pattern(df, symbol, '15m')
+        all_touches.extend(analyzer.analyze_trade_outcomes_with_timeframe(df, touches, '15m'))
+        data_cache[f"{symbol}_15m"] = df
+    start_date = min(df.index[0] for df in data_cache.values())
+    return all_touches, data_cache, start_date
+
+
+def simulate(universe_trades, engine, total_capital):
+    all_touches, data_cache, start_date = universe_trades
+    manager = CapitalManager(total_capital, 10000, start_date)
+    manager.simulate_chronological_trading(all_touches, data_cache, engine=engine)
+    return manager
+
+
+def test_events_match_sequential_with_ample_capital(universe_trades):
+    # With room for every trade at once nothing is rejected, so holding capital until
+    # exit (events) and settling right after entry (sequential) must book the same trades
+    total_capital = 10000 * (len(universe_trades[0]) + 1)
+    events = simulate(universe_trades, 'events', total_capital)
+    sequential = simulate(universe_trades, 'sequential', total_capital)
+
+    def closed(manager):
+        return sorted((trade.trade_id, trade.exit_timestamp, trade.exit_price, trade.pnl)
+                      for trade in manager.closed_trades)
+
+    assert events.total_trades_executed > 100
+    assert events.total_trades_rejected == sequential.total_trades_rejected == 0
+    assert closed(events) == closed(sequential)
+    for name in ('total_trades_attempted', 'total_trades_executed', 'winning_trades', 'losing_trades'):
+        assert getattr(events, name) == getattr(sequential, name), name
+    assert events.total_pnl == pytest.approx(sequential.total_pnl)
+    assert events.available_capital == pytest.approx(sequential.available_capital)
+    assert events.locked_capital == sequential.locked_capital == 0
+
+
+def test_events_hold_capital_until_exit(universe_trades):
+    events = simulate(universe_trades, 'events', 50000)
+    sequential = simulate(universe_trades, 'sequential', 50000)
+    summary = events.get_performance_summary()
+
+    # Only the events engine keeps trades open across later entries, so only it runs out of capital
+    assert sequential.max_concurrent_trades == 1 and sequential.total_trades_rejected == 0
+    assert events.max_concurrent_trades >= 5 and events.total_trades_rejected > 0
+    assert events.total_trades_attempted == events.total_trades_executed + events.total_trades_rejected
+    assert summary['total_capital_current'] == pytest.approx(50000 + events.total_pnl)
+
+    # Replaying the capital events, locked capital never exceeds the capital on hand
+    timeline = events.get_capital_timeline_df()
+    assert (timeline['locked_capital'] <= timeline['total_capital'] + 1e-6).all()
+    assert (timeline['available_capital'] > -1e-6).all()
+    assert pd.Index(timeline['timestamp']).is_monotonic_increasing
+
+
+@pytest.mark.parametrize('total_capital', [30000, 50000, 200000])
+def test_identity_path_matches_events_engine(universe_trades, total_capital):
+    all_touches, _, start_date = universe_trades
+    events = simulate(universe_trades, 'events', total_capital)
+    simulator = MonteCarloCapitalSimulator(total_capital, 10000, start_date)
+    n_trades = simulator.load_touches(all_touches)
+
+    # Each outcome at its own entry slot replays the historical sequence
+    identity = np.arange(n_trades)[None, :]
+    path = {name: values[0] for name, values in simulate_capital_paths(
+        simulator.entry_ns, simulator.hold_ns, simulator.pnl, identity, total_capital, 10000).items()}
+
+    assert n_trades == events.total_trades_attempted
+    assert path['trades_executed'] == events.total_trades_executed
+    assert path['trades_rejected'] == events.total_trades_rejected
+    assert path['max_concurrent_trades'] == events.max_concurrent_trades
+    assert path['max_drawdown_pct'] == pytest.approx(events.max_drawdown, abs=1e-9)
+    assert path['final_capital'] == pytest.approx(events.available_capital + events.locked_capital)
+    if total_capital < 200000:
+        assert events.total_trades_rejected > 0
+
+
+def test_monte_carlo_depends_only_on_seed(universe_trades):
+    all_touches, _, start_date = universe_trades
+    simulator = MonteCarloCapitalSimulator(50000, 10000, start_date)
+    n_trades = simulator.load_touches(all_touches)
+    # Several blocks, so the per-block seeds and the process pool are exercised
+    simulator.BLOCK_CELLS = 100 * n_trades
+
+    for method in ('permute', 'bootstrap'):
+        paths = simulator.run(250, method, seed=11, executor='serial')
+        assert list(paths.columns) == list(MONTE_CARLO_METRICS) and len(paths) == 250
+        pd.testing.assert_frame_equal(paths, simulator.run(250, method, seed=11, executor='serial'))
+        assert not paths.equals(simulator.run(250, method, seed=12, executor='serial'))
+        assert (paths['trades_executed'] + paths['trades_rejected'] == n_trades).all()
+    pd.testing.assert_frame_equal(paths, simulator.run(250, 'bootstrap', seed=11, max_workers=2))
+
+    # A permutation reorders the same outcomes, so with room for every trade all paths end level
+    ample = MonteCarloCapitalSimulator(10000 * (n_trades + 1), 10000, start_date)
+    ample.load_touches(all_touches)
+    final_capital = ample.run(50, 'permute', seed=11, executor='serial')['final_capital']
+    assert final_capital.to_numpy() == pytest.approx(np.full(50, final_capital.iloc[0]))
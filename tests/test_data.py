@@ -0,0 +1,91 @@
+"""Concurrent fetching and incremental cache updates against FakeDatafeed (no network)"""
+
+import threading
+
+import pytest
+
+from apex_core import BackgroundDataManager, ConcurrentDataFetcher, FakeDatafeed, FetchRequest, FileManager
+
+SYMBOLS = ['RELIANCE', 'TCS', 'INFY', 'HDFCBANK', 'SBIN', 'ITC']
+
+
+def fetch_requests(n_bars=200, interval='15'):
+    return [FetchRequest(symbol, 'NSE', '15m', interval, n_bars, 'full') for symbol in SYMBOLS]
+
+
+def test_fetcher_returns_every_request_on_per_worker_sessions():
+    sessions = []
+    lock = threading.Lock()
+
+    def factory():
+        datafeed = FakeDatafeed(latency=0.01, jitter=0.005, seed=len(sessions))
+        with lock:
+            sessions.append(datafeed)
+        return datafeed
+
+    fetcher = ConcurrentDataFetcher(factory, max_workers=3, requests_per_second=1000)
+    results = list(fetcher.fetch(fetch_requests()))
+
+    assert sorted(result.request.symbol for result in results) == sorted(SYMBOLS)
+    assert all(result.error is None and result.attempts == 1 for result in results)
+    assert all(len(result.data) == 200 for result in results)
+    assert len(sessions) <= 3
+    assert sum(datafeed.calls for datafeed in sessions) == len(SYMBOLS)
+
+
+def test_fetcher_serves_the_same_series_per_symbol():
+    def fetch_closes():
+        fetcher = ConcurrentDataFetcher(lambda: FakeDatafeed(latency=0.0), max_workers=2, requests_per_second=1000)
+        return {result.request.symbol: result.data['close'].tolist() for result in fetcher.fetch(fetch_requests())}
+
+    first, second = fetch_closes(), fetch_closes()
+    assert first == second
+    assert first['RELIANCE'] != first['TCS']
+
+
+def test_fetcher_reports_failures_after_retries():
+    fetcher = ConcurrentDataFetcher(lambda: FakeDatafeed(latency=0.0, failure_rate=1.0, seed=1), max_workers=2,
+                                    requests_per_second=1000, retries=2)
+    results = list(fetcher.fetch(fetch_requests()))
+
+    assert len(results) == len(SYMBOLS)
+    assert all(result.data is None for result in results)
+    assert all(result.attempts == 3 and 'Injected failure' in result.error for result in results)
+
+
+def test_fetcher_abandons_hung_calls():
+    fetcher = ConcurrentDataFetcher(lambda: FakeDatafeed(latency=0.0, hang_rate=1.0, hang_seconds=1.0, seed=1),
+                                    max_workers=len(SYMBOLS), requests_per_second=1000, timeout=0.1, retries=0)
+    results = list(fetcher.fetch(fetch_requests()))
+
+    assert all(result.data is None and 'Timed out' in result.error for result in results)
+    assert max(result.elapsed for result in results) < 0.9
+
+
+@pytest.mark.parametrize('consolidated_store', [False, True], ids=['files', 'consolidated'])
+def test_background_manager_downloads_then_updates(tmp_path, monkeypatch, consolidated_store):
+    # FileManager keeps its cache in ./data_cache
+    monkeypatch.chdir(tmp_path)
+    manager = BackgroundDataManager(FileManager(consolidated_store=consolidated_store),
+                                    lambda: FakeDatafeed(latency=0.0, seed=1), requests_per_second=1000)
+    symbols, timeframes = SYMBOLS[:3], ['15m', '1H', '1D']
+
+    first = manager.update_data_incrementally(symbols, timeframes)
+    for symbol in symbols:
+        assert set(first[symbol]) == set(timeframes)
+        assert all(status.startswith('✅') for status in first[symbol].values()), first[symbol]
+        for timeframe in timeframes:
+            cached = manager.get_cached_data(symbol, timeframe)
+            assert cached is not None and not cached.empty
+            assert cached.index.is_monotonic_increasing and not cached.index.has_duplicates
+
+    bars_before = {(symbol, timeframe): len(manager.get_cached_data(symbol, timeframe))
+                   for symbol in symbols for timeframe in timeframes}
+    second = manager.update_data_incrementally(symbols, timeframes)
+    for symbol in symbols:
+        assert all(status.startswith('✅') for status in second[symbol].values()), second[symbol]
+        assert not any('download' in status for status in second[symbol].values()), second[symbol]
+        for timeframe in timeframes:
+            cached = manager.get_cached_data(symbol, timeframe)
+            assert len(cached) >= bars_before[symbol, timeframe]
+            assert not cached.index.has_duplicates
@@ -0,0 +1,95 @@
+"""Candlestick patterns: the fused single-pass engine against the per-detector loops"""
+
+from dataclasses import fields
+
+import numpy as np
+import pytest
+
+from apex_core import (
+    PinBarDetector, BullishEngulfingDetector, ThreeCandleDetector, DragonflyDojiDetector,
+    ThreeWhiteSoldiersDetector, BullishMarubozuDetector, BullishHaramiDetector, BullishAbandonedBabyDetector,
+    TweezerBottomDetector, BullishKickerDetector, FusedPatternDetector, detect_selected_patterns_with_today
+)
+
+
+def default_detectors():
+    return {
+        'pin_bar': PinBarDetector(),
+        'bullish_engulfing': BullishEngulfingDetector(),
+        'three_candle': ThreeCandleDetector(),
+        'dragonfly_doji': DragonflyDojiDetector(),
+        'three_white_soldiers': ThreeWhiteSoldiersDetector(),
+        'bullish_marubozu': BullishMarubozuDetector(),
+        'bullish_harami': BullishHaramiDetector(),
+        'bullish_abandoned_baby': BullishAbandonedBabyDetector(),
+        'tweezer_bottom': TweezerBottomDetector(),
+        'bullish_kicker': BullishKickerDetector(),
+    }
+
+
+def sensitive_detectors():
+    """Loosened thresholds, like the live-hours adjustments, so the rarer patterns fire too"""
+    return {
+        'pin_bar': PinBarDetector(1.5, 0.4),
+        'bullish_engulfing': BullishEngulfingDetector(0.95),
+        'three_candle': ThreeCandleDetector(0.4, 0.6, 0.4),
+        'dragonfly_doji': DragonflyDojiDetector(0.2, 1.5),
+        'three_white_soldiers': ThreeWhiteSoldiersDetector(0.4, 0.4),
+        'bullish_marubozu': BullishMarubozuDetector(0.15, 0.6),
+        'bullish_harami': BullishHaramiDetector(0.4),
+        'bullish_abandoned_baby': BullishAbandonedBabyDetector(0.0, 0.3),
+        'tweezer_bottom': TweezerBottomDetector(0.3),
+        'bullish_kicker': BullishKickerDetector(0.0),
+    }
+
+
+@pytest.mark.parametrize('include_live', [False, True])
+@pytest.mark.parametrize('make_detectors', [default_detectors, sensitive_detectors])
+def test_fused_detects_same_bars_as_loop(short_df, make_detectors, include_live):
+    detector = FusedPatternDetector(make_detectors())
+    fused = detector.detect(short_df, include_live)
+    loop = detector.detect_loop(short_df, include_live)
+
+    assert set(fused) == set(loop) == set(FusedPatternDetector.LOOP_METHODS)
+    assert sum(len(patterns) for patterns in loop.values()) > 0
+    for pattern_type, patterns in loop.items():
+        table = fused[pattern_type]
+        np.testing.assert_array_equal(table.column('index'), [p.index for p in patterns], err_msg=pattern_type)
+        assert list(table.timestamps) == [p.timestamp for p in patterns], pattern_type
+        assert [row.is_live for row in table] == [p.is_live for p in patterns], pattern_type
+
+
+def test_selected_patterns_engines_agree(short_df):
+    selection = dict.fromkeys(FusedPatternDetector.LOOP_METHODS, True)
+    fused = detect_selected_patterns_with_today(short_df, selection, {}, engine='fused')
+    loop = detect_selected_patterns_with_today(short_df, selection, {}, engine='loop')
+
+    assert set(fused) == set(loop)
+    for pattern_type in loop:
+        assert [row.index for row in fused[pattern_type]] == [p.index for p in loop[pattern_type]], pattern_type
+
+
+@pytest.mark.parametrize('make_detectors', [default_detectors, sensitive_detectors])
+def test_pattern_table_rows_match_loop_dataclasses(short_df, make_detectors):
+    detector = FusedPatternDetector(make_detectors())
+    fused = detector.detect(short_df, include_live=True)
+    loop = detector.detect_loop(short_df, include_live=True)
+
+    for pattern_type, patterns in loop.items():
+        table = fused[pattern_type]
+        assert len(table) == len(patterns), pattern_type
+        assert table.to_objects() == patterns, pattern_type
+        assert list(table) == patterns, pattern_type
+        for row, pattern in zip(table, patterns):
+            for field in fields(pattern):
+                assert getattr(row, field.name) == getattr(pattern, field.name), (pattern_type, field.name)
+
+
+def test_pattern_table_slicing_keeps_rows(short_df):
+    table = FusedPatternDetector(default_detectors()).detect(short_df)['tweezer_bottom']
+    assert len(table) > 2
+
+    head = table[:2]
+    assert len(head) == 2
+    assert head.to_objects() == table.to_objects()[:2]
+    assert table[-1] == table.to_objects()[-1]
@@ -0,0 +1,70 @@
+"""Scheduler shard checkpoints: resuming after a failed fetch or on a machine without the data cache"""
+
+import json
+import shutil
+
+import pytest
+
+pytest.importorskip('tvDatafeed')
+
+import scheduler  # noqa: E402
+from apex_core import FakeDatafeed  # noqa: E402
+
+INSTRUMENTS = ['RELIANCE', 'TCS', 'INFY', 'SBIN']
+
+
+class FlakyDatafeed(FakeDatafeed):
+    """FakeDatafeed whose requests for the symbols in `failing` raise"""
+
+    failing = set()
+
+    def __init__(self):
+        super().__init__(latency=0.0, seed=1)
+
+    def get_hist(self, symbol, *args, **kwargs):
+        if symbol in self.failing:
+            raise ConnectionError(f"Injected failure for {symbol}")
+        return super().get_hist(symbol, *args, **kwargs)
+
+
+@pytest.fixture
+def run_shard(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'instruments_one.txt').write_text(','.join(INSTRUMENTS))
+    monkeypatch.setattr(scheduler, 'TvDatafeed', FlakyDatafeed)
+
+    def run(failing=()):
+        monkeypatch.setattr(FlakyDatafeed, 'failing', set(failing))
+        analyzer = scheduler.ScheduledAnalyzer(shard_index=1, shard_count=2, run_id='run-1')
+        analyzer.config['requests_per_second'] = 1000
+        finished = analyzer.run_scheduled_analysis()
+        with open(analyzer.shard_dir() / 'checkpoint.json') as f:
+            return finished, json.load(f)
+    return run
+
+
+def test_failed_fetch_is_retried_not_recorded_empty(run_shard):
+    # Shard 1/2 holds RELIANCE and INFY
+    finished, state = run_shard(failing={'INFY'})
+    assert not finished and not state['finished']
+    assert state['analyzed'] == ['RELIANCE']
+
+    finished, state = run_shard()
+    assert finished and state['finished']
+    assert state['analyzed'] == ['INFY', 'RELIANCE']
+
+
+def test_resume_without_data_cache_fetches_again(run_shard, tmp_path, monkeypatch):
+    # The first attempt is cut off right after fetching
+    with monkeypatch.context() as patch:
+        patch.setattr(scheduler.ScheduledAnalyzer, 'run_real_pattern_analysis', lambda self, *args: [])
+        finished, state = run_shard()
+    assert not finished
+    assert state['fetched'] == ['INFY', 'RELIANCE'] and state['analyzed'] == []
+
+    # The re-run lands on a fresh runner: the checkpoint is restored but the data cache is not
+    shutil.rmtree(tmp_path / 'data_cache')
+    finished, state = run_shard()
+    assert finished and state['finished']
+    assert state['analyzed'] == ['INFY', 'RELIANCE']
+    assert (tmp_path / 'data_cache' / 'INFY_NSE_4H.ohlcv').exists()
@@ -0,0 +1,81 @@
+"""OHLCV cache backends: single files, appended segments and the consolidated SQLite store"""
+
+import pandas as pd
+import pytest
+
+from apex_core import FileManager, generate_synthetic_ohlcv
+from apex_core.storage import OHLCVCacheFormat, SegmentedOHLCVStore
+
+BARS = ['open', 'high', 'low', 'close', 'volume']
+
+
+@pytest.fixture
+def file_manager(tmp_path, monkeypatch, request):
+    # FileManager keeps its cache in ./data_cache
+    monkeypatch.chdir(tmp_path)
+    return FileManager(consolidated_store=getattr(request, 'param', False))
+
+
+def minute_bars(start, rows):
+    index = pd.date_range(start, periods=len(rows), freq='1min', name='datetime').as_unit('ns')
+    return pd.DataFrame(rows, columns=BARS, index=index).astype(float)
+
+
+@pytest.mark.parametrize('file_manager', [False, True], ids=['files', 'consolidated'], indirect=True)
+def test_append_replaces_the_forming_last_bar(file_manager):
+    saved = minute_bars('2025-01-06 09:15', [(i, i + 1, i - 0.5, i, 1) for i in range(1, 6)])
+    file_manager.save_data_to_cache('X', '1m', 'NSE', saved)
+
+    # The 09:19 bar was still forming when saved; the next fetch brings its final values and 09:20
+    update = minute_bars('2025-01-06 09:19', [(4, 9, 3, 8, 100), (8, 9, 7, 8.5, 5)])
+    added, total = file_manager.append_data_to_cache('X', '1m', 'NSE', update)
+
+    expected = pd.concat([saved.iloc[:-1], update])
+    assert (added, total) == (1, 6)
+    pd.testing.assert_frame_equal(file_manager.load_data_from_cache('X', '1m', 'NSE')[BARS], expected,
+                                  check_freq=False)
+    mapped = file_manager.map_data_from_cache('X', '1m', 'NSE', window=2).to_frame()
+    pd.testing.assert_frame_equal(mapped[BARS], expected.iloc[-2:], check_freq=False)
+
+
+@pytest.mark.parametrize('file_manager', [False, True], ids=['files', 'consolidated'], indirect=True)
+def test_incremental_appends_match_a_full_rewrite(file_manager):
+    df = generate_synthetic_ohlcv(1_200, seed=3)[BARS]
+    file_manager.save_data_to_cache('SYN', '15m', 'NSE', df.iloc[:500])
+
+    # Each fetch overlaps a few stored bars and revises the last one, like a live incremental update
+    for end in range(600, 1_300, 100):
+        chunk = df.iloc[end - 110:end].copy()
+        chunk.iloc[-1, chunk.columns.get_loc('close')] += 0.5
+        file_manager.append_data_to_cache('SYN', '15m', 'NSE', chunk)
+        df.iloc[end - 1, df.columns.get_loc('close')] += 0.5
+
+    pd.testing.assert_frame_equal(file_manager.load_data_from_cache('SYN', '15m', 'NSE')[BARS], df,
+                                  check_freq=False)
+    assert file_manager.get_cache_info('SYN', '15m', 'NSE')['total_candles'] == len(df)
+
+
+def test_compaction_keeps_the_series(tmp_path):
+    df = generate_synthetic_ohlcv(400, seed=5)[BARS]
+    store = SegmentedOHLCVStore(str(tmp_path / 'SYN_NSE_15m.seg'))
+    for end in range(20, 401, 20):
+        store.append(df.iloc[max(0, end - 25):end], {'symbol': 'SYN'})
+    segments_before = len(store._segments())
+
+    merged = store.compact()
+    assert merged > 0 and len(store._segments()) == segments_before - merged
+    pd.testing.assert_frame_equal(store.read()[0][BARS], df, check_freq=False)
+    pd.testing.assert_frame_equal(store.map(window=50).to_frame()[BARS], df.iloc[-50:], check_freq=False)
+
+
+def test_cache_format_round_trip(tmp_path):
+    df = generate_synthetic_ohlcv(300, seed=9)
+    df.index = df.index.tz_localize('Asia/Kolkata')
+    path = str(tmp_path / 'series.ohlcv')
+    OHLCVCacheFormat.write(path, df, {'symbol': 'SYN'})
+
+    loaded, metadata = OHLCVCacheFormat.read(path)
+    pd.testing.assert_frame_equal(loaded, df, check_freq=False)
+    assert metadata['symbol'] == 'SYN'
+    assert OHLCVCacheFormat.read_bounds(path)[0] == len(df)
+    pd.testing.assert_frame_equal(OHLCVCacheFormat.map(path, 10).to_frame(), df.iloc[-10:], check_freq=False)
@@ -0,0 +1,37 @@
+"""Swing-low detection: the numpy engine against the loop reference"""
+
+from dataclasses import asdict
+
+import pytest
+
+from apex_core import EnhancedSwingLowDetector
+
+LOOKBACKS = [(5, None), (10, None), (10, 1), (20, 8)]
+
+
+def _swing_rows(swing_lows):
+    return [asdict(swing_low) for swing_low in swing_lows]
+
+
+@pytest.mark.parametrize('left_lookback, right_lookback', LOOKBACKS)
+def test_numpy_matches_loop(short_df, left_lookback, right_lookback):
+    results = {}
+    for engine in ('loop', 'numpy'):
+        detector = EnhancedSwingLowDetector(left_lookback, right_lookback, engine=engine)
+        swing_lows = detector.find_swing_lows_with_invalidation(short_df)
+        untouched = detector.find_untouched_swing_lows(short_df, swing_lows)
+        results[engine] = (_swing_rows(swing_lows), _swing_rows(untouched))
+
+    assert results['loop'][0], "series should produce swing lows"
+    assert results['numpy'] == results['loop']
+
+
+def test_incremental_matches_batch(synthetic_df):
+    detector = EnhancedSwingLowDetector(10)
+    batch = detector.find_swing_lows_with_invalidation(synthetic_df)
+
+    state = None
+    for end in (1_200, 1_500, 1_501, len(synthetic_df)):
+        swing_lows, state = detector.find_swing_lows_incremental(synthetic_df.iloc[:end], state)
+
+    assert _swing_rows(swing_lows) == _swing_rows(batch)
@@ -0,0 +1,52 @@
+"""Synthetic universe: seeded, and its retests reach the real touch and trade analyzers"""
+
+import pandas as pd
+import pytest
+
+from apex_core import (
+    EnhancedSwingLowDetector, EnhancedSwingLowTouchAnalyzer, EnhancedTradeOutcomeAnalyzer, FusedPatternDetector
+)
+from benchmark import ANALYSIS_PARAMETERS, DETECTOR_CLASSES, PipelineBenchmark
+
+N_SYMBOLS, N_BARS = 5, 1_000
+
+
+def _universe(seed):
+    # The universe the benchmark times, swing detector settings included
+    return PipelineBenchmark(seed=seed).universe(N_SYMBOLS, N_BARS)
+
+
+def _touches_and_outcomes(universe):
+    params = ANALYSIS_PARAMETERS
+    detector = EnhancedSwingLowDetector(params['swing_lookback'], params['right_lookback'], params['min_swing_size'])
+    patterns = FusedPatternDetector({name: cls() for name, cls in DETECTOR_CLASSES.items()})
+    touch_analyzer = EnhancedSwingLowTouchAnalyzer(params['touch_tolerance'], params['min_days_between'])
+    trade_analyzer = EnhancedTradeOutcomeAnalyzer(params['max_bars_to_analyze'], params['capital_per_trade'])
+
+    n_touches = n_outcomes = 0
+    for symbol, df in universe.items():
+        swing_lows = detector.find_swing_lows_with_invalidation(df)
+        untouched = detector.find_untouched_swing_lows(df, swing_lows)
+        touches = touch_analyzer.analyze_touches(df, untouched, patterns.detect(df, True), symbol, '15m')
+        outcomes = trade_analyzer.analyze_trade_outcomes_with_timeframe(df, touches, '15m')
+        n_touches += len(touches)
+        n_outcomes += sum(1 for touch in outcomes if touch.trade_outcome)
+    return n_touches, n_outcomes
+
+
+def test_universe_is_seeded():
+    first, again = _universe(3), _universe(3)
+    assert first.keys() == again.keys()
+    for symbol, df in first.items():
+        pd.testing.assert_frame_equal(df, again[symbol])
+        assert df.attrs['planted'] == again[symbol].attrs['planted']
+
+
+@pytest.mark.parametrize('seed', [1, 7, 42])
+def test_retests_become_touches_with_outcomes(seed):
+    n_touches, n_outcomes = _touches_and_outcomes(_universe(seed))
+
+    per_thousand_bars = N_SYMBOLS * N_BARS / 1_000
+    assert n_touches >= 2 * per_thousand_bars
+    # Only a retest in a series' last few bars can lack the bars to resolve a trade
+    assert n_outcomes >= n_touches - N_SYMBOLS
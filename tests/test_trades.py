@@ -0,0 +1,58 @@
+"""Trade outcomes: the batched NumPy engine against the bar-by-bar loop"""
+
+import copy
+import math
+from dataclasses import asdict
+
+import pytest
+
+from apex_core import EnhancedTradeOutcomeAnalyzer
+
+
+def _outcomes(df, touches, engine, **options):
+    # The analyzer writes entry/stop prices back onto the touches, so each engine gets its own copy
+    analyzer = EnhancedTradeOutcomeAnalyzer(max_bars_to_analyze=100, capital_per_trade=10000)
+    enhanced = analyzer.analyze_trade_outcomes_with_timeframe(df, copy.deepcopy(touches), '15m', engine=engine,
+                                                              **options)
+    return [asdict(touch.trade_outcome) for touch in enhanced]
+
+
+def assert_engines_agree(df, touches, **options):
+    batched = _outcomes(df, touches, 'batched', **options)
+    loop = _outcomes(df, touches, 'loop', **options)
+
+    assert len(loop) > 50
+    assert len(batched) == len(loop)
+    for position, (fast, reference) in enumerate(zip(batched, loop)):
+        assert fast.keys() == reference.keys()
+        for name, expected in reference.items():
+            actual = fast[name]
+            if isinstance(expected, float):
+                assert math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-9), (position, name)
+            else:
+                assert actual == expected, (position, name)
+    return loop
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'custom_target_pct': 0.5},
+    {'intraday_mode': True},
+    {'intraday_mode': True, 'entry_cutoff_time': '13:00', 'exit_time': '14:30'},
+], ids=['fixed', 'custom-target', 'intraday', 'intraday-cutoffs'])
+def test_fixed_stop_batched_matches_loop(synthetic_df, synthetic_touches, options):
+    outcomes = assert_engines_agree(synthetic_df, synthetic_touches, **options)
+    assert {'target_hit', 'stop_loss'} <= {outcome['resolution_type'] for outcome in outcomes}
+
+
+@pytest.mark.parametrize('options, resolution_type', [
+    ({'use_trailing_stop': True}, 'trailing_stop'),
+    ({'use_trailing_stop': True, 'intraday_mode': True}, 'trailing_stop'),
+    ({'use_partial_exits': True}, 'partial_exits_complete'),
+    ({'use_partial_exits': True, 'first_exit_pct': 0.3, 'second_exit_pct': 1.2, 'first_exit_capital_pct': 30.0},
+     'partial_exits_complete'),
+    ({'use_partial_exits': True, 'use_trailing_stop': True, 'intraday_mode': True}, 'partial_exits_complete'),
+], ids=['trailing', 'trailing-intraday', 'partial', 'partial-custom', 'partial-trailing-intraday'])
+def test_trailing_and_partial_batched_matches_loop(synthetic_df, synthetic_touches, options, resolution_type):
+    outcomes = assert_engines_agree(synthetic_df, synthetic_touches, **options)
+    assert resolution_type in {outcome['resolution_type'] for outcome in outcomes}